@@ -1,12 +1,28 @@
-"""Simple benchmark runner for SPARQL client and publish planners."""
+"""Simple benchmark runner for SPARQL client, publish planners, pathway search, MCP response encoding, worker offload, and audit logging."""
 
 from __future__ import annotations
 
+import asyncio
+import json
+import random
+import tempfile
 import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
 
 from src.adapters import SparqlClient, SparqlEndpoint
+from src.instrumentation.audit import (
+    InMemoryToolCallAuditLog,
+    JsonlToolCallAuditSink,
+    ToolCallAuditRecord,
+    hash_json,
+)
 from src.instrumentation.cache import InMemoryCache
 from src.instrumentation.metrics import MetricsRecorder
+from src.semantic.pathway_graph import PathwayGraph
+from src.server.mcp import codec
+from src.tools.offload import WorkerPools
 
 
 def benchmark_sparql(query: str) -> dict[str, float]:
@@ -29,3 +45,281 @@ def benchmark_sparql(query: str) -> dict[str, float]:
     results["warm"] = time.perf_counter() - start
     return results
 
+
+def build_synthetic_pathway_edges(
+    *,
+    edge_count: int = 10_000,
+    layers: int = 12,
+    seed: int = 7,
+) -> list[tuple[str, str]]:
+    """Build a dense layered KE network with forward, skip, and back edges."""
+
+    rng = random.Random(seed)
+    width = max(2, edge_count // (layers * 4))
+    layer_nodes = [[f"KE:{layer}-{slot}" for slot in range(width)] for layer in range(layers)]
+    edges: set[tuple[str, str]] = set()
+    while len(edges) < edge_count:
+        layer = rng.randrange(layers - 1)
+        step = 1 if rng.random() < 0.8 else rng.choice((2, 3, -1))
+        target_layer = min(max(layer + step, 0), layers - 1)
+        upstream = rng.choice(layer_nodes[layer])
+        downstream = rng.choice(layer_nodes[target_layer])
+        if upstream != downstream:
+            edges.add((upstream, downstream))
+    return sorted(edges)
+
+
+def benchmark_path_enumeration(
+    *,
+    edge_count: int = 10_000,
+    k: int = 10,
+    max_hops: int = 20,
+) -> dict[str, float]:
+    edges = build_synthetic_pathway_edges(edge_count=edge_count)
+    start = time.perf_counter()
+    graph = PathwayGraph(edges, weights=[1.0 + (index % 5) / 4 for index in range(len(edges))])
+    build_seconds = time.perf_counter() - start
+    source = min(upstream for upstream, _ in edges if upstream.startswith("KE:0-"))
+    target = max(downstream for _, downstream in edges if downstream.startswith("KE:11-"))
+    start = time.perf_counter()
+    paths = graph.k_shortest_paths([source], [target], k=k, max_hops=max_hops)
+    search_seconds = time.perf_counter() - start
+    return {
+        "edges": float(graph.edge_count),
+        "nodes": float(graph.node_count),
+        "paths": float(len(paths)),
+        "build_seconds": build_seconds,
+        "search_seconds": search_seconds,
+    }
+
+
+def build_synthetic_tool_result(*, node_count: int = 2_000, seed: int = 7) -> dict[str, object]:
+    """Build an ``assemble_aop_network``-sized result for encoding benchmarks."""
+
+    rng = random.Random(seed)
+    nodes = [
+        {
+            "id": f"KE:{index}",
+            "iri": f"https://identifiers.org/aop.events/{index}",
+            "title": f"Synthetic key event {index} \u2014 r\u00e9ponse",
+            "aop_ids": [f"AOP:{rng.randrange(500)}" for _ in range(rng.randrange(1, 4))],
+            "degree": rng.randrange(12),
+            "betweenness": round(rng.random(), 6),
+        }
+        for index in range(node_count)
+    ]
+    edges = [
+        {
+            "id": f"KER:{index}",
+            "upstream_event_id": f"KE:{rng.randrange(node_count)}",
+            "downstream_event_id": f"KE:{rng.randrange(node_count)}",
+            "aop_count": rng.randrange(1, 4),
+        }
+        for index in range(node_count * 2)
+    ]
+    return {"node_count": node_count, "edge_count": len(edges), "nodes": nodes, "edges": edges}
+
+
+def benchmark_response_rendering(*, node_count: int = 2_000, repeats: int = 20) -> dict[str, object]:
+    """Compare per-call CPU of the legacy and codec tool-result encoding paths.
+
+    The legacy path mirrors the previous router: ``json.dumps(indent=2)`` for
+    the text block, ``hash_json`` for the audit record, and FastAPI's
+    ``jsonable_encoder`` plus ``json.dumps`` for the HTTP body.
+    """
+
+    result = build_synthetic_tool_result(node_count=node_count)
+    sources = [{"name": "AOP-Wiki", "url": "https://aopwiki.org/"}]
+
+    def legacy() -> bytes:
+        envelope = {
+            "content": [{"type": "text", "text": json.dumps(result, indent=2)}],
+            "_meta": {"sources": sources},
+            "structuredContent": result,
+        }
+        hash_json(result)
+        payload = {"jsonrpc": "2.0", "result": envelope, "id": 1}
+        return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def encoded(compact: bool) -> bytes:
+        payload = codec.encode_payload(result)
+        envelope = codec.ToolCallResult(
+            content=[{"type": "text", "text": payload.text(compact=compact)}],
+            _meta={"sources": sources},
+            structuredContent=result,
+        )
+        envelope.encoded_structured_content = payload.canonical
+        payload.sha256  # audit response_hash
+        return codec.render_jsonrpc(result=envelope, request_id=1)
+
+    def per_call_ms(render) -> float:
+        render()
+        start = time.process_time()
+        for _ in range(repeats):
+            render()
+        return (time.process_time() - start) * 1000 / repeats
+
+    legacy_ms = per_call_ms(legacy)
+    pretty_ms = per_call_ms(lambda: encoded(False))
+    compact_ms = per_call_ms(lambda: encoded(True))
+    body = encoded(True)
+    return {
+        "backend": codec.JSON_BACKEND,
+        "body_bytes": len(body),
+        "gzip_bytes": len(codec.maybe_gzip(body, "gzip", min_bytes=0)[0]),
+        "legacy_cpu_ms": round(legacy_ms, 3),
+        "codec_pretty_cpu_ms": round(pretty_ms, 3),
+        "codec_compact_cpu_ms": round(compact_ms, 3),
+        "saved_pretty_cpu_ms": round(legacy_ms - pretty_ms, 3),
+        "saved_compact_cpu_ms": round(legacy_ms - compact_ms, 3),
+    }
+
+
+def _encode_and_hash(result: dict[str, object]) -> str:
+    payload = codec.encode_payload(result)
+    payload.text()
+    return payload.sha256
+
+
+def benchmark_offload_latency(
+    *,
+    node_count: int = 5_000,
+    heavy_calls: int = 8,
+    light_calls: int = 200,
+    process_workers: int = 2,
+) -> dict[str, float]:
+    """p50/p99 latency (ms) of light requests while large results are encoded and hashed.
+
+    Light requests are 1 ms sleeps on the event loop, so their extra latency is
+    time the loop spent blocked. The heavy results run inline on the loop, on
+    the offload thread pool, or in offload worker processes.
+    """
+
+    result = build_synthetic_tool_result(node_count=node_count)
+
+    async def run(mode: str, pools: WorkerPools) -> list[float]:
+        latencies: list[float] = []
+
+        async def light() -> None:
+            for _ in range(light_calls):
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                latencies.append((time.perf_counter() - start - 0.001) * 1000)
+
+        async def heavy() -> None:
+            for _ in range(heavy_calls):
+                if mode == "inline":
+                    _encode_and_hash(result)
+                    await asyncio.sleep(0)
+                elif mode == "thread":
+                    await pools.run_in_thread(_encode_and_hash, result)
+                else:
+                    await pools.run_in_process(_encode_and_hash, result)
+
+        await asyncio.gather(light(), heavy())
+        return sorted(latencies)
+
+    results: dict[str, float] = {}
+    for mode in ("inline", "thread", "process"):
+        pools = WorkerPools(process_workers=process_workers)
+        try:
+            if mode == "process":
+                # Start the workers before measuring.
+                asyncio.run(pools.run_in_process(_encode_and_hash, {}))
+            latencies = asyncio.run(run(mode, pools))
+        finally:
+            pools.shutdown()
+        results[f"{mode}_light_p50_ms"] = round(latencies[len(latencies) // 2], 3)
+        results[f"{mode}_light_p99_ms"] = round(latencies[int(len(latencies) * 0.99) - 1], 3)
+    return results
+
+
+def build_synthetic_audit_record(index: int) -> ToolCallAuditRecord:
+    return ToolCallAuditRecord(
+        call_id=f"call-{index}",
+        tool_name="get_aop",
+        started_at="2026-01-01T00:00:00Z",
+        finished_at="2026-01-01T00:00:01Z",
+        duration_ms=12.5,
+        status="success",
+        argument_keys=["aop_id"],
+        request_hash=f"{index:064x}",
+        response_hash=f"{index:064x}",
+        output_schema_title="get_aop.response",
+        output_schema_hash="0" * 64,
+        output_validation_status="passed",
+        risk_class="read",
+        required_scopes=["toxmcp:read"],
+        granted_scopes=["toxmcp:read"],
+        requires_confirmation=False,
+        confirmation_provided=False,
+        policy_status="passed",
+    )
+
+
+def benchmark_audit_append(
+    *,
+    record_count: int = 1_000_000,
+    milestones: tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000),
+    sample: int = 1_000,
+) -> dict[str, float]:
+    """Mean JSONL audit append latency (microseconds) as the log grows."""
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        sink = JsonlToolCallAuditSink(Path(directory) / "audit.jsonl")
+        appended = 0
+        for milestone in sorted(value for value in milestones if value <= record_count):
+            while appended < milestone - sample:
+                sink.append(build_synthetic_audit_record(appended))
+                appended += 1
+            start = time.perf_counter()
+            while appended < milestone:
+                sink.append(build_synthetic_audit_record(appended))
+                appended += 1
+            results[f"append_us_at_{milestone}"] = round(
+                (time.perf_counter() - start) * 1_000_000 / sample, 2
+            )
+    return results
+
+
+def benchmark_audit_writer(
+    *,
+    concurrency: int = 64,
+    rounds: int = 50,
+    fsync: str = "batch",
+) -> dict[str, float]:
+    """Throughput (records/s) of concurrent audited calls, sync vs background writer."""
+
+    async def run(log: InMemoryToolCallAuditLog) -> float:
+        start = time.perf_counter()
+        for round_index in range(rounds):
+            base = round_index * concurrency
+            await asyncio.gather(
+                *(
+                    log.append_async(build_synthetic_audit_record(base + offset))
+                    for offset in range(concurrency)
+                )
+            )
+        log.close()
+        return concurrency * rounds / (time.perf_counter() - start)
+
+    results: dict[str, float] = {}
+    for mode in ("sync", "background"):
+        with tempfile.TemporaryDirectory() as directory:
+            log = InMemoryToolCallAuditLog()
+            log.configure_jsonl_sink(
+                Path(directory) / "audit.jsonl",
+                fsync=fsync,
+                background=mode == "background",
+            )
+            results[f"{mode}_records_per_s"] = round(asyncio.run(run(log)), 1)
+    return results
+
+
+if __name__ == "__main__":
+    print(benchmark_path_enumeration())
+    print(benchmark_response_rendering())
+    print(benchmark_offload_latency())
+    print(benchmark_audit_append())
+    print(benchmark_audit_writer())
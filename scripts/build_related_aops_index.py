@@ -0,0 +1,53 @@
+"""Build the precomputed related-AOP overlap index used by get_related_aops.
+
+Run offline or on a schedule (for example nightly via cron). The server picks
+up a rewritten index file on the next call without a restart.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.adapters import AOPWikiAdapter, SparqlClient  # noqa: E402
+from src.server.config.settings import get_settings  # noqa: E402
+from src.services.related_aops import build_aop_similarity_index_from_adapter  # noqa: E402
+
+
+async def main(argv: Sequence[str] | None = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(settings.related_aops_index_path or "output/related_aops_index.json"),
+        help="Index file to write (default: AOP_MCP_RELATED_AOPS_INDEX_PATH or %(default)s)",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=100,
+        help="Neighbours kept per AOP for each similarity metric (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    async with SparqlClient(settings.aop_wiki_sparql_endpoints, max_retries=2, timeout=120.0) as client:
+        # Never fall back to fixture data: the index would be published as real.
+        adapter = AOPWikiAdapter(client, cache_ttl_seconds=0, enable_fixture_fallback=False)
+        index = await build_aop_similarity_index_from_adapter(adapter, top_k=args.top_k)
+
+    path = index.save(args.output)
+    neighbour_count = sum(len(items) for items in index.neighbors.values())
+    print(f"Indexed {len(index.aops)} AOPs ({neighbour_count} neighbour entries) -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,82 @@
+"""Precompute heuristic confidence calls for every AOP into a CSV results table.
+
+Each AOP is assessed with the same logic as ``assess_aop_confidence`` under
+bounded concurrency. Rows are appended as they finish, so an interrupted run
+resumes where it stopped when started again with the same ``--output``.
+``query_aop_confidence_results`` serves the table once
+``AOP_MCP_CONFIDENCE_RESULTS_PATH`` points at it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.server.config.settings import get_settings  # noqa: E402
+from src.server.dependencies import get_aop_wiki_adapter  # noqa: E402
+from src.server.tools.aop import make_shared_confidence_assessor  # noqa: E402
+from src.services.confidence_corpus import precompute_confidence_results  # noqa: E402
+
+
+async def main(argv: Sequence[str] | None = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(settings.confidence_results_path or "output/aop_confidence_results.csv"),
+        help="Results CSV to append to (default: AOP_MCP_CONFIDENCE_RESULTS_PATH or %(default)s)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of AOPs assessed at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--aop-id",
+        action="append",
+        dest="aop_ids",
+        default=None,
+        help="Assess only this AOP (repeatable); defaults to every AOP in AOP-Wiki",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Re-assess AOPs whose previous row recorded an error",
+    )
+    args = parser.parse_args(argv)
+
+    aop_ids = args.aop_ids
+    if not aop_ids:
+        memberships = await get_aop_wiki_adapter().list_aop_memberships()
+        aop_ids = [record["id"] for record in memberships if record.get("id")]
+
+    def report(row: dict) -> None:
+        status = f"error: {row['error']}" if row["error"] else row["overall_call"]
+        print(f"{row['aop_id']}: {status}", flush=True)
+
+    summary = await precompute_confidence_results(
+        aop_ids,
+        make_shared_confidence_assessor(),
+        output_path=args.output,
+        concurrency=args.concurrency,
+        retry_failed=args.retry_failed,
+        on_result=report,
+    )
+    print(
+        f"Assessed {summary['assessed']} AOPs ({summary['failed']} failed, "
+        f"{summary['skipped']} already done) -> {summary['output_path']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -8,6 +8,12 @@ import re
 from typing import Any
 from urllib.parse import quote
 
+from src.instrumentation.progress import (
+    report_partial_result,
+    report_progress,
+    wants_partial_results,
+)
+from src.instrumentation.tracing import tracer
 from src.semantic import AOP_CURIE_RESOLVER
 from .comp_tox import CompToxClient, CompToxError, compute_specificity_score
 from .fixtures import FixtureNotFoundError, load_fixture
@@ -498,13 +504,29 @@ class AOPDBAdapter:
 
         aggregated_candidates: dict[int, dict[str, Any]] = {}
         per_aop_diagnostics: list[dict[str, Any]] = []
-        for aop_id in normalized_aop_ids:
+        for completed, aop_id in enumerate(normalized_aop_ids, start=1):
             assay_rows, aop_diagnostics = await self._list_assays_for_aop_with_diagnostics(
                 aop_id,
                 limit=per_aop_limit,
                 min_hitcall=min_hitcall,
             )
             per_aop_diagnostics.append(aop_diagnostics)
+            report_progress(completed, len(normalized_aop_ids), f"Collected assays for {aop_id}")
+            if wants_partial_results():
+                report_partial_result(
+                    {
+                        "aop_id": aop_id,
+                        "assays": [
+                            {
+                                "aeid": row["aeid"],
+                                "assay_name": row.get("assay_name"),
+                                "max_hitcall": float(row.get("max_hitcall") or 0.0),
+                            }
+                            for row in assay_rows
+                        ],
+                        "diagnostics": aop_diagnostics,
+                    }
+                )
             for row in assay_rows:
                 aeid = row["aeid"]
                 candidate = aggregated_candidates.setdefault(
@@ -1157,7 +1179,8 @@ class AOPDBAdapter:
         if not self.comptox:
             raise ValueError("CompTox client is required for this operation")
         method = getattr(self.comptox, method_name)
-        return await asyncio.to_thread(method, *args, **kwargs)
+        with tracer.span(f"comptox.{method_name}"):
+            return await asyncio.to_thread(method, *args, **kwargs)
 
     async def _gather_bounded(
         self,
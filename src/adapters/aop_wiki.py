@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 import html
 from pathlib import Path
 import re
-from typing import Any
+from typing import Any, Sequence
 
 from .fixtures import FixtureNotFoundError, load_fixture
 from .sparql_client import SparqlClient, SparqlClientError
 from .sparql_client import TemplateCatalog as _TemplateCatalog
+from src.instrumentation.tracing import traced
 from src.semantic import AOP_CURIE_RESOLVER
 
 TEMPLATE_DIR = Path(__file__).resolve().parent / "templates" / "aop_wiki"
@@ -256,6 +258,7 @@ class AOPWikiAdapter:
     def __post_init__(self) -> None:
         self._templates = _TemplateCatalog.from_directory(TEMPLATE_DIR)
 
+    @traced("aop_wiki.search_aops")
     async def search_aops(self, *, text: str | None = None, limit: int = 25) -> list[dict[str, Any]]:
         search_query_parts = _build_search_query_parts(text)
 
@@ -287,6 +290,7 @@ class AOPWikiAdapter:
             )
         return results
 
+    @traced("aop_wiki.get_aop")
     async def get_aop(self, aop_id: str) -> dict[str, Any]:
         iri = self._aop_iri(aop_id)
         query = self._templates.render_safe("get_aop", uris={"aop_iri": iri})
@@ -318,6 +322,7 @@ class AOPWikiAdapter:
             ],
         }
 
+    @traced("aop_wiki.get_aop_assessment")
     async def get_aop_assessment(self, aop_id: str) -> dict[str, Any]:
         iri = self._aop_iri(aop_id)
         query = self._templates.render_safe("get_aop_assessment", uris={"aop_iri": iri})
@@ -385,6 +390,7 @@ class AOPWikiAdapter:
 
         return record
 
+    @traced("aop_wiki.list_key_events")
     async def list_key_events(self, aop_id: str) -> list[dict[str, Any]]:
         iri = self._aop_iri(aop_id)
         query = self._templates.render_safe("list_key_events", uris={"aop_iri": iri})
@@ -405,6 +411,7 @@ class AOPWikiAdapter:
             )
         return items
 
+    @traced("aop_wiki.get_key_event")
     async def get_key_event(self, ke_id: str) -> dict[str, Any]:
         iri = self._event_iri(ke_id)
         query = self._templates.render_safe("get_key_event", uris={"ke_iri": iri})
@@ -504,6 +511,7 @@ class AOPWikiAdapter:
         record["shared_aop_count"] = len(record["part_of_aops"])
         return record
 
+    @traced("aop_wiki.list_kers")
     async def list_kers(self, aop_id: str) -> list[dict[str, Any]]:
         iri = self._aop_iri(aop_id)
         query = self._templates.render_safe("list_kers", uris={"aop_iri": iri})
@@ -528,6 +536,7 @@ class AOPWikiAdapter:
             )
         return items
 
+    @traced("aop_wiki.get_ker")
     async def get_ker(self, ker_id: str) -> dict[str, Any]:
         iri = self._ker_iri(ker_id)
         query = self._templates.render_safe("get_ker", uris={"ker_iri": iri})
@@ -619,6 +628,106 @@ class AOPWikiAdapter:
         record["shared_aop_count"] = len(record["referenced_aops"])
         return record
 
+    @traced("aop_wiki.list_aop_memberships")
+    async def list_aop_memberships(self) -> list[dict[str, Any]]:
+        """Return KE and KER membership for every AOP in one corpus-wide query."""
+
+        query = self._templates.render_safe("list_aop_memberships")
+        try:
+            payload = await self.client.query(query, cache_ttl_seconds=self.cache_ttl_seconds)
+        except SparqlClientError as exc:
+            payload = self._load_fixture("aop_wiki", "list_aop_memberships", error=exc)
+        bindings = payload.get("results", {}).get("bindings", [])
+        records: dict[str, dict[str, Any]] = {}
+        for row in bindings:
+            identifier = _normalize_binding_identifier(row, "aop")
+            key = identifier["id"] or identifier["iri"]
+            if not key:
+                continue
+            record = records.setdefault(
+                key,
+                {
+                    **identifier,
+                    "title": None,
+                    "key_event_ids": [],
+                    "ker_ids": [],
+                },
+            )
+            _coalesce(record, "title", _normalize_text(_binding_value(row, "title")))
+            key_event = _normalize_binding_identifier(row, "ke")
+            _append_unique(record["key_event_ids"], key_event["id"] or key_event["iri"])
+            ker = _normalize_binding_identifier(row, "ker")
+            _append_unique(record["ker_ids"], ker["id"] or ker["iri"])
+        return list(records.values())
+
+    @traced("aop_wiki.list_aop_networks")
+    async def list_aop_networks(
+        self,
+        aop_ids: Sequence[str],
+        *,
+        batch_size: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Return KE and KER membership for many AOPs using batched ``VALUES`` queries.
+
+        Records come back in the order of ``aop_ids``; AOPs the endpoint does
+        not know are returned with empty key-event and KER lists.
+        """
+
+        iris = list(dict.fromkeys(self._aop_iri(aop_id) for aop_id in aop_ids))
+        if not iris:
+            return []
+        batches = [iris[start : start + batch_size] for start in range(0, len(iris), max(1, batch_size))]
+        payloads = await asyncio.gather(*(self._query_aop_network_batch(batch) for batch in batches))
+
+        records: dict[str, dict[str, Any]] = {
+            iri: {
+                "id": _iri_to_curie(iri),
+                "iri": iri,
+                "title": None,
+                "key_events": [],
+                "kers": [],
+            }
+            for iri in iris
+        }
+        seen: set[tuple[str, str]] = set()
+        for payload in payloads:
+            for row in payload.get("results", {}).get("bindings", []):
+                record = records.get(_binding_value(row, "aop") or "")
+                if record is None:
+                    continue
+                _coalesce(record, "title", _normalize_text(_binding_value(row, "title")))
+                key_event = _normalize_binding_identifier(row, "ke")
+                ke_key = key_event["id"] or key_event["iri"]
+                if ke_key and (record["iri"], ke_key) not in seen:
+                    seen.add((record["iri"], ke_key))
+                    record["key_events"].append(
+                        {
+                            **key_event,
+                            "title": _normalize_text(_binding_value(row, "label")),
+                            "event_type": _binding_value(row, "eventType"),
+                        }
+                    )
+                ker = _normalize_binding_identifier(row, "ker")
+                ker_key = ker["id"] or ker["iri"]
+                if ker_key and (record["iri"], ker_key) not in seen:
+                    seen.add((record["iri"], ker_key))
+                    record["kers"].append(
+                        {
+                            **ker,
+                            "upstream": _normalize_binding_identifier(row, "upstream"),
+                            "downstream": _normalize_binding_identifier(row, "downstream"),
+                        }
+                    )
+        return list(records.values())
+
+    async def _query_aop_network_batch(self, iris: Sequence[str]) -> dict[str, Any]:
+        query = self._templates.render_safe("list_aop_networks", uri_lists={"aop_iris": iris})
+        try:
+            return await self.client.query(query, cache_ttl_seconds=self.cache_ttl_seconds)
+        except SparqlClientError as exc:
+            return self._load_fixture("aop_wiki", "list_aop_networks", error=exc)
+
+    @traced("aop_wiki.get_related_aops")
     async def get_related_aops(self, aop_id: str, *, limit: int = 20) -> list[dict[str, Any]]:
         iri = self._aop_iri(aop_id)
         query = self._templates.render_safe(
@@ -11,6 +11,10 @@ from urllib.parse import quote
 
 import httpx
 
+from src.instrumentation.accounting import record_cache_lookup, upstream_event_hooks
+
+COMPTOX_SERVICE = "comptox"
+
 
 class CompToxError(Exception):
     """Base exception for CompTox client."""
@@ -26,8 +30,13 @@ class CompToxClient:
         timeout: float = 10.0,
         transport: httpx.BaseTransport | None = None,
     ) -> None:
-        self._client = httpx.Client(base_url=base_url, timeout=timeout, transport=transport)
-        self._bio_client = httpx.Client(base_url=bioactivity_url, timeout=timeout, transport=transport)
+        event_hooks = upstream_event_hooks(COMPTOX_SERVICE)
+        self._client = httpx.Client(
+            base_url=base_url, timeout=timeout, transport=transport, event_hooks=event_hooks
+        )
+        self._bio_client = httpx.Client(
+            base_url=bioactivity_url, timeout=timeout, transport=transport, event_hooks=event_hooks
+        )
         self._api_key = api_key
         self._assay_catalog_items_cache: list[dict[str, Any]] | None = None
         self._all_assays_cache: list[dict[str, Any]] | None = None
@@ -76,7 +85,9 @@ class CompToxClient:
         """Fetch chemicals active in a specific assay (by AEID) from Bioactivity API."""
         cache_key = str(aeid)
         if cache_key in self._assay_chemicals_cache:
+            record_cache_lookup(COMPTOX_SERVICE, hit=True)
             return self._assay_chemicals_cache[cache_key]
+        record_cache_lookup(COMPTOX_SERVICE, hit=False)
         # Endpoint: bioactivity/assay/chemicals/search/by-aeid/{aeid}
         # Note: We use _bio_client which points to ctx-api
         response = self._bio_client.get(f"bioactivity/assay/chemicals/search/by-aeid/{aeid}", headers=self._headers())
@@ -92,7 +103,9 @@ class CompToxClient:
     def search_equal(self, value: str) -> list[dict[str, Any]]:
         cache_key = str(value)
         if cache_key in self._search_equal_cache:
+            record_cache_lookup(COMPTOX_SERVICE, hit=True)
             return self._search_equal_cache[cache_key]
+        record_cache_lookup(COMPTOX_SERVICE, hit=False)
         response = self._bio_client.get(
             f"chemical/search/equal/{quote(value, safe='')}",
             headers=self._headers(),
@@ -108,7 +121,9 @@ class CompToxClient:
     def bioactivity_data_by_dtxsid(self, dtxsid: str) -> list[dict[str, Any]]:
         cache_key = str(dtxsid)
         if cache_key in self._bioactivity_cache:
+            record_cache_lookup(COMPTOX_SERVICE, hit=True)
             return self._bioactivity_cache[cache_key]
+        record_cache_lookup(COMPTOX_SERVICE, hit=False)
         response = self._bio_client.get(
             f"bioactivity/data/search/by-dtxsid/{quote(dtxsid, safe='')}",
             headers=self._headers(),
@@ -124,7 +139,9 @@ class CompToxClient:
     def assay_by_aeid(self, aeid: int) -> dict[str, Any] | None:
         cache_key = int(aeid)
         if cache_key in self._assay_cache:
+            record_cache_lookup(COMPTOX_SERVICE, hit=True)
             return self._assay_cache[cache_key]
+        record_cache_lookup(COMPTOX_SERVICE, hit=False)
         response = self._bio_client.get(
             f"bioactivity/assay/search/by-aeid/{aeid}",
             headers=self._headers(),
@@ -155,7 +172,9 @@ class CompToxClient:
 
     def all_assays(self) -> list[dict[str, Any]]:
         if self._all_assays_cache is not None:
+            record_cache_lookup(COMPTOX_SERVICE, hit=True)
             return self._all_assays_cache
+        record_cache_lookup(COMPTOX_SERVICE, hit=False)
 
         response = self._bio_client.get("bioactivity/assay/", headers=self._headers())
         payload = self._handle_response(response)
@@ -171,7 +190,9 @@ class CompToxClient:
 
     def assay_catalog_items(self) -> list[dict[str, Any]]:
         if self._assay_catalog_items_cache is not None:
+            record_cache_lookup(COMPTOX_SERVICE, hit=True)
             return self._assay_catalog_items_cache
+        record_cache_lookup(COMPTOX_SERVICE, hit=False)
 
         html = self._fetch_assay_catalog_html()
         self._assay_catalog_items_cache = self._parse_assay_catalog_items(html)
@@ -6,6 +6,11 @@ from typing import Any
 
 import httpx
 
+from src.instrumentation.accounting import record_cache_lookup, upstream_event_hooks
+from src.instrumentation.tracing import traced
+
+HGNC_SERVICE = "hgnc"
+
 
 class HgncError(Exception):
     """Base exception for HGNC client failures."""
@@ -19,7 +24,12 @@ class HgncClient:
         timeout: float = 5.0,
         transport: httpx.BaseTransport | None = None,
     ) -> None:
-        self._client = httpx.Client(base_url=base_url, timeout=timeout, transport=transport)
+        self._client = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            transport=transport,
+            event_hooks=upstream_event_hooks(HGNC_SERVICE),
+        )
         self._symbol_cache: dict[str, str | None] = {}
 
     def close(self) -> None:
@@ -31,12 +41,15 @@ class HgncClient:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
+    @traced("hgnc.resolve_symbol")
     def resolve_symbol(self, identifier: str) -> str | None:
         normalized_identifier = self._normalize_identifier(identifier)
         if normalized_identifier is None:
             return None
         if normalized_identifier in self._symbol_cache:
+            record_cache_lookup(HGNC_SERVICE, hit=True)
             return self._symbol_cache[normalized_identifier]
+        record_cache_lookup(HGNC_SERVICE, hit=False)
 
         response = self._client.get(
             f"fetch/hgnc_id/{normalized_identifier}",
@@ -10,12 +10,14 @@ import time
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping
+from typing import Any, Mapping, MutableMapping, Sequence
 
 import httpx
 
+from src.instrumentation.accounting import record_cache_lookup, record_upstream, record_upstream_response
 from src.instrumentation.cache import Cache
 from src.instrumentation.metrics import MetricsRecorder
+from src.instrumentation.tracing import Span, tracer
 
 
 import logging
@@ -69,6 +71,14 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"
 
 
+# Values of the ``sparql.circuit_breaker_state`` gauge.
+CIRCUIT_STATE_GAUGE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+
 @dataclass
 class CircuitBreakerConfig:
     """Configuration for per-endpoint circuit breaker behavior."""
@@ -175,11 +185,14 @@ class TemplateCatalog:
         uris: Mapping[str, str] | None = None,
         ints: Mapping[str, int] | None = None,
         fragments: Mapping[str, str] | None = None,
+        uri_lists: Mapping[str, Sequence[str]] | None = None,
     ) -> str:
         """Render template with safe, categorized parameter binding.
 
         - literals: escaped as SPARQL string literals.
         - uris: validated as URIs and passed through.
+        - uri_lists: each URI validated and rendered as ``<iri>`` tokens
+          separated by spaces, for ``VALUES`` blocks.
         - ints: validated as integers and passed through.
         - fragments: passed through verbatim (trusted structural fragments only).
         """
@@ -192,6 +205,9 @@ class TemplateCatalog:
         for key, value in (uris or {}).items():
             replacements[key] = self._validate_uri(value)
 
+        for key, values in (uri_lists or {}).items():
+            replacements[key] = " ".join(f"<{self._validate_uri(value)}>" for value in values if value)
+
         for key, value in (ints or {}).items():
             replacements[key] = str(int(value))
 
@@ -259,6 +275,7 @@ class SparqlClient:
         retry_max_delay: float = 5.0,
         circuit_breaker_config: CircuitBreakerConfig | None = None,
         enable_circuit_breaker: bool = True,
+        service_name: str = "sparql",
     ) -> None:
         if not endpoints:
             raise ValueError("At least one SPARQL endpoint must be configured")
@@ -271,6 +288,7 @@ class SparqlClient:
         self._catalog = template_catalog or TemplateCatalog()
         self._cache = cache
         self._metrics = metrics
+        self.service_name = service_name
         self._max_retries = max(0, max_retries)
         self._timeout = timeout
         self._retry_base_delay = max(0.0, retry_base_delay)
@@ -280,6 +298,8 @@ class SparqlClient:
             endpoint.url: CircuitBreaker(config=circuit_breaker_config)
             for endpoint in self._endpoints
         }
+        if metrics is not None:
+            self._register_gauges(metrics)
         self._client = httpx.AsyncClient(
             timeout=timeout,
             headers={
@@ -289,6 +309,22 @@ class SparqlClient:
             transport=transport,
         )
 
+    def _register_gauges(self, metrics: MetricsRecorder) -> None:
+        for url, circuit in self._circuit_breakers.items():
+            metrics.register_gauge(
+                "sparql.circuit_breaker_state",
+                lambda circuit=circuit: CIRCUIT_STATE_GAUGE_VALUES[circuit.state],
+                service=self.service_name,
+                endpoint=url,
+            )
+        cache = self._cache
+        if cache is not None and hasattr(cache, "__len__"):
+            metrics.register_gauge(
+                "sparql.cache_entries",
+                lambda: len(cache),
+                service=self.service_name,
+            )
+
     async def aclose(self) -> None:
         await self._client.aclose()
 
@@ -306,17 +342,41 @@ class SparqlClient:
         cache_ttl_seconds: int | None = None,
         use_cache: bool = True,
         timeout: float | None = None,
+    ) -> dict[str, Any]:
+        with tracer.span("sparql.query", service=self.service_name) as span:
+            return await self._query(
+                query,
+                cache_key=cache_key,
+                cache_ttl_seconds=cache_ttl_seconds,
+                use_cache=use_cache,
+                timeout=timeout,
+                span=span,
+            )
+
+    async def _query(
+        self,
+        query: str,
+        *,
+        cache_key: str | None,
+        cache_ttl_seconds: int | None,
+        use_cache: bool,
+        timeout: float | None,
+        span: Span | None,
     ) -> dict[str, Any]:
         key = cache_key or self._hash_query(query)
         if use_cache and self._cache is not None:
             cached = await _resolve_maybe_awaitable(self._cache.get(key))
             if cached is not None:
                 if self._metrics:
-                    self._metrics.increment("sparql.cache_hit")
+                    self._metrics.increment("sparql.cache_hits", service=self.service_name)
+                record_cache_lookup(self.service_name, hit=True)
+                if span is not None:
+                    span.set_attribute("cache.hit", True)
                 return cached
+            record_cache_lookup(self.service_name, hit=False)
 
         if self._metrics:
-            with self._metrics.time("sparql.query_time"):
+            with self._metrics.time("sparql.query_seconds", service=self.service_name):
                 response = await self._dispatch(query, timeout=timeout)
         else:
             response = await self._dispatch(query, timeout=timeout)
@@ -326,7 +386,7 @@ class SparqlClient:
                 self._cache.set(key, response, ttl_seconds=cache_ttl_seconds)
             )
         if self._metrics:
-            self._metrics.increment("sparql.cache_miss")
+            self._metrics.increment("sparql.cache_misses", service=self.service_name)
 
         return response
 
@@ -361,11 +421,24 @@ class SparqlClient:
         Raises SparqlUpstreamError on 5xx or non-JSON responses.
         Raises SparqlQueryError on 4xx.
         """
+        start = time.perf_counter()
         response = await self._client.post(
             endpoint.url,
             content=query.encode("utf-8"),
             timeout=timeout or self._timeout,
         )
+        record_upstream_response(
+            self.service_name,
+            response,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+        if self._metrics:
+            self._metrics.increment(
+                "sparql.requests",
+                service=self.service_name,
+                endpoint=endpoint.url,
+                status=response.status_code,
+            )
 
         if response.status_code >= 500:
             raise SparqlUpstreamError(
@@ -388,6 +461,9 @@ class SparqlClient:
             circuit = self._circuit_breakers[endpoint.url]
             attempts = self._max_retries + 1
             for attempt in range(attempts):
+                if attempt:
+                    record_upstream(self.service_name, retries=1)
+                was_open = circuit.state == CircuitState.OPEN
                 try:
                     if self._enable_circuit_breaker:
                         return await circuit.call(
@@ -403,6 +479,7 @@ class SparqlClient:
                     )
                 except CircuitBreakerOpen:
                     logger.warning("SPARQL circuit breaker open for %s", endpoint.url)
+                    record_upstream(self.service_name, circuit_breaker_rejections=1)
                     last_error = CircuitBreakerOpen(
                         f"Circuit breaker open for {endpoint.url}"
                     )
@@ -419,6 +496,17 @@ class SparqlClient:
                         exc,
                     )
                     last_error = exc
+                    if isinstance(exc, httpx.HTTPError):
+                        record_upstream(self.service_name, requests=1, errors=1)
+                        if self._metrics:
+                            self._metrics.increment(
+                                "sparql.requests",
+                                service=self.service_name,
+                                endpoint=endpoint.url,
+                                status="transport_error",
+                            )
+                    if not was_open and circuit.state == CircuitState.OPEN:
+                        record_upstream(self.service_name, circuit_breaker_trips=1)
                     if attempt < attempts - 1 and self._retry_base_delay > 0:
                         delay = min(
                             self._retry_base_delay * (2 ** attempt) + random.uniform(0, 1),
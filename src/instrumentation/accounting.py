@@ -0,0 +1,179 @@
+"""Per-call accounting of upstream work done by MCP tool calls."""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+import httpx
+
+from src.instrumentation.metrics import metrics_recorder
+from src.instrumentation.throttle import upstream_throttle
+
+CALL_ACCOUNTING_SCHEMA_VERSION = "tool-call-cost.v1"
+_START_EXTENSION = "toxmcp.accounting_start"
+
+
+@dataclass
+class UpstreamServiceUsage:
+    """Counters for one upstream service within one tool call."""
+
+    requests: int = 0
+    errors: int = 0
+    bytes_received: int = 0
+    elapsed_ms: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    retries: int = 0
+    circuit_breaker_trips: int = 0
+    circuit_breaker_rejections: int = 0
+
+
+class CallAccounting:
+    """Upstream usage and phase timings collected for one tool call."""
+
+    def __init__(self) -> None:
+        self.services: dict[str, UpstreamServiceUsage] = {}
+        self.phases_ms: dict[str, float] = {}
+        # HGNC lookups fan out over worker threads that share this object.
+        self._lock = threading.Lock()
+
+    def add(self, service: str, **counts: float) -> None:
+        with self._lock:
+            usage = self.services.get(service)
+            if usage is None:
+                usage = self.services[service] = UpstreamServiceUsage()
+            for name, value in counts.items():
+                setattr(usage, name, getattr(usage, name) + value)
+
+    def add_phase(self, phase: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.phases_ms[phase] = self.phases_ms.get(phase, 0.0) + elapsed_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            services = {}
+            for name in sorted(self.services):
+                usage = asdict(self.services[name])
+                usage["elapsed_ms"] = round(usage["elapsed_ms"], 3)
+                services[name] = usage
+            phases = {name: round(self.phases_ms[name], 3) for name in sorted(self.phases_ms)}
+        return {
+            "schema_version": CALL_ACCOUNTING_SCHEMA_VERSION,
+            "services": services,
+            "phases_ms": phases,
+        }
+
+
+_current_accounting: ContextVar[CallAccounting | None] = ContextVar(
+    "tool_call_accounting", default=None
+)
+
+
+def current_call_accounting() -> CallAccounting | None:
+    return _current_accounting.get()
+
+
+@contextmanager
+def call_accounting_scope() -> Iterator[CallAccounting]:
+    """Collect upstream usage reported in this context into a new ``CallAccounting``."""
+
+    accounting = CallAccounting()
+    token = _current_accounting.set(accounting)
+    try:
+        yield accounting
+    finally:
+        _current_accounting.reset(token)
+
+
+def record_upstream(service: str, **counts: float) -> None:
+    """Add ``counts`` (``UpstreamServiceUsage`` field names) to the active scope."""
+
+    accounting = _current_accounting.get()
+    if accounting is not None:
+        accounting.add(service, **counts)
+
+
+def record_cache_lookup(service: str, *, hit: bool) -> None:
+    accounting = _current_accounting.get()
+    if accounting is not None:
+        accounting.add(service, **{"cache_hits" if hit else "cache_misses": 1})
+
+
+def record_upstream_response(
+    service: str,
+    response: httpx.Response,
+    *,
+    elapsed_ms: float,
+) -> None:
+    """Count one completed upstream request and the bytes of its (read) body."""
+
+    accounting = _current_accounting.get()
+    if accounting is None:
+        return
+    accounting.add(
+        service,
+        requests=1,
+        errors=int(response.status_code >= 500),
+        bytes_received=len(response.content),
+        elapsed_ms=elapsed_ms,
+    )
+
+
+def upstream_event_hooks(service: str) -> dict[str, list[Callable[[Any], None]]]:
+    """Return ``httpx.Client`` event hooks that account each request to ``service``.
+
+    Requests are also counted in the process-wide ``upstream.*`` metrics, and
+    wait for the service's rate budget when one is configured.
+    """
+
+    def on_request(request: httpx.Request) -> None:
+        upstream_throttle.acquire(service)
+        request.extensions[_START_EXTENSION] = perf_counter()
+
+    def on_response(response: httpx.Response) -> None:
+        start = response.request.extensions.get(_START_EXTENSION)
+        elapsed = perf_counter() - start if start is not None else 0.0
+        metrics_recorder.increment(
+            "upstream.requests", service=service, status=response.status_code
+        )
+        metrics_recorder.observe("upstream.response_seconds", elapsed, service=service)
+        if _current_accounting.get() is None:
+            return
+        response.read()
+        record_upstream_response(service, response, elapsed_ms=elapsed * 1000)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+@contextmanager
+def accounting_phase(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to ``phase`` of the active scope."""
+
+    accounting = _current_accounting.get()
+    if accounting is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        accounting.add_phase(phase, (perf_counter() - start) * 1000)
+
+
+__all__ = [
+    "CALL_ACCOUNTING_SCHEMA_VERSION",
+    "CallAccounting",
+    "UpstreamServiceUsage",
+    "accounting_phase",
+    "call_accounting_scope",
+    "current_call_accounting",
+    "record_cache_lookup",
+    "record_upstream",
+    "record_upstream_response",
+    "upstream_event_hooks",
+]
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import bisect
 import json
-from dataclasses import asdict, dataclass
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from itertools import islice
 from datetime import datetime, timezone
 from hashlib import sha256
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Callable, Iterable, Sequence
 
+from src.instrumentation.audit_index import AuditIndexEntry, AuditLogIndex
 from src.services.draft_store import (
     Draft,
     compute_graph_checksum,
@@ -18,6 +30,41 @@ from src.services.draft_store import (
 
 SUPPORTED_CHECKSUM_ALGORITHMS = {"sha256-v1"}
 AUDIT_CHAIN_ALGORITHM = "sha256-json-v1"
+AUDIT_ENVELOPE_SCHEMA_VERSION = "tool-call-audit-jsonl.v1"
+AUDIT_CHECKPOINT_SCHEMA_VERSION = "tool-call-audit-checkpoint.v1"
+AUDIT_SEGMENT_SEAL_SCHEMA_VERSION = "tool-call-audit-segment-seal.v1"
+AUDIT_FSYNC_MODES = ("none", "record", "batch", "interval")
+_AUDIT_ENVELOPE_FIELDS = frozenset(
+    {
+        "schema_version",
+        "algorithm",
+        "sequence",
+        "previous_record_hash",
+        "record",
+        "record_hash",
+    }
+)
+_AUDIT_SEAL_FIELDS = frozenset(
+    {
+        "schema_version",
+        "algorithm",
+        "segment_index",
+        "file_name",
+        "first_sequence",
+        "last_sequence",
+        "record_count",
+        "first_previous_record_hash",
+        "last_record_hash",
+        "merkle_root",
+        "previous_seal_hash",
+        "sealed_at",
+        "seal_hash",
+    }
+)
+TOOL_CALL_LATENCY_PERCENTILES = (50, 90, 95, 99)
+# Statistics key for calls naming a tool that is not registered, so arbitrary
+# request names cannot grow the statistics table.
+UNREGISTERED_TOOL_STATS_KEY = "(unregistered)"
 
 
 def verify_audit_chain(draft: Draft) -> bool:
@@ -101,37 +148,267 @@ class ToolCallAuditRecord:
     policy_status: str
     error_type: str | None = None
     error_message: str | None = None
+    cost: dict[str, object] | None = None
 
     def to_dict(self) -> dict[str, object]:
-        return asdict(self)
+        record = asdict(self)
+        # Records written before per-call accounting keep their original shape
+        # (and hash).
+        if record["cost"] is None:
+            del record["cost"]
+        return record
+
+
+# Fields added after the v1 envelope shipped; older records may omit them.
+_OPTIONAL_AUDIT_RECORD_FIELDS = frozenset({"cost"})
+
+
+@dataclass
+class _ToolCallStats:
+    """Lifetime counts and a rolling latency window for one tool."""
+
+    window_size: int
+    call_count: int = 0
+    error_count: int = 0
+    last_called_at: str | None = None
+    _recent: deque[tuple[float, bool]] = field(default_factory=deque, init=False, repr=False)
+    _sorted_durations: list[float] = field(default_factory=list, init=False, repr=False)
+    _recent_errors: int = field(default=0, init=False, repr=False)
+    _recent_duration_sum: float = field(default=0.0, init=False, repr=False)
+
+    def add(self, record: ToolCallAuditRecord) -> None:
+        is_error = record.status != "success"
+        self.call_count += 1
+        self.error_count += is_error
+        self.last_called_at = record.finished_at
+        self._recent.append((record.duration_ms, is_error))
+        bisect.insort(self._sorted_durations, record.duration_ms)
+        self._recent_errors += is_error
+        self._recent_duration_sum += record.duration_ms
+        if len(self._recent) > self.window_size:
+            duration, evicted_error = self._recent.popleft()
+            del self._sorted_durations[bisect.bisect_left(self._sorted_durations, duration)]
+            self._recent_errors -= evicted_error
+            self._recent_duration_sum -= duration
+
+    def snapshot(self) -> dict[str, object]:
+        window_count = len(self._recent)
+        durations = self._sorted_durations
+        latency: dict[str, float | None] = {
+            "min": durations[0] if durations else None,
+            "mean": round(self._recent_duration_sum / window_count, 3) if window_count else None,
+            **{
+                f"p{percentile}": (
+                    durations[max(math.ceil(percentile / 100 * window_count) - 1, 0)]
+                    if durations
+                    else None
+                )
+                for percentile in TOOL_CALL_LATENCY_PERCENTILES
+            },
+            "max": durations[-1] if durations else None,
+        }
+        return {
+            "call_count": self.call_count,
+            "error_count": self.error_count,
+            "error_rate": round(self.error_count / self.call_count, 4) if self.call_count else 0.0,
+            "last_called_at": self.last_called_at,
+            "window": {
+                "call_count": window_count,
+                "error_count": self._recent_errors,
+                "error_rate": round(self._recent_errors / window_count, 4) if window_count else 0.0,
+                "latency_ms": latency,
+            },
+        }
 
 
 class InMemoryToolCallAuditLog:
-    """Bounded process-local audit log for MCP dispatch records."""
+    """Bounded process-local audit log for MCP dispatch records.
+
+    Records live in a ring buffer with secondary indexes of buffer positions
+    by tool name, by status, and by both, so filtered listings only touch
+    matching records. Per-tool statistics cover every call since the last
+    ``clear`` (counts) and the last ``stats_window`` calls (error rate and
+    latency percentiles), independent of buffer eviction.
+
+    With a JSONL sink configured, records are persisted synchronously by
+    default. ``background=True`` hands them to a ``GroupCommitAuditWriter``
+    instead; call ``close`` (the server does on shutdown) to flush it.
+    """
 
-    def __init__(self, max_records: int = 1000) -> None:
+    def __init__(self, max_records: int = 1000, *, stats_window: int = 1000) -> None:
         self._max_records = max_records
-        self._records: list[ToolCallAuditRecord] = []
+        self.stats_window = stats_window
+        self._records: deque[ToolCallAuditRecord] = deque()
+        # Absolute position of self._records[0]; positions only grow.
+        self._first_position = 0
+        self._positions_by_tool: dict[str, deque[int]] = {}
+        self._positions_by_status: dict[str, deque[int]] = {}
+        self._positions_by_tool_status: dict[tuple[str, str], deque[int]] = {}
+        self._stats: dict[str, _ToolCallStats] = {}
         self._jsonl_sink: JsonlToolCallAuditSink | None = None
+        self._writer: GroupCommitAuditWriter | None = None
         self._last_persistence_error: str | None = None
 
-    def configure_jsonl_sink(self, path: str | Path | None) -> None:
-        self._jsonl_sink = JsonlToolCallAuditSink(path) if path else None
+    def configure_jsonl_sink(
+        self,
+        path: str | Path | None,
+        *,
+        segment_records: int | None = None,
+        fsync: str = "none",
+        fsync_interval: float = 1.0,
+        background: bool = False,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        index: bool = False,
+    ) -> None:
+        try:
+            self.close()
+        except RuntimeError:
+            # A broken writer already reported its error through
+            # ``_record_persistence_result``; reconfiguring replaces it.
+            pass
+        if self._jsonl_sink is not None:
+            self._jsonl_sink.close()
+        self._jsonl_sink = (
+            JsonlToolCallAuditSink(
+                path,
+                segment_records=segment_records,
+                fsync=fsync,
+                fsync_interval=fsync_interval,
+                index=index,
+            )
+            if path
+            else None
+        )
+        if self._jsonl_sink is not None and background:
+            self._writer = GroupCommitAuditWriter(
+                self._jsonl_sink,
+                queue_size=queue_size,
+                batch_size=batch_size,
+                on_result=self._record_persistence_result,
+            )
         self._last_persistence_error = None
 
     def append(self, record: ToolCallAuditRecord) -> None:
+        self._remember(record)
+        if self._writer is not None:
+            self._writer.submit(record)
+        elif self._jsonl_sink is not None:
+            self._persist(record)
+
+    async def append_async(self, record: ToolCallAuditRecord) -> None:
+        """Like ``append``, but waits without blocking the loop when the queue is full."""
+
+        self._remember(record)
+        if self._writer is not None:
+            await self._writer.submit_async(record)
+        elif self._jsonl_sink is not None:
+            self._persist(record)
+
+    def jsonl_sink_for(self, path: str | Path) -> JsonlToolCallAuditSink | None:
+        """The configured durable sink if it writes ``path``, else None."""
+
+        sink = self._jsonl_sink
+        if sink is not None and sink.path.resolve() == Path(path).expanduser().resolve():
+            return sink
+        return None
+
+    @property
+    def pending_writes(self) -> int:
+        """Records queued for the background writer (always 0 when synchronous)."""
+
+        return self._writer.pending if self._writer is not None else 0
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Flush and stop the background writer; later appends are synchronous."""
+
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.close()
+
+    def _remember(self, record: ToolCallAuditRecord) -> None:
+        position = self._first_position + len(self._records)
         self._records.append(record)
-        if len(self._records) > self._max_records:
-            del self._records[: len(self._records) - self._max_records]
-        if self._jsonl_sink is not None:
-            try:
-                self._jsonl_sink.append(record)
-                self._last_persistence_error = None
-            except OSError as exc:
-                self._last_persistence_error = str(exc)
+        for index, key in self._index_keys(record):
+            index.setdefault(key, deque()).append(position)
+        while len(self._records) > self._max_records:
+            evicted = self._records.popleft()
+            # The evicted record holds the oldest position in each of its indexes.
+            for index, key in self._index_keys(evicted):
+                positions = index[key]
+                positions.popleft()
+                if not positions:
+                    del index[key]
+            self._first_position += 1
+        stats_key = record.tool_name if record.risk_class is not None else UNREGISTERED_TOOL_STATS_KEY
+        stats = self._stats.get(stats_key)
+        if stats is None:
+            stats = self._stats[stats_key] = _ToolCallStats(window_size=self.stats_window)
+        stats.add(record)
+
+    def _index_keys(self, record: ToolCallAuditRecord) -> tuple[tuple[dict, object], ...]:
+        return (
+            (self._positions_by_tool, record.tool_name),
+            (self._positions_by_status, record.status),
+            (self._positions_by_tool_status, (record.tool_name, record.status)),
+        )
+
+    def _persist(self, record: ToolCallAuditRecord) -> None:
+        try:
+            self._jsonl_sink.append(record)
+        except OSError as exc:
+            self._record_persistence_result(str(exc))
+        else:
+            self._record_persistence_result(None)
+
+    def _record_persistence_result(self, error: str | None) -> None:
+        self._last_persistence_error = error
+
+    def list_records(
+        self,
+        *,
+        tool_name: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+    ) -> list[ToolCallAuditRecord]:
+        """Buffered records matching the filters, oldest first.
+
+        With ``limit``, only the newest ``limit`` matches are returned.
+        """
+
+        positions = self._matching_positions(tool_name, status)
+        if positions is None:
+            if limit is None:
+                return list(self._records)
+            return list(islice(reversed(self._records), limit))[::-1]
+        selected = positions if limit is None else list(islice(reversed(positions), limit))[::-1]
+        return [self._records[position - self._first_position] for position in selected]
+
+    def count_records(self, *, tool_name: str | None = None, status: str | None = None) -> int:
+        positions = self._matching_positions(tool_name, status)
+        return len(self._records) if positions is None else len(positions)
+
+    def tool_statistics(self, tool_name: str | None = None) -> dict[str, dict[str, object]]:
+        """Rolling statistics per tool name, sorted by name."""
 
-    def list_records(self) -> list[ToolCallAuditRecord]:
-        return list(self._records)
+        return {
+            name: stats.snapshot()
+            for name, stats in sorted(self._stats.items())
+            if tool_name is None or name == tool_name
+        }
+
+    def _matching_positions(self, tool_name: str | None, status: str | None) -> deque[int] | None:
+        if tool_name is not None and status is not None:
+            return self._positions_by_tool_status.get((tool_name, status), deque())
+        if tool_name is not None:
+            return self._positions_by_tool.get(tool_name, deque())
+        if status is not None:
+            return self._positions_by_status.get(status, deque())
+        return None
 
     def persistence_status(self) -> dict[str, object]:
         chain = self._jsonl_sink.chain_status() if self._jsonl_sink is not None else {
@@ -149,187 +426,1227 @@ class InMemoryToolCallAuditLog:
         }
 
     def clear(self) -> None:
+        self._first_position += len(self._records)
         self._records.clear()
+        self._positions_by_tool.clear()
+        self._positions_by_status.clear()
+        self._positions_by_tool_status.clear()
+        self._stats.clear()
+
+
+@dataclass
+class _ChainHead:
+    """Verified prefix of a JSONL audit log and the file state it was read from."""
+
+    record_count: int = 0
+    head_record_hash: str | None = None
+    offset: int = 0
+    line_count: int = 0
+    verification_error: str | None = None
+    size: int | None = None
+    mtime_ns: int | None = None
+    inode: int | None = None
+
+    @property
+    def verified(self) -> bool:
+        return self.verification_error is None
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return (
+            self.size == stat.st_size
+            and self.mtime_ns == stat.st_mtime_ns
+            and self.inode == stat.st_ino
+        )
+
+    def stamp(self, stat: os.stat_result) -> None:
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.inode = stat.st_ino
+
+    def to_chain(self) -> dict[str, object]:
+        if not self.verified:
+            return _audit_chain_status_error(
+                record_count=self.record_count,
+                head_record_hash=self.head_record_hash,
+                message=str(self.verification_error),
+            )
+        return {
+            "algorithm": AUDIT_CHAIN_ALGORITHM,
+            "record_count": self.record_count,
+            "head_record_hash": self.head_record_hash,
+            "verified": True,
+            "verification_error": None,
+        }
+
+
+@dataclass
+class _SealManifest:
+    """Verified prefix of a segment seal manifest and the file state it was read from."""
+
+    seals: list[dict[str, object]]
+    verification_error: str | None = None
+    size: int | None = None
+    mtime_ns: int | None = None
+
+    def base_head(self) -> _ChainHead:
+        """Chain head at the end of the last sealed segment."""
+
+        head = _ChainHead(verification_error=self.verification_error)
+        if self.seals:
+            last = self.seals[-1]
+            head.record_count = int(last["last_sequence"])
+            head.head_record_hash = str(last["last_record_hash"])
+            head.line_count = head.record_count
+        return head
 
 
 class JsonlToolCallAuditSink:
-    """Append-only JSONL sink for durable MCP tool-call audit records."""
+    """Append-only JSONL sink for durable MCP tool-call audit records.
+
+    The verified chain head (sequence, hash, and byte offset) is cached, so an
+    append only re-checks the file's size, mtime, and inode. If another writer
+    extended the file, only the new tail is verified; any other change forces
+    a full re-scan. A checkpoint sidecar written every ``checkpoint_interval``
+    records lets a new process verify from the checkpoint instead of line 1.
+
+    With ``segment_records`` set, the active file is sealed once it holds that
+    many records: a seal carrying the Merkle root of the segment's record
+    hashes and the hash of the previous seal is appended to
+    ``<name>.segments/seals.jsonl``, and the file moves into that directory.
+    Sequences and ``previous_record_hash`` continue across segments, so the
+    chain is the same one an unsegmented log would hold. Logs with sealed
+    segments are read whether or not ``segment_records`` is set.
+
+    ``verify_chain`` and ``read_verified_envelopes`` re-read every segment.
+    ``read_tail_envelopes`` reads only the newest segments needed to fill a
+    bounded export. Reads never move or delete files: if a crash fell between
+    writing a seal and moving the active file, readers take the sealed
+    segment's records from the active file, and the next append finishes the
+    move.
 
-    def __init__(self, path: str | Path) -> None:
+    With ``index`` set, appends also record each envelope's location, tool
+    name, status, and ``started_at`` in a ``<name>.index.sqlite3`` sidecar
+    (see ``AuditLogIndex``), which ``read_indexed_envelopes`` uses to read
+    only matching lines. Any sink uses an existing sidecar for queries and
+    may extend it, but only a sink with ``index`` set empties one that no
+    longer matches the log; the others fall back to scanning. ``close``
+    releases the sidecar's connection.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        checkpoint_interval: int = 1000,
+        segment_records: int | None = None,
+        fsync: str = "none",
+        fsync_interval: float = 1.0,
+        index: bool = False,
+    ) -> None:
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be positive")
+        if segment_records is not None and segment_records < 1:
+            raise ValueError("segment_records must be positive")
+        if fsync not in AUDIT_FSYNC_MODES:
+            raise ValueError(f"fsync must be one of: {', '.join(AUDIT_FSYNC_MODES)}")
         self.path = Path(path).expanduser()
+        self.checkpoint_path = self.path.with_name(f"{self.path.name}.checkpoint.json")
+        self.segments_dir = self.path.with_name(f"{self.path.name}.segments")
+        self.seals_path = self.segments_dir / "seals.jsonl"
+        self.index_path = self.path.with_name(f"{self.path.name}.index.sqlite3")
+        self.checkpoint_interval = checkpoint_interval
+        self.segment_records = segment_records
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._lock = threading.RLock()
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+        self._head: _ChainHead | None = None
+        self._manifest: _SealManifest | None = None
+        self._index_enabled = index
+        self._index: AuditLogIndex | None = None
+        # Sequence the index is known to cover, or None when it must catch up.
+        self._indexed_through: int | None = None
+        # Index generation _indexed_through was established under.
+        self._index_generation = 0
+        self._checkpointed_count = 0
 
     def append(self, record: ToolCallAuditRecord) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        chain = self.chain_status()
-        if chain["verified"] is False:
+        self.append_batch([record])
+
+    def append_batch(self, records: Sequence[ToolCallAuditRecord]) -> None:
+        """Append ``records`` in order, writing each segment's share in one call."""
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._finish_interrupted_seal()
+            remaining = list(records)
+            while remaining:
+                remaining = self._append_to_active_segment(remaining)
+
+    def sync(self) -> None:
+        """fsync writes that the ``interval`` mode has not synced yet."""
+
+        with self._lock:
+            if not self._unsynced:
+                return
+            try:
+                with self.path.open("ab") as handle:
+                    os.fsync(handle.fileno())
+            except FileNotFoundError:
+                # Sealing already synced and moved the file.
+                pass
+            self._mark_synced()
+
+    def sync_if_due(self) -> None:
+        if self._unsynced and time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.sync()
+
+    def _append_to_active_segment(
+        self,
+        records: list[ToolCallAuditRecord],
+    ) -> list[ToolCallAuditRecord]:
+        head = self._current_head()
+        if not head.verified:
             raise OSError(
                 "Refusing to append to audit log with invalid hash chain: "
-                + str(chain["verification_error"])
+                + str(head.verification_error)
             )
-        envelope = {
-            "schema_version": "tool-call-audit-jsonl.v1",
-            "algorithm": AUDIT_CHAIN_ALGORITHM,
-            "sequence": int(chain["record_count"]) + 1,
-            "previous_record_hash": chain["head_record_hash"],
-            "record": record.to_dict(),
-        }
-        envelope["record_hash"] = hash_json(envelope)
-        with self.path.open("a", encoding="utf-8") as handle:
-            handle.write(
-                json.dumps(
-                    envelope,
-                    sort_keys=True,
-                    separators=(",", ":"),
-                    ensure_ascii=True,
+        capacity = len(records)
+        if self.segment_records is not None:
+            sealed_count = self._sealed_manifest().base_head().record_count
+            capacity = self.segment_records - (head.record_count - sealed_count)
+            if capacity <= 0:
+                # segment_records was lowered below the active file's size.
+                if not self._seal_active_segment():
+                    raise OSError("Could not seal the full active audit segment.")
+                return records
+        chunk, remaining = records[:capacity], records[capacity:]
+        lines: list[bytes] = []
+        record_hashes: list[str] = []
+        head_record_hash = head.head_record_hash
+        for sequence, record in enumerate(chunk, start=head.record_count + 1):
+            envelope = {
+                "schema_version": AUDIT_ENVELOPE_SCHEMA_VERSION,
+                "algorithm": AUDIT_CHAIN_ALGORITHM,
+                "sequence": sequence,
+                "previous_record_hash": head_record_hash,
+                "record": record.to_dict(),
+            }
+            head_record_hash = envelope["record_hash"] = hash_json(envelope)
+            record_hashes.append(head_record_hash)
+            lines.append(
+                (
+                    json.dumps(
+                        envelope,
+                        sort_keys=True,
+                        separators=(",", ":"),
+                        ensure_ascii=True,
+                    )
+                    + "\n"
+                ).encode("ascii")
+            )
+        with self.path.open("ab") as handle:
+            self._write_lines(handle, lines)
+            stat = os.fstat(handle.fileno())
+        written = sum(len(line) for line in lines)
+        if stat.st_size != head.offset + written:
+            # Someone else wrote concurrently; re-verify on the next access.
+            self._head = None
+            return remaining
+        self._head = _ChainHead(
+            record_count=head.record_count + len(chunk),
+            head_record_hash=head_record_hash,
+            offset=stat.st_size,
+            line_count=head.line_count + len(chunk),
+        )
+        self._head.stamp(stat)
+        if self._index_enabled:
+            self._index_appended(head, chunk, lines, record_hashes)
+        if len(chunk) == capacity and self.segment_records is not None:
+            self._seal_active_segment()
+        elif self._head.record_count - self._checkpointed_count >= self.checkpoint_interval:
+            self._write_checkpoint(self._head)
+        return remaining
+
+    def _write_lines(self, handle: BinaryIO, lines: list[bytes]) -> None:
+        if self.fsync == "record":
+            for line in lines:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._mark_synced()
+            return
+        handle.write(b"".join(lines))
+        handle.flush()
+        if self.fsync == "batch" or (
+            self.fsync == "interval"
+            and time.monotonic() - self._last_fsync >= self.fsync_interval
+        ):
+            os.fsync(handle.fileno())
+            self._mark_synced()
+        elif self.fsync == "interval":
+            self._unsynced = True
+
+    def _mark_synced(self) -> None:
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+    def _index_appended(
+        self,
+        previous: _ChainHead,
+        records: list[ToolCallAuditRecord],
+        lines: list[bytes],
+        record_hashes: list[str],
+    ) -> None:
+        index = self._open_index(create=True)
+        if index is None:
+            return
+        segment_index = len(self._sealed_manifest().seals) + 1
+        entries: list[AuditIndexEntry] = []
+        offset = previous.offset
+        for position, (record, line, record_hash) in enumerate(zip(records, lines, record_hashes), start=1):
+            entries.append(
+                AuditIndexEntry(
+                    sequence=previous.record_count + position,
+                    segment_index=segment_index,
+                    offset=offset,
+                    length=len(line),
+                    line_number=previous.line_count + position,
+                    record_hash=record_hash,
+                    tool_name=record.tool_name,
+                    status=record.status,
+                    started_at=record.started_at,
                 )
-                + "\n"
             )
+            offset += len(line)
+        try:
+            if self._index_in_sync(index, previous.record_count):
+                index.add(entries)
+                self._indexed_through = entries[-1].sequence
+            else:
+                self._catch_up_index(index)
+        except sqlite3.Error:
+            # The index only speeds up queries; the log stays authoritative.
+            self._indexed_through = None
 
     def chain_status(self) -> dict[str, object]:
-        return self.read_verified_envelopes()["chain"]
+        """Chain status from the cached head, verifying only what changed."""
+
+        with self._lock:
+            return self._current_head().to_chain()
+
+    def verify_chain(self) -> dict[str, object]:
+        """Verify the seal manifest, every sealed segment, and the active file.
+
+        Cached heads and checkpoints are ignored, and every record is re-hashed.
+        """
+
+        with self._lock:
+            return self._verify_chain()
+
+    def _verify_chain(self) -> dict[str, object]:
+        manifest = self._read_seal_manifest()
+        base = manifest.base_head()
+        if not base.verified:
+            return base.to_chain()
+        for seal in manifest.seals:
+            head, _ = self._scan_sealed_segment(seal, self._segment_path(manifest, seal), collect=False)
+            if not head.verified:
+                return head.to_chain()
+        if not self._active_file_exists(manifest):
+            return base.to_chain()
+        head, _ = self._scan(base, collect=False)
+        return head.to_chain()
 
     def read_verified_envelopes(self) -> dict[str, object]:
+        with self._lock:
+            return self._read_verified_envelopes()
+
+    def _read_verified_envelopes(self) -> dict[str, object]:
+        manifest = self._read_seal_manifest()
+        base = manifest.base_head()
         envelopes: list[dict[str, object]] = []
-        record_count = 0
-        previous_hash: str | None = None
-        if not self.path.exists():
+        if not base.verified:
+            return {"chain": base.to_chain(), "envelopes": envelopes}
+        for seal in manifest.seals:
+            head, segment_envelopes = self._scan_sealed_segment(
+                seal, self._segment_path(manifest, seal), collect=True
+            )
+            envelopes.extend(segment_envelopes)
+            if not head.verified:
+                return {"chain": head.to_chain(), "envelopes": envelopes}
+        if not self._active_file_exists(manifest):
+            return {"chain": base.to_chain(), "envelopes": envelopes}
+        head, active_envelopes = self._scan(base, collect=True)
+        envelopes.extend(active_envelopes)
+        return {"chain": head.to_chain(), "envelopes": envelopes}
+
+    def read_tail_envelopes(
+        self,
+        limit: int,
+        predicate: Callable[[dict[str, object]], bool] | None = None,
+    ) -> dict[str, object]:
+        """Return verified envelopes matching ``predicate`` from the newest segments.
+
+        The seal manifest and the active file are always verified. Sealed
+        segments are then read newest first, each checked against its seal,
+        until at least ``limit`` envelopes match; older segments are vouched
+        for by the seal chain alone. ``envelopes`` holds every match in the
+        segments read, oldest to newest. If any verification fails the whole
+        log is read instead, so the result is the verified prefix as with
+        ``read_verified_envelopes``.
+        """
+
+        with self._lock:
+            return self._read_tail_envelopes(limit, predicate)
+
+    def _read_tail_envelopes(
+        self,
+        limit: int,
+        predicate: Callable[[dict[str, object]], bool] | None,
+    ) -> dict[str, object]:
+        def matches(envelopes: list[dict[str, object]]) -> list[dict[str, object]]:
+            if predicate is None:
+                return envelopes
+            return [envelope for envelope in envelopes if predicate(envelope)]
+
+        manifest = self._read_seal_manifest()
+        base = manifest.base_head()
+        if base.verified:
+            head, envelopes = (
+                self._scan(base, collect=True) if self._active_file_exists(manifest) else (base, [])
+            )
+            matched = matches(envelopes)
+            scanned_envelope_count = len(envelopes)
+            scanned_segment_count = 0
+            for seal in reversed(manifest.seals):
+                if len(matched) >= limit or not head.verified:
+                    break
+                segment_head, envelopes = self._scan_sealed_segment(
+                    seal, self._segment_path(manifest, seal), collect=True
+                )
+                if not segment_head.verified:
+                    head = segment_head
+                    break
+                matched = matches(envelopes) + matched
+                scanned_envelope_count += len(envelopes)
+                scanned_segment_count += 1
+            if head.verified:
+                return {
+                    "chain": head.to_chain(),
+                    "envelopes": matched,
+                    "scanned_envelope_count": scanned_envelope_count,
+                    "sealed_segment_count": len(manifest.seals),
+                    "scanned_segment_count": scanned_segment_count,
+                    "complete": scanned_segment_count == len(manifest.seals),
+                }
+        scan = self._read_verified_envelopes()
+        envelopes = list(scan["envelopes"])
+        return {
+            "chain": scan["chain"],
+            "envelopes": matches(envelopes),
+            "scanned_envelope_count": len(envelopes),
+            "sealed_segment_count": len(manifest.seals),
+            "scanned_segment_count": len(manifest.seals),
+            "complete": True,
+        }
+
+    def read_indexed_envelopes(
+        self,
+        *,
+        limit: int,
+        tool_name: str | None = None,
+        status: str | None = None,
+        started_after: str | None = None,
+        started_before: str | None = None,
+    ) -> dict[str, object] | None:
+        """Return the newest ``limit`` matching envelopes located through the index.
+
+        The index first catches up with the verified chain head. Every line
+        read through it is re-hashed, checked against the preceding record's
+        hash, and re-matched against the filters. ``None`` means there is no
+        usable index (or it disagreed with the log and was reset); callers
+        should fall back to scanning.
+        """
+
+        with self._lock:
+            index = self._open_index(create=self._index_enabled)
+            if index is None:
+                return None
+            head = self._current_head()
+            if not head.verified:
+                return None
+            try:
+                if not self._index_in_sync(index, head.record_count) and not self._catch_up_index(index):
+                    return None
+                matched_count, entries = index.query(
+                    tool_name=tool_name,
+                    status=status,
+                    started_after=started_after,
+                    started_before=started_before,
+                    limit=limit,
+                )
+            except sqlite3.Error:
+                return None
+            manifest = self._sealed_manifest()
+            envelopes: list[dict[str, object]] = []
+            for entry in entries:
+                envelope = self._read_indexed_envelope(entry, manifest)
+                record = envelope["record"] if envelope is not None else None
+                if (
+                    record is None
+                    or (tool_name is not None and record["tool_name"] != tool_name)
+                    or (status is not None and record["status"] != status)
+                    or (started_after is not None and record["started_at"] < started_after)
+                    or (started_before is not None and record["started_at"] >= started_before)
+                ):
+                    if self._index_enabled:
+                        self._reset_index(index)
+                    return None
+                envelopes.append(envelope)
             return {
-                "chain": {
-                    "algorithm": AUDIT_CHAIN_ALGORITHM,
-                    "record_count": 0,
-                    "head_record_hash": None,
-                    "verified": True,
-                    "verification_error": None,
-                },
+                "chain": head.to_chain(),
                 "envelopes": envelopes,
+                "matched_count": matched_count,
             }
 
+    def _open_index(self, *, create: bool) -> AuditLogIndex | None:
+        if self._index is None and (create or self.index_path.exists()):
+            try:
+                self._index = AuditLogIndex(self.index_path)
+            except sqlite3.Error:
+                return None
+        return self._index
+
+    def close(self) -> None:
+        """Close the sidecar index connection; it is reopened if needed again."""
+
+        with self._lock:
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+            self._indexed_through = None
+
+    def _index_in_sync(self, index: AuditLogIndex, record_count: int) -> bool:
+        """Whether the index is known to cover exactly ``record_count`` records."""
+
+        # Another connection may have reset the index since we last caught up.
+        return self._indexed_through == record_count and index.generation() == self._index_generation
+
+    def _reset_index(self, index: AuditLogIndex) -> None:
         try:
-            with self.path.open("r", encoding="utf-8") as handle:
-                for line_number, line in enumerate(handle, start=1):
-                    stripped = line.strip()
-                    if not stripped:
-                        continue
-                    envelope = json.loads(stripped)
-                    if not isinstance(envelope, dict):
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=f"Line {line_number} is not a JSON object.",
-                        )
-                    required_fields = {
-                        "schema_version",
-                        "algorithm",
-                        "sequence",
-                        "previous_record_hash",
-                        "record",
-                        "record_hash",
-                    }
-                    missing_fields = sorted(required_fields - set(envelope))
-                    if missing_fields:
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=(
-                                f"Line {line_number} is missing audit envelope field(s): "
-                                + ", ".join(missing_fields)
-                            ),
-                        )
-                    expected_previous = envelope.get("previous_record_hash")
-                    if expected_previous != previous_hash:
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=f"Line {line_number} previous_record_hash does not match chain head.",
-                        )
-                    recorded_hash = envelope.get("record_hash")
-                    envelope_without_hash = dict(envelope)
-                    envelope_without_hash.pop("record_hash", None)
-                    calculated_hash = hash_json(envelope_without_hash)
-                    if recorded_hash != calculated_hash:
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=f"Line {line_number} record_hash does not match record contents.",
-                        )
-                    if envelope.get("schema_version") != "tool-call-audit-jsonl.v1":
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=f"Line {line_number} uses unsupported audit envelope schema version.",
-                        )
-                    if envelope.get("algorithm") != AUDIT_CHAIN_ALGORITHM:
-                        return _audit_chain_scan_error(
-                            record_count=record_count,
-                            envelopes=envelopes,
-                            head_record_hash=previous_hash,
-                            message=f"Line {line_number} uses unsupported audit chain algorithm.",
-                        )
-                    expected_sequence = record_count + 1
-                    if envelope.get("sequence") != expected_sequence:
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=f"Line {line_number} sequence does not match expected value {expected_sequence}.",
-                        )
-                    record = envelope.get("record")
-                    if not isinstance(record, dict):
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=f"Line {line_number} record is not a JSON object.",
-                        )
-                    missing_record_fields = sorted(
-                        set(ToolCallAuditRecord.__dataclass_fields__) - set(record)
+            index.reset()
+        except sqlite3.Error:
+            pass
+        self._indexed_through = None
+
+    def _catch_up_index(self, index: AuditLogIndex) -> bool:
+        """Index every verified record after the index's last entry.
+
+        The index is trusted only if it holds every sequence up to its last
+        entry and that entry still matches the log; otherwise the sink that
+        maintains the index rebuilds it, and other sinks return False.
+        """
+
+        manifest = self._sealed_manifest()
+        base = manifest.base_head()
+        if not base.verified:
+            return False
+        generation = index.generation()
+        last = index.last_entry()
+        if last is not None and (
+            index.count() != last.sequence or self._read_indexed_envelope(last, manifest) is None
+        ):
+            # Gaps, or the log no longer holds what the index describes.
+            if not self._index_enabled:
+                return False
+            index.reset()
+            generation = index.generation()
+            last = None
+        indexed_through = last.sequence if last is not None else 0
+        files: list[tuple[int, Path, _ChainHead]] = [
+            (
+                int(seal["segment_index"]),
+                self._segment_path(manifest, seal),
+                _ChainHead(
+                    record_count=int(seal["first_sequence"]) - 1,
+                    head_record_hash=seal["first_previous_record_hash"],
+                    line_count=int(seal["first_sequence"]) - 1,
+                ),
+            )
+            for seal in manifest.seals
+            if int(seal["last_sequence"]) > indexed_through
+        ]
+        if self._active_file_exists(manifest):
+            files.append((len(manifest.seals) + 1, self.path, base))
+        for segment_index, path, start in files:
+            if last is not None and last.segment_index == segment_index:
+                start = _ChainHead(
+                    record_count=last.sequence,
+                    head_record_hash=last.record_hash,
+                    offset=last.end_offset,
+                    line_count=last.line_number,
+                )
+            if not path.exists():
+                continue
+            locations: list[tuple[int, int]] = []
+            head, envelopes = self._scan(start, collect=True, path=path, locations=locations)
+            index.add(
+                AuditIndexEntry(
+                    sequence=envelope["sequence"],
+                    segment_index=segment_index,
+                    offset=offset,
+                    length=length,
+                    line_number=envelope["line_number"],
+                    record_hash=envelope["record_hash"],
+                    tool_name=envelope["record"]["tool_name"],
+                    status=envelope["record"]["status"],
+                    started_at=envelope["record"]["started_at"],
+                )
+                for envelope, (offset, length) in zip(envelopes, locations)
+            )
+            if not head.verified:
+                self._indexed_through = None
+                return False
+            indexed_through = head.record_count
+        self._indexed_through = indexed_through
+        self._index_generation = generation
+        return True
+
+    def _read_indexed_envelope(
+        self,
+        entry: AuditIndexEntry,
+        manifest: _SealManifest,
+    ) -> dict[str, object] | None:
+        """Read and verify the envelope at ``entry``, or ``None`` if it does not hold."""
+
+        seals = manifest.seals
+        if entry.segment_index < 1 or entry.segment_index > len(seals) + 1:
+            return None
+        if entry.segment_index <= len(seals):
+            path = self._segment_path(manifest, seals[entry.segment_index - 1])
+        elif self._active_file_exists(manifest):
+            path = self.path
+        else:
+            return None
+        try:
+            with path.open("rb") as handle:
+                handle.seek(entry.offset)
+                raw_line = handle.read(entry.length)
+                if entry.offset > 0:
+                    previous_line = json.loads(
+                        _read_line_ending_at(handle, entry.offset).decode("utf-8")
                     )
-                    if missing_record_fields:
-                        return _audit_chain_scan_error(
-                            envelopes=envelopes,
-                            record_count=record_count,
-                            head_record_hash=previous_hash,
-                            message=(
-                                f"Line {line_number} record is missing audit field(s): "
-                                + ", ".join(missing_record_fields)
-                            ),
+                    previous_hash = (
+                        previous_line.get("record_hash")
+                        if isinstance(previous_line, dict)
+                        else None
+                    )
+                elif entry.segment_index > 1:
+                    previous_hash = seals[entry.segment_index - 2]["last_record_hash"]
+                else:
+                    previous_hash = None
+            if not raw_line.endswith(b"\n"):
+                return None
+            envelope = json.loads(raw_line.decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+        error = _verify_audit_envelope(
+            envelope,
+            line_number=entry.line_number,
+            record_count=entry.sequence - 1,
+            previous_hash=previous_hash,
+        )
+        if error is not None or envelope["record_hash"] != entry.record_hash:
+            return None
+        return {
+            "line_number": entry.line_number,
+            "schema_version": envelope["schema_version"],
+            "algorithm": envelope["algorithm"],
+            "sequence": envelope["sequence"],
+            "previous_record_hash": envelope["previous_record_hash"],
+            "record_hash": envelope["record_hash"],
+            "record": envelope["record"],
+        }
+
+    def _current_head(self) -> _ChainHead:
+        manifest = self._sealed_manifest()
+        pending = self._interrupted_seal(manifest)
+        if pending is not None:
+            # The active file still holds the last sealed segment.
+            self._head = None
+            head, _ = self._scan_sealed_segment(pending, self.path, collect=False)
+            return manifest.base_head() if head.verified else head
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._head = manifest.base_head()
+            return self._head
+        head = self._head
+        if head is not None and head.matches(stat):
+            return head
+        base = manifest.base_head()
+        if not base.verified:
+            self._head = base
+            return base
+        if head is None:
+            start = self._load_checkpoint(base)
+        elif (
+            head.verified
+            and head.inode == stat.st_ino
+            and stat.st_size > head.offset
+            and self._anchor_holds(head)
+        ):
+            # Appended by another writer: only the new tail needs checking.
+            start = head
+        else:
+            start = base
+        head, _ = self._scan(start, collect=False)
+        head.stamp(self.path.stat())
+        self._head = head
+        if head.verified and head.record_count - self._checkpointed_count >= self.checkpoint_interval:
+            self._write_checkpoint(head)
+        return head
+
+    def _scan(
+        self,
+        start: _ChainHead,
+        *,
+        collect: bool,
+        path: Path | None = None,
+        record_hashes: list[str] | None = None,
+        locations: list[tuple[int, int]] | None = None,
+    ) -> tuple[_ChainHead, list[dict[str, object]]]:
+        head = _ChainHead(
+            record_count=start.record_count,
+            head_record_hash=start.head_record_hash,
+            offset=start.offset,
+            line_count=start.line_count,
+        )
+        envelopes: list[dict[str, object]] = []
+        try:
+            with (path or self.path).open("rb") as handle:
+                handle.seek(start.offset)
+                for raw_line in handle:
+                    line_number = head.line_count + 1
+                    stripped = raw_line.strip()
+                    if stripped:
+                        try:
+                            envelope = json.loads(stripped.decode("utf-8"))
+                        except ValueError as exc:
+                            head.verification_error = str(exc)
+                            break
+                        error = _verify_audit_envelope(
+                            envelope,
+                            line_number=line_number,
+                            record_count=head.record_count,
+                            previous_hash=head.head_record_hash,
                         )
-                    record_count += 1
-                    previous_hash = recorded_hash
-                    envelopes.append(
-                        {
-                            "line_number": line_number,
-                            "schema_version": envelope["schema_version"],
-                            "algorithm": envelope["algorithm"],
-                            "sequence": envelope["sequence"],
-                            "previous_record_hash": envelope["previous_record_hash"],
-                            "record_hash": envelope["record_hash"],
-                            "record": record,
-                        }
+                        if error is not None:
+                            head.verification_error = error
+                            break
+                        head.record_count += 1
+                        head.head_record_hash = envelope["record_hash"]
+                        if record_hashes is not None:
+                            record_hashes.append(envelope["record_hash"])
+                        if locations is not None:
+                            locations.append((head.offset, len(raw_line)))
+                        if collect:
+                            envelopes.append(
+                                {
+                                    "line_number": line_number,
+                                    "schema_version": envelope["schema_version"],
+                                    "algorithm": envelope["algorithm"],
+                                    "sequence": envelope["sequence"],
+                                    "previous_record_hash": envelope["previous_record_hash"],
+                                    "record_hash": envelope["record_hash"],
+                                    "record": envelope["record"],
+                                }
+                            )
+                    head.line_count = line_number
+                    head.offset += len(raw_line)
+        except OSError as exc:
+            head.verification_error = str(exc)
+        return head, envelopes
+
+    def _scan_sealed_segment(
+        self,
+        seal: dict[str, object],
+        path: Path,
+        *,
+        collect: bool,
+    ) -> tuple[_ChainHead, list[dict[str, object]]]:
+        """Verify the segment at ``path`` against ``seal``: chain, record count, and Merkle root."""
+
+        first_sequence = int(seal["first_sequence"])
+        start = _ChainHead(
+            record_count=first_sequence - 1,
+            head_record_hash=seal["first_previous_record_hash"],
+            line_count=first_sequence - 1,
+        )
+        record_hashes: list[str] = []
+        head, envelopes = self._scan(
+            start,
+            collect=collect,
+            path=path,
+            record_hashes=record_hashes,
+        )
+        error = head.verification_error
+        if error is None:
+            if head.record_count != int(seal["last_sequence"]):
+                error = (
+                    f"holds {head.record_count - start.record_count} record(s) "
+                    f"but its seal lists {seal['record_count']}."
+                )
+            elif head.head_record_hash != seal["last_record_hash"]:
+                error = "last record_hash does not match its seal."
+            elif audit_merkle_root(record_hashes) != seal["merkle_root"]:
+                error = "Merkle root does not match its seal."
+        if error is not None:
+            head.verification_error = f"Sealed segment {seal['segment_index']}: {error}"
+        return head, envelopes
+
+    def _interrupted_seal(self, manifest: _SealManifest) -> dict[str, object] | None:
+        """The last seal, if a crash fell between writing it and moving the active file."""
+
+        if not manifest.seals:
+            return None
+        seal = manifest.seals[-1]
+        if (self.segments_dir / str(seal["file_name"])).exists() or not self.path.exists():
+            return None
+        return seal
+
+    def _segment_path(self, manifest: _SealManifest, seal: dict[str, object]) -> Path:
+        if seal is self._interrupted_seal(manifest):
+            return self.path
+        return self.segments_dir / str(seal["file_name"])
+
+    def _active_file_exists(self, manifest: _SealManifest) -> bool:
+        """Whether the active file holds records after the last seal."""
+
+        return self._interrupted_seal(manifest) is None and self.path.exists()
+
+    def _sealed_manifest(self) -> _SealManifest:
+        """Seal manifest, re-read only when the file's size or mtime changed."""
+
+        try:
+            stat = self.seals_path.stat()
+        except FileNotFoundError:
+            self._manifest = None
+            return _SealManifest(seals=[])
+        manifest = self._manifest
+        if (
+            manifest is None
+            or manifest.size != stat.st_size
+            or manifest.mtime_ns != stat.st_mtime_ns
+        ):
+            manifest = self._read_seal_manifest()
+            self._manifest = manifest
+        return manifest
+
+    def _read_seal_manifest(self) -> _SealManifest:
+        """Read and verify the seal chain."""
+
+        try:
+            stat = self.seals_path.stat()
+        except FileNotFoundError:
+            return _SealManifest(seals=[])
+        manifest = _SealManifest(seals=[], size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        try:
+            with self.seals_path.open("rb") as handle:
+                for line_number, raw_line in enumerate(handle, start=1):
+                    if not raw_line.strip():
+                        continue
+                    try:
+                        seal = json.loads(raw_line.decode("utf-8"))
+                    except ValueError as exc:
+                        manifest.verification_error = f"Seal line {line_number}: {exc}"
+                        break
+                    error = _verify_segment_seal(
+                        seal,
+                        line_number=line_number,
+                        previous=manifest.seals[-1] if manifest.seals else None,
                     )
-        except (OSError, json.JSONDecodeError) as exc:
-            return _audit_chain_scan_error(
-                envelopes=envelopes,
-                record_count=record_count,
-                head_record_hash=previous_hash,
-                message=str(exc),
+                    if error is not None:
+                        manifest.verification_error = error
+                        break
+                    manifest.seals.append(seal)
+        except OSError as exc:
+            manifest.verification_error = str(exc)
+        return manifest
+
+    def _finish_interrupted_seal(self) -> None:
+        """Move the active file into place if a crash fell between seal and rename.
+
+        Only appends call this, so reads never change the files.
+        """
+
+        seal = self._interrupted_seal(self._sealed_manifest())
+        if seal is None:
+            return
+        head, _ = self._scan_sealed_segment(seal, self.path, collect=False)
+        if head.verified:
+            os.replace(self.path, self.segments_dir / str(seal["file_name"]))
+            self.checkpoint_path.unlink(missing_ok=True)
+            self._head = None
+
+    def _seal_active_segment(self) -> bool:
+        manifest = self._sealed_manifest()
+        base = manifest.base_head()
+        if not base.verified:
+            return False
+        record_hashes: list[str] = []
+        head, _ = self._scan(base, collect=False, record_hashes=record_hashes)
+        if not head.verified or not record_hashes:
+            self._head = None
+            return False
+        previous = manifest.seals[-1] if manifest.seals else None
+        segment_index = int(previous["segment_index"]) + 1 if previous else 1
+        seal: dict[str, object] = {
+            "schema_version": AUDIT_SEGMENT_SEAL_SCHEMA_VERSION,
+            "algorithm": AUDIT_CHAIN_ALGORITHM,
+            "segment_index": segment_index,
+            "file_name": f"{segment_index:08d}.jsonl",
+            "first_sequence": base.record_count + 1,
+            "last_sequence": head.record_count,
+            "record_count": len(record_hashes),
+            "first_previous_record_hash": base.head_record_hash,
+            "last_record_hash": head.head_record_hash,
+            "merkle_root": audit_merkle_root(record_hashes),
+            "previous_seal_hash": previous["seal_hash"] if previous else None,
+            "sealed_at": utc_timestamp(),
+        }
+        seal["seal_hash"] = hash_json(seal)
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        if self._unsynced:
+            self.sync()
+        line = json.dumps(seal, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+        with self.seals_path.open("ab") as handle:
+            handle.write((line + "\n").encode("ascii"))
+            if self.fsync != "none":
+                handle.flush()
+                os.fsync(handle.fileno())
+        # A crash here leaves the seal without its file; the next append
+        # finishes the move.
+        os.replace(self.path, self.segments_dir / str(seal["file_name"]))
+        self.checkpoint_path.unlink(missing_ok=True)
+        self._checkpointed_count = head.record_count
+        self._head = None
+        return True
+
+    def _anchor_holds(self, head: _ChainHead) -> bool:
+        """Check that the line ending at ``head.offset`` is still the chain head."""
+
+        if head.offset == 0:
+            return head.record_count == self._sealed_manifest().base_head().record_count
+        try:
+            with self.path.open("rb") as handle:
+                line = _read_line_ending_at(handle, head.offset)
+            envelope = json.loads(line.decode("utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(envelope, dict) or envelope.get("sequence") != head.record_count:
+            return False
+        recorded_hash = envelope.get("record_hash")
+        unsigned = {key: value for key, value in envelope.items() if key != "record_hash"}
+        return recorded_hash == head.head_record_hash == hash_json(unsigned)
+
+    def _load_checkpoint(self, base: _ChainHead) -> _ChainHead:
+        try:
+            payload = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+            head = _ChainHead(
+                record_count=int(payload["record_count"]),
+                head_record_hash=payload["head_record_hash"],
+                offset=int(payload["offset"]),
+                line_count=int(payload["line_count"]),
             )
+        except (OSError, ValueError, KeyError, TypeError):
+            return base
+        if (
+            payload.get("schema_version") != AUDIT_CHECKPOINT_SCHEMA_VERSION
+            or payload.get("algorithm") != AUDIT_CHAIN_ALGORITHM
+            or head.record_count < base.record_count
+            or not self._anchor_holds(head)
+        ):
+            return base
+        self._checkpointed_count = head.record_count
+        return head
 
-        return {
-            "chain": {
-                "algorithm": AUDIT_CHAIN_ALGORITHM,
-                "record_count": record_count,
-                "head_record_hash": previous_hash,
-                "verified": True,
-                "verification_error": None,
-            },
-            "envelopes": envelopes,
+    def _write_checkpoint(self, head: _ChainHead) -> None:
+        payload = {
+            "schema_version": AUDIT_CHECKPOINT_SCHEMA_VERSION,
+            "algorithm": AUDIT_CHAIN_ALGORITHM,
+            "record_count": head.record_count,
+            "head_record_hash": head.head_record_hash,
+            "offset": head.offset,
+            "line_count": head.line_count,
+            "written_at": utc_timestamp(),
         }
+        temporary = self.checkpoint_path.with_name(f".{self.checkpoint_path.name}.tmp")
+        try:
+            temporary.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+            temporary.replace(self.checkpoint_path)
+        except OSError:
+            # The checkpoint only speeds up verification; the log stays authoritative.
+            return
+        self._checkpointed_count = head.record_count
+
+
+class GroupCommitAuditWriter:
+    """Background thread that appends queued audit records to a sink in batches.
+
+    Records wait in a bounded queue; the writer takes whatever is queued (up
+    to ``batch_size``) and hands it to ``JsonlToolCallAuditSink.append_batch``,
+    so concurrent tool calls share one write and, depending on the sink's
+    ``fsync`` mode, one fsync. ``on_result`` receives ``None`` after each
+    successful batch and the error message after a failed one.
+
+    An ``OSError`` fails only its batch. Any other error breaks the writer:
+    the records still queued are dropped, waiting ``flush`` calls return, and
+    ``submit``, ``flush``, and ``close`` raise from then on instead of waiting
+    on a thread that no longer writes.
+    """
+
+    def __init__(
+        self,
+        sink: JsonlToolCallAuditSink,
+        *,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        on_result: Callable[[str | None], None] | None = None,
+    ) -> None:
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("queue_size and batch_size must be positive")
+        self.sink = sink
+        self.batch_size = batch_size
+        self._on_result = on_result
+        self._queue: queue.Queue[ToolCallAuditRecord | None] = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._failure: Exception | None = None
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, record: ToolCallAuditRecord) -> None:
+        """Queue ``record``, blocking the calling thread while the queue is full."""
+
+        self._check_open()
+        self._queue.put(record)
+        self._check_failed()
+
+    async def submit_async(self, record: ToolCallAuditRecord) -> None:
+        """Queue ``record``, waiting off the event loop while the queue is full."""
+
+        self._check_open()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, record)
+        self._check_failed()
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+
+        self._check_failed()
+        self._queue.join()
+        self._check_failed()
+
+    def close(self) -> None:
+        """Write the queued records, sync the sink, and stop the thread."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        self._check_failed()
+
+    def _check_open(self) -> None:
+        self._check_failed()
+        if self._closed:
+            raise RuntimeError("Audit writer is closed")
+
+    def _check_failed(self) -> None:
+        if self._failure is not None:
+            raise RuntimeError(f"Audit writer failed: {self._failure}") from self._failure
+
+    def _run(self) -> None:
+        # After a failure the loop keeps draining the queue, without writing,
+        # so blocked submitters and flushers are released until close.
+        idle_timeout = self.sink.fsync_interval if self.sink.fsync == "interval" else None
+        while True:
+            try:
+                item = self._queue.get(timeout=idle_timeout)
+            except queue.Empty:
+                if self._failure is None:
+                    try:
+                        self._sync()
+                    except Exception as exc:
+                        self._fail(exc)
+                continue
+            batch: list[ToolCallAuditRecord] = []
+            taken = 1
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+            try:
+                if self._failure is None:
+                    if batch:
+                        self._write(batch)
+                    if item is None:
+                        self._sync(force=True)
+            except Exception as exc:
+                self._fail(exc)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+            if item is None:
+                return
+
+    def _fail(self, exc: Exception) -> None:
+        self._failure = exc
+        try:
+            self._report(f"{type(exc).__name__}: {exc}")
+        except Exception:
+            pass
+
+    def _write(self, batch: list[ToolCallAuditRecord]) -> None:
+        try:
+            self.sink.append_batch(batch)
+        except OSError as exc:
+            self._report(str(exc))
+        else:
+            self._report(None)
+
+    def _sync(self, *, force: bool = False) -> None:
+        try:
+            if force:
+                self.sink.sync()
+            else:
+                self.sink.sync_if_due()
+        except OSError as exc:
+            self._report(str(exc))
+
+    def _report(self, error: str | None) -> None:
+        if self._on_result is not None:
+            self._on_result(error)
+
+
+def _read_line_ending_at(handle: BinaryIO, offset: int, *, chunk_size: int = 4096) -> bytes:
+    """Return the line whose terminating newline is the byte before ``offset``."""
+
+    if offset <= 0:
+        raise ValueError("No line ends at offset 0")
+    handle.seek(offset - 1)
+    if handle.read(1) != b"\n":
+        raise ValueError("Offset does not fall on a line boundary")
+    position = offset - 1
+    buffer = b""
+    while position > 0:
+        step = min(chunk_size, position)
+        position -= step
+        handle.seek(position)
+        buffer = handle.read(step) + buffer
+        newline = buffer.rfind(b"\n")
+        if newline != -1:
+            return buffer[newline + 1 :]
+    return buffer
+
+
+def _verify_audit_envelope(
+    envelope: object,
+    *,
+    line_number: int,
+    record_count: int,
+    previous_hash: str | None,
+) -> str | None:
+    """Return why ``envelope`` cannot extend the chain, or ``None`` if it can."""
+
+    if not isinstance(envelope, dict):
+        return f"Line {line_number} is not a JSON object."
+    missing_fields = sorted(_AUDIT_ENVELOPE_FIELDS - set(envelope))
+    if missing_fields:
+        return (
+            f"Line {line_number} is missing audit envelope field(s): "
+            + ", ".join(missing_fields)
+        )
+    if envelope.get("previous_record_hash") != previous_hash:
+        return f"Line {line_number} previous_record_hash does not match chain head."
+    envelope_without_hash = dict(envelope)
+    envelope_without_hash.pop("record_hash", None)
+    if envelope.get("record_hash") != hash_json(envelope_without_hash):
+        return f"Line {line_number} record_hash does not match record contents."
+    if envelope.get("schema_version") != AUDIT_ENVELOPE_SCHEMA_VERSION:
+        return f"Line {line_number} uses unsupported audit envelope schema version."
+    if envelope.get("algorithm") != AUDIT_CHAIN_ALGORITHM:
+        return f"Line {line_number} uses unsupported audit chain algorithm."
+    expected_sequence = record_count + 1
+    if envelope.get("sequence") != expected_sequence:
+        return f"Line {line_number} sequence does not match expected value {expected_sequence}."
+    record = envelope.get("record")
+    if not isinstance(record, dict):
+        return f"Line {line_number} record is not a JSON object."
+    required_record_fields = set(ToolCallAuditRecord.__dataclass_fields__) - _OPTIONAL_AUDIT_RECORD_FIELDS
+    missing_record_fields = sorted(required_record_fields - set(record))
+    if missing_record_fields:
+        return (
+            f"Line {line_number} record is missing audit field(s): "
+            + ", ".join(missing_record_fields)
+        )
+    return None
+
+
+def _verify_segment_seal(
+    seal: object,
+    *,
+    line_number: int,
+    previous: dict[str, object] | None,
+) -> str | None:
+    """Return why ``seal`` cannot extend the seal chain, or ``None`` if it can."""
+
+    if not isinstance(seal, dict):
+        return f"Seal line {line_number} is not a JSON object."
+    missing_fields = sorted(_AUDIT_SEAL_FIELDS - set(seal))
+    if missing_fields:
+        return f"Seal line {line_number} is missing field(s): " + ", ".join(missing_fields)
+    unsigned = {key: value for key, value in seal.items() if key != "seal_hash"}
+    if seal["seal_hash"] != hash_json(unsigned):
+        return f"Seal line {line_number} seal_hash does not match seal contents."
+    if seal["schema_version"] != AUDIT_SEGMENT_SEAL_SCHEMA_VERSION:
+        return f"Seal line {line_number} uses unsupported seal schema version."
+    if seal["algorithm"] != AUDIT_CHAIN_ALGORITHM:
+        return f"Seal line {line_number} uses unsupported audit chain algorithm."
+    expected = {
+        "segment_index": previous["segment_index"] + 1 if previous else 1,
+        "previous_seal_hash": previous["seal_hash"] if previous else None,
+        "first_sequence": previous["last_sequence"] + 1 if previous else 1,
+        "first_previous_record_hash": previous["last_record_hash"] if previous else None,
+    }
+    for field_name, value in expected.items():
+        if seal[field_name] != value:
+            return f"Seal line {line_number} {field_name} does not continue the previous seal."
+    record_count = seal["record_count"]
+    if (
+        not isinstance(record_count, int)
+        or record_count < 1
+        or seal["last_sequence"] != seal["first_sequence"] + record_count - 1
+    ):
+        return f"Seal line {line_number} record_count does not match its sequence range."
+    if seal["file_name"] != f"{seal['segment_index']:08d}.jsonl":
+        return f"Seal line {line_number} file_name does not match its segment_index."
+    return None
 
 
 def _audit_chain_status_error(
@@ -347,23 +1664,6 @@ def _audit_chain_status_error(
     }
 
 
-def _audit_chain_scan_error(
-    *,
-    envelopes: list[dict[str, object]],
-    record_count: int,
-    head_record_hash: str | None,
-    message: str,
-) -> dict[str, object]:
-    return {
-        "chain": _audit_chain_status_error(
-            record_count=record_count,
-            head_record_hash=head_record_hash,
-            message=message,
-        ),
-        "envelopes": envelopes,
-    }
-
-
 tool_call_audit_log = InMemoryToolCallAuditLog()
 
 
@@ -371,6 +1671,27 @@ def utc_timestamp() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
+def audit_merkle_root(record_hashes: Sequence[str]) -> str | None:
+    """Merkle root over hex record hashes.
+
+    Leaves and interior nodes are domain-separated (``0x00``/``0x01``
+    prefixes, as in RFC 6962); an odd node is promoted to the next level.
+    """
+
+    if not record_hashes:
+        return None
+    level = [sha256(b"\x00" + bytes.fromhex(value)).digest() for value in record_hashes]
+    while len(level) > 1:
+        parents = [
+            sha256(b"\x01" + level[index] + level[index + 1]).digest()
+            for index in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parents.append(level[-1])
+        level = parents
+    return level[0].hex()
+
+
 def hash_json(value: object) -> str:
     canonical = json.dumps(
         value,
@@ -0,0 +1,159 @@
+"""SQLite sidecar index over the durable MCP tool-call audit log."""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+AUDIT_INDEX_SCHEMA_VERSION = "tool-call-audit-index.v1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS records (
+    sequence INTEGER PRIMARY KEY,
+    segment_index INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    line_number INTEGER NOT NULL,
+    record_hash TEXT NOT NULL,
+    tool_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_tool_status_time
+    ON records (tool_name, status, started_at);
+CREATE INDEX IF NOT EXISTS records_by_status_time ON records (status, started_at);
+CREATE INDEX IF NOT EXISTS records_by_time ON records (started_at);
+"""
+
+
+@dataclass(frozen=True)
+class AuditIndexEntry:
+    """Location and filter fields of one audit envelope."""
+
+    sequence: int
+    segment_index: int
+    offset: int
+    length: int
+    line_number: int
+    record_hash: str
+    tool_name: str
+    status: str
+    started_at: str
+
+    @property
+    def end_offset(self) -> int:
+        return self.offset + self.length
+
+
+class AuditLogIndex:
+    """Tool/status/time index of audit envelope locations."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            row = self._connection.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is None:
+                self._connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (AUDIT_INDEX_SCHEMA_VERSION,),
+                )
+            elif row[0] != AUDIT_INDEX_SCHEMA_VERSION:
+                self._delete_records()
+                self._connection.execute(
+                    "UPDATE meta SET value = ? WHERE key = 'schema_version'",
+                    (AUDIT_INDEX_SCHEMA_VERSION,),
+                )
+
+    def add(self, entries: Iterable[AuditIndexEntry]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        entry.sequence,
+                        entry.segment_index,
+                        entry.offset,
+                        entry.length,
+                        entry.line_number,
+                        entry.record_hash,
+                        entry.tool_name,
+                        entry.status,
+                        entry.started_at,
+                    )
+                    for entry in entries
+                ],
+            )
+
+    def generation(self) -> int:
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE key = 'generation'"
+        ).fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def count(self) -> int:
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM records").fetchone()
+        return count
+
+    def last_entry(self) -> AuditIndexEntry | None:
+        row = self._connection.execute(
+            "SELECT * FROM records ORDER BY sequence DESC LIMIT 1"
+        ).fetchone()
+        return AuditIndexEntry(*row) if row is not None else None
+
+    def query(
+        self,
+        *,
+        tool_name: str | None = None,
+        status: str | None = None,
+        started_after: str | None = None,
+        started_before: str | None = None,
+        limit: int,
+    ) -> tuple[int, list[AuditIndexEntry]]:
+        """Return the match count and the newest ``limit`` matches, oldest first."""
+
+        clauses: list[str] = []
+        parameters: list[object] = []
+        for column, operator, value in (
+            ("tool_name", "=", tool_name),
+            ("status", "=", status),
+            ("started_at", ">=", started_after),
+            ("started_at", "<", started_before),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {operator} ?")
+                parameters.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        (count,) = self._connection.execute(
+            f"SELECT COUNT(*) FROM records{where}", parameters
+        ).fetchone()
+        rows = self._connection.execute(
+            f"SELECT * FROM records{where} ORDER BY sequence DESC LIMIT ?",
+            [*parameters, limit],
+        ).fetchall()
+        return count, [AuditIndexEntry(*row) for row in reversed(rows)]
+
+    def reset(self) -> None:
+        with self._connection:
+            self._delete_records()
+
+    def _delete_records(self) -> None:
+        self._connection.execute("DELETE FROM records")
+        self._connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('generation', '1') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+__all__ = ["AUDIT_INDEX_SCHEMA_VERSION", "AuditIndexEntry", "AuditLogIndex"]
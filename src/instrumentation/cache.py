@@ -28,6 +28,11 @@ class InMemoryCache(Cache):
     def __init__(self) -> None:
         self._entries: Dict[str, CacheEntry] = {}
 
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones not yet evicted."""
+
+        return len(self._entries)
+
     def get(self, key: str) -> Any | None:
         entry = self._entries.get(key)
         if entry is None:
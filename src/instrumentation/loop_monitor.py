@@ -0,0 +1,210 @@
+"""Event-loop lag monitor and blocking-call detector."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import monotonic
+from typing import Any
+
+from src.instrumentation.metrics import MetricsRecorder, metrics_recorder
+
+DEFAULT_LAG_THRESHOLD_SECONDS = 0.1
+LAG_QUANTILES = (0.5, 0.9, 0.99)
+_MAX_STACK_DEPTH = 64
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class BlockingEvent:
+    """One stretch of time during which the event loop did not run."""
+
+    detected_at: str
+    # Lag observed when the stack was captured; updated to the total once the loop resumes.
+    lag_seconds: float
+    coroutine: str | None
+    stack: list[str] = field(default_factory=list)
+    resolved: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "detected_at": self.detected_at,
+            "lag_seconds": round(self.lag_seconds, 6),
+            "coroutine": self.coroutine,
+            "stack": list(self.stack),
+            "resolved": self.resolved,
+        }
+
+
+class EventLoopMonitor:
+    """Measures event-loop lag and captures the stack of loop-blocking code."""
+
+    def __init__(
+        self,
+        *,
+        threshold_seconds: float = DEFAULT_LAG_THRESHOLD_SECONDS,
+        interval_seconds: float | None = None,
+        metrics: MetricsRecorder = metrics_recorder,
+        max_events: int = 50,
+    ) -> None:
+        self.metrics = metrics
+        self.events: deque[BlockingEvent] = deque(maxlen=max_events)
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._loop_thread_id: int | None = None
+        self._expected_wakeup: float | None = None
+        self._pending: BlockingEvent | None = None
+        self.configure(threshold_seconds=threshold_seconds, interval_seconds=interval_seconds)
+
+    def configure(
+        self,
+        *,
+        threshold_seconds: float = DEFAULT_LAG_THRESHOLD_SECONDS,
+        interval_seconds: float | None = None,
+    ) -> None:
+        if threshold_seconds <= 0:
+            raise ValueError("threshold_seconds must be positive")
+        self.threshold_seconds = threshold_seconds
+        # Sample several times per threshold so short stalls are still caught.
+        self.interval_seconds = interval_seconds or min(max(threshold_seconds / 4, 0.01), 0.25)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop (no-op if already running)."""
+
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._expected_wakeup = None
+        self._task = asyncio.get_running_loop().create_task(
+            self._heartbeat(), name="event-loop-monitor"
+        )
+        self._watchdog = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        self.metrics.describe(
+            "event_loop.lag_seconds", "How late the event-loop heartbeat woke up."
+        )
+        self.metrics.describe(
+            "event_loop.blocked", "Times the event loop was blocked longer than the threshold."
+        )
+        for quantile in LAG_QUANTILES:
+            self.metrics.register_gauge(
+                "event_loop.lag_quantile_seconds",
+                lambda q=quantile: self.lag_quantile(q) or 0.0,
+                quantile=quantile,
+            )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        watchdog, self._watchdog = self._watchdog, None
+        if watchdog is not None:
+            await asyncio.to_thread(watchdog.join)
+
+    def lag_quantile(self, quantile: float) -> float | None:
+        histogram = self.metrics.histogram("event_loop.lag_seconds")
+        return histogram.quantile(quantile) if histogram is not None else None
+
+    def recent_events(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [event.to_dict() for event in self.events]
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._expected_wakeup = monotonic() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            self._beat(monotonic())
+
+    def _beat(self, now: float) -> None:
+        expected = self._expected_wakeup
+        if expected is None:
+            return
+        lag = max(0.0, now - expected)
+        self.metrics.observe("event_loop.lag_seconds", lag)
+        with self._lock:
+            self._expected_wakeup = None
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.lag_seconds = lag
+            pending.resolved = True
+            log.warning(
+                "Event loop blocked for %.3fs in %s:\n  %s",
+                lag,
+                pending.coroutine or "<no coroutine>",
+                "\n  ".join(pending.stack),
+            )
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            with self._lock:
+                expected = self._expected_wakeup
+                if expected is None or self._pending is not None:
+                    continue
+                overdue = monotonic() - expected
+                if overdue < self.threshold_seconds:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id or 0)
+                event = BlockingEvent(
+                    detected_at=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                    lag_seconds=overdue,
+                    coroutine=_blocking_coroutine(frame),
+                    stack=_format_stack(frame),
+                )
+                self._pending = event
+                self.events.append(event)
+            self.metrics.increment("event_loop.blocked")
+
+
+def _format_stack(frame: Any) -> list[str]:
+    """Innermost-last ``file:line function`` entries for ``frame`` and its callers."""
+
+    stack: list[str] = []
+    while frame is not None and len(stack) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append(f"{Path(code.co_filename).name}:{frame.f_lineno} {code.co_qualname}")
+        frame = frame.f_back
+    return stack[::-1]
+
+
+def _blocking_coroutine(frame: Any) -> str | None:
+    """Name the innermost coroutine on the stack: the async code that made the blocking call."""
+
+    while frame is not None:
+        if frame.f_code.co_flags & inspect.CO_COROUTINE:
+            return frame.f_code.co_qualname
+        frame = frame.f_back
+    return None
+
+
+event_loop_monitor = EventLoopMonitor()
+
+
+__all__ = [
+    "BlockingEvent",
+    "DEFAULT_LAG_THRESHOLD_SECONDS",
+    "EventLoopMonitor",
+    "LAG_QUANTILES",
+    "event_loop_monitor",
+]
@@ -2,26 +2,239 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+import math
+import re
+import threading
+from bisect import bisect_left
 from contextlib import contextmanager
 from time import perf_counter
-from typing import Dict
+from typing import Callable, Dict, Iterator, Sequence
+
+# Upper bounds, in seconds, for latency histograms (plus an implicit +Inf).
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PROMETHEUS_NAMESPACE = "aop_mcp"
+
+Labels = tuple[tuple[str, str], ...]
+SeriesKey = tuple[str, Labels]
+
+_INVALID_NAME_CHARACTERS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min, and max."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile by interpolating within its bucket."""
+
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                lower = max(lower, self.min or 0.0)
+                upper = min(upper, self.max if self.max is not None else upper)
+                fraction = (rank - seen) / bucket_count
+                return lower + (upper - lower) * fraction
+            seen += bucket_count
+        return self.max
 
 
 class MetricsRecorder:
-    def __init__(self) -> None:
-        self.counters: Dict[str, int] = defaultdict(int)
-        self.timings: Dict[str, list[float]] = defaultdict(list)
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counters: Dict[SeriesKey, float] = {}
+        self.gauges: Dict[SeriesKey, float] = {}
+        self.timings: Dict[SeriesKey, Histogram] = {}
+        self.descriptions: Dict[str, str] = {}
+        self._gauge_callbacks: Dict[SeriesKey, Callable[[], float]] = {}
+        # Synchronous adapters report from worker threads.
+        self._lock = threading.Lock()
 
-    def increment(self, name: str, value: int = 1) -> None:
-        self.counters[name] += value
+    def describe(self, name: str, help_text: str) -> None:
+        self.descriptions[name] = help_text
+
+    def increment(self, name: str, value: float = 1, **labels: object) -> None:
+        key = _series_key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        with self._lock:
+            self.gauges[_series_key(name, labels)] = value
+
+    def add_gauge(self, name: str, delta: float, **labels: object) -> None:
+        key = _series_key(name, labels)
+        with self._lock:
+            self.gauges[key] = self.gauges.get(key, 0) + delta
+
+    def register_gauge(self, name: str, callback: Callable[[], float], **labels: object) -> None:
+        """Sample ``callback`` at export time (replaces any earlier callback for the series)."""
+
+        with self._lock:
+            self._gauge_callbacks[_series_key(name, labels)] = callback
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        key = _series_key(name, labels)
+        with self._lock:
+            histogram = self.timings.get(key)
+            if histogram is None:
+                histogram = self.timings[key] = Histogram(self.buckets)
+            histogram.observe(value)
 
     @contextmanager
-    def time(self, name: str):
+    def time(self, name: str, **labels: object) -> Iterator[None]:
         start = perf_counter()
         try:
             yield
         finally:
-            elapsed = perf_counter() - start
-            self.timings[name].append(elapsed)
+            self.observe(name, perf_counter() - start, **labels)
+
+    def counter_value(self, name: str, **labels: object) -> float:
+        return self.counters.get(_series_key(name, labels), 0)
+
+    def gauge_value(self, name: str, **labels: object) -> float | None:
+        key = _series_key(name, labels)
+        callback = self._gauge_callbacks.get(key)
+        if callback is not None:
+            return float(callback())
+        return self.gauges.get(key)
+
+    def histogram(self, name: str, **labels: object) -> Histogram | None:
+        return self.timings.get(_series_key(name, labels))
+
+    def render_prometheus(self) -> str:
+        """Format every series in the Prometheus text exposition format (0.0.4)."""
+
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            callbacks = dict(self._gauge_callbacks)
+            histograms = {
+                key: (list(h.bucket_counts), h.count, h.sum, h.buckets)
+                for key, h in self.timings.items()
+            }
+        for key, callback in callbacks.items():
+            try:
+                gauges[key] = float(callback())
+            except Exception:  # pragma: no cover - a broken gauge must not break scrapes
+                continue
+
+        lines: list[str] = []
+        for name, series in _group(counters):
+            metric = _prometheus_name(name) + "_total"
+            self._header(lines, name, metric, "counter")
+            for labels, value in series:
+                lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+        for name, series in _group(gauges):
+            metric = _prometheus_name(name)
+            self._header(lines, name, metric, "gauge")
+            for labels, value in series:
+                lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+        for name, series in _group(histograms):
+            metric = _prometheus_name(name)
+            self._header(lines, name, metric, "histogram")
+            for labels, (bucket_counts, count, total, buckets) in series:
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, math.inf), bucket_counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == math.inf else _format_value(bound)
+                    lines.append(
+                        f"{metric}_bucket{_format_labels((*labels, ('le', le)))} {cumulative}"
+                    )
+                lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _header(self, lines: list[str], name: str, metric: str, kind: str) -> None:
+        help_text = self.descriptions.get(name)
+        if help_text:
+            escaped = help_text.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append(f"# HELP {metric} {escaped}")
+        lines.append(f"# TYPE {metric} {kind}")
+
+
+def _series_key(name: str, labels: dict[str, object]) -> SeriesKey:
+    if not labels:
+        return name, ()
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _group(series: dict[SeriesKey, object]) -> list[tuple[str, list[tuple[Labels, object]]]]:
+    grouped: dict[str, list[tuple[Labels, object]]] = {}
+    for (name, labels), value in sorted(series.items()):
+        grouped.setdefault(name, []).append((labels, value))
+    return list(grouped.items())
+
+
+def _prometheus_name(name: str) -> str:
+    return f"{PROMETHEUS_NAMESPACE}_{_INVALID_NAME_CHARACTERS.sub('_', name)}"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(
+        f'{_INVALID_NAME_CHARACTERS.sub("_", key)}="{_escape_label(value)}"'
+        for key, value in labels
+    )
+    return "{" + rendered + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+metrics_recorder = MetricsRecorder()
+
 
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS",
+    "Histogram",
+    "MetricsRecorder",
+    "PROMETHEUS_CONTENT_TYPE",
+    "metrics_recorder",
+]
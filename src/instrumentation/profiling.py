@@ -0,0 +1,400 @@
+"""On-demand profiling of live MCP tool calls."""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import monotonic, perf_counter
+from typing import Any, Iterator
+from uuid import uuid4
+
+PROFILE_MODES = ("cprofile", "sampling")
+PROFILE_SUMMARY_SCHEMA_VERSION = "tool-call-profile.v1"
+# Calls profiled by a time-window session when no call count is given.
+DEFAULT_WINDOW_MAX_CALLS = 100
+MAX_RETAINED_SESSIONS = 32
+_MAX_STACK_DEPTH = 128
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _isoformat(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass
+class ProfiledCall:
+    """Summary of one profiled tool call and the artifacts written for it."""
+
+    call_id: str
+    started_at: str
+    duration_ms: float
+    summary_path: str
+    artifact_path: str
+    top_functions: list[dict[str, Any]] = field(default_factory=list)
+    collapsed_stacks: list[dict[str, Any]] = field(default_factory=list)
+    sample_count: int | None = None
+    allocation_sites: list[dict[str, Any]] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "call_id": self.call_id,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "summary_path": self.summary_path,
+            "artifact_path": self.artifact_path,
+            "top_functions": self.top_functions,
+            "collapsed_stacks": self.collapsed_stacks,
+            "sample_count": self.sample_count,
+            "allocation_sites": self.allocation_sites,
+        }
+
+
+@dataclass
+class ProfileSession:
+    """Profiler armed for the next calls of one tool."""
+
+    session_id: str
+    tool_name: str
+    mode: str
+    memory: bool
+    calls_requested: int
+    output_directory: Path
+    armed_at: str
+    expires_at: str | None = None
+    sample_interval_seconds: float = 0.005
+    top: int = 20
+    calls_remaining: int = 0
+    disarmed: bool = False
+    profiles: list[ProfiledCall] = field(default_factory=list)
+    _deadline: float | None = field(default=None, repr=False)
+
+    @property
+    def state(self) -> str:
+        if self.disarmed:
+            return "disarmed"
+        if self.calls_remaining <= 0:
+            return "completed"
+        if self._deadline is not None and monotonic() >= self._deadline:
+            return "expired"
+        return "armed"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "tool_name": self.tool_name,
+            "mode": self.mode,
+            "memory": self.memory,
+            "state": self.state,
+            "calls_requested": self.calls_requested,
+            "calls_profiled": len(self.profiles),
+            "calls_remaining": max(0, self.calls_remaining),
+            "armed_at": self.armed_at,
+            "expires_at": self.expires_at,
+            "output_directory": str(self.output_directory),
+            "profiles": [profile.to_dict() for profile in self.profiles],
+        }
+
+
+class _CProfileCollector:
+    suffix = ".pstats"
+
+    def __init__(self) -> None:
+        self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profiler.enable()
+
+    def stop(self) -> None:
+        self._profiler.disable()
+
+    def write(self, path: Path, call: ProfiledCall, top: int) -> None:
+        self._profiler.dump_stats(str(path))
+        stats = pstats.Stats(self._profiler).stats  # type: ignore[attr-defined]
+        ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        call.top_functions = [
+            {
+                "function": pstats.func_std_string(function),
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for function, (_, calls, total, cumulative, _) in ranked[:top]
+        ]
+
+
+class _StackSampler:
+    suffix = ".folded"
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tool-call-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack: list[str] = []
+                while frame is not None and len(stack) < _MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_qualname}")
+                    frame = frame.f_back
+                stack.append(f"thread:{names.get(thread_id, thread_id)}")
+                self.counts[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def write(self, path: Path, call: ProfiledCall, top: int) -> None:
+        ranked = self.counts.most_common()
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in ranked),
+            encoding="utf-8",
+        )
+        call.sample_count = self.sample_count
+        call.collapsed_stacks = [
+            {"stack": stack, "samples": count} for stack, count in ranked[:top]
+        ]
+
+
+class ToolCallProfiler:
+    """Arms, runs, and retains profiling sessions for named tools."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, ProfileSession] = {}
+        self._armed_by_tool: dict[str, str] = {}
+        self._busy = False
+        self._lock = threading.Lock()
+
+    def arm(
+        self,
+        tool_name: str,
+        *,
+        output_directory: Path,
+        mode: str = "cprofile",
+        calls: int | None = None,
+        duration_seconds: float | None = None,
+        memory: bool = False,
+        sample_interval_seconds: float = 0.005,
+        top: int = 20,
+    ) -> ProfileSession:
+        """Arm a session for ``tool_name``, replacing any session already armed for it."""
+
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(PROFILE_MODES)}")
+        if calls is None:
+            calls = 1 if duration_seconds is None else DEFAULT_WINDOW_MAX_CALLS
+        armed_at = _utc_now()
+        session_id = uuid4().hex
+        session = ProfileSession(
+            session_id=session_id,
+            tool_name=tool_name,
+            mode=mode,
+            memory=memory,
+            calls_requested=calls,
+            calls_remaining=calls,
+            output_directory=output_directory / session_id,
+            armed_at=_isoformat(armed_at),
+            expires_at=(
+                _isoformat(armed_at + timedelta(seconds=duration_seconds))
+                if duration_seconds is not None
+                else None
+            ),
+            sample_interval_seconds=sample_interval_seconds,
+            top=top,
+            _deadline=monotonic() + duration_seconds if duration_seconds is not None else None,
+        )
+        with self._lock:
+            previous = self._armed_by_tool.get(tool_name)
+            if previous is not None:
+                self._sessions[previous].disarmed = True
+            self._sessions[session_id] = session
+            self._armed_by_tool[tool_name] = session_id
+            self._prune()
+        return session
+
+    def disarm(self, *, session_id: str | None = None, tool_name: str | None = None) -> list[ProfileSession]:
+        with self._lock:
+            disarmed = []
+            for session in self._sessions.values():
+                if session.state != "armed":
+                    continue
+                if session_id is not None and session.session_id != session_id:
+                    continue
+                if tool_name is not None and session.tool_name != tool_name:
+                    continue
+                session.disarmed = True
+                self._armed_by_tool.pop(session.tool_name, None)
+                disarmed.append(session)
+            return disarmed
+
+    def get(self, session_id: str) -> ProfileSession | None:
+        return self._sessions.get(session_id)
+
+    def sessions(self, *, tool_name: str | None = None) -> list[ProfileSession]:
+        with self._lock:
+            return [
+                session
+                for session in self._sessions.values()
+                if tool_name is None or session.tool_name == tool_name
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._armed_by_tool.clear()
+
+    @contextmanager
+    def profile(self, tool_name: str, call_id: str) -> Iterator[None]:
+        """Profile the block if a session is armed for ``tool_name``."""
+
+        if tool_name not in self._armed_by_tool:
+            yield
+            return
+        session = self._claim(tool_name)
+        if session is None:
+            yield
+            return
+        try:
+            collector: _CProfileCollector | _StackSampler = (
+                _CProfileCollector()
+                if session.mode == "cprofile"
+                else _StackSampler(session.sample_interval_seconds)
+            )
+            started_tracemalloc = False
+            before = None
+            if session.memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    started_tracemalloc = True
+                before = tracemalloc.take_snapshot()
+            started_at = _isoformat(_utc_now())
+            start = perf_counter()
+            collector.start()
+            try:
+                yield
+            finally:
+                collector.stop()
+                duration_ms = round((perf_counter() - start) * 1000, 3)
+                allocation_sites = None
+                if before is not None:
+                    after = tracemalloc.take_snapshot()
+                    allocation_sites = _allocation_sites(before, after, session.top)
+                    if started_tracemalloc:
+                        tracemalloc.stop()
+                self._record(session, collector, call_id, started_at, duration_ms, allocation_sites)
+        finally:
+            with self._lock:
+                self._busy = False
+
+    def _claim(self, tool_name: str) -> ProfileSession | None:
+        with self._lock:
+            session_id = self._armed_by_tool.get(tool_name)
+            session = self._sessions.get(session_id) if session_id is not None else None
+            if session is None or session.state != "armed":
+                self._armed_by_tool.pop(tool_name, None)
+                return None
+            if self._busy:
+                return None
+            self._busy = True
+            session.calls_remaining -= 1
+            if session.calls_remaining <= 0:
+                self._armed_by_tool.pop(tool_name, None)
+            return session
+
+    def _record(
+        self,
+        session: ProfileSession,
+        collector: _CProfileCollector | _StackSampler,
+        call_id: str,
+        started_at: str,
+        duration_ms: float,
+        allocation_sites: list[dict[str, Any]] | None,
+    ) -> None:
+        session.output_directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{len(session.profiles) + 1:03d}-{call_id}"
+        artifact_path = session.output_directory / f"{stem}{collector.suffix}"
+        summary_path = session.output_directory / f"{stem}.json"
+        call = ProfiledCall(
+            call_id=call_id,
+            started_at=started_at,
+            duration_ms=duration_ms,
+            summary_path=str(summary_path),
+            artifact_path=str(artifact_path),
+            allocation_sites=allocation_sites,
+        )
+        collector.write(artifact_path, call, session.top)
+        summary = {
+            "schema_version": PROFILE_SUMMARY_SCHEMA_VERSION,
+            "session_id": session.session_id,
+            "tool_name": session.tool_name,
+            "mode": session.mode,
+            **call.to_dict(),
+        }
+        summary_path.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+        session.profiles.append(call)
+
+    def _prune(self) -> None:
+        excess = len(self._sessions) - MAX_RETAINED_SESSIONS
+        if excess <= 0:
+            return
+        for session_id in [
+            session.session_id
+            for session in self._sessions.values()
+            if session.state != "armed"
+        ][:excess]:
+            del self._sessions[session_id]
+
+
+def _allocation_sites(
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+    top: int,
+) -> list[dict[str, Any]]:
+    sites = []
+    for stat in after.compare_to(before, "lineno")[:top]:
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+            }
+        )
+    return sites
+
+
+tool_call_profiler = ToolCallProfiler()
+
+
+__all__ = [
+    "DEFAULT_WINDOW_MAX_CALLS",
+    "PROFILE_MODES",
+    "ProfileSession",
+    "ProfiledCall",
+    "ToolCallProfiler",
+    "tool_call_profiler",
+]
@@ -0,0 +1,73 @@
+"""Progress reporting from long-running tool handlers."""
+
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+ProgressCallback = Callable[[float, "float | None", "str | None"], None]
+PartialResultCallback = Callable[[dict[str, Any]], None]
+
+log = logging.getLogger(__name__)
+
+_current_progress: ContextVar[ProgressCallback | None] = ContextVar(
+    "tool_progress_callback", default=None
+)
+_current_partial_results: ContextVar[PartialResultCallback | None] = ContextVar(
+    "tool_partial_result_callback", default=None
+)
+
+
+@contextmanager
+def progress_scope(
+    callback: ProgressCallback,
+    *,
+    partial_results: PartialResultCallback | None = None,
+) -> Iterator[None]:
+    """Send ``report_progress`` (and ``report_partial_result``) calls made in this context on."""
+
+    token = _current_progress.set(callback)
+    partial_token = _current_partial_results.set(partial_results)
+    try:
+        yield
+    finally:
+        _current_partial_results.reset(partial_token)
+        _current_progress.reset(token)
+
+
+def report_progress(progress: float, total: float | None = None, message: str | None = None) -> None:
+    callback = _current_progress.get()
+    if callback is None:
+        return
+    try:
+        callback(progress, total, message)
+    except Exception:  # pragma: no cover - progress must not fail the work it reports on
+        log.exception("Progress callback failed")
+
+
+def wants_partial_results() -> bool:
+    """Whether anyone receives partial results, so handlers can skip building them."""
+
+    return _current_partial_results.get() is not None
+
+
+def report_partial_result(partial: dict[str, Any]) -> None:
+    callback = _current_partial_results.get()
+    if callback is None:
+        return
+    try:
+        callback(partial)
+    except Exception:  # pragma: no cover - see report_progress
+        log.exception("Partial result callback failed")
+
+
+__all__ = [
+    "PartialResultCallback",
+    "ProgressCallback",
+    "progress_scope",
+    "report_partial_result",
+    "report_progress",
+    "wants_partial_results",
+]
@@ -0,0 +1,179 @@
+"""Per-client rate budgets for upstream services."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from src.instrumentation.metrics import metrics_recorder
+
+DEFAULT_CLIENT_SHARE = 0.5
+_UNKNOWN_CLIENT = "anonymous"
+_EVICT_INTERVAL_SECONDS = 60.0
+
+_current_client: ContextVar[str | None] = ContextVar("upstream_client_id", default=None)
+
+
+def current_client_id() -> str | None:
+    return _current_client.get()
+
+
+@contextmanager
+def client_scope(client_id: str | None) -> Iterator[None]:
+    """Charge upstream requests made in this context to ``client_id``."""
+
+    token = _current_client.set(client_id)
+    try:
+        yield
+    finally:
+        _current_client.reset(token)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Take one token (possibly going negative); return the wait until it is covered."""
+
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def refilled(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+@dataclass(frozen=True)
+class _ServiceBudget:
+    requests_per_second: float
+    burst: float
+    client_share: float
+
+
+class UpstreamThrottle:
+    def __init__(self) -> None:
+        self._budgets: dict[str, _ServiceBudget] = {}
+        self._service_buckets: dict[str, _TokenBucket] = {}
+        self._client_buckets: dict[tuple[str, str], _TokenBucket] = {}
+        self._last_seen: dict[str, dict[str, float]] = {}
+        self._next_eviction = 0.0
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        service: str,
+        *,
+        requests_per_second: float,
+        burst: float | None = None,
+        client_share: float = DEFAULT_CLIENT_SHARE,
+    ) -> None:
+        """Set ``service``'s budget; ``requests_per_second <= 0`` removes it."""
+
+        if not 0 < client_share <= 1:
+            raise ValueError("client_share must be in (0, 1]")
+        with self._lock:
+            self._service_buckets.pop(service, None)
+            self._last_seen.pop(service, None)
+            for key in [key for key in self._client_buckets if key[0] == service]:
+                del self._client_buckets[key]
+            if requests_per_second <= 0:
+                self._budgets.pop(service, None)
+                return
+            self._budgets[service] = _ServiceBudget(
+                requests_per_second=requests_per_second,
+                burst=burst if burst is not None else max(1.0, requests_per_second),
+                client_share=client_share,
+            )
+
+    def acquire(self, service: str) -> float:
+        """Wait for a request slot for the current client; return the seconds waited."""
+
+        budget = self._budgets.get(service)
+        if budget is None:
+            return 0.0
+        client = _current_client.get() or _UNKNOWN_CLIENT
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_eviction:
+                self._evict_refilled_buckets(now)
+            service_bucket = self._service_buckets.get(service)
+            if service_bucket is None:
+                service_bucket = self._service_buckets[service] = _TokenBucket(
+                    budget.requests_per_second, budget.burst
+                )
+            # Reserving from the buckets up front keeps waiting clients in arrival order.
+            delay = service_bucket.reserve(now)
+            if self._others_active(service, client, budget, now):
+                client_bucket = self._client_buckets.get((service, client))
+                if client_bucket is None:
+                    client_rate = budget.requests_per_second * budget.client_share
+                    client_bucket = self._client_buckets[(service, client)] = _TokenBucket(
+                        client_rate, max(1.0, budget.burst * budget.client_share)
+                    )
+                delay = max(delay, client_bucket.reserve(now))
+        if delay <= 0:
+            return 0.0
+        metrics_recorder.increment("upstream.throttled", service=service)
+        metrics_recorder.observe("upstream.throttle_wait_seconds", delay, service=service)
+        if _on_event_loop_thread():
+            return 0.0
+        time.sleep(delay)
+        return delay
+
+    def reset(self) -> None:
+        with self._lock:
+            self._budgets.clear()
+            self._service_buckets.clear()
+            self._client_buckets.clear()
+            self._last_seen.clear()
+
+    def _others_active(self, service: str, client: str, budget: _ServiceBudget, now: float) -> bool:
+        """Record ``client``'s request; return whether another client called within the window.
+
+        The window is the time the service bucket takes to refill from empty.
+        """
+
+        seen = self._last_seen.setdefault(service, {})
+        seen[client] = now
+        window = budget.burst / budget.requests_per_second
+        return any(other != client and now - at < window for other, at in seen.items())
+
+    def _evict_refilled_buckets(self, now: float) -> None:
+        for key in [key for key, bucket in self._client_buckets.items() if bucket.refilled(now)]:
+            del self._client_buckets[key]
+        for service, seen in self._last_seen.items():
+            budget = self._budgets.get(service)
+            window = budget.burst / budget.requests_per_second if budget else 0.0
+            for client in [client for client, at in seen.items() if now - at >= window]:
+                del seen[client]
+        self._next_eviction = now + _EVICT_INTERVAL_SECONDS
+
+
+def _on_event_loop_thread() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+upstream_throttle = UpstreamThrottle()
+
+
+__all__ = [
+    "DEFAULT_CLIENT_SHARE",
+    "UpstreamThrottle",
+    "client_scope",
+    "current_client_id",
+    "upstream_throttle",
+]
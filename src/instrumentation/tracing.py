@@ -0,0 +1,424 @@
+"""In-process tracing spans for MCP tool calls."""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Protocol, Sequence, TypeVar
+
+TRACE_SERVICE_NAME = "aop-mcp"
+TRACE_SCOPE_NAME = "src.instrumentation.tracing"
+DEFAULT_MAX_SPANS_PER_TRACE = 10_000
+
+# OTLP enum values.
+_SPAN_KIND_INTERNAL = 1
+_STATUS_CODE_OK = 1
+_STATUS_CODE_ERROR = 2
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _TraceBuffer:
+    trace_id: str
+    max_spans: int
+    spans: list["Span"] = field(default_factory=list)
+    dropped_span_count: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, span: "Span") -> None:
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            else:
+                self.dropped_span_count += 1
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    start_time_unix_nano: int
+    end_time_unix_nano: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "unset"
+    status_message: str | None = None
+    _trace: _TraceBuffer | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time_unix_nano or self.start_time_unix_nano
+        return (end - self.start_time_unix_nano) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_time_unix_nano),
+            "endTimeUnixNano": str(self.end_time_unix_nano or self.start_time_unix_nano),
+            "attributes": _otlp_attributes(self.attributes),
+        }
+        if self.parent_span_id is not None:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status == "ok":
+            span["status"] = {"code": _STATUS_CODE_OK}
+        elif self.status == "error":
+            span["status"] = {"code": _STATUS_CODE_ERROR, "message": self.status_message or ""}
+        return span
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None:  # pragma: no cover - protocol shim
+        ...
+
+
+def otlp_trace_request(
+    spans: Sequence[Span],
+    *,
+    service_name: str = TRACE_SERVICE_NAME,
+) -> dict[str, Any]:
+    """Wrap ``spans`` in an OTLP/JSON ``ExportTraceServiceRequest``."""
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": service_name}),
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": TRACE_SCOPE_NAME},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class JsonlSpanExporter:
+    """Append each finished trace to a file as one OTLP/JSON line.
+
+    ``export`` only queues the spans; a writer thread encodes and appends
+    them, so ending a root span never waits on the file. Traces that arrive
+    while ``max_queued`` are waiting are dropped and counted in
+    ``dropped_traces``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        service_name: str = TRACE_SERVICE_NAME,
+        max_queued: int = 1000,
+    ) -> None:
+        self.path = Path(path)
+        self.service_name = service_name
+        self.dropped_traces = 0
+        self._queue: queue.Queue[list[Span] | None] = queue.Queue(maxsize=max_queued)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(list(spans))
+        except queue.Full:
+            self.dropped_traces += 1
+
+    def flush(self) -> None:
+        """Block until every queued trace has been written."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the queued traces and stop the thread."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                if spans is None:
+                    return
+                self._write(spans)
+            except Exception:
+                log.exception("Trace export failed")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, spans: Sequence[Span]) -> None:
+        line = json.dumps(
+            otlp_trace_request(spans, service_name=self.service_name),
+            separators=(",", ":"),
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class InMemorySpanExporter:
+    """Keep finished traces in memory (tests and ad hoc inspection)."""
+
+    def __init__(self) -> None:
+        self.traces: list[list[Span]] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.traces.append(list(spans))
+
+
+# Marks a context whose root span was sampled out, so descendants skip too.
+_NOT_SAMPLED = object()
+_current_span: ContextVar[Any] = ContextVar("tracing_current_span", default=None)
+
+
+class Tracer:
+    """Creates nested spans and exports each sampled trace when its root ends."""
+
+    def __init__(
+        self,
+        *,
+        exporter: SpanExporter | None = None,
+        sample_rate: float = 1.0,
+        max_spans_per_trace: int = DEFAULT_MAX_SPANS_PER_TRACE,
+    ) -> None:
+        self.configure(
+            exporter=exporter,
+            sample_rate=sample_rate,
+            max_spans_per_trace=max_spans_per_trace,
+        )
+
+    def configure(
+        self,
+        *,
+        exporter: SpanExporter | None,
+        sample_rate: float = 1.0,
+        max_spans_per_trace: int = DEFAULT_MAX_SPANS_PER_TRACE,
+    ) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        previous = getattr(self, "exporter", None)
+        if previous is not None and previous is not exporter:
+            # Let a replaced exporter write what it has queued.
+            close = getattr(previous, "close", None)
+            if close is not None:
+                close()
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.max_spans_per_trace = max_spans_per_trace
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0
+
+    def flush(self) -> None:
+        """Wait for the exporter to write the traces it has queued, if it queues."""
+
+        flush = getattr(self.exporter, "flush", None)
+        if flush is not None:
+            flush()
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Start a trace rooted at ``name`` (subject to sampling).
+
+        Inside an existing trace this is an ordinary child span. Yields
+        ``None`` when the trace is not recorded.
+        """
+
+        parent = _current_span.get()
+        if parent is not None:
+            with self.span(name, **attributes) as span:
+                yield span
+            return
+        if not self.enabled or (
+            self.sample_rate < 1.0 and random.random() >= self.sample_rate
+        ):
+            token = _current_span.set(_NOT_SAMPLED)
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+        trace = _TraceBuffer(
+            trace_id=f"{random.getrandbits(128):032x}",
+            max_spans=self.max_spans_per_trace,
+        )
+        with self._record(name, attributes, trace, None) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Time the block as a child of the current span.
+
+        Outside a recorded trace this yields ``None`` and records nothing, so
+        adapters can open spans unconditionally.
+        """
+
+        parent = _current_span.get()
+        if not isinstance(parent, Span):
+            yield None
+            return
+        with self._record(name, attributes, parent._trace, parent.span_id) as span:
+            yield span
+
+    @contextmanager
+    def _record(
+        self,
+        name: str,
+        attributes: dict[str, Any],
+        trace: _TraceBuffer,
+        parent_span_id: str | None,
+    ) -> Iterator[Span]:
+        span = Span(
+            name=name,
+            trace_id=trace.trace_id,
+            span_id=f"{random.getrandbits(64):016x}",
+            parent_span_id=parent_span_id,
+            start_time_unix_nano=time.time_ns(),
+            attributes=attributes,
+            _trace=trace,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.status = "error"
+            span.status_message = f"{type(exc).__name__}: {exc}"
+            raise
+        else:
+            if span.status == "unset":
+                span.status = "ok"
+        finally:
+            _current_span.reset(token)
+            span.end_time_unix_nano = time.time_ns()
+            trace.add(span)
+            if parent_span_id is None:
+                self._export(span, trace)
+
+    def _export(self, root: Span, trace: _TraceBuffer) -> None:
+        exporter = self.exporter
+        if exporter is None:
+            return
+        if trace.dropped_span_count:
+            root.attributes["trace.dropped_span_count"] = trace.dropped_span_count
+        try:
+            exporter.export(trace.spans)
+        except Exception:  # pragma: no cover - tracing must not fail tool calls
+            log.exception("Trace export failed")
+
+
+def current_span() -> Span | None:
+    span = _current_span.get()
+    return span if isinstance(span, Span) else None
+
+
+def traced(name: str) -> Callable[[_F], _F]:
+    """Decorate a function or coroutine function to run inside ``tracer.span(name)``."""
+
+    def decorate(func: _F) -> _F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with tracer.span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def critical_path(spans: Sequence[Span]) -> list[Span]:
+    """Return the chain from the root that, at each level, follows the child ending last.
+
+    For fan-out handlers this is the sequence of operations that bounded the
+    call's wall-clock time.
+    """
+
+    children: dict[str | None, list[Span]] = {}
+    for span in spans:
+        children.setdefault(span.parent_span_id, []).append(span)
+    roots = children.get(None)
+    if not roots:
+        return []
+    path = [max(roots, key=lambda span: span.end_time_unix_nano or 0)]
+    while children.get(path[-1].span_id):
+        path.append(
+            max(children[path[-1].span_id], key=lambda span: span.end_time_unix_nano or 0)
+        )
+    return path
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    encoded = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": typed})
+    return encoded
+
+
+tracer = Tracer()
+
+
+__all__ = [
+    "DEFAULT_MAX_SPANS_PER_TRACE",
+    "InMemorySpanExporter",
+    "JsonlSpanExporter",
+    "Span",
+    "SpanExporter",
+    "TRACE_SERVICE_NAME",
+    "Tracer",
+    "critical_path",
+    "current_span",
+    "otlp_trace_request",
+    "traced",
+    "tracer",
+]
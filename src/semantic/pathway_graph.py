@@ -0,0 +1,318 @@
+"""Directed pathway-graph algorithms for AOP network review."""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+
+@dataclass(frozen=True)
+class PathwayPath:
+    """One simple path through a :class:`PathwayGraph`.
+
+    ``edges`` holds indexes into the edge sequence the graph was built from, so
+    callers can map each hop back to the KER record that produced it.
+    """
+
+    nodes: tuple[str, ...]
+    edges: tuple[int, ...]
+    cost: float
+
+    @property
+    def hop_count(self) -> int:
+        return len(self.edges)
+
+
+class PathwayGraph:
+    """Interned directed multigraph of key events and KERs.
+
+    Node labels are interned to integers once at construction time. Adjacency
+    lists are sorted by downstream label and edge index so every traversal is
+    deterministic for a given input, regardless of dict or set ordering.
+    """
+
+    def __init__(
+        self,
+        edges: Sequence[tuple[str, str]],
+        *,
+        weights: Sequence[float] | None = None,
+        nodes: Iterable[str] = (),
+    ) -> None:
+        if weights is not None and len(weights) != len(edges):
+            raise ValueError("weights must align with edges")
+        if weights is not None and any(weight <= 0 for weight in weights):
+            raise ValueError("edge weights must be positive")
+        self._labels: list[str] = []
+        self._index: dict[str, int] = {}
+        for label in nodes:
+            self._intern(label)
+        self._edge_from: list[int] = []
+        self._edge_to: list[int] = []
+        for upstream, downstream in edges:
+            self._edge_from.append(self._intern(upstream))
+            self._edge_to.append(self._intern(downstream))
+        self._edge_weight: list[float] = (
+            [float(weight) for weight in weights] if weights is not None else [1.0] * len(edges)
+        )
+        self._max_weight = max(self._edge_weight, default=1.0)
+        self._out: list[list[int]] = [[] for _ in self._labels]
+        self._in: list[list[int]] = [[] for _ in self._labels]
+        for edge_index, (source, target) in enumerate(zip(self._edge_from, self._edge_to)):
+            self._out[source].append(edge_index)
+            self._in[target].append(edge_index)
+        for adjacency in self._out:
+            adjacency.sort(key=lambda edge_index: (self._labels[self._edge_to[edge_index]], edge_index))
+        self._reaching_cache: dict[frozenset[int], frozenset[int]] = {}
+
+    def _intern(self, label: str) -> int:
+        index = self._index.get(label)
+        if index is None:
+            index = len(self._labels)
+            self._index[label] = index
+            self._labels.append(label)
+        return index
+
+    @property
+    def node_count(self) -> int:
+        return len(self._labels)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edge_from)
+
+    def degrees(self) -> dict[str, tuple[int, int]]:
+        """Return ``(in_degree, out_degree)`` per node, counting each edge once."""
+
+        return {
+            label: (len(self._in[index]), len(self._out[index]))
+            for index, label in enumerate(self._labels)
+        }
+
+    def betweenness_centrality(self, *, normalized: bool = True) -> dict[str, float]:
+        """Return directed, unweighted betweenness centrality per node.
+
+        Uses Brandes' algorithm: one BFS per node plus a reverse dependency
+        sweep, ``O(V * E)`` overall. Parallel edges collapse to one hop. When
+        ``normalized`` is true, scores are divided by ``(n - 1) * (n - 2)``.
+        """
+
+        node_count = len(self._labels)
+        successors = [
+            sorted({self._edge_to[edge_index] for edge_index in adjacency}) for adjacency in self._out
+        ]
+        centrality = [0.0] * node_count
+        for source in range(node_count):
+            order: list[int] = []
+            predecessors: list[list[int]] = [[] for _ in range(node_count)]
+            path_counts = [0] * node_count
+            path_counts[source] = 1
+            distance = [-1] * node_count
+            distance[source] = 0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                order.append(node)
+                for nxt in successors[node]:
+                    if distance[nxt] < 0:
+                        distance[nxt] = distance[node] + 1
+                        queue.append(nxt)
+                    if distance[nxt] == distance[node] + 1:
+                        path_counts[nxt] += path_counts[node]
+                        predecessors[nxt].append(node)
+            dependency = [0.0] * node_count
+            for node in reversed(order):
+                for previous in predecessors[node]:
+                    dependency[previous] += path_counts[previous] / path_counts[node] * (1.0 + dependency[node])
+                if node != source:
+                    centrality[node] += dependency[node]
+        scale = 1.0 / ((node_count - 1) * (node_count - 2)) if normalized and node_count > 2 else 1.0
+        return {label: centrality[index] * scale for index, label in enumerate(self._labels)}
+
+    def nodes_reaching(self, targets: Iterable[str]) -> frozenset[str]:
+        """Return every node label with a directed path to any of ``targets``."""
+
+        reaching = self._reaching(self._lookup(targets))
+        return frozenset(self._labels[index] for index in reaching)
+
+    def _lookup(self, labels: Iterable[str]) -> frozenset[int]:
+        return frozenset(self._index[label] for label in labels if label in self._index)
+
+    def _reaching(self, targets: frozenset[int]) -> frozenset[int]:
+        cached = self._reaching_cache.get(targets)
+        if cached is not None:
+            return cached
+        seen = set(targets)
+        stack = list(targets)
+        while stack:
+            node = stack.pop()
+            for edge_index in self._in[node]:
+                upstream = self._edge_from[edge_index]
+                if upstream not in seen:
+                    seen.add(upstream)
+                    stack.append(upstream)
+        reaching = frozenset(seen)
+        self._reaching_cache[targets] = reaching
+        return reaching
+
+    def k_shortest_paths(
+        self,
+        sources: Iterable[str],
+        targets: Iterable[str],
+        *,
+        k: int,
+        max_hops: int | None = None,
+    ) -> list[PathwayPath]:
+        """Return up to ``k`` cheapest simple paths from any source to any target.
+
+        Uses Yen's algorithm over a virtual super-source so several MIEs can be
+        enumerated together. Targets are terminal: a path stops at the first
+        target it reaches. Branches that cannot reach a target are pruned via a
+        memoized reverse-reachability set before any spur search runs.
+
+        Paths longer than ``max_hops`` are never returned. They are still kept
+        as spur roots while their cost could hide a shorter-hop path, which
+        keeps the enumeration exact when edge weights are not uniform.
+        """
+
+        if k < 1:
+            return []
+        target_ids = self._lookup(targets)
+        source_ids = sorted(
+            self._lookup(sources),
+            key=lambda index: self._labels[index],
+        )
+        if not target_ids or not source_ids:
+            return []
+        reaching = self._reaching(target_ids)
+        source_ids = [index for index in source_ids if index in reaching]
+        if not source_ids:
+            return []
+
+        virtual_source = len(self._labels)
+        virtual_edge_base = len(self._edge_from)
+        virtual_edges = list(range(virtual_edge_base, virtual_edge_base + len(source_ids)))
+
+        def edge_target(edge_index: int) -> int:
+            if edge_index >= virtual_edge_base:
+                return source_ids[edge_index - virtual_edge_base]
+            return self._edge_to[edge_index]
+
+        def edge_weight(edge_index: int) -> float:
+            if edge_index >= virtual_edge_base:
+                return 0.0
+            return self._edge_weight[edge_index]
+
+        def out_edges(node: int) -> list[int]:
+            if node == virtual_source:
+                return virtual_edges
+            return self._out[node]
+
+        def spur_search(
+            spur: int,
+            removed_nodes: set[int],
+            removed_edges: set[int],
+        ) -> tuple[list[int], list[int], float] | None:
+            best: dict[int, float] = {spur: 0.0}
+            parent_edge: dict[int, int] = {}
+            counter = 0
+            frontier: list[tuple[float, int, int]] = [(0.0, counter, spur)]
+            settled: set[int] = set()
+            while frontier:
+                cost, _, node = heapq.heappop(frontier)
+                if node in settled:
+                    continue
+                settled.add(node)
+                if node in target_ids:
+                    edges_rev: list[int] = []
+                    nodes_rev = [node]
+                    while node != spur:
+                        edge_index = parent_edge[node]
+                        edges_rev.append(edge_index)
+                        node = self._edge_from[edge_index] if edge_index < virtual_edge_base else virtual_source
+                        nodes_rev.append(node)
+                    return nodes_rev[::-1], edges_rev[::-1], cost
+                for edge_index in out_edges(node):
+                    if edge_index in removed_edges:
+                        continue
+                    nxt = edge_target(edge_index)
+                    if nxt in removed_nodes or nxt in settled or nxt not in reaching:
+                        continue
+                    next_cost = cost + edge_weight(edge_index)
+                    if next_cost < best.get(nxt, float("inf")):
+                        best[nxt] = next_cost
+                        parent_edge[nxt] = edge_index
+                        counter += 1
+                        heapq.heappush(frontier, (next_cost, counter, nxt))
+            return None
+
+        first = spur_search(virtual_source, set(), set())
+        if first is None:
+            return []
+
+        hop_budget = max_hops if max_hops is not None else len(self._labels)
+        cost_ceiling = hop_budget * self._max_weight
+        accepted: list[tuple[list[int], list[int], float]] = []
+        results: list[PathwayPath] = []
+        candidates: list[tuple[float, int, tuple[str, ...], tuple[int, ...], list[int]]] = []
+        seen_paths: set[tuple[int, ...]] = {tuple(first[1])}
+        current: tuple[list[int], list[int], float] | None = first
+
+        while current is not None:
+            nodes, edges, cost = current
+            if cost > cost_ceiling:
+                break
+            accepted.append(current)
+            # The first edge is the virtual super-source hop.
+            if len(edges) - 1 <= hop_budget:
+                results.append(
+                    PathwayPath(
+                        nodes=tuple(self._labels[node] for node in nodes[1:]),
+                        edges=tuple(edges[1:]),
+                        cost=cost,
+                    )
+                )
+                if len(results) >= k:
+                    break
+
+            root_cost = 0.0
+            for spur_position in range(len(nodes) - 1):
+                spur = nodes[spur_position]
+                root_edges = edges[:spur_position]
+                removed_edges = {
+                    path_edges[spur_position]
+                    for _, path_edges, _ in accepted
+                    if len(path_edges) > spur_position and path_edges[:spur_position] == root_edges
+                }
+                removed_nodes = set(nodes[:spur_position])
+                spur_result = spur_search(spur, removed_nodes, removed_edges)
+                if spur_result is not None:
+                    spur_nodes, spur_edges, spur_cost = spur_result
+                    total_edges = [*root_edges, *spur_edges]
+                    key = tuple(total_edges)
+                    if key not in seen_paths:
+                        seen_paths.add(key)
+                        total_nodes = [*nodes[:spur_position], *spur_nodes]
+                        heapq.heappush(
+                            candidates,
+                            (
+                                root_cost + spur_cost,
+                                len(total_edges),
+                                tuple(self._labels[node] for node in total_nodes[1:]),
+                                key,
+                                total_nodes,
+                            ),
+                        )
+                root_cost += edge_weight(edges[spur_position])
+
+            if not candidates:
+                break
+            next_cost, _, _, next_edges, next_nodes = heapq.heappop(candidates)
+            current = (next_nodes, list(next_edges), next_cost)
+
+        results.sort(key=lambda path: (path.cost, path.hop_count, path.nodes, path.edges))
+        return results
+
+
+__all__ = ["PathwayGraph", "PathwayPath"]
@@ -2,33 +2,64 @@
 
 from __future__ import annotations
 
+import hashlib
 import hmac
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from src.instrumentation.audit import tool_call_audit_log
-from src.server.config.settings import get_settings
+from src.instrumentation.metrics import PROMETHEUS_CONTENT_TYPE, metrics_recorder
+from src.server.config.settings import Settings, get_settings
 from src.server.mcp.router import router as mcp_router
+from src.server.runtime import configure_runtime, start_runtime, stop_runtime
 from src.server.version import get_app_version
 
 
+# Paths behind the origin and bearer-token checks.
+_PROTECTED_PATHS = frozenset({"/mcp", "/metrics"})
+
+
 def _is_allowed_local_origin(origin: str) -> bool:
     return origin.startswith(("http://127.0.0.1", "http://localhost", "http://[::1]"))
 
 
+def _bearer_clients(settings: Settings) -> list[tuple[str, str]]:
+    """Pair each accepted Authorization header with the client id it authenticates."""
+
+    clients = [
+        (f"Bearer {token}", client_id) for client_id, token in settings.auth_bearer_tokens.items()
+    ]
+    if settings.auth_bearer_token:
+        # A stable, non-reversible identity for per-client scheduling and rate budgets.
+        client_id = "token:" + hashlib.sha256(settings.auth_bearer_token.encode("utf-8")).hexdigest()[:12]
+        clients.append((f"Bearer {settings.auth_bearer_token}", client_id))
+    return clients
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    start_runtime(loop_lag_monitor=app.state.loop_lag_monitor_enabled)
+    yield
+    await stop_runtime()
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
-    tool_call_audit_log.configure_jsonl_sink(settings.audit_log_path)
+    configure_runtime(settings)
     app = FastAPI(
         title="AOP MCP Server",
         description="Model Context Protocol server for Adverse Outcome Pathway tooling",
         version=get_app_version(),
+        lifespan=_lifespan,
     )
+    app.state.loop_lag_monitor_enabled = settings.loop_lag_monitor_enabled
+    bearer_clients = _bearer_clients(settings)
 
     @app.middleware("http")
     async def mcp_security_boundary(request: Request, call_next):
-        if request.url.path != "/mcp":
+        if request.url.path not in _PROTECTED_PATHS:
             return await call_next(request)
 
         content_length = request.headers.get("content-length")
@@ -49,8 +80,12 @@ def create_app() -> FastAPI:
 
         if settings.auth_mode == "bearer":
             header = request.headers.get("authorization", "")
-            expected = f"Bearer {settings.auth_bearer_token}"
-            if not hmac.compare_digest(header, expected):
+            client_id = None
+            # Compare against every token so the timing does not reveal which one matched.
+            for expected, candidate in bearer_clients:
+                if hmac.compare_digest(header, expected):
+                    client_id = candidate
+            if client_id is None:
                 scopes = " ".join(settings.auth_bearer_scopes)
                 return JSONResponse(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,6 +93,7 @@ def create_app() -> FastAPI:
                     content={"jsonrpc": "2.0", "error": {"code": -32001, "message": "Unauthorized"}},
                 )
             request.state.toxmcp_scopes = list(settings.auth_bearer_scopes)
+            request.state.toxmcp_client_id = client_id
             request.state.toxmcp_enforce_confirmations = True
 
         return await call_next(request)
@@ -66,6 +102,18 @@ def create_app() -> FastAPI:
     async def health() -> dict[str, str]:
         return {"status": "ok", "environment": settings.environment}
 
+    if settings.metrics_enabled:
+        metrics_recorder.register_gauge(
+            "audit.writer_queue_depth", lambda: tool_call_audit_log.pending_writes
+        )
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics() -> Response:
+            return Response(
+                content=metrics_recorder.render_prometheus(),
+                media_type=PROMETHEUS_CONTENT_TYPE,
+            )
+
     app.include_router(mcp_router)
     return app
 
@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     enable_fixture_fallback: bool = False
     auth_mode: str = "disabled"
     auth_bearer_token: str | None = None
+    # Per-client bearer tokens ("client_id=token,..."); each client is scheduled and
+    # rate-limited under its own client_id
+    auth_bearer_tokens: Annotated[dict[str, str], NoDecode] = {}
     auth_bearer_scopes: Annotated[list[str], NoDecode] = [
         "toxmcp:read",
         "toxmcp:live",
@@ -47,6 +50,10 @@ class Settings(BaseSettings):
     comptox_base_url: str = "https://comptox.epa.gov/dashboard/api/"
     comptox_bioactivity_url: str = "https://comptox.epa.gov/ctx-api/"
     comptox_api_key: str | None = None
+    # Rate budget for CompTox requests (0 = unlimited); while other clients are also
+    # calling CompTox, each client may use at most comptox_client_share of it
+    comptox_requests_per_second: float = 0.0
+    comptox_client_share: float = 0.5
 
     # HGNC
     hgnc_base_url: str = "https://rest.genenames.org/"
@@ -55,6 +62,73 @@ class Settings(BaseSettings):
     # Local artifact export
     artifact_output_dir: str = "output"
     audit_log_path: str | None = None
+    # Seal the durable audit log into a new segment every N records, so tail
+    # exports read only the newest segments (0: keep one file)
+    audit_log_segment_records: int | None = 10_000
+    # "sync" writes each record in the request; "background" group-commits them
+    audit_log_writer: str = "sync"
+    audit_log_queue_size: int = 10_000
+    audit_log_batch_size: int = 256
+    # "none", "record", "batch", or "interval" (every audit_log_fsync_interval_seconds)
+    audit_log_fsync: str = "none"
+    audit_log_fsync_interval_seconds: float = 1.0
+    # Maintain a <log>.index.sqlite3 sidecar for filtered audit exports
+    audit_log_index: bool = False
+
+    # Precomputed related-AOP overlap index (see scripts/build_related_aops_index.py)
+    related_aops_index_path: str | None = None
+    # Precomputed confidence results table (see scripts/precompute_aop_confidence.py)
+    confidence_results_path: str | None = None
+
+    # Validate 1 in N read/live tool results against their output schema;
+    # write, export, and admin tools are always validated.
+    output_validation_sample_rate: int = 1
+
+    # Tracing: append sampled tool-call traces to this file as OTLP/JSON lines
+    trace_export_path: str | None = None
+    # Fraction of tool calls traced (head sampling at the root span)
+    trace_sample_rate: float = 1.0
+
+    # Serve Prometheus metrics at /metrics (behind the same bearer token as /mcp)
+    metrics_enabled: bool = True
+    # Measure event-loop lag and log the stack of code blocking the loop longer than the threshold
+    loop_lag_monitor_enabled: bool = True
+    loop_lag_threshold_ms: float = 100.0
+
+    # Worker pools for rendering, hashing, and validating payloads whose JSON is at
+    # least offload_min_bytes; process workers are opt-in, and with 0 the
+    # process-bound work runs on threads
+    offload_thread_workers: int = 4
+    offload_process_workers: int = 0
+    offload_min_bytes: int = 65536
+
+    # Background jobs (submit_job): concurrent jobs, default per-job timeout, and
+    # how long finished jobs and their results are kept for get_job
+    job_workers: int = 4
+    job_timeout_seconds: float = 600.0
+    job_result_ttl_seconds: float = 3600.0
+    # SQLite job store shared across restarts and worker processes (in-memory when unset),
+    # and how long a worker's claim on a running job lasts without renewal
+    job_store_path: str | None = None
+    job_lease_seconds: float = 60.0
+    # Job scheduling: workers kept free of batch jobs for interactive ones, per-client
+    # caps on running jobs (0 = no cap), and fair-share weights ("client_id=weight,...")
+    job_interactive_reserved_workers: int = 1
+    job_max_running_per_client: int = 0
+    job_comptox_max_running_per_client: int = 2
+    job_client_weights: Annotated[dict[str, float], NoDecode] = {}
+
+    # MCP response encoding
+    compact_json_text: bool = False
+    response_gzip: bool = True
+    response_gzip_min_bytes: int = 1024
+    # Answer tools/call with an SSE stream (progress notifications, then the result)
+    # when the client accepts text/event-stream and asks for progress or partial results
+    response_event_stream: bool = True
+    # Requests of one JSON-RPC batch dispatched at a time (the batch's size is
+    # bounded by max_request_bytes); also the AOPs, and the KE/KER lookups, one
+    # assess_aop_confidences call runs at a time
+    batch_concurrency: int = 8
 
     @property
     def is_production(self) -> bool:
@@ -74,6 +148,69 @@ class Settings(BaseSettings):
             return [part.strip() for part in value.split(",") if part.strip()]
         return value
 
+    @field_validator("job_client_weights", mode="before")
+    @classmethod
+    def _parse_client_weights(cls, value: object) -> object:
+        if not isinstance(value, str):
+            return value
+        weights: dict[str, str] = {}
+        for part in value.split(","):
+            if not part.strip():
+                continue
+            client, separator, weight = part.rpartition("=")
+            if not separator or not client.strip():
+                raise ValueError("job_client_weights entries must look like client_id=weight")
+            weights[client.strip()] = weight.strip()
+        return weights
+
+    @field_validator("auth_bearer_tokens", mode="before")
+    @classmethod
+    def _parse_bearer_tokens(cls, value: object) -> object:
+        if not isinstance(value, str):
+            return value
+        tokens: dict[str, str] = {}
+        for part in value.split(","):
+            if not part.strip():
+                continue
+            client, separator, token = part.partition("=")
+            if not separator or not client.strip() or not token.strip():
+                raise ValueError("auth_bearer_tokens entries must look like client_id=token")
+            tokens[client.strip()] = token.strip()
+        return tokens
+
+    @field_validator("auth_bearer_tokens")
+    @classmethod
+    def _ensure_distinct_bearer_tokens(cls, value: dict[str, str]) -> dict[str, str]:
+        if len(set(value.values())) != len(value):
+            raise ValueError("auth_bearer_tokens must give each client a different token")
+        return value
+
+    @field_validator("job_client_weights")
+    @classmethod
+    def _ensure_positive_client_weights(cls, value: dict[str, float]) -> dict[str, float]:
+        if any(weight <= 0 for weight in value.values()):
+            raise ValueError("job_client_weights must be positive")
+        return value
+
+    @field_validator(
+        "job_interactive_reserved_workers",
+        "job_max_running_per_client",
+        "job_comptox_max_running_per_client",
+        "comptox_requests_per_second",
+    )
+    @classmethod
+    def _ensure_non_negative_scheduling_limit(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("job scheduling limits and comptox_requests_per_second must not be negative")
+        return value
+
+    @field_validator("comptox_client_share")
+    @classmethod
+    def _ensure_client_share_fraction(cls, value: float) -> float:
+        if not 0 < value <= 1:
+            raise ValueError("comptox_client_share must be greater than 0 and at most 1")
+        return value
+
     @field_validator("auth_bearer_scopes", mode="before")
     @classmethod
     def _split_csv_scopes(cls, value: object) -> object:
@@ -81,9 +218,118 @@ class Settings(BaseSettings):
             return [part.strip() for part in value.split(",") if part.strip()]
         return value
 
-    @field_validator("audit_log_path", mode="before")
+    @field_validator("output_validation_sample_rate")
+    @classmethod
+    def _ensure_positive_sample_rate(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("output_validation_sample_rate must be at least 1")
+        return value
+
+    @field_validator("audit_log_segment_records")
+    @classmethod
+    def _ensure_positive_segment_records(cls, value: int | None) -> int | None:
+        if value is not None and value < 0:
+            raise ValueError("audit_log_segment_records must not be negative")
+        return value or None
+
+    @field_validator("audit_log_queue_size", "audit_log_batch_size")
+    @classmethod
+    def _ensure_positive_audit_writer_size(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("audit log queue and batch sizes must be at least 1")
+        return value
+
+    @field_validator("audit_log_fsync_interval_seconds")
+    @classmethod
+    def _ensure_positive_fsync_interval(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("audit_log_fsync_interval_seconds must be positive")
+        return value
+
+    @field_validator("audit_log_writer")
+    @classmethod
+    def _normalise_audit_log_writer(cls, value: str) -> str:
+        mode = value.strip().lower()
+        if mode not in {"sync", "background"}:
+            raise ValueError("AOP_MCP_AUDIT_LOG_WRITER must be 'sync' or 'background'")
+        return mode
+
+    @field_validator("audit_log_fsync")
+    @classmethod
+    def _normalise_audit_log_fsync(cls, value: str) -> str:
+        mode = value.strip().lower()
+        if mode not in {"none", "record", "batch", "interval"}:
+            raise ValueError(
+                "AOP_MCP_AUDIT_LOG_FSYNC must be 'none', 'record', 'batch', or 'interval'"
+            )
+        return mode
+
+    @field_validator("trace_sample_rate")
+    @classmethod
+    def _ensure_fractional_trace_sample_rate(cls, value: float) -> float:
+        if not 0.0 <= value <= 1.0:
+            raise ValueError("trace_sample_rate must be between 0 and 1")
+        return value
+
+    @field_validator("loop_lag_threshold_ms")
+    @classmethod
+    def _ensure_positive_loop_lag_threshold(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("loop_lag_threshold_ms must be positive")
+        return value
+
+    @field_validator("offload_thread_workers")
+    @classmethod
+    def _ensure_positive_offload_threads(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("offload_thread_workers must be at least 1")
+        return value
+
+    @field_validator("offload_process_workers", "offload_min_bytes")
+    @classmethod
+    def _ensure_non_negative_offload_setting(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("offload_process_workers and offload_min_bytes must not be negative")
+        return value
+
+    @field_validator("job_workers")
+    @classmethod
+    def _ensure_positive_job_workers(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("job_workers must be at least 1")
+        return value
+
+    @field_validator("job_timeout_seconds", "job_result_ttl_seconds", "job_lease_seconds")
+    @classmethod
+    def _ensure_positive_job_durations(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("job_timeout_seconds, job_result_ttl_seconds and job_lease_seconds must be positive")
+        return value
+
+    @field_validator("response_gzip_min_bytes")
+    @classmethod
+    def _ensure_non_negative_gzip_threshold(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("response_gzip_min_bytes must not be negative")
+        return value
+
+    @field_validator("batch_concurrency")
+    @classmethod
+    def _ensure_positive_batch_concurrency(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("batch_concurrency must be at least 1")
+        return value
+
+    @field_validator(
+        "audit_log_path",
+        "related_aops_index_path",
+        "confidence_results_path",
+        "trace_export_path",
+        "job_store_path",
+        mode="before",
+    )
     @classmethod
-    def _empty_audit_log_path_to_none(cls, value: object) -> object:
+    def _empty_path_to_none(cls, value: object) -> object:
         if isinstance(value, str) and not value.strip():
             return None
         return value
@@ -106,8 +352,10 @@ class Settings(BaseSettings):
             raise ValueError("AOP_MCP_HOST must not be 0.0.0.0/:: in production")
         if self.auth_mode == "disabled" and not self.allow_unauthenticated_production:
             raise ValueError("AOP_MCP_AUTH_MODE=bearer is required in production")
-        if self.auth_mode == "bearer" and not self.auth_bearer_token:
-            raise ValueError("AOP_MCP_AUTH_BEARER_TOKEN is required when bearer auth is enabled")
+        if self.auth_mode == "bearer" and not (self.auth_bearer_token or self.auth_bearer_tokens):
+            raise ValueError(
+                "AOP_MCP_AUTH_BEARER_TOKEN or AOP_MCP_AUTH_BEARER_TOKENS is required when bearer auth is enabled"
+            )
         if not self.allowed_origins:
             raise ValueError("AOP_MCP_ALLOWED_ORIGINS must be set in production")
         return self
@@ -11,40 +11,43 @@ from src.adapters import (
     SparqlClient,
     SparqlEndpoint,
 )
-from src.adapters.comp_tox import CompToxClient
+from src.adapters.comp_tox import COMPTOX_SERVICE, CompToxClient
 from src.instrumentation.cache import InMemoryCache
-from src.instrumentation.metrics import MetricsRecorder
+from src.instrumentation.metrics import MetricsRecorder, metrics_recorder
 from src.tools.semantic import SemanticToolConfig, SemanticTools
 from src.services.draft_store import DraftStoreService, InMemoryDraftRepository
-from src.services.jobs import JobService
+from src.services.jobs import JobRunner, JobService, SchedulingPolicy, SqliteJobBackend
+from src.services.confidence_corpus import ConfidenceResultsStore
+from src.services.related_aops import RelatedAopsIndexStore
 from src.tools.write import WriteTools
 from src.server.config.settings import get_settings
 
 
 @lru_cache
 def get_metrics() -> MetricsRecorder:
-    return MetricsRecorder()
+    return metrics_recorder
 
 
-def _build_sparql_client(endpoints: list[str]) -> SparqlClient:
+def _build_sparql_client(endpoints: list[str], service_name: str) -> SparqlClient:
     return SparqlClient(
         [SparqlEndpoint(url=e) for e in endpoints],
         cache=InMemoryCache(),
         metrics=get_metrics(),
+        service_name=service_name,
     )
 
 
 @lru_cache
 def get_aop_wiki_adapter() -> AOPWikiAdapter:
     settings = get_settings()
-    client = _build_sparql_client(settings.aop_wiki_sparql_endpoints)
+    client = _build_sparql_client(settings.aop_wiki_sparql_endpoints, "aop_wiki_sparql")
     return AOPWikiAdapter(client=client, enable_fixture_fallback=settings.enable_fixture_fallback)
 
 
 @lru_cache
 def get_aop_db_adapter() -> AOPDBAdapter:
     settings = get_settings()
-    client = _build_sparql_client(settings.aop_db_sparql_endpoints)
+    client = _build_sparql_client(settings.aop_db_sparql_endpoints, "aop_db_sparql")
     comptox = get_comptox_client()
     hgnc = get_hgnc_client()
     return AOPDBAdapter(
@@ -107,4 +110,50 @@ def get_write_tools() -> WriteTools:
 
 @lru_cache
 def get_job_service() -> JobService:
-    return JobService()
+    store_path = get_settings().job_store_path
+    return JobService(SqliteJobBackend(store_path) if store_path else None)
+
+
+@lru_cache
+def get_job_runner() -> JobRunner:
+    # Imported here: the dispatcher imports the tool modules that use this factory.
+    from src.server.mcp.dispatch import (
+        TOOL_CALL_JOB_CACHE_KEY_FIELDS,
+        TOOL_CALL_JOB_TYPE,
+        run_tool_call_job,
+    )
+
+    settings = get_settings()
+    runner = JobRunner(
+        get_job_service(),
+        max_workers=settings.job_workers,
+        default_timeout_seconds=settings.job_timeout_seconds,
+        result_ttl_seconds=settings.job_result_ttl_seconds,
+        lease_seconds=settings.job_lease_seconds,
+        scheduling=SchedulingPolicy(
+            client_weights=settings.job_client_weights,
+            max_running_per_client=settings.job_max_running_per_client or None,
+            batch_max_running=max(1, settings.job_workers - settings.job_interactive_reserved_workers),
+            upstream_max_running_per_client=(
+                {COMPTOX_SERVICE: settings.job_comptox_max_running_per_client}
+                if settings.job_comptox_max_running_per_client
+                else {}
+            ),
+        ),
+    )
+    runner.register(
+        TOOL_CALL_JOB_TYPE,
+        run_tool_call_job,
+        cache_key_fields=TOOL_CALL_JOB_CACHE_KEY_FIELDS,
+    )
+    return runner
+
+
+@lru_cache
+def get_related_aops_index_store() -> RelatedAopsIndexStore:
+    return RelatedAopsIndexStore(get_settings().related_aops_index_path)
+
+
+@lru_cache
+def get_confidence_results_store() -> ConfidenceResultsStore:
+    return ConfidenceResultsStore(get_settings().confidence_results_path)
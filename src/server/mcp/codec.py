@@ -0,0 +1,183 @@
+"""JSON encoding for MCP requests and responses."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass, field
+from hashlib import sha256
+from typing import Any
+
+try:  # pragma: no cover - exercised only when the optional extra is installed
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+JSON_BACKEND = "orjson" if HAS_ORJSON else "json"
+
+_STRUCTURED_CONTENT_KEY = b'"structuredContent":'
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    """Parse a JSON document."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any, *, pretty: bool = False) -> bytes:
+    """Encode ``value`` as UTF-8 JSON, preserving key order.
+
+    ``pretty`` indents by two spaces, matching ``json.dumps(value, indent=2)``
+    apart from non-ASCII characters, which are emitted as UTF-8.
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(value, option=option, default=repr)
+        except TypeError:
+            # Integers beyond 64 bits and similar edge cases.
+            pass
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False, default=repr).encode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=repr).encode("utf-8")
+
+
+def canonical_dumps(value: Any) -> bytes:
+    """Encode ``value`` in the canonical form hashed by ``hash_json``.
+
+    Keys are sorted, separators are compact, and output is ASCII-only. This
+    stays on the stdlib encoder regardless of backend so audit hashes do not
+    depend on which JSON library is installed.
+    """
+
+    return json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=True,
+        default=repr,
+    ).encode("ascii")
+
+
+@dataclass
+class EncodedPayload:
+    """A tool result together with its canonical encoding."""
+
+    value: Any
+    canonical: bytes
+    _sha256: str | None = field(default=None, init=False, repr=False)
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 of the canonical bytes; equal to ``hash_json(value)``."""
+
+        if self._sha256 is None:
+            self._sha256 = sha256(self.canonical).hexdigest()
+        return self._sha256
+
+    def text(self, *, compact: bool = False) -> str:
+        if compact:
+            return self.canonical.decode("ascii")
+        return dumps(self.value, pretty=True).decode("utf-8")
+
+
+def encode_payload(value: Any) -> EncodedPayload:
+    return EncodedPayload(value=value, canonical=canonical_dumps(value))
+
+
+class ToolCallResult(dict):
+    """``tools/call`` result that carries its pre-encoded structured content.
+
+    It behaves as the plain result dict for in-process callers;
+    ``render_jsonrpc`` splices ``encoded_structured_content`` into the HTTP
+    body instead of encoding the result a second time.
+    """
+
+    encoded_structured_content: bytes | None = None
+
+
+def render_jsonrpc(
+    *,
+    result: Any = None,
+    error: dict[str, Any] | None = None,
+    request_id: Any | None = None,
+) -> bytes:
+    """Encode a JSON-RPC response envelope."""
+
+    parts = [b'{"jsonrpc":"2.0"']
+    if result is not None:
+        parts.append(b',"result":')
+        parts.append(_render_result(result))
+    if error is not None:
+        parts.append(b',"error":')
+        parts.append(dumps(error))
+    if request_id is not None:
+        parts.append(b',"id":')
+        parts.append(dumps(request_id))
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def _render_result(result: Any) -> bytes:
+    encoded = getattr(result, "encoded_structured_content", None)
+    if encoded is None or "structuredContent" not in result:
+        return dumps(result)
+    head = dumps({key: value for key, value in result.items() if key != "structuredContent"})
+    separator = b"," if len(head) > 2 else b""
+    return b"".join((head[:-1], separator, _STRUCTURED_CONTENT_KEY, encoded, b"}"))
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return whether an ``Accept-Encoding`` header allows gzip."""
+
+    if not accept_encoding:
+        return False
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, raw = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def maybe_gzip(
+    body: bytes,
+    accept_encoding: str | None,
+    *,
+    min_bytes: int,
+    compresslevel: int = 5,
+) -> tuple[bytes, dict[str, str]]:
+    """Gzip ``body`` when the client accepts it and it is at least ``min_bytes``."""
+
+    if len(body) < min_bytes or not accepts_gzip(accept_encoding):
+        return body, {"Vary": "Accept-Encoding"}
+    return (
+        gzip.compress(body, compresslevel=compresslevel, mtime=0),
+        {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+    )
+
+
+__all__ = [
+    "EncodedPayload",
+    "HAS_ORJSON",
+    "JSON_BACKEND",
+    "ToolCallResult",
+    "accepts_gzip",
+    "canonical_dumps",
+    "dumps",
+    "encode_payload",
+    "loads",
+    "maybe_gzip",
+    "render_jsonrpc",
+]
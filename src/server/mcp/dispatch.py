@@ -0,0 +1,739 @@
+"""Transport-independent MCP JSON-RPC dispatch."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from contextlib import AbstractContextManager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from src.instrumentation.accounting import CallAccounting, call_accounting_scope
+from src.instrumentation.audit import (
+    UNREGISTERED_TOOL_STATS_KEY,
+    ToolCallAuditRecord,
+    hash_json,
+    tool_call_audit_log,
+    utc_timestamp,
+)
+from src.instrumentation.metrics import metrics_recorder
+from src.instrumentation.profiling import tool_call_profiler
+from src.instrumentation.progress import progress_scope
+from src.instrumentation.throttle import client_scope
+from src.instrumentation.tracing import tracer
+from src.adapters.comp_tox import COMPTOX_SERVICE
+from src.server.mcp import codec
+from src.server.mcp.protocol import (
+    FeatureSupport,
+    InitializeParams,
+    InitializeResult,
+    JSONRPCError,
+    JSONRPCRequest,
+    ListPromptsResult,
+    ListToolsResult,
+    ServerInfo,
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    INTERNAL_ERROR,
+    METHOD_NOT_FOUND,
+    FORBIDDEN,
+)
+from src.server.config.settings import get_settings
+from src.server.tools.registry import (
+    AOP_DB_SOURCE,
+    AOP_WIKI_SOURCE,
+    CALLER_INPUT_SOURCE,
+    COMPTOX_SOURCE,
+    REGISTRY_SOURCE,
+    RegisteredTool,
+    tool_registry,
+)
+from src.server.version import get_app_version
+from src.services.jobs import JobPriority, JobRecord
+from src.tools import (
+    SchemaValidationError,
+    payload_validation_scope,
+    validate_payload_against_schema_async,
+)
+from src.tools.offload import offload
+
+log = logging.getLogger(__name__)
+
+
+SERVER_INFO = ServerInfo(name="AOP MCP Server", version=get_app_version())
+MCP_VERSION = "2025-03-26"
+SERVER_INSTRUCTIONS = (
+    "Preserve the visible Sources section from every AOP MCP tool result. "
+    "Clearly distinguish evidence returned by this MCP server from content found "
+    "through a separate web search, and never attribute web-search content to an MCP tool."
+)
+
+SERVER_CAPABILITIES: dict[str, FeatureSupport] = {
+    "tools": FeatureSupport(enabled=True),
+    "prompts": FeatureSupport(enabled=True),  # Enable prompt support
+    "resources": FeatureSupport(enabled=False),
+    # Clients that set STRUCTURED_CONTENT_META_KEY in tools/call ``_meta`` get a
+    # short text summary instead of a second JSON copy of structuredContent.
+    "structuredContentSummaries": FeatureSupport(enabled=True),
+    # Clients that set COST_META_KEY in tools/call ``_meta`` get the call's
+    # upstream accounting (also stored on its audit record) back in ``_meta``.
+    "costAccounting": FeatureSupport(enabled=True),
+    # Clients that set PARTIAL_RESULTS_META_KEY in tools/call ``_meta`` (over
+    # stdio, or accepting text/event-stream over HTTP) get
+    # PARTIAL_RESULT_NOTIFICATION messages as long tools finish each input.
+    "partialResults": FeatureSupport(enabled=True),
+}
+STRUCTURED_CONTENT_META_KEY = "toxmcp/structuredContent"
+COST_META_KEY = "toxmcp/cost"
+PARTIAL_RESULTS_META_KEY = "toxmcp/partialResults"
+PROGRESS_NOTIFICATION = "notifications/progress"
+PARTIAL_RESULT_NOTIFICATION = "notifications/toxmcp/partialResult"
+_SUMMARY_MAX_ENTRIES = 8
+_SUMMARY_MAX_VALUE_CHARS = 80
+
+ALL_TOOL_SCOPES = frozenset(
+    {
+        "toxmcp:read",
+        "toxmcp:live",
+        "toxmcp:execute",
+        "toxmcp:export",
+        "toxmcp:admin",
+    }
+)
+
+
+metrics_recorder.describe("mcp.tool_calls", "MCP tool calls by tool and status.")
+metrics_recorder.describe("mcp.tool_call_seconds", "MCP tool-call latency by tool.")
+metrics_recorder.describe("mcp.tool_calls_in_flight", "MCP tool calls currently executing.")
+metrics_recorder.describe("mcp.batches", "JSON-RPC batch requests received.")
+metrics_recorder.describe("mcp.batch_requests", "Requests received inside JSON-RPC batches.")
+metrics_recorder.describe(
+    "mcp.stream_notifications", "Progress and partial-result notifications sent, by method."
+)
+
+# Only read-style tools are eligible for sampled output validation.
+SAMPLED_VALIDATION_RISK_CLASSES = frozenset({"read", "live"})
+_output_validation_counter = itertools.count()
+
+
+@dataclass(frozen=True)
+class ToolExecutionContext:
+    scopes: frozenset[str] = ALL_TOOL_SCOPES
+    enforce_confirmations: bool = False
+    # Authenticated caller identity for job ownership, fair-sharing, and
+    # upstream rate budgets; never taken from anything the client sends.
+    client_id: str | None = None
+
+
+TOOL_CALL_JOB_TYPE = "tool_call"
+# Payload fields that determine a tool-call job's result.
+TOOL_CALL_JOB_CACHE_KEY_FIELDS = ("tool_name", "arguments")
+_CACHEABLE_JOB_SOURCE_NAMES = frozenset(
+    source["name"]
+    for source in (
+        AOP_WIKI_SOURCE,
+        AOP_DB_SOURCE,
+        COMPTOX_SOURCE,
+        REGISTRY_SOURCE,
+        CALLER_INPUT_SOURCE,
+    )
+)
+
+# Authority of the tool call whose handler is running, for tools that queue
+# further tool calls (``submit_job``).
+_current_call_origin: ContextVar[tuple[ToolExecutionContext, bool] | None] = ContextVar(
+    "mcp_tool_call_origin", default=None
+)
+
+
+def jsonrpc_error_payload(exc: JSONRPCError) -> dict[str, Any]:
+    error_payload = {"code": exc.code, "message": exc.message}
+    if exc.data is not None:
+        error_payload["data"] = exc.data
+    return error_payload
+
+
+def progress_token(params: dict[str, Any]) -> str | int | None:
+    meta = params.get("_meta")
+    token = meta.get("progressToken") if isinstance(meta, dict) else None
+    if isinstance(token, bool) or not isinstance(token, (str, int)):
+        return None
+    return token
+
+
+def wants_notifications(params: dict[str, Any]) -> bool:
+    """Whether a tools/call asked for progress or partial-result notifications."""
+
+    return progress_token(params) is not None or _meta_flag(params, PARTIAL_RESULTS_META_KEY)
+
+
+def notification_scope(
+    params: dict[str, Any],
+    send: Callable[[bytes], None],
+) -> AbstractContextManager[None]:
+    """Pass progress and partial results reported in this context to ``send`` as notifications.
+
+    ``send`` receives encoded JSON-RPC notifications. It may be called from
+    worker threads, so transports hand the bytes back to their loop.
+    """
+
+    token = progress_token(params)
+
+    def notify(method: str, notification_params: dict[str, Any]) -> None:
+        metrics_recorder.increment("mcp.stream_notifications", method=method)
+        send(codec.dumps({"jsonrpc": "2.0", "method": method, "params": notification_params}))
+
+    def on_progress(progress: float, total: float | None, message: str | None) -> None:
+        if token is None:
+            return
+        notification_params: dict[str, Any] = {"progressToken": token, "progress": progress}
+        if total is not None:
+            notification_params["total"] = total
+        if message is not None:
+            notification_params["message"] = message
+        notify(PROGRESS_NOTIFICATION, notification_params)
+
+    def on_partial_result(partial: dict[str, Any]) -> None:
+        notification_params: dict[str, Any] = {"result": partial}
+        if token is not None:
+            notification_params["progressToken"] = token
+        notify(PARTIAL_RESULT_NOTIFICATION, notification_params)
+
+    return progress_scope(
+        on_progress,
+        partial_results=on_partial_result if _meta_flag(params, PARTIAL_RESULTS_META_KEY) else None,
+    )
+
+
+async def dispatch_message(
+    message: Any,
+    *,
+    execution_context: ToolExecutionContext | None = None,
+    in_batch: bool = False,
+) -> bytes | None:
+    """Validate and dispatch one decoded JSON-RPC message and encode its response.
+
+    Errors are encoded as JSON-RPC error responses. Notifications (no ``id``)
+    are dispatched but return ``None``.
+    """
+
+    if not isinstance(message, dict):
+        return codec.render_jsonrpc(
+            error={"code": INVALID_REQUEST, "message": "Request must be a JSON object"}
+        )
+    try:
+        rpc_request = JSONRPCRequest.model_validate(message)
+    except ValidationError as exc:
+        log.error("Invalid JSON-RPC request: %s", exc)
+        return codec.render_jsonrpc(
+            error={"code": INVALID_REQUEST, "message": str(exc)},
+            request_id=message.get("id"),
+        )
+    if in_batch and rpc_request.method == "initialize":
+        # MCP requires initialize to be sent on its own.
+        return codec.render_jsonrpc(
+            error={"code": INVALID_REQUEST, "message": "initialize must not be part of a batch"},
+            request_id=rpc_request.id,
+        )
+    return await dispatch_and_render(rpc_request, execution_context=execution_context)
+
+
+async def dispatch_and_render(
+    rpc_request: JSONRPCRequest,
+    *,
+    execution_context: ToolExecutionContext | None = None,
+) -> bytes | None:
+    """Dispatch a validated request and encode its result or error (``None`` for notifications)."""
+
+    try:
+        result = await dispatch_request(rpc_request, execution_context=execution_context)
+    except JSONRPCError as exc:
+        log.error("MCP JSON-RPC error: code=%s, message=%s, data=%s", exc.code, exc.message, exc.data)
+        error = jsonrpc_error_payload(exc)
+    except Exception:  # pragma: no cover - safeguard
+        log.exception("Unhandled MCP error during dispatch")
+        error = {"code": INTERNAL_ERROR, "message": "Internal server error"}
+    else:
+        if rpc_request.id is None:
+            return None
+        return codec.render_jsonrpc(result=result, request_id=rpc_request.id)
+    if rpc_request.id is None:
+        return None
+    return codec.render_jsonrpc(error=error, request_id=rpc_request.id)
+
+
+async def dispatch_batch(
+    batch: list[Any],
+    *,
+    execution_context: ToolExecutionContext | None = None,
+    concurrency: int,
+) -> list[bytes]:
+    """Dispatch a JSON-RPC batch, ``concurrency`` elements at a time.
+
+    Each element is validated, dispatched, audited, and policy-checked on its
+    own, exactly as if it had been sent alone. The encoded responses keep
+    request order, and notifications get no entry.
+    """
+
+    metrics_recorder.increment("mcp.batches")
+    metrics_recorder.increment("mcp.batch_requests", len(batch))
+    responses: list[bytes | None] = [None] * len(batch)
+    # Workers share one iterator, so at most ``concurrency`` elements are in
+    # flight and no task exists for an element before a worker takes it.
+    pending = iter(enumerate(batch))
+
+    async def work() -> None:
+        for index, element in pending:
+            responses[index] = await dispatch_message(
+                element, execution_context=execution_context, in_batch=True
+            )
+
+    await asyncio.gather(*(work() for _ in range(min(concurrency, len(batch)))))
+    return [response for response in responses if response is not None]
+
+
+async def dispatch_request(
+    request: JSONRPCRequest,
+    *,
+    execution_context: ToolExecutionContext | None = None,
+) -> Any:
+    context = execution_context or ToolExecutionContext()
+    log.debug("Dispatching MCP method: %s", request.method)
+    if request.method == "initialize":
+        InitializeParams.model_validate(request.params or {})
+        return InitializeResult(
+            protocolVersion=MCP_VERSION,
+            serverInfo=SERVER_INFO,
+            capabilities=SERVER_CAPABILITIES,
+            instructions=SERVER_INSTRUCTIONS,
+        ).model_dump(by_alias=True)
+
+    if request.method in {"initialized", "notifications/initialized"}:
+        # Return empty object for initialized notification
+        return {}
+    
+    if request.method in {"shutdown", "exit", "notifications/shutdown"}:
+        return {}
+
+    if request.method in {"tools/list", "mcp/tool/list"}:
+        tools = tool_registry.list_tools()
+        return ListToolsResult(tools=tools).model_dump(by_alias=True, exclude_none=True)
+
+    if request.method in {"prompts/list", "mcp/prompt/list"}:
+        # Return an empty list of prompts for now to satisfy the client
+        return ListPromptsResult(prompts=[]).model_dump(by_alias=True, exclude_none=True)
+
+    if request.method in {"tools/call", "mcp/tool/call"}:
+        if not isinstance(request.params, dict):
+            raise JSONRPCError(INVALID_PARAMS, "Params must be an object")
+        name = request.params.get("name")
+        arguments = request.params.get("arguments") or {}
+        argument_keys = sorted(arguments) if isinstance(arguments, dict) else []
+        log.debug("Calling tool: name=%s, argument_keys=%s", name, argument_keys)
+        if not isinstance(name, str):
+            raise JSONRPCError(INVALID_PARAMS, "Missing tool name")
+        if not isinstance(arguments, dict):
+            raise JSONRPCError(INVALID_PARAMS, "Tool arguments must be an object")
+        return await _dispatch_tool_call(
+            name,
+            arguments,
+            execution_context=context,
+            confirmed=_tool_call_confirmed(request.params),
+            summarize_text=_client_reads_structured_content(request.params),
+            include_cost=_meta_flag(request.params, COST_META_KEY),
+        )
+
+    log.error("Method not found: %s", request.method)
+    raise JSONRPCError(METHOD_NOT_FOUND, f"Method not found: {request.method}")
+
+
+def _client_reads_structured_content(params: dict[str, Any]) -> bool:
+    return _meta_flag(params, STRUCTURED_CONTENT_META_KEY)
+
+
+def _meta_flag(params: dict[str, Any], key: str) -> bool:
+    meta = params.get("_meta")
+    return isinstance(meta, dict) and meta.get(key) is True
+
+
+def _tool_call_confirmed(params: dict[str, Any]) -> bool:
+    if params.get("confirmed") is True or params.get("confirm") is True:
+        return True
+    confirmation = params.get("confirmation")
+    return isinstance(confirmation, dict) and confirmation.get("confirmed") is True
+
+
+async def _dispatch_tool_call(
+    name: str,
+    arguments: dict[str, Any],
+    *,
+    execution_context: ToolExecutionContext,
+    confirmed: bool,
+    summarize_text: bool = False,
+    include_cost: bool = False,
+) -> dict[str, Any]:
+    metrics_recorder.add_gauge("mcp.tool_calls_in_flight", 1)
+    try:
+        with (
+            call_accounting_scope() as accounting,
+            tracer.trace("tools/call", **{"mcp.tool.name": name}),
+        ):
+            return await _execute_tool_call(
+                name,
+                arguments,
+                execution_context=execution_context,
+                confirmed=confirmed,
+                summarize_text=summarize_text,
+                include_cost=include_cost,
+                accounting=accounting,
+            )
+    finally:
+        metrics_recorder.add_gauge("mcp.tool_calls_in_flight", -1)
+
+
+def _enforce_tool_policy(
+    tool_def: RegisteredTool,
+    execution_context: ToolExecutionContext,
+    confirmed: bool,
+) -> None:
+    missing_scopes = sorted(set(tool_def.required_scopes) - set(execution_context.scopes))
+    if missing_scopes:
+        raise JSONRPCError(
+            FORBIDDEN,
+            "Missing required tool scope(s): " + ", ".join(missing_scopes),
+            data={
+                "requiredScopes": list(tool_def.required_scopes),
+                "grantedScopes": sorted(execution_context.scopes),
+                "missingScopes": missing_scopes,
+            },
+        )
+    if (
+        tool_def.requires_confirmation
+        and execution_context.enforce_confirmations
+        and not confirmed
+    ):
+        raise JSONRPCError(
+            FORBIDDEN,
+            "Tool requires explicit confirmation",
+            data={
+                "requiresConfirmation": True,
+                "riskClass": tool_def.risk_class,
+            },
+        )
+
+
+async def submit_tool_call_job(
+    tool_name: str,
+    arguments: dict[str, Any],
+    *,
+    timeout_seconds: float | None = None,
+    use_cache: bool = True,
+    priority: JobPriority = JobPriority.INTERACTIVE,
+) -> JobRecord:
+    """Queue ``tool_name`` as a background job on behalf of the current tool call.
+
+    The caller's scopes and confirmation are checked now and recorded on the
+    job, so the queued call runs (and is audited) with the same authority.
+    Results of read-only tools over external reference data are cached by
+    tool name and arguments; other tools always run.
+    """
+
+    execution_context, confirmed = _current_call_origin.get() or (ToolExecutionContext(), False)
+    tool_def = tool_registry.get_tool(tool_name)
+    _enforce_tool_policy(tool_def, execution_context, confirmed)
+    # Imported here: dependencies builds the runner around run_tool_call_job.
+    from src.server.dependencies import get_job_runner
+
+    return await get_job_runner().submit_async(
+        TOOL_CALL_JOB_TYPE,
+        {
+            "tool_name": tool_name,
+            "arguments": dict(arguments),
+            "scopes": sorted(execution_context.scopes),
+            "enforce_confirmations": execution_context.enforce_confirmations,
+            "confirmed": confirmed,
+            "client_id": execution_context.client_id,
+        },
+        timeout_seconds=timeout_seconds,
+        use_cache=use_cache and _job_result_cacheable(tool_def),
+        client_id=execution_context.client_id,
+        priority=priority,
+        upstreams=_rate_limited_upstreams(tool_def),
+    )
+
+
+def current_execution_context() -> ToolExecutionContext:
+    """Authority of the tool call whose handler is running (all scopes outside a call)."""
+
+    origin = _current_call_origin.get()
+    return origin[0] if origin is not None else ToolExecutionContext()
+
+
+def caller_owns_job(job: JobRecord) -> bool:
+    """Whether the current tool call comes from the client that submitted ``job``.
+
+    Jobs belong to the authenticated client recorded at submission; callers
+    without an authenticated identity only see jobs submitted without one.
+    """
+
+    return job.client_id == current_execution_context().client_id
+
+
+def caller_may_read_job_result(job: JobRecord) -> bool:
+    """Whether the current caller holds every scope the job's target tool requires."""
+
+    try:
+        tool_def = tool_registry.get_tool(job.payload.get("tool_name"))
+    except KeyError:
+        return False
+    return set(tool_def.required_scopes) <= current_execution_context().scopes
+
+
+def _rate_limited_upstreams(tool_def: RegisteredTool) -> tuple[str, ...]:
+    if any(source["name"] == COMPTOX_SOURCE["name"] for source in tool_def.sources):
+        return (COMPTOX_SERVICE,)
+    return ()
+
+
+def _job_result_cacheable(tool_def: RegisteredTool) -> bool:
+    # Local drafts, audit records, and runtime state change between calls.
+    return tool_def.risk_class in SAMPLED_VALIDATION_RISK_CLASSES and all(
+        source["name"] in _CACHEABLE_JOB_SOURCE_NAMES for source in tool_def.sources
+    )
+
+
+async def run_tool_call_job(job: JobRecord) -> dict[str, Any]:
+    """Job handler that runs a queued tool call and keeps its structured result."""
+
+    payload = job.payload
+    response = await _dispatch_tool_call(
+        payload["tool_name"],
+        dict(payload["arguments"]),
+        execution_context=ToolExecutionContext(
+            scopes=frozenset(payload["scopes"]),
+            enforce_confirmations=payload["enforce_confirmations"],
+            client_id=payload.get("client_id"),
+        ),
+        confirmed=payload["confirmed"],
+    )
+    if "structuredContent" in response:
+        return dict(response["structuredContent"])
+    return {"content": response["content"]}
+
+
+async def _execute_tool_call(
+    name: str,
+    arguments: dict[str, Any],
+    *,
+    execution_context: ToolExecutionContext,
+    confirmed: bool,
+    summarize_text: bool,
+    include_cost: bool,
+    accounting: CallAccounting,
+) -> dict[str, Any]:
+    call_id = str(uuid4())
+    started_at = utc_timestamp()
+    start = perf_counter()
+    tool_def = None
+    result: Any | None = None
+    encoded: codec.EncodedPayload | None = None
+    status_value = "error"
+    output_validation_status = "not_applicable"
+    policy_status = "not_evaluated"
+    error_type: str | None = None
+    error_message: str | None = None
+
+    try:
+        tool_def = tool_registry.get_tool(name)
+        try:
+            _enforce_tool_policy(tool_def, execution_context, confirmed)
+        except JSONRPCError:
+            policy_status = "failed"
+            raise
+        policy_status = "passed"
+        validate_output = _should_validate_output(tool_def)
+        handler_start = perf_counter()
+        origin_token = _current_call_origin.set((execution_context, confirmed))
+        try:
+            with (
+                client_scope(execution_context.client_id),
+                payload_validation_scope(enabled=validate_output) as validation_scope,
+                tool_call_profiler.profile(name, call_id),
+            ):
+                result = await tool_registry.call_tool(name, arguments)
+        finally:
+            _current_call_origin.reset(origin_token)
+        accounting.add_phase("handler", (perf_counter() - handler_start) * 1000)
+        if tool_def.output_schema:
+            if not validate_output:
+                output_validation_status = "sampled_out"
+            else:
+                # Handlers usually validate against the same schema already.
+                if not validation_scope.was_validated(result, tool_def.output_schema_hash):
+                    await validate_payload_against_schema_async(result, tool_def.output_schema)
+                output_validation_status = "passed"
+
+        render_start = perf_counter()
+        summarize = summarize_text and bool(tool_def.output_schema)
+        compact = get_settings().compact_json_text
+        if offload.should_offload(result):
+            encoded, text = await offload.run_in_thread(
+                _encode_result, result, render_text=not summarize, compact=compact
+            )
+        else:
+            encoded, text = _encode_result(result, render_text=not summarize, compact=compact)
+        if summarize:
+            text = _summarize_structured_result(name, result)
+        response = codec.ToolCallResult(
+            content=[
+                {
+                    "type": "text",
+                    "text": text + _render_sources(tool_def.sources),
+                }
+            ],
+            _meta={"sources": tool_def.sources},
+        )
+        if tool_def.output_schema:
+            response["structuredContent"] = result
+            response.encoded_structured_content = encoded.canonical
+        accounting.add_phase("render", (perf_counter() - render_start) * 1000)
+        if include_cost:
+            response["_meta"][COST_META_KEY] = accounting.to_dict()
+        status_value = "success"
+        return response
+    except KeyError as exc:
+        error_type = "KeyError"
+        if tool_def is not None:
+            # Raised inside the handler, e.g. by a dict lookup; the tool itself exists.
+            error_message = str(exc)
+            raise _tool_execution_failed(name, exc)
+        error_message = f"Tool not found: {name}"
+        log.error("%s", error_message)
+        raise JSONRPCError(METHOD_NOT_FOUND, error_message)
+    except ValidationError as exc:
+        error_type = "ValidationError"
+        error_message = str(exc)
+        log.error("Invalid params for tool %s: %s", name, exc)
+        raise JSONRPCError(INVALID_PARAMS, str(exc))
+    except SchemaValidationError as exc:
+        output_validation_status = "failed"
+        error_type = "SchemaValidationError"
+        error_message = str(exc)
+        log.error("Tool output failed schema validation for %s: %s", name, exc)
+        raise JSONRPCError(
+            INTERNAL_ERROR,
+            "Tool output failed schema validation",
+            data={"errorType": "SchemaValidationError"},
+        )
+    except JSONRPCError as exc:
+        error_type = "JSONRPCError"
+        error_message = exc.message
+        raise
+    except Exception as exc:
+        error_type = type(exc).__name__
+        error_message = str(exc)
+        raise _tool_execution_failed(name, exc)
+    finally:
+        finished_at = utc_timestamp()
+        output_schema = tool_def.output_schema if tool_def is not None else None
+        output_schema_hash = tool_def.output_schema_hash if tool_def is not None else None
+        audit_record = ToolCallAuditRecord(
+            call_id=call_id,
+            tool_name=name,
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_ms=round((perf_counter() - start) * 1000, 3),
+            status=status_value,
+            argument_keys=sorted(arguments),
+            request_hash=hash_json({"tool": name, "arguments": arguments}),
+            response_hash=_response_hash(result, encoded),
+            output_schema_title=output_schema.get("title") if output_schema else None,
+            output_schema_hash=output_schema_hash if output_schema else None,
+            output_validation_status=output_validation_status,
+            risk_class=tool_def.risk_class if tool_def is not None else None,
+            required_scopes=list(tool_def.required_scopes) if tool_def is not None else [],
+            granted_scopes=sorted(execution_context.scopes),
+            requires_confirmation=tool_def.requires_confirmation if tool_def is not None else None,
+            confirmation_provided=confirmed,
+            policy_status=policy_status,
+            error_type=error_type,
+            error_message=error_message,
+            cost=accounting.to_dict(),
+        )
+        # Unknown tool names come from clients; keep them out of metric labels.
+        metric_tool = name if tool_def is not None else UNREGISTERED_TOOL_STATS_KEY
+        metrics_recorder.increment("mcp.tool_calls", tool=metric_tool, status=status_value)
+        metrics_recorder.observe(
+            "mcp.tool_call_seconds", audit_record.duration_ms / 1000, tool=metric_tool
+        )
+        await tool_call_audit_log.append_async(audit_record)
+
+
+def _tool_execution_failed(name: str, exc: Exception) -> JSONRPCError:
+    log.exception("Tool execution failed for %s", name)
+    return JSONRPCError(
+        INTERNAL_ERROR,
+        "Tool execution failed",
+        data={"errorType": type(exc).__name__},
+    )
+
+
+def _encode_result(
+    result: Any,
+    *,
+    render_text: bool,
+    compact: bool,
+) -> tuple[codec.EncodedPayload, str]:
+    """Encode, hash, and (unless summarized) render the text block of a tool result."""
+
+    encoded = codec.encode_payload(result)
+    encoded.sha256  # computed here so large results are hashed off the event loop
+    return encoded, encoded.text(compact=compact) if render_text else ""
+
+
+def _response_hash(result: Any, encoded: codec.EncodedPayload | None) -> str | None:
+    if encoded is not None:
+        return encoded.sha256
+    return hash_json(result) if result is not None else None
+
+
+def _should_validate_output(tool_def: RegisteredTool) -> bool:
+    if tool_def.risk_class not in SAMPLED_VALIDATION_RISK_CLASSES:
+        return True
+    sample_rate = get_settings().output_validation_sample_rate
+    return sample_rate <= 1 or next(_output_validation_counter) % sample_rate == 0
+
+
+def _summarize_structured_result(name: str, result: Any) -> str:
+    if not isinstance(result, dict):
+        return f"{name} returned its result as structuredContent."
+    entries: list[str] = []
+    for key, value in result.items():
+        if len(entries) == _SUMMARY_MAX_ENTRIES:
+            break
+        if isinstance(value, list):
+            entries.append(f"{key}: {len(value)} item(s)")
+        elif isinstance(value, (str, int, float, bool)):
+            text = str(value)
+            if len(text) > _SUMMARY_MAX_VALUE_CHARS:
+                text = text[: _SUMMARY_MAX_VALUE_CHARS - 3] + "..."
+            entries.append(f"{key}: {text}")
+    summary = f"{name} returned {len(result)} field(s) in structuredContent."
+    if entries:
+        summary += "\n" + "\n".join(f"- {entry}" for entry in entries)
+    return summary
+
+
+def _render_sources(sources: list[dict[str, str]]) -> str:
+    lines = ["", "", "Sources:"]
+    for source in sources:
+        name = source["name"]
+        url = source.get("url")
+        lines.append(f"- {name}: {url}" if url else f"- {name}")
+    return "\n".join(lines)
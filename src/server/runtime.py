@@ -0,0 +1,63 @@
+"""Process-wide setup shared by the HTTP app and the stdio transport."""
+
+from __future__ import annotations
+
+import asyncio
+
+from src.adapters.comp_tox import COMPTOX_SERVICE
+from src.instrumentation.audit import tool_call_audit_log
+from src.instrumentation.loop_monitor import event_loop_monitor
+from src.instrumentation.throttle import upstream_throttle
+from src.instrumentation.tracing import JsonlSpanExporter, tracer
+from src.server.config.settings import Settings
+from src.server.dependencies import get_job_runner
+from src.tools.offload import offload
+
+
+def configure_runtime(settings: Settings) -> None:
+    tool_call_audit_log.configure_jsonl_sink(
+        settings.audit_log_path,
+        segment_records=settings.audit_log_segment_records,
+        fsync=settings.audit_log_fsync,
+        fsync_interval=settings.audit_log_fsync_interval_seconds,
+        background=settings.audit_log_writer == "background",
+        queue_size=settings.audit_log_queue_size,
+        batch_size=settings.audit_log_batch_size,
+        index=settings.audit_log_index,
+    )
+    tracer.configure(
+        exporter=JsonlSpanExporter(settings.trace_export_path) if settings.trace_export_path else None,
+        sample_rate=settings.trace_sample_rate,
+    )
+    event_loop_monitor.configure(threshold_seconds=settings.loop_lag_threshold_ms / 1000)
+    offload.configure(
+        thread_workers=settings.offload_thread_workers,
+        process_workers=settings.offload_process_workers,
+        min_offload_bytes=settings.offload_min_bytes,
+    )
+    upstream_throttle.configure(
+        COMPTOX_SERVICE,
+        requests_per_second=settings.comptox_requests_per_second,
+        client_share=settings.comptox_client_share,
+    )
+
+
+def start_runtime(*, loop_lag_monitor: bool) -> None:
+    """Start the background services; call from the running event loop."""
+
+    if loop_lag_monitor:
+        event_loop_monitor.start()
+    # Resume jobs left pending or running by a previous process.
+    get_job_runner().start()
+
+
+async def stop_runtime() -> None:
+    await get_job_runner().stop()
+    await event_loop_monitor.stop()
+    await asyncio.to_thread(offload.shutdown)
+    # Write any audit records still queued for the background writer.
+    await asyncio.to_thread(tool_call_audit_log.close)
+    await asyncio.to_thread(tracer.flush)
+
+
+__all__ = ["configure_runtime", "start_runtime", "stop_runtime"]
@@ -0,0 +1,214 @@
+"""MCP stdio transport for local single-client deployments."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import sys
+from typing import Any, BinaryIO
+
+from src.server.config.settings import Settings, get_settings
+from src.server.mcp import codec
+from src.server.mcp.protocol import INTERNAL_ERROR, INVALID_REQUEST, PARSE_ERROR
+
+STDIO_CLIENT_ID = "stdio"
+CANCELLED_NOTIFICATION = "notifications/cancelled"
+
+log = logging.getLogger(__name__)
+
+
+class StdioServer:
+    """Serves MCP over a pair of binary streams until the input reaches EOF."""
+
+    def __init__(
+        self,
+        reader: BinaryIO,
+        writer: BinaryIO,
+        *,
+        settings: Settings | None = None,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.settings = settings or get_settings()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._outgoing: asyncio.Queue[bytes | None] | None = None
+        self._ready: asyncio.Task[Any] | None = None
+        self._in_flight: dict[Any, asyncio.Task[None]] = {}
+        self._started = False
+
+    async def serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._outgoing = asyncio.Queue()
+        self._ready = asyncio.create_task(self._load_dispatcher())
+        writer_task = asyncio.create_task(self._write_outgoing())
+        tasks: set[asyncio.Task[None]] = set()
+        limit = self.settings.max_request_bytes
+        try:
+            while line := await asyncio.to_thread(self.reader.readline, limit + 1):
+                if len(line) > limit and not line.endswith(b"\n"):
+                    await asyncio.to_thread(self._discard_rest_of_line, limit)
+                    self._send(
+                        codec.render_jsonrpc(
+                            error={"code": INVALID_REQUEST, "message": "Request too large"}
+                        )
+                    )
+                    continue
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._handle_line(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._ready.cancel()
+            if self._started:
+                await importlib.import_module("src.server.runtime").stop_runtime()
+            self._send(None)
+            await writer_task
+        if not self._ready.cancelled():
+            # Surface a failed tool import instead of exiting quietly.
+            self._ready.result()
+
+    async def _load_dispatcher(self) -> Any:
+        try:
+            dispatch = await asyncio.to_thread(importlib.import_module, "src.server.mcp.dispatch")
+            runtime = await asyncio.to_thread(importlib.import_module, "src.server.runtime")
+            runtime.configure_runtime(self.settings)
+            runtime.start_runtime(loop_lag_monitor=self.settings.loop_lag_monitor_enabled)
+        except Exception:
+            log.exception("Failed to start the MCP dispatcher")
+            raise
+        self._started = True
+        return dispatch
+
+    async def _handle_line(self, line: bytes) -> None:
+        try:
+            message = codec.loads(line)
+        except ValueError as exc:
+            log.error("Failed to parse JSON: %s", exc)
+            self._send(codec.render_jsonrpc(error={"code": PARSE_ERROR, "message": "Invalid JSON"}))
+            return
+        if message == []:
+            self._send(
+                codec.render_jsonrpc(
+                    error={"code": INVALID_REQUEST, "message": "Batch must not be empty"}
+                )
+            )
+            return
+        try:
+            dispatch = await self._ready
+        except Exception as exc:
+            self._answer_unavailable(message, exc)
+            return
+        context = dispatch.ToolExecutionContext(client_id=STDIO_CLIENT_ID)
+
+        if isinstance(message, list):
+            responses = await dispatch.dispatch_batch(
+                message,
+                execution_context=context,
+                concurrency=self.settings.batch_concurrency,
+            )
+            if responses:
+                self._send(b"[" + b",".join(responses) + b"]")
+            return
+
+        fields = message if isinstance(message, dict) else {}
+        params = fields.get("params") if isinstance(fields.get("params"), dict) else {}
+        if fields.get("method") == CANCELLED_NOTIFICATION:
+            self._cancel(params.get("requestId"))
+            return
+
+        request_id = fields.get("id")
+        task = asyncio.current_task()
+        if request_id is not None and task is not None:
+            self._in_flight[request_id] = task
+        try:
+            with dispatch.notification_scope(params, self._send):
+                response = await dispatch.dispatch_message(message, execution_context=context)
+        except asyncio.CancelledError:
+            # MCP: the receiver of a cancellation does not answer the cancelled request.
+            log.info("Request %r cancelled by the client", request_id)
+            return
+        finally:
+            if request_id is not None:
+                self._in_flight.pop(request_id, None)
+        if response is not None:
+            self._send(response)
+
+    def _answer_unavailable(self, message: Any, exc: Exception) -> None:
+        """Fail every request in ``message`` because the dispatcher did not start."""
+
+        error = {
+            "code": INTERNAL_ERROR,
+            "message": "Server failed to start",
+            "data": {"errorType": type(exc).__name__},
+        }
+        elements = message if isinstance(message, list) else [message]
+        responses = [
+            codec.render_jsonrpc(
+                error=error,
+                request_id=element.get("id") if isinstance(element, dict) else None,
+            )
+            for element in elements
+            # Notifications get no answer.
+            if not (isinstance(element, dict) and "method" in element and "id" not in element)
+        ]
+        if isinstance(message, list) and responses:
+            self._send(b"[" + b",".join(responses) + b"]")
+        elif responses:
+            self._send(responses[0])
+
+    def _cancel(self, request_id: Any) -> None:
+        task = self._in_flight.get(request_id)
+        if task is not None:
+            task.cancel()
+
+    def _send(self, message: bytes | None) -> None:
+        """Queue a message for stdout; safe to call from worker threads."""
+
+        assert self._loop is not None and self._outgoing is not None
+        self._loop.call_soon_threadsafe(self._outgoing.put_nowait, message)
+
+    async def _write_outgoing(self) -> None:
+        assert self._outgoing is not None
+        done = False
+        while not done:
+            messages = [await self._outgoing.get()]
+            # Write everything already queued in one call.
+            while not self._outgoing.empty():
+                messages.append(self._outgoing.get_nowait())
+            if None in messages:
+                done = True
+                messages = messages[: messages.index(None)]
+            if messages:
+                await asyncio.to_thread(self._write, b"".join(m + b"\n" for m in messages))
+
+    def _write(self, data: bytes) -> None:
+        self.writer.write(data)
+        self.writer.flush()
+
+    def _discard_rest_of_line(self, chunk_size: int) -> None:
+        while (chunk := self.reader.readline(chunk_size)) and not chunk.endswith(b"\n"):
+            pass
+
+
+def main() -> None:
+    settings = get_settings()
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=settings.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    try:
+        asyncio.run(StdioServer(sys.stdin.buffer, sys.stdout.buffer, settings=settings).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["CANCELLED_NOTIFICATION", "STDIO_CLIENT_ID", "StdioServer", "main"]
+
+
+if __name__ == "__main__":
+    main()
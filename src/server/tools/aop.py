@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import csv
+import functools
 import hashlib
 import io
 import json
@@ -12,17 +13,22 @@ import re
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Literal, Optional
+from typing import Any, Awaitable, Callable, ClassVar, Literal, Optional
 
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from src.instrumentation.profiling import tool_call_profiler
+from src.instrumentation.progress import report_partial_result, report_progress
 from src.instrumentation.audit import (
     AUDIT_CHAIN_ALGORITHM,
+    TOOL_CALL_LATENCY_PERCENTILES,
+    UNREGISTERED_TOOL_STATS_KEY,
     JsonlToolCallAuditSink,
     tool_call_audit_log,
     verify_draft_integrity,
 )
 from src.server.config.settings import get_settings
+from src.server.mcp.protocol import INVALID_PARAMS, JSONRPCError
 from src.server.version import get_app_version
 from src.adapters import CompToxError
 from src.server.dependencies import (
@@ -30,6 +36,10 @@ from src.server.dependencies import (
     get_aop_db_adapter,
     get_aop_wiki_adapter,
     get_comptox_client,
+    get_confidence_results_store,
+    get_job_runner,
+    get_job_service,
+    get_related_aops_index_store,
     get_semantic_tools,
     get_write_tools,
 )
@@ -37,8 +47,11 @@ from src.services.registry_handoff import (
     build_imported_registry_support_summary,
     build_registry_handoff_review,
 )
+from src.services.confidence_corpus import CONFIDENCE_RESULT_COLUMNS
+from src.services.jobs import JobPriority, JobRecord, JobStatus
 from src.services.draft_store import compute_provenance_checksum
 from src.services.publish import LinearDocumentPlanner
+from src.services.related_aops import SimilarityMetric
 from src.tools.write import (
     DraftApplicability,
     KeyEventPayload,
@@ -47,8 +60,10 @@ from src.tools.write import (
     is_governed_ke_essentiality,
     normalize_key_event_attributes,
 )
-from src.tools import validate_payload
+from src.tools import load_schema, validate_payload, validate_payload_async
+from src.tools.offload import offload
 from src.semantic.mechanism_roles import classify_key_event_role, summarize_mechanism_roles
+from src.semantic.pathway_graph import PathwayGraph
 
 
 class SearchAopsInput(BaseModel):
@@ -64,28 +79,91 @@ async def search_aops(params: SearchAopsInput) -> dict[str, Any]:
     return payload
 
 
-class GetAopInput(BaseModel):
+class _FieldProjectionInput(BaseModel):
+    """Input mixin for read tools that accept a top-level ``fields`` projection."""
+
+    response_schema_name: ClassVar[str]
+    identity_fields: ClassVar[tuple[str, ...]] = ("id", "iri")
+
+    fields: Optional[list[str]] = Field(
+        default=None,
+        min_length=1,
+        description=(
+            "Optional top-level response fields to return. Identity fields are always kept, "
+            "and sections that are not requested are not computed."
+        ),
+    )
+
+    @field_validator("fields")
+    @classmethod
+    def ensure_known_fields(cls, value: Optional[list[str]]) -> Optional[list[str]]:
+        if value is None:
+            return None
+        properties = load_schema("read", cls.response_schema_name)["properties"]
+        unknown = sorted({field for field in value if field not in properties or field == "projected_fields"})
+        if unknown:
+            raise ValueError(f"Unknown response field(s): {', '.join(unknown)}")
+        return list(dict.fromkeys(value))
+
+    def wants(self, *fields: str) -> bool:
+        return self.fields is None or any(field in self.fields for field in fields)
+
+    def project(self, payload: dict[str, Any]) -> dict[str, Any]:
+        if self.fields is None:
+            return payload
+        kept = {*self.identity_fields, *self.fields}
+        projected = {key: value for key, value in payload.items() if key in kept}
+        projected["projected_fields"] = list(self.fields)
+        return projected
+
+
+class GetAopInput(_FieldProjectionInput):
+    response_schema_name: ClassVar[str] = "get_aop.response.schema"
+
     aop_id: str
 
 
+# get_aop fields that draw on the AOP assessment record and on AOP-DB stressors.
+_AOP_ASSESSMENT_FIELDS = (
+    "created",
+    "modified",
+    "evidence_summary",
+    "molecular_initiating_events",
+    "adverse_outcomes",
+    "references",
+)
+_AOP_STRESSOR_FIELDS = ("stressors", "provenance")
+
+
 async def get_aop(params: GetAopInput) -> dict[str, Any]:
     wiki_adapter = get_aop_wiki_adapter()
     db_adapter = get_aop_db_adapter()
     core_record, assessment_record, stressor_records = await asyncio.gather(
         wiki_adapter.get_aop(params.aop_id),
-        wiki_adapter.get_aop_assessment(params.aop_id),
-        db_adapter.list_stressor_chemicals_for_aop(params.aop_id),
+        _maybe(params.wants(*_AOP_ASSESSMENT_FIELDS), wiki_adapter.get_aop_assessment, params.aop_id),
+        _maybe(params.wants(*_AOP_STRESSOR_FIELDS), db_adapter.list_stressor_chemicals_for_aop, params.aop_id),
     )
-    record = _normalize_aop_record(
-        core_record,
-        assessment_record=assessment_record,
-        stressor_records=stressor_records,
+    if assessment_record is None and not core_record.get("iri"):
+        # The assessment record is the fallback source of the AOP IRI.
+        assessment_record = await wiki_adapter.get_aop_assessment(params.aop_id)
+    record = params.project(
+        _normalize_aop_record(
+            core_record,
+            assessment_record=assessment_record,
+            stressor_records=stressor_records,
+        )
     )
     validate_payload(record, namespace="read", name="get_aop.response.schema")
     return record
 
 
-class GetKeyEventInput(BaseModel):
+async def _maybe(needed: bool, fetch: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    return await fetch(*args) if needed else None
+
+
+class GetKeyEventInput(_FieldProjectionInput):
+    response_schema_name: ClassVar[str] = "get_key_event.response.schema"
+
     key_event_id: str = Field(
         validation_alias=AliasChoices("key_event_id", "ke_id"),
     )
@@ -93,7 +171,9 @@ class GetKeyEventInput(BaseModel):
 
 async def get_key_event(params: GetKeyEventInput) -> dict[str, Any]:
     adapter = get_aop_wiki_adapter()
-    record = _normalize_key_event_record(await adapter.get_key_event(params.key_event_id))
+    record = params.project(
+        _normalize_key_event_record(await adapter.get_key_event(params.key_event_id))
+    )
     validate_payload(record, namespace="read", name="get_key_event.response.schema")
     return record
 
@@ -122,29 +202,36 @@ async def list_kers(params: ListKersInput) -> dict[str, Any]:
     return payload
 
 
-class GetKerInput(BaseModel):
+class GetKerInput(_FieldProjectionInput):
+    response_schema_name: ClassVar[str] = "get_ker.response.schema"
+
     ker_id: str
 
 
 async def get_ker(params: GetKerInput) -> dict[str, Any]:
     adapter = get_aop_wiki_adapter()
     raw_record = await adapter.get_ker(params.ker_id)
-    upstream_id = raw_record.get("upstream", {}).get("id")
-    downstream_id = raw_record.get("downstream", {}).get("id")
-    upstream_record, downstream_record = await asyncio.gather(
-        _get_key_event_if_available(adapter, upstream_id),
-        _get_key_event_if_available(adapter, downstream_id),
-    )
-    assay_cutoff_ordering = await _build_assay_cutoff_ordering_for_get_ker(
-        raw_record,
-        upstream_record=upstream_record,
-        downstream_record=downstream_record,
-    )
-    record = _normalize_ker_record(
-        raw_record,
-        upstream_record=upstream_record,
-        downstream_record=downstream_record,
-        assay_cutoff_ordering=assay_cutoff_ordering,
+    upstream_record = downstream_record = assay_cutoff_ordering = None
+    if params.wants("applicability", "citation_concordance", "assay_cutoff_ordering"):
+        upstream_id = raw_record.get("upstream", {}).get("id")
+        downstream_id = raw_record.get("downstream", {}).get("id")
+        upstream_record, downstream_record = await asyncio.gather(
+            _get_key_event_if_available(adapter, upstream_id),
+            _get_key_event_if_available(adapter, downstream_id),
+        )
+    if params.wants("assay_cutoff_ordering"):
+        assay_cutoff_ordering = await _build_assay_cutoff_ordering_for_get_ker(
+            raw_record,
+            upstream_record=upstream_record,
+            downstream_record=downstream_record,
+        )
+    record = params.project(
+        _normalize_ker_record(
+            raw_record,
+            upstream_record=upstream_record,
+            downstream_record=downstream_record,
+            assay_cutoff_ordering=assay_cutoff_ordering,
+        )
     )
     validate_payload(record, namespace="read", name="get_ker.response.schema")
     return record
@@ -153,43 +240,329 @@ async def get_ker(params: GetKerInput) -> dict[str, Any]:
 class GetRelatedAopsInput(BaseModel):
     aop_id: str
     limit: int = Field(default=20, ge=1, le=100)
+    metric: SimilarityMetric = "shared_elements"
 
 
 async def get_related_aops(params: GetRelatedAopsInput) -> dict[str, Any]:
-    adapter = get_aop_wiki_adapter()
-    source_aop = await adapter.get_aop(params.aop_id)
-    related = await adapter.get_related_aops(params.aop_id, limit=params.limit)
-    payload = {"aop": source_aop, "results": related}
+    index = get_related_aops_index_store().get()
+    aop_id = _related_aop_key(params.aop_id)
+    related = (
+        index.related(aop_id, limit=params.limit, metric=params.metric)
+        if index is not None
+        else None
+    )
+    if related is not None:
+        # The index carries the source AOP's identity, so no upstream call is needed.
+        indexed = index.aops[aop_id]
+        payload = {
+            "aop": {"id": aop_id, "iri": indexed.get("iri"), "title": indexed.get("title")},
+            "metric": params.metric,
+            "source": "precomputed_index",
+            "index_generated_at": index.generated_at,
+            "results": related,
+        }
+    else:
+        # The live query only reports raw shared-element counts.
+        if params.metric != "shared_elements":
+            raise JSONRPCError(
+                INVALID_PARAMS,
+                f"metric '{params.metric}' needs the precomputed related-AOP index "
+                f"(AOP_MCP_RELATED_AOPS_INDEX_PATH), and it has no entry for {params.aop_id}",
+            )
+        adapter = get_aop_wiki_adapter()
+        source_aop = await adapter.get_aop(params.aop_id)
+        related = await adapter.get_related_aops(params.aop_id, limit=params.limit)
+        payload = {
+            "aop": source_aop,
+            "metric": "shared_elements",
+            "source": "live_sparql",
+            "results": related,
+        }
     validate_payload(payload, namespace="read", name="get_related_aops.response.schema")
     return payload
 
 
-class AssessAopConfidenceInput(BaseModel):
+class AssessAopConfidenceInput(_FieldProjectionInput):
+    response_schema_name: ClassVar[str] = "assess_aop_confidence.response.schema"
+    identity_fields: ClassVar[tuple[str, ...]] = ("aop",)
+
     aop_id: str
 
 
+# assess_aop_confidence fields that depend on the CompTox-backed assay-cutoff ordering.
+_ASSAY_CUTOFF_ORDERING_FIELDS = (
+    "coverage",
+    "supplemental_signals",
+    "rationale",
+    "limitations",
+    "ker_assessments",
+)
+
+
 async def assess_aop_confidence(params: AssessAopConfidenceInput) -> dict[str, Any]:
+    return await _assess_aop_confidence(
+        params.aop_id,
+        pool=_ConfidenceFetchPool(),
+        projection=params,
+    )
+
+
+class AssessAopConfidencesInput(BaseModel):
+    aop_ids: list[str] = Field(max_length=200)
+
+    @model_validator(mode="after")
+    def ensure_aop_ids(self) -> "AssessAopConfidencesInput":
+        if not self.aop_ids:
+            raise ValueError("Provide at least one aop_id")
+        return self
+
+
+async def assess_aop_confidences(params: AssessAopConfidencesInput) -> dict[str, Any]:
+    concurrency = get_settings().batch_concurrency
+    pool = _ConfidenceFetchPool(concurrency=concurrency)
+    aop_ids = list(dict.fromkeys(params.aop_ids))
+    completed = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def assess(aop_id: str) -> dict[str, Any]:
+        nonlocal completed
+        try:
+            async with semaphore:
+                result = await _assess_aop_confidence(aop_id, pool=pool)
+        finally:
+            completed += 1
+            report_progress(completed, len(aop_ids), f"Assessed {aop_id}")
+        report_partial_result(result)
+        return result
+
+    outcomes = await asyncio.gather(
+        *(assess(aop_id) for aop_id in aop_ids), return_exceptions=True
+    )
+    results: list[dict[str, Any]] = []
+    errors: list[dict[str, str]] = []
+    for aop_id, outcome in zip(aop_ids, outcomes):
+        if isinstance(outcome, asyncio.CancelledError):
+            raise outcome
+        if isinstance(outcome, BaseException):
+            errors.append({"aop_id": aop_id, "error": f"{type(outcome).__name__}: {outcome}"})
+        else:
+            results.append(outcome)
+    payload = {
+        "aop_count": len(results),
+        "shared_elements": pool.stats(),
+        "results": results,
+        "errors": errors,
+    }
+    validate_payload(payload, namespace="read", name="assess_aop_confidences.response.schema")
+    return payload
+
+
+def make_shared_confidence_assessor() -> Callable[[str], Awaitable[dict[str, Any]]]:
+    """Return an AOP-ID assessor whose calls share one KE/KER fetch pool.
+
+    Used by the corpus precompute job so each distinct KE and KER is fetched
+    once for the whole run.
+    """
+
+    pool = _ConfidenceFetchPool()
+
+    async def assess(aop_id: str) -> dict[str, Any]:
+        return await _assess_aop_confidence(aop_id, pool=pool)
+
+    return assess
+
+
+_CONFIDENCE_CALL = Literal["strong", "moderate", "low", "not_assessed", "not_reported"]
+
+
+class QueryAopConfidenceResultsInput(BaseModel):
+    overall_call: list[Literal["high", "moderate", "low", "sparse_evidence"]] = Field(default_factory=list)
+    biological_plausibility: list[_CONFIDENCE_CALL] = Field(default_factory=list)
+    empirical_support: list[_CONFIDENCE_CALL] = Field(default_factory=list)
+    quantitative_understanding: list[_CONFIDENCE_CALL] = Field(default_factory=list)
+    essentiality_of_key_events: list[_CONFIDENCE_CALL] = Field(default_factory=list)
+    aop_ids: list[str] = Field(default_factory=list)
+    title_contains: Optional[str] = None
+    min_ker_count: Optional[int] = Field(default=None, ge=0)
+    include_failed: bool = False
+    sort_by: str = "aop_id"
+    descending: bool = False
+    limit: int = Field(default=50, ge=1, le=1000)
+    offset: int = Field(default=0, ge=0)
+
+    @field_validator("sort_by")
+    @classmethod
+    def ensure_sort_column(cls, value: str) -> str:
+        if value not in CONFIDENCE_RESULT_COLUMNS:
+            raise ValueError(f"sort_by must be one of: {', '.join(CONFIDENCE_RESULT_COLUMNS)}")
+        return value
+
+
+async def query_aop_confidence_results(params: QueryAopConfidenceResultsInput) -> dict[str, Any]:
+    store = get_confidence_results_store()
+    warnings: list[str] = []
+    rows = store.rows()
+    if not store.configured:
+        warnings.append(
+            "AOP_MCP_CONFIDENCE_RESULTS_PATH is not configured; run scripts/precompute_aop_confidence.py and set it."
+        )
+    elif not rows:
+        warnings.append("The confidence results table does not exist yet or has no rows.")
+    matched_count, results = store.query(
+        filters={
+            "overall_call": params.overall_call,
+            "biological_plausibility": params.biological_plausibility,
+            "empirical_support": params.empirical_support,
+            "quantitative_understanding": params.quantitative_understanding,
+            "essentiality_of_key_events": params.essentiality_of_key_events,
+            "aop_id": [_normalize_aop_element_id(aop_id) for aop_id in params.aop_ids],
+        },
+        min_ker_count=params.min_ker_count,
+        title_contains=params.title_contains,
+        include_failed=params.include_failed,
+        sort_by=params.sort_by,
+        descending=params.descending,
+        limit=params.limit,
+        offset=params.offset,
+    )
+    payload = {
+        "configured": store.configured,
+        "updated_at": store.updated_at,
+        "total_rows": len(rows),
+        "matched_count": matched_count,
+        "results": results,
+        "warnings": warnings,
+    }
+    validate_payload(payload, namespace="read", name="query_aop_confidence_results.response.schema")
+    return payload
+
+
+class _ConfidenceFetchPool:
+    """Memoize KE/KER, stressor, and CompTox lookups across confidence assessments.
+
+    Every lookup is keyed and stored as a shared task, so AOPs that reference
+    the same key event, KER, or chemical await a single upstream request and
+    reuse the same per-element summary. A lookup that fails is forgotten, so
+    the next AOP to need it retries instead of inheriting the error. With
+    ``concurrency`` set, at most that many lookups are in flight at once.
+    """
+
+    def __init__(self, *, concurrency: int | None = None) -> None:
+        self._limit = asyncio.Semaphore(concurrency) if concurrency is not None else None
+        self._tasks: dict[tuple[Any, ...], asyncio.Future[Any]] = {}
+        self._key_event_summaries: dict[str, dict[str, Any]] = {}
+        self._requests: dict[str, int] = {}
+
+    def _shared(self, key: tuple[Any, ...], factory: Any) -> asyncio.Future[Any]:
+        self._requests[key[0]] = self._requests.get(key[0], 0) + 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._limited(factory))
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._forget_failed, key))
+        return task
+
+    async def _limited(self, factory: Any) -> Any:
+        if self._limit is None:
+            return await factory()
+        async with self._limit:
+            return await factory()
+
+    def _forget_failed(self, key: tuple[Any, ...], task: asyncio.Future[Any]) -> None:
+        if (task.cancelled() or task.exception() is not None) and self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def get_key_event(self, key_event_id: str) -> asyncio.Future[Any]:
+        return self._shared(
+            ("key_event", key_event_id),
+            lambda: get_aop_wiki_adapter().get_key_event(key_event_id),
+        )
+
+    def get_ker(self, ker_id: str) -> asyncio.Future[Any]:
+        return self._shared(("ker", ker_id), lambda: get_aop_wiki_adapter().get_ker(ker_id))
+
+    def list_stressor_chemicals_for_aop(self, aop_id: str) -> asyncio.Future[Any]:
+        return self._shared(
+            ("aop_stressors", aop_id),
+            lambda: get_aop_db_adapter().list_stressor_chemicals_for_aop(aop_id),
+        )
+
+    def search_assays_for_key_event(self, record: dict[str, Any], *, limit: int) -> Any:
+        key_event_id = record.get("id")
+        if not key_event_id:
+            return get_aop_db_adapter().search_assays_for_key_event(record, limit=limit)
+        return self._shared(
+            ("key_event_assays", key_event_id, limit),
+            lambda: get_aop_db_adapter().search_assays_for_key_event(record, limit=limit),
+        )
+
+    def search_equal(self, comptox: Any, value: str) -> asyncio.Future[Any]:
+        return self._shared(
+            ("comptox_search", value),
+            lambda: asyncio.to_thread(comptox.search_equal, value),
+        )
+
+    def bioactivity_data_by_dtxsid(self, comptox: Any, dtxsid: str) -> asyncio.Future[Any]:
+        return self._shared(
+            ("comptox_bioactivity", dtxsid),
+            lambda: asyncio.to_thread(comptox.bioactivity_data_by_dtxsid, dtxsid),
+        )
+
+    def summarize_key_event(self, record: dict[str, Any]) -> dict[str, Any]:
+        key_event_id = record.get("id")
+        if not key_event_id:
+            return _summarize_key_event(record)
+        summary = self._key_event_summaries.get(key_event_id)
+        if summary is None:
+            summary = self._key_event_summaries[key_event_id] = _summarize_key_event(record)
+        return summary
+
+    def stats(self) -> dict[str, int]:
+        distinct: dict[str, int] = {}
+        for key in self._tasks:
+            distinct[key[0]] = distinct.get(key[0], 0) + 1
+        return {
+            "distinct_key_events": distinct.get("key_event", 0),
+            "key_event_references": self._requests.get("key_event", 0),
+            "distinct_kers": distinct.get("ker", 0),
+            "ker_references": self._requests.get("ker", 0),
+        }
+
+
+async def _assess_aop_confidence(
+    aop_id: str,
+    *,
+    pool: _ConfidenceFetchPool,
+    projection: _FieldProjectionInput | None = None,
+) -> dict[str, Any]:
     adapter = get_aop_wiki_adapter()
-    aop = await adapter.get_aop_assessment(params.aop_id)
-    key_events = await adapter.list_key_events(params.aop_id)
-    kers = await adapter.list_kers(params.aop_id)
+    aop = await adapter.get_aop_assessment(aop_id)
+    key_events = await adapter.list_key_events(aop_id)
+    kers = await adapter.list_kers(aop_id)
 
     key_event_ids = [item["id"] for item in key_events if item.get("id")]
     ker_ids = [item["id"] for item in kers if item.get("id")]
     key_event_details, ker_details = await asyncio.gather(
-        asyncio.gather(*(adapter.get_key_event(item_id) for item_id in key_event_ids)),
-        asyncio.gather(*(adapter.get_ker(item_id) for item_id in ker_ids)),
+        asyncio.gather(*(pool.get_key_event(item_id) for item_id in key_event_ids)),
+        asyncio.gather(*(pool.get_ker(item_id) for item_id in ker_ids)),
     )
+    key_event_details = list(key_event_details)
+    ker_details = list(ker_details)
 
     key_event_lookup = {
         record["id"]: record for record in key_event_details if record.get("id")
     }
-    assay_cutoff_ordering_records = await _build_assay_cutoff_ordering_records(
-        params.aop_id,
-        key_event_details=key_event_details,
-        ker_details=ker_details,
+    assay_cutoff_ordering_records = (
+        await _build_assay_cutoff_ordering_records(
+            aop_id,
+            key_event_details=key_event_details,
+            ker_details=ker_details,
+            pool=pool,
+        )
+        if projection is None or projection.wants(*_ASSAY_CUTOFF_ORDERING_FIELDS)
+        else []
     )
-    key_event_summaries = [_summarize_key_event(record) for record in key_event_details]
+    key_event_summaries = [pool.summarize_key_event(record) for record in key_event_details]
     mechanism_role_summary = summarize_mechanism_roles(key_event_details)
     ker_assessments = [
         _summarize_ker(
@@ -261,7 +634,7 @@ async def assess_aop_confidence(params: AssessAopConfidenceInput) -> dict[str, A
             f"{supplemental_signals['citation_concordance_signal']['coverage']['present']}/{coverage['ker_count']} KERs."
         )
     if (
-        supplemental_signals.get("assay_cutoff_ordering_signal", {}).get("heuristic_call")
+        supplemental_signals.get("assay_cutoff_ordering_signal", {}).get("heuristic_call", "not_reported")
         != "not_reported"
     ):
         rationale.append(
@@ -304,6 +677,8 @@ async def assess_aop_confidence(params: AssessAopConfidenceInput) -> dict[str, A
             )
         ],
     }
+    if projection is not None:
+        result = projection.project(result)
     validate_payload(result, namespace="read", name="assess_aop_confidence.response.schema")
     return result
 
@@ -314,6 +689,7 @@ class FindPathsBetweenEventsInput(BaseModel):
     target_event_id: str
     max_depth: int = Field(default=8, ge=1, le=20)
     limit: int = Field(default=10, ge=1, le=50)
+    weighting: Literal["hops", "evidence"] = "hops"
 
 
 async def find_paths_between_events(params: FindPathsBetweenEventsInput) -> dict[str, Any]:
@@ -325,58 +701,51 @@ async def find_paths_between_events(params: FindPathsBetweenEventsInput) -> dict
     source_event_id = _normalize_aop_element_id(params.source_event_id)
     target_event_id = _normalize_aop_element_id(params.target_event_id)
 
-    adjacency: dict[str, list[dict[str, Any]]] = {}
-    for ker in kers:
-        upstream_id = ker.get("upstream", {}).get("id")
-        downstream_id = ker.get("downstream", {}).get("id")
-        if not upstream_id or not downstream_id:
-            continue
-        adjacency.setdefault(upstream_id, []).append(ker)
-
-    paths: list[dict[str, Any]] = []
-
-    def dfs(current_event_id: str, visited: set[str], ker_path: list[dict[str, Any]]) -> None:
-        if len(paths) >= params.limit:
-            return
-        if len(ker_path) > params.max_depth:
-            return
-        if current_event_id == target_event_id:
-            event_ids = [source_event_id]
-            for edge in ker_path:
-                downstream_id = edge["downstream"]["id"]
-                event_ids.append(downstream_id)
-            paths.append(
+    edges = [
+        ker
+        for ker in kers
+        if ker.get("upstream", {}).get("id") and ker.get("downstream", {}).get("id")
+    ]
+    graph = PathwayGraph(
+        [(edge["upstream"]["id"], edge["downstream"]["id"]) for edge in edges],
+        weights=(
+            [_ker_evidence_weight(edge) for edge in edges]
+            if params.weighting == "evidence"
+            else None
+        ),
+        nodes=[source_event_id, target_event_id],
+    )
+    paths = [
+        {
+            "event_path": [
                 {
-                    "event_path": [
-                        {
-                            "id": event_id,
-                            "title": key_event_titles.get(event_id),
-                        }
-                        for event_id in event_ids
-                    ],
-                    "ker_path": [
-                        {
-                            "id": edge.get("id"),
-                            "upstream_event_id": edge["upstream"]["id"],
-                            "downstream_event_id": edge["downstream"]["id"],
-                        }
-                        for edge in ker_path
-                    ],
+                    "id": event_id,
+                    "title": key_event_titles.get(event_id),
                 }
-            )
-            return
-
-        for edge in adjacency.get(current_event_id, []):
-            downstream_id = edge["downstream"]["id"]
-            if downstream_id in visited:
-                continue
-            dfs(downstream_id, visited | {downstream_id}, [*ker_path, edge])
-
-    dfs(source_event_id, {source_event_id}, [])
+                for event_id in path.nodes
+            ],
+            "ker_path": [
+                {
+                    "id": edges[edge_index].get("id"),
+                    "upstream_event_id": edges[edge_index]["upstream"]["id"],
+                    "downstream_event_id": edges[edge_index]["downstream"]["id"],
+                }
+                for edge_index in path.edges
+            ],
+            "path_weight": path.cost,
+        }
+        for path in graph.k_shortest_paths(
+            [source_event_id],
+            [target_event_id],
+            k=params.limit,
+            max_hops=params.max_depth,
+        )
+    ]
     payload = {
         "aop_id": _normalize_aop_element_id(params.aop_id),
         "source_event_id": source_event_id,
         "target_event_id": target_event_id,
+        "weighting": params.weighting,
         "path_count": len(paths),
         "results": paths,
     }
@@ -384,6 +753,115 @@ async def find_paths_between_events(params: FindPathsBetweenEventsInput) -> dict
     return payload
 
 
+class AssembleAopNetworkInput(BaseModel):
+    aop_ids: list[str] = Field(default_factory=list, max_length=300)
+    query: Optional[str] = None
+    query_limit: int = Field(default=50, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def ensure_selection(self) -> "AssembleAopNetworkInput":
+        if not self.aop_ids and not (self.query and self.query.strip()):
+            raise ValueError("Provide aop_ids or a search query")
+        return self
+
+
+async def assemble_aop_network(params: AssembleAopNetworkInput) -> dict[str, Any]:
+    adapter = get_aop_wiki_adapter()
+    aop_ids = [_normalize_aop_element_id(aop_id) for aop_id in params.aop_ids]
+    if params.query and params.query.strip():
+        matches = await adapter.search_aops(text=params.query, limit=params.query_limit)
+        aop_ids.extend(match["id"] for match in matches if match.get("id"))
+    aop_ids = list(dict.fromkeys(aop_ids))
+    memberships = await adapter.list_aop_networks(aop_ids)
+
+    nodes: dict[str, dict[str, Any]] = {}
+    edges: dict[str, dict[str, Any]] = {}
+
+    def node_for(identifier: dict[str, Any]) -> dict[str, Any]:
+        key = identifier.get("id") or identifier.get("iri")
+        return nodes.setdefault(
+            key,
+            {
+                "id": key,
+                "iri": identifier.get("iri"),
+                "title": None,
+                "event_type": None,
+                "aop_ids": set(),
+            },
+        )
+
+    for record in memberships:
+        for key_event in record["key_events"]:
+            node = node_for(key_event)
+            node["title"] = node["title"] or key_event.get("title")
+            node["event_type"] = node["event_type"] or key_event.get("event_type")
+            node["aop_ids"].add(record["id"])
+        for ker in record["kers"]:
+            upstream = ker["upstream"].get("id") or ker["upstream"].get("iri")
+            downstream = ker["downstream"].get("id") or ker["downstream"].get("iri")
+            key = ker.get("id") or ker.get("iri")
+            if not (key and upstream and downstream):
+                continue
+            for endpoint in (ker["upstream"], ker["downstream"]):
+                node_for(endpoint)["aop_ids"].add(record["id"])
+            edge = edges.setdefault(
+                key,
+                {
+                    "id": key,
+                    "iri": ker.get("iri"),
+                    "upstream_event_id": upstream,
+                    "downstream_event_id": downstream,
+                    "aop_ids": set(),
+                },
+            )
+            edge["aop_ids"].add(record["id"])
+
+    ordered_edges = sorted(edges.values(), key=lambda item: item["id"])
+    graph = PathwayGraph(
+        [(edge["upstream_event_id"], edge["downstream_event_id"]) for edge in ordered_edges],
+        nodes=sorted(nodes),
+    )
+    degrees = graph.degrees()
+    betweenness = graph.betweenness_centrality()
+    node_results = []
+    for key in sorted(nodes):
+        node = nodes[key]
+        in_degree, out_degree = degrees[key]
+        node_results.append(
+            {
+                **node,
+                "aop_ids": sorted(node["aop_ids"]),
+                "aop_count": len(node["aop_ids"]),
+                "in_degree": in_degree,
+                "out_degree": out_degree,
+                "degree": in_degree + out_degree,
+                "betweenness": round(betweenness[key], 6),
+            }
+        )
+    payload = {
+        "query": params.query,
+        "aops": [
+            {
+                "id": record["id"],
+                "iri": record["iri"],
+                "title": record["title"],
+                "key_event_count": len(record["key_events"]),
+                "ker_count": len(record["kers"]),
+            }
+            for record in memberships
+        ],
+        "node_count": len(node_results),
+        "edge_count": len(ordered_edges),
+        "nodes": node_results,
+        "edges": [
+            {**edge, "aop_ids": sorted(edge["aop_ids"]), "aop_count": len(edge["aop_ids"])}
+            for edge in ordered_edges
+        ],
+    }
+    await validate_payload_async(payload, namespace="read", name="assemble_aop_network.response.schema")
+    return payload
+
+
 class MapChemicalInput(BaseModel):
     cas: Optional[str] = None
     name: Optional[str] = None
@@ -688,7 +1166,7 @@ async def export_assays_table(params: ExportAssaysTableInput) -> dict[str, Any]:
         "selected_aops": selected_aops,
         "content": _serialize_assay_rows(records, params.format),
     }
-    validate_payload(payload, namespace="read", name="export_assays_table.response.schema")
+    await validate_payload_async(payload, namespace="read", name="export_assays_table.response.schema")
     return payload
 
 
@@ -859,12 +1337,15 @@ def _validate_artifact_filename(value: str | None) -> str | None:
     return value
 
 
-def _resolve_artifact_output_directory(subdirectory: str | None = None) -> Path:
-    settings = get_settings()
-    root = Path(settings.artifact_output_dir).expanduser()
+def _artifact_output_root() -> Path:
+    root = Path(get_settings().artifact_output_dir).expanduser()
     if not root.is_absolute():
         root = Path.cwd() / root
-    target_dir = root / "draft_reviews"
+    return root
+
+
+def _resolve_artifact_output_directory(subdirectory: str | None = None) -> Path:
+    target_dir = _artifact_output_root() / "draft_reviews"
     if subdirectory:
         target_dir = target_dir.joinpath(*subdirectory.split("/"))
     return target_dir.resolve()
@@ -2107,6 +2588,12 @@ def _metadata_payload_sha256(payload: dict[str, Any]) -> str:
     ).hexdigest()
 
 
+async def _metadata_payload_sha256_offloaded(payload: dict[str, Any]) -> str:
+    if offload.should_offload(payload):
+        return await offload.run_in_thread(_metadata_payload_sha256, payload)
+    return _metadata_payload_sha256(payload)
+
+
 def _file_sha256(path: Path) -> str:
     return hashlib.sha256(path.read_bytes()).hexdigest()
 
@@ -2237,7 +2724,8 @@ def _build_runtime_manifest() -> dict[str, Any]:
         "configuration": {
             "environment": environment,
             "auth_mode": getattr(settings, "auth_mode", "disabled"),
-            "auth_bearer_token_configured": getattr(settings, "auth_bearer_token", None) is not None,
+            "auth_bearer_token_configured": getattr(settings, "auth_bearer_token", None) is not None
+            or bool(getattr(settings, "auth_bearer_tokens", None)),
             "auth_bearer_scope_count": len(getattr(settings, "auth_bearer_scopes", [])),
             "allowed_origin_count": len(getattr(settings, "allowed_origins", [])),
             "fixture_fallback_enabled": bool(getattr(settings, "enable_fixture_fallback", False)),
@@ -2369,7 +2857,7 @@ def _recent_tool_call_audit_records(limit: int) -> list[dict[str, Any]]:
         return []
     return [
         record.to_dict()
-        for record in tool_call_audit_log.list_records()[-limit:]
+        for record in tool_call_audit_log.list_records(limit=limit)
     ]
 
 
@@ -2729,18 +3217,14 @@ async def trace_chemical_on_draft(params: TraceChemicalOnDraftInput) -> dict[str
     bioactivity_by_aeid = _aggregate_trace_bioactivity(bioactivity_rows)
 
     db_adapter = get_aop_db_adapter()
-    search_reports = await asyncio.gather(
-        *(
-            db_adapter.search_assays_for_key_event(
-                _draft_key_event_search_record(entity),
-                limit=params.assay_limit,
-            )
-            for entity in key_events
-        )
-    )
+    completed = 0
 
-    traced_key_events: list[dict[str, Any]] = []
-    for entity, search_report in zip(key_events, search_reports, strict=False):
+    async def trace_key_event(entity: Any) -> dict[str, Any]:
+        nonlocal completed
+        search_report = await db_adapter.search_assays_for_key_event(
+            _draft_key_event_search_record(entity),
+            limit=params.assay_limit,
+        )
         assay_rows: list[dict[str, Any]] = []
         matching_assay_count = 0
         active_assay_count = 0
@@ -2781,24 +3265,30 @@ async def trace_chemical_on_draft(params: TraceChemicalOnDraftInput) -> dict[str
         else:
             activity_state = "inactive"
 
-        traced_key_events.append(
-            {
-                "id": entity.identifier,
-                "title": entity.attributes.get("title"),
-                "event_type": entity.attributes.get("event_type"),
-                "event_role": entity.attributes.get("event_role"),
-                "activity_state": activity_state,
-                "active": activity_state == "active",
-                "assay_candidate_count": len(search_report["results"]),
-                "matching_assay_count": matching_assay_count,
-                "active_assay_count": active_assay_count,
-                "max_hitcall": max(hitcalls) if hitcalls else None,
-                "best_activity_cutoff": min(cutoffs) if cutoffs else None,
-                "derived_search_terms": search_report["derived_search_terms"],
-                "top_assays": assay_rows,
-                "limitations": list(search_report["limitations"]),
-            }
-        )
+        traced = {
+            "id": entity.identifier,
+            "title": entity.attributes.get("title"),
+            "event_type": entity.attributes.get("event_type"),
+            "event_role": entity.attributes.get("event_role"),
+            "activity_state": activity_state,
+            "active": activity_state == "active",
+            "assay_candidate_count": len(search_report["results"]),
+            "matching_assay_count": matching_assay_count,
+            "active_assay_count": active_assay_count,
+            "max_hitcall": max(hitcalls) if hitcalls else None,
+            "best_activity_cutoff": min(cutoffs) if cutoffs else None,
+            "derived_search_terms": search_report["derived_search_terms"],
+            "top_assays": assay_rows,
+            "limitations": list(search_report["limitations"]),
+        }
+        completed += 1
+        report_progress(completed, len(key_events), f"Traced {entity.identifier}")
+        report_partial_result(traced)
+        return traced
+
+    traced_key_events = list(
+        await asyncio.gather(*(trace_key_event(entity) for entity in key_events))
+    )
 
     payload = {
         "draft_id": draft.draft_id,
@@ -3194,7 +3684,7 @@ async def review_draft_bundle(params: ReviewDraftBundleInput) -> dict[str, Any]:
         namespace="read",
         name="review_draft_evidence_gaps.response.schema",
     )
-    validate_payload(payload, namespace="read", name="review_draft_bundle.response.schema")
+    await validate_payload_async(payload, namespace="read", name="review_draft_bundle.response.schema")
     return payload
 
 
@@ -3388,8 +3878,10 @@ async def export_draft_review_artifact(
     evidence_gaps = bundle["evidence_gaps"]
     evidence_gap_summary = bundle["evidence_gap_summary"]
     section_titles = _draft_review_artifact_section_titles(params.artifact_profile)
+    offloaded = offload.should_offload(bundle)
     if params.format == "json":
-        content = json.dumps(
+        render = functools.partial(
+            json.dumps,
             {
                 "bundle": bundle,
                 "evidence_gaps": evidence_gaps,
@@ -3398,12 +3890,15 @@ async def export_draft_review_artifact(
             sort_keys=False,
             ensure_ascii=True,
         )
+        content = await offload.run_in_thread(render) if offloaded else render()
     else:
-        content = _render_draft_review_artifact_markdown_for_profile(
+        render = functools.partial(
+            _render_draft_review_artifact_markdown_for_profile,
             bundle,
             artifact_profile=params.artifact_profile,
             evidence_gaps=evidence_gaps,
         )
+        content = await offload.run_in_process(render) if offloaded else render()
 
     payload = {
         "format": params.format,
@@ -3420,7 +3915,7 @@ async def export_draft_review_artifact(
         "section_titles": section_titles,
         "content": content,
     }
-    validate_payload(
+    await validate_payload_async(
         payload,
         namespace="read",
         name="export_draft_review_artifact.response.schema",
@@ -3687,6 +4182,137 @@ class ListToolCallAuditRecordsInput(BaseModel):
         return normalized
 
 
+class GetToolCallStatisticsInput(BaseModel):
+    tool_name: Optional[str] = None
+
+    @field_validator("tool_name")
+    @classmethod
+    def _validate_tool_name(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        normalized = value.strip()
+        if not normalized:
+            raise ValueError("tool_name cannot be blank")
+        return normalized
+
+
+class ProfileToolCallsInput(BaseModel):
+    action: Literal["arm", "status", "disarm"] = "status"
+    tool_name: Optional[str] = None
+    session_id: Optional[str] = None
+    mode: Literal["cprofile", "sampling"] = "cprofile"
+    calls: Optional[int] = Field(default=None, ge=1, le=100)
+    duration_seconds: Optional[float] = Field(default=None, gt=0, le=3600)
+    memory: bool = False
+    sample_interval_ms: float = Field(default=5.0, ge=1, le=1000)
+    top: int = Field(default=20, ge=1, le=200)
+
+    @field_validator("tool_name", "session_id")
+    @classmethod
+    def _validate_identifier(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        normalized = value.strip()
+        if not normalized:
+            raise ValueError("value cannot be blank")
+        return normalized
+
+    @model_validator(mode="after")
+    def ensure_armable(self) -> "ProfileToolCallsInput":
+        if self.action != "arm":
+            return self
+        if self.tool_name is None:
+            raise ValueError("Provide tool_name to arm a profiler")
+        # Imported here: the registry imports this module to register its tools.
+        from src.server.tools.registry import tool_registry
+
+        try:
+            tool_registry.get_tool(self.tool_name)
+        except KeyError as exc:
+            raise ValueError(f"Unknown tool: {self.tool_name}") from exc
+        return self
+
+
+JOB_TOOL_NAMES = frozenset({"submit_job", "get_job", "cancel_job", "list_jobs"})
+
+
+class SubmitJobInput(BaseModel):
+    tool_name: str
+    arguments: dict[str, Any] = Field(default_factory=dict)
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=86400,
+        description="Time limit for the job. Defaults to AOP_MCP_JOB_TIMEOUT_SECONDS.",
+    )
+    priority: Literal["interactive", "batch"] = Field(
+        default="interactive",
+        description="Use batch for bulk submissions; interactive jobs are scheduled first.",
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Return a stored result of an identical earlier call of a cacheable tool instead of running it again.",
+    )
+
+    @field_validator("tool_name")
+    @classmethod
+    def _validate_tool_name(cls, value: str) -> str:
+        normalized = value.strip()
+        if not normalized:
+            raise ValueError("tool_name cannot be blank")
+        if normalized in JOB_TOOL_NAMES:
+            raise ValueError(f"{normalized} cannot run as a job")
+        return normalized
+
+    @model_validator(mode="after")
+    def ensure_runnable(self) -> "SubmitJobInput":
+        # Imported here: the registry imports this module to register its tools.
+        from src.server.tools.registry import tool_registry
+
+        try:
+            tool_def = tool_registry.get_tool(self.tool_name)
+        except KeyError as exc:
+            raise ValueError(f"Unknown tool: {self.tool_name}") from exc
+        # Reject bad arguments now rather than in a job that fails later.
+        try:
+            tool_def.input_model.model_validate(self.arguments)
+        except ValueError as exc:
+            raise ValueError(f"Invalid arguments for {self.tool_name}: {exc}") from exc
+        return self
+
+
+class GetJobInput(BaseModel):
+    job_id: str
+
+    @field_validator("job_id")
+    @classmethod
+    def _validate_job_id(cls, value: str) -> str:
+        normalized = value.strip()
+        if not normalized:
+            raise ValueError("job_id cannot be blank")
+        return normalized
+
+
+class CancelJobInput(GetJobInput):
+    pass
+
+
+class ListJobsInput(BaseModel):
+    status: Optional[Literal["pending", "running", "succeeded", "failed", "cancelled"]] = None
+    tool_name: Optional[str] = None
+    limit: int = Field(default=25, ge=1, le=100)
+
+    @field_validator("tool_name")
+    @classmethod
+    def _validate_tool_name(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        normalized = value.strip()
+        if not normalized:
+            raise ValueError("tool_name cannot be blank")
+        return normalized
+
+
 class ExportToolCallAuditLogEvidenceInput(BaseModel):
     audit_log_path: Optional[str] = Field(
         default=None,
@@ -3699,6 +4325,14 @@ class ExportToolCallAuditLogEvidenceInput(BaseModel):
     limit: int = Field(default=25, ge=0, le=100)
     tool_name: Optional[str] = None
     status: Optional[Literal["success", "error"]] = None
+    started_after: Optional[str] = Field(
+        default=None,
+        description="Only export calls started at or after this ISO 8601 timestamp (UTC if no offset).",
+    )
+    started_before: Optional[str] = Field(
+        default=None,
+        description="Only export calls started before this ISO 8601 timestamp (UTC if no offset).",
+    )
 
     @field_validator("audit_log_path", "tool_name")
     @classmethod
@@ -3710,6 +4344,20 @@ class ExportToolCallAuditLogEvidenceInput(BaseModel):
             raise ValueError("value cannot be blank")
         return normalized
 
+    @field_validator("started_after", "started_before")
+    @classmethod
+    def _normalise_timestamp(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError as exc:
+            raise ValueError("timestamp must be ISO 8601") from exc
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        # Same shape as audit record timestamps, so they compare as strings.
+        return parsed.astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
 
 async def export_draft_replay_package(
     params: ExportDraftReplayPackageInput,
@@ -3782,8 +4430,8 @@ async def export_draft_replay_package(
         },
         "limitations": limitations,
     }
-    payload["package_sha256"] = _metadata_payload_sha256(payload)
-    validate_payload(
+    payload["package_sha256"] = await _metadata_payload_sha256_offloaded(payload)
+    await validate_payload_async(
         payload,
         namespace="read",
         name="export_draft_replay_package.response.schema",
@@ -3791,6 +4439,63 @@ async def export_draft_replay_package(
     return payload
 
 
+def _audit_log_sink(audit_path: Path) -> tuple[JsonlToolCallAuditSink, bool]:
+    """Return a sink for ``audit_path`` and whether it is the live, shared one.
+
+    Reading through the live sink shares its lock with the writer, so a read
+    never sees a half-written batch or a segment being sealed.
+    """
+
+    shared = tool_call_audit_log.jsonl_sink_for(audit_path)
+    if shared is not None:
+        return shared, True
+    return JsonlToolCallAuditSink(audit_path), False
+
+
+def _read_audit_evidence(
+    audit_path: Path,
+    params: ExportToolCallAuditLogEvidenceInput,
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    sink, shared = _audit_log_sink(audit_path)
+    filtered = any(
+        value is not None
+        for value in (params.tool_name, params.status, params.started_after, params.started_before)
+    )
+    try:
+        indexed = (
+            sink.read_indexed_envelopes(
+                limit=params.limit,
+                tool_name=params.tool_name,
+                status=params.status,
+                started_after=params.started_after,
+                started_before=params.started_before,
+            )
+            if filtered
+            else None
+        )
+        scan = (
+            sink.read_tail_envelopes(
+                params.limit,
+                lambda envelope: _audit_envelope_matches(envelope, params),
+            )
+            if indexed is None
+            else None
+        )
+    finally:
+        if not shared:
+            sink.close()
+    return indexed, scan
+
+
+def _verify_audit_chain(audit_path: Path) -> dict[str, object]:
+    sink, shared = _audit_log_sink(audit_path)
+    try:
+        return sink.verify_chain()
+    finally:
+        if not shared:
+            sink.close()
+
+
 async def export_tool_call_audit_log_evidence(
     params: ExportToolCallAuditLogEvidenceInput,
 ) -> dict[str, Any]:
@@ -3819,15 +4524,52 @@ async def export_tool_call_audit_log_evidence(
         }
         audit_path: Path | None = None
         exists = False
-        verified_envelopes: list[dict[str, Any]] = []
+        matched_envelopes: list[dict[str, Any]] = []
+        matched_envelope_count = 0
+        matched_count_complete = True
+        verified_envelope_count = 0
+        index_used = False
+        segments = {"sealed_segment_count": 0, "scanned_segment_count": 0, "complete": True}
         configured = False
     else:
         audit_path = Path(selected_path).expanduser().resolve()
         exists = audit_path.exists()
-        scan = JsonlToolCallAuditSink(audit_path).read_verified_envelopes()
-        chain = scan["chain"]
-        verified_envelopes = list(scan["envelopes"])
+        indexed, scan = await offload.run_in_thread(_read_audit_evidence, audit_path, params)
+        if indexed is not None:
+            chain = indexed["chain"]
+            matched_envelopes = list(indexed["envelopes"])
+            # The index counts every match in the log.
+            matched_envelope_count = indexed["matched_count"]
+            matched_count_complete = True
+            verified_envelope_count = len(matched_envelopes)
+            index_used = True
+            segments = None
+            limitations.append(
+                "Envelopes were located through the audit log's sidecar index: each one was re-hashed and checked "
+                "against the preceding record's hash, and the chain head was verified incrementally. Use "
+                "verify_tool_call_audit_log to re-verify the full chain."
+            )
+        else:
+            chain = scan["chain"]
+            matched_envelopes = list(scan["envelopes"])
+            # Every match in the log only when no sealed segment was skipped.
+            matched_envelope_count = len(matched_envelopes)
+            matched_count_complete = scan["complete"]
+            verified_envelope_count = scan["scanned_envelope_count"]
+            index_used = False
+            segments = {
+                "sealed_segment_count": scan["sealed_segment_count"],
+                "scanned_segment_count": scan["scanned_segment_count"],
+                "complete": scan["complete"],
+            }
         configured = configured_path is not None
+        if segments is not None and not segments["complete"]:
+            limitations.append(
+                f"Only the newest {segments['scanned_segment_count']} of "
+                f"{segments['sealed_segment_count']} sealed audit segments were read to fill the limit; "
+                "verified_prefix_envelope_count and matched_envelope_count cover the segments read, and older "
+                "segments are covered by the verified seal chain without re-hashing their records."
+            )
         if not exists:
             warnings.append(
                 "Audit log file does not exist yet; an empty chain is valid but contains no durable evidence."
@@ -3835,12 +4577,6 @@ async def export_tool_call_audit_log_evidence(
         if chain["verified"] is False and chain["verification_error"]:
             warnings.append(str(chain["verification_error"]))
 
-    matched_envelopes = [
-        envelope
-        for envelope in verified_envelopes
-        if (params.tool_name is None or envelope["record"]["tool_name"] == params.tool_name)
-        and (params.status is None or envelope["record"]["status"] == params.status)
-    ]
     exported_envelopes = matched_envelopes[-params.limit:] if params.limit else []
     payload = {
         "evidence_schema_version": "tool-call-audit-log-evidence.v1",
@@ -3853,18 +4589,23 @@ async def export_tool_call_audit_log_evidence(
             "limit": params.limit,
             "tool_name": params.tool_name,
             "status": params.status,
+            "started_after": params.started_after,
+            "started_before": params.started_before,
         },
         "chain": chain,
-        "verified_prefix_envelope_count": len(verified_envelopes),
-        "matched_envelope_count": len(matched_envelopes),
+        **({"segments": segments} if segments is not None else {}),
+        "index_used": index_used,
+        "verified_prefix_envelope_count": verified_envelope_count,
+        "matched_envelope_count": matched_envelope_count,
+        "matched_envelope_count_complete": matched_count_complete,
         "exported_envelope_count": len(exported_envelopes),
         "exported_order": "oldest_to_newest",
         "envelopes": exported_envelopes,
         "warnings": warnings,
         "limitations": limitations,
     }
-    payload["evidence_sha256"] = _metadata_payload_sha256(payload)
-    validate_payload(
+    payload["evidence_sha256"] = await _metadata_payload_sha256_offloaded(payload)
+    await validate_payload_async(
         payload,
         namespace="read",
         name="export_tool_call_audit_log_evidence.response.schema",
@@ -3872,17 +4613,30 @@ async def export_tool_call_audit_log_evidence(
     return payload
 
 
+def _audit_envelope_matches(
+    envelope: dict[str, Any],
+    params: ExportToolCallAuditLogEvidenceInput,
+) -> bool:
+    record = envelope["record"]
+    return (
+        (params.tool_name is None or record["tool_name"] == params.tool_name)
+        and (params.status is None or record["status"] == params.status)
+        and (params.started_after is None or record["started_at"] >= params.started_after)
+        and (params.started_before is None or record["started_at"] < params.started_before)
+    )
+
+
 async def list_tool_call_audit_records(
     params: ListToolCallAuditRecordsInput,
 ) -> dict[str, Any]:
-    all_records = [record.to_dict() for record in tool_call_audit_log.list_records()]
-    filtered_records = [
-        record
-        for record in all_records
-        if (params.tool_name is None or record["tool_name"] == params.tool_name)
-        and (params.status is None or record["status"] == params.status)
+    returned_records = [
+        record.to_dict()
+        for record in tool_call_audit_log.list_records(
+            tool_name=params.tool_name,
+            status=params.status,
+            limit=params.limit,
+        )
     ]
-    returned_records = filtered_records[-params.limit:] if params.limit else []
     payload = {
         "scope": "process_local_recent_records",
         "limit": params.limit,
@@ -3890,8 +4644,11 @@ async def list_tool_call_audit_records(
             "tool_name": params.tool_name,
             "status": params.status,
         },
-        "available_record_count": len(all_records),
-        "matched_record_count": len(filtered_records),
+        "available_record_count": tool_call_audit_log.count_records(),
+        "matched_record_count": tool_call_audit_log.count_records(
+            tool_name=params.tool_name,
+            status=params.status,
+        ),
         "returned_record_count": len(returned_records),
         "returned_order": "oldest_to_newest",
         "persistence": tool_call_audit_log.persistence_status(),
@@ -3909,6 +4666,201 @@ async def list_tool_call_audit_records(
     return payload
 
 
+async def get_tool_call_statistics(
+    params: GetToolCallStatisticsInput,
+) -> dict[str, Any]:
+    statistics = tool_call_audit_log.tool_statistics(params.tool_name)
+    payload = {
+        "scope": "process_local_rolling_statistics",
+        "generated_at": _current_utc_timestamp(),
+        "filters": {"tool_name": params.tool_name},
+        "window_size": tool_call_audit_log.stats_window,
+        "latency_percentiles": [f"p{value}" for value in TOOL_CALL_LATENCY_PERCENTILES],
+        "tool_count": len(statistics),
+        "tools": [{"tool_name": name, **stats} for name, stats in statistics.items()],
+        "limitations": [
+            "Statistics cover MCP tool calls handled by this server process since it started; they reset on restart.",
+            "Latency percentiles and window error rates cover each tool's most recent window_size calls; call_count and error_count cover every call.",
+            f"Calls naming an unregistered tool are grouped under {UNREGISTERED_TOOL_STATS_KEY!r}.",
+        ],
+    }
+    validate_payload(
+        payload,
+        namespace="read",
+        name="get_tool_call_statistics.response.schema",
+    )
+    return payload
+
+
+async def profile_tool_calls(params: ProfileToolCallsInput) -> dict[str, Any]:
+    if params.action == "arm":
+        sessions = [
+            tool_call_profiler.arm(
+                params.tool_name,
+                output_directory=(_artifact_output_root() / "profiles").resolve(),
+                mode=params.mode,
+                calls=params.calls,
+                duration_seconds=params.duration_seconds,
+                memory=params.memory,
+                sample_interval_seconds=params.sample_interval_ms / 1000,
+                top=params.top,
+            )
+        ]
+    elif params.action == "disarm":
+        sessions = tool_call_profiler.disarm(
+            session_id=params.session_id,
+            tool_name=params.tool_name,
+        )
+    elif params.session_id is not None:
+        session = tool_call_profiler.get(params.session_id)
+        sessions = [session] if session is not None else []
+    else:
+        sessions = tool_call_profiler.sessions(tool_name=params.tool_name)
+
+    payload = {
+        "action": params.action,
+        "generated_at": _current_utc_timestamp(),
+        "filters": {"tool_name": params.tool_name, "session_id": params.session_id},
+        "session_count": len(sessions),
+        "sessions": [session.to_dict() for session in sessions],
+        "limitations": [
+            "Profiles cover calls handled by this server process; sessions and their summaries reset on restart, while written profile files remain.",
+            "Only one call is profiled at a time; concurrent calls of an armed tool run unprofiled and do not consume the session.",
+            "cprofile mode profiles the event-loop thread, so other requests running concurrently on the loop appear in the profile; work offloaded to worker threads does not.",
+            "sampling mode samples every thread of the process, labelled by thread name, so idle and unrelated threads appear alongside the profiled call.",
+            "tracemalloc allocation sites compare snapshots taken before and after the call and include allocations made by concurrent requests.",
+        ],
+    }
+    validate_payload(
+        payload,
+        namespace="write",
+        name="profile_tool_calls.response.schema",
+    )
+    return payload
+
+
+_JOB_LIMITATIONS = [
+    "Without AOP_MCP_JOB_STORE_PATH, jobs are held in memory and lost on restart; with it, jobs interrupted by a crash are rerun once their lease expires.",
+    "Interactive jobs run before batch jobs and clients share workers by weight, but a job that has started is never preempted.",
+    "Cached results are reused only for read-only tools over external reference data, keyed by tool name and arguments, until they expire.",
+    "Finished jobs and their results are kept for AOP_MCP_JOB_RESULT_TTL_SECONDS, then purged.",
+    "Each job runs as its own audited tool call with the scopes and confirmation of the submit_job call.",
+    "Jobs are visible only to the client that submitted them, and a job's result only to callers holding the target tool's scopes.",
+]
+
+
+def _job_timestamp(value: datetime | None) -> str | None:
+    return _isoformat_utc(value) if value is not None else None
+
+
+def _job_payload(record: JobRecord, *, include_result: bool) -> dict[str, Any]:
+    payload = {
+        "job_id": record.job_id,
+        "tool_name": record.payload.get("tool_name"),
+        "status": record.status.value,
+        "created_at": _job_timestamp(record.created_at),
+        "updated_at": _job_timestamp(record.updated_at),
+        "started_at": _job_timestamp(record.started_at),
+        "finished_at": _job_timestamp(record.finished_at),
+        "timeout_seconds": record.timeout_seconds,
+        "priority": record.priority.value,
+        "client_id": record.client_id,
+        "attempts": record.attempts,
+        "cached": record.cached,
+        "progress": (
+            {
+                "progress": record.progress,
+                "total": record.progress_total,
+                "message": record.progress_message,
+            }
+            if record.progress is not None
+            else None
+        ),
+        "error": record.error,
+    }
+    if include_result:
+        # Imported here: the router imports the registry, which imports this module.
+        from src.server.mcp.dispatch import caller_may_read_job_result
+
+        withheld = record.result is not None and not caller_may_read_job_result(record)
+        payload["result"] = dict(record.result) if record.result is not None and not withheld else None
+        payload["result_withheld"] = withheld
+    return payload
+
+
+def _job_response(record: JobRecord, *, name: str, namespace: str = "read") -> dict[str, Any]:
+    payload = {
+        "generated_at": _current_utc_timestamp(),
+        "job": _job_payload(record, include_result=True),
+        "limitations": list(_JOB_LIMITATIONS),
+    }
+    validate_payload(payload, namespace=namespace, name=name)
+    return payload
+
+
+def _caller_job(job_id: str) -> JobRecord:
+    from src.server.mcp.dispatch import caller_owns_job
+
+    record = get_job_service().get(job_id)
+    # Other clients' jobs are reported as missing so their ids cannot be probed.
+    if record is None or not caller_owns_job(record):
+        raise JSONRPCError(INVALID_PARAMS, f"Job '{job_id}' not found")
+    return record
+
+
+async def submit_job(params: SubmitJobInput) -> dict[str, Any]:
+    # Imported here: the router imports the registry, which imports this module.
+    from src.server.mcp.dispatch import submit_tool_call_job
+
+    record = await submit_tool_call_job(
+        params.tool_name,
+        params.arguments,
+        timeout_seconds=params.timeout_seconds,
+        use_cache=params.use_cache,
+        priority=JobPriority(params.priority),
+    )
+    return _job_response(record, name="submit_job.response.schema")
+
+
+def _caller_jobs(params: ListJobsInput) -> list[JobRecord]:
+    from src.server.mcp.dispatch import caller_owns_job
+
+    get_job_runner().purge_expired()
+    status = JobStatus(params.status) if params.status is not None else None
+    return [
+        record
+        for record in get_job_service().list(status=status)
+        if caller_owns_job(record)
+        and (params.tool_name is None or record.payload.get("tool_name") == params.tool_name)
+    ]
+
+
+async def get_job(params: GetJobInput) -> dict[str, Any]:
+    record = await get_job_runner().call_store(_caller_job, params.job_id)
+    return _job_response(record, name="get_job.response.schema")
+
+
+async def cancel_job(params: CancelJobInput) -> dict[str, Any]:
+    runner = get_job_runner()
+    job = await runner.call_store(_caller_job, params.job_id)
+    record = await runner.cancel_async(job.job_id)
+    return _job_response(record, name="cancel_job.response.schema", namespace="write")
+
+
+async def list_jobs(params: ListJobsInput) -> dict[str, Any]:
+    records = await get_job_runner().call_store(_caller_jobs, params)
+    records.sort(key=lambda record: record.created_at, reverse=True)
+    payload = {
+        "generated_at": _current_utc_timestamp(),
+        "filters": {"status": params.status, "tool_name": params.tool_name},
+        "total_matches": len(records),
+        "jobs": [_job_payload(record, include_result=False) for record in records[: params.limit]],
+        "limitations": list(_JOB_LIMITATIONS),
+    }
+    validate_payload(payload, namespace="read", name="list_jobs.response.schema")
+    return payload
+
+
 async def verify_tool_call_audit_log(
     params: VerifyToolCallAuditLogInput,
 ) -> dict[str, Any]:
@@ -3937,7 +4889,7 @@ async def verify_tool_call_audit_log(
         }
     else:
         audit_path = Path(selected_path).expanduser().resolve()
-        chain = JsonlToolCallAuditSink(audit_path).chain_status()
+        chain = await offload.run_in_thread(_verify_audit_chain, audit_path)
         exists = audit_path.exists()
         if not exists:
             warnings.append(
@@ -5571,6 +6523,7 @@ async def _build_assay_cutoff_ordering_records(
     assay_limit: int = 5,
     stressor_limit: int = 10,
     min_hitcall: float = 0.9,
+    pool: _ConfidenceFetchPool | None = None,
 ) -> list[dict[str, Any]]:
     db_adapter = get_aop_db_adapter()
     comptox = getattr(db_adapter, "comptox", None)
@@ -5582,7 +6535,8 @@ async def _build_assay_cutoff_ordering_records(
             )
             for _ in ker_details
         ]
-    stressor_records = await db_adapter.list_stressor_chemicals_for_aop(aop_id)
+    pool = pool or _ConfidenceFetchPool()
+    stressor_records = await pool.list_stressor_chemicals_for_aop(aop_id)
     return await _build_assay_cutoff_ordering_records_for_stressors(
         stressor_records=stressor_records,
         key_event_details=key_event_details,
@@ -5590,6 +6544,7 @@ async def _build_assay_cutoff_ordering_records(
         assay_limit=assay_limit,
         stressor_limit=stressor_limit,
         min_hitcall=min_hitcall,
+        pool=pool,
     )
 
 
@@ -5601,6 +6556,7 @@ async def _build_assay_cutoff_ordering_records_for_stressors(
     assay_limit: int = 5,
     stressor_limit: int = 10,
     min_hitcall: float = 0.9,
+    pool: _ConfidenceFetchPool | None = None,
 ) -> list[dict[str, Any]]:
     if not ker_details:
         return []
@@ -5625,10 +6581,11 @@ async def _build_assay_cutoff_ordering_records_for_stressors(
             for _ in ker_details
         ]
 
+    pool = pool or _ConfidenceFetchPool()
     try:
         key_event_reports = await asyncio.gather(
             *(
-                db_adapter.search_assays_for_key_event(record, limit=assay_limit)
+                pool.search_assays_for_key_event(record, limit=assay_limit)
                 for record in key_event_details
             )
         )
@@ -5673,7 +6630,7 @@ async def _build_assay_cutoff_ordering_records_for_stressors(
             ]
 
         matched_chemicals = await asyncio.gather(
-            *(asyncio.to_thread(comptox.search_equal, search_value) for search_value in search_values)
+            *(pool.search_equal(comptox, search_value) for search_value in search_values)
         )
         matched_chemical_index: dict[str, dict[str, Any]] = {}
         for rows in matched_chemicals:
@@ -5703,7 +6660,7 @@ async def _build_assay_cutoff_ordering_records_for_stressors(
 
         bioactivity_rows = await asyncio.gather(
             *(
-                asyncio.to_thread(comptox.bioactivity_data_by_dtxsid, dtxsid)
+                pool.bioactivity_data_by_dtxsid(comptox, dtxsid)
                 for dtxsid in matched_chemical_index
             )
         )
@@ -7025,41 +7982,24 @@ def _enumerate_mie_to_ao_paths(
     *,
     max_paths: int = 64,
 ) -> list[list[str]]:
-    target_ids = set(ao_ids)
-    adjacency: dict[str, list[str]] = {}
-    event_ids: set[str] = set()
-    for record in ker_details:
-        upstream_id = record.get("upstream", {}).get("id")
-        downstream_id = record.get("downstream", {}).get("id")
-        if not upstream_id or not downstream_id:
-            continue
-        adjacency.setdefault(upstream_id, []).append(downstream_id)
-        event_ids.add(upstream_id)
-        event_ids.add(downstream_id)
-
-    max_depth = max(1, len(event_ids) + 1)
-    paths: list[list[str]] = []
-
-    def dfs(current_id: str, visited: set[str], path: list[str]) -> None:
-        if len(paths) >= max_paths or len(path) > max_depth:
-            return
-        if current_id in target_ids:
-            paths.append(list(path))
-            return
-        for next_id in adjacency.get(current_id, []):
-            if next_id in visited:
-                continue
-            visited.add(next_id)
-            path.append(next_id)
-            dfs(next_id, visited, path)
-            path.pop()
-            visited.remove(next_id)
+    edges = [
+        (record["upstream"]["id"], record["downstream"]["id"])
+        for record in ker_details
+        if (record.get("upstream") or {}).get("id") and (record.get("downstream") or {}).get("id")
+    ]
+    graph = PathwayGraph(edges, nodes=[*mie_ids, *ao_ids])
+    return [
+        list(path.nodes)
+        for path in graph.k_shortest_paths(mie_ids, ao_ids, k=max_paths)
+    ]
 
-    for mie_id in mie_ids:
-        dfs(mie_id, {mie_id}, [mie_id])
-        if len(paths) >= max_paths:
-            break
-    return paths
+
+def _ker_evidence_weight(record: dict[str, Any]) -> float:
+    """Map KER plausibility text to a path weight between 1.0 (strong) and 2.0 (unsupported)."""
+
+    text = record.get("biological_plausibility") or record.get("plausibility")
+    score = _SUPPORT_CALL_SCORES.get(_extract_support_call(text), 1.0)
+    return 1.0 + (_SUPPORT_CALL_SCORES["strong"] - score) / 2
 
 
 def _extract_essentiality_text_signal(texts: list[str | None]) -> tuple[str, int]:
@@ -7322,6 +8262,15 @@ def _extract_support_call(text: str | None) -> str:
     return "reported"
 
 
+def _related_aop_key(aop_id: str) -> str:
+    """Return the ``AOP:<n>`` key the related-AOP index uses for ``aop_id``."""
+
+    normalized = _normalize_aop_element_id(aop_id.strip())
+    if normalized.upper().startswith("AOP:"):
+        return f"AOP:{normalized.split(':', 1)[1]}"
+    return f"AOP:{normalized}" if normalized.isdigit() else normalized
+
+
 def _normalize_aop_element_id(value: str) -> str:
     if value.startswith("https://identifiers.org/aop.events/"):
         return f"KE:{value.rsplit('/', 1)[-1]}"
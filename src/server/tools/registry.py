@@ -8,7 +8,7 @@ from typing import Any, Callable, Dict
 from pydantic import BaseModel
 
 from src.server.mcp.protocol import ToolDescription
-from src.tools import load_schema
+from src.tools import compiled_schema_fingerprint, load_schema
 
 
 SourceDescriptor = dict[str, str]
@@ -43,6 +43,11 @@ REGISTRY_SOURCE: SourceDescriptor = {
     "url": "https://github.com/ToxMCP",
     "description": "Registry evidence supplied directly in the tool call.",
 }
+RUNTIME_SOURCE: SourceDescriptor = {
+    "name": "AOP MCP server runtime diagnostics",
+    "url": "https://github.com/ToxMCP/aop-mcp",
+    "description": "Process-local profiles and measurements of this server's own execution.",
+}
 CALLER_INPUT_SOURCE: SourceDescriptor = {
     "name": "Caller-provided scientific inputs",
     "url": "https://github.com/ToxMCP/aop-mcp",
@@ -58,7 +63,10 @@ _WIKI_TOOLS = {
     "get_ker",
     "get_related_aops",
     "assess_aop_confidence",
+    "assess_aop_confidences",
+    "query_aop_confidence_results",
     "find_paths_between_events",
+    "assemble_aop_network",
 }
 _AOP_DB_TOOLS = {"map_chemical_to_aops"}
 _ASSAY_TOOLS = {
@@ -77,6 +85,7 @@ _QUERY_ASSAY_TOOLS = {
 }
 _AUDIT_TOOLS = {
     "export_tool_call_audit_log_evidence",
+    "get_tool_call_statistics",
     "list_tool_call_audit_records",
     "verify_tool_call_audit_log",
 }
@@ -93,6 +102,7 @@ _DRAFT_EXTERNAL_TOOLS = {
     "plan_linear_draft_review_document",
 }
 _CALLER_INPUT_TOOLS = {"get_applicability", "get_evidence_matrix"}
+_RUNTIME_TOOLS = {"profile_tool_calls", "submit_job", "get_job", "cancel_job", "list_jobs"}
 
 
 def source_descriptors_for_tool(name: str) -> tuple[SourceDescriptor, ...]:
@@ -121,6 +131,8 @@ def source_descriptors_for_tool(name: str) -> tuple[SourceDescriptor, ...]:
         return (LOCAL_DRAFT_SOURCE, AOP_DB_SOURCE, COMPTOX_SOURCE)
     if name in _CALLER_INPUT_TOOLS:
         return (CALLER_INPUT_SOURCE,)
+    if name in _RUNTIME_TOOLS:
+        return (RUNTIME_SOURCE,)
     return (LOCAL_DRAFT_SOURCE,)
 
 
@@ -144,6 +156,7 @@ class RegisteredTool:
         self.handler = handler
         self.input_model = input_model
         self.output_schema = output_schema or {"type": "object"}
+        self.output_schema_hash = compiled_schema_fingerprint(self.output_schema)
         # Ensure input_schema is always a dictionary, even if the model has no fields
         self.input_schema = input_model.model_json_schema() or {}
         policy = classify_tool_policy(name, risk_class, required_scopes, requires_confirmation)
@@ -242,7 +255,9 @@ def classify_tool_policy(
 ) -> dict[str, Any]:
     if risk_class is None:
         lowered = name.lower()
-        if lowered.startswith(("save_", "create_", "add_", "update_", "delete_", "link_")):
+        if lowered.startswith("profile_"):
+            risk_class = "admin"
+        elif lowered.startswith(("save_", "create_", "add_", "update_", "delete_", "link_")):
             risk_class = "execute"
         elif "export" in lowered or "packet" in lowered or "document" in lowered:
             risk_class = "export"
@@ -328,6 +343,20 @@ tool_registry.register(
     input_model=aop.AssessAopConfidenceInput,
     output_schema=_schema("read", "assess_aop_confidence.response.schema"),
 )
+tool_registry.register(
+    name="assess_aop_confidences",
+    description="Run assess_aop_confidence for several AOPs at once, fetching and summarizing shared KEs and KERs only once.",
+    handler=aop.assess_aop_confidences,
+    input_model=aop.AssessAopConfidencesInput,
+    output_schema=_schema("read", "assess_aop_confidences.response.schema"),
+)
+tool_registry.register(
+    name="query_aop_confidence_results",
+    description="Filter and sort the precomputed corpus-wide table of heuristic AOP confidence calls and coverage metrics.",
+    handler=aop.query_aop_confidence_results,
+    input_model=aop.QueryAopConfidenceResultsInput,
+    output_schema=_schema("read", "query_aop_confidence_results.response.schema"),
+)
 tool_registry.register(
     name="find_paths_between_events",
     description="Find directed KE/KER paths between two events within a selected AOP.",
@@ -335,6 +364,13 @@ tool_registry.register(
     input_model=aop.FindPathsBetweenEventsInput,
     output_schema=_schema("read", "find_paths_between_events.response.schema"),
 )
+tool_registry.register(
+    name="assemble_aop_network",
+    description="Merge the KE/KER networks of several AOPs (by ID or search query) into one deduplicated graph with membership counts and centrality.",
+    handler=aop.assemble_aop_network,
+    input_model=aop.AssembleAopNetworkInput,
+    output_schema=_schema("read", "assemble_aop_network.response.schema"),
+)
 
 tool_registry.register(
     name="map_chemical_to_aops",
@@ -474,6 +510,56 @@ tool_registry.register(
     output_schema=_schema("read", "list_tool_call_audit_records.response.schema"),
 )
 
+tool_registry.register(
+    name="get_tool_call_statistics",
+    description="Report rolling per-tool MCP call statistics for this server process: call counts, error rates, and latency percentiles.",
+    handler=aop.get_tool_call_statistics,
+    input_model=aop.GetToolCallStatisticsInput,
+    output_schema=_schema("read", "get_tool_call_statistics.response.schema"),
+)
+
+tool_registry.register(
+    name="profile_tool_calls",
+    description="Arm, inspect, or disarm on-demand cProfile or stack-sampling profiles (optionally with tracemalloc allocation sites) of the next calls of a named tool; profiles are written under the artifact output directory.",
+    handler=aop.profile_tool_calls,
+    input_model=aop.ProfileToolCallsInput,
+    output_schema=_schema("write", "profile_tool_calls.response.schema"),
+    risk_class="admin",
+)
+
+tool_registry.register(
+    name="submit_job",
+    description="Run any other tool as a background job and return its job_id at once; poll get_job for progress and the result. The caller's scopes and confirmation are checked against the target tool at submission.",
+    handler=aop.submit_job,
+    input_model=aop.SubmitJobInput,
+    output_schema=_schema("read", "submit_job.response.schema"),
+)
+
+tool_registry.register(
+    name="get_job",
+    description="Report one of the caller's background jobs: status, progress, timing, and (once finished) its result or error.",
+    handler=aop.get_job,
+    input_model=aop.GetJobInput,
+    output_schema=_schema("read", "get_job.response.schema"),
+)
+
+tool_registry.register(
+    name="cancel_job",
+    description="Cancel one of the caller's pending or running background jobs; finished jobs are returned unchanged.",
+    handler=aop.cancel_job,
+    input_model=aop.CancelJobInput,
+    output_schema=_schema("write", "cancel_job.response.schema"),
+    risk_class="execute",
+)
+
+tool_registry.register(
+    name="list_jobs",
+    description="List the caller's recent background jobs, newest first, optionally filtered by status or tool name.",
+    handler=aop.list_jobs,
+    input_model=aop.ListJobsInput,
+    output_schema=_schema("read", "list_jobs.response.schema"),
+)
+
 tool_registry.register(
     name="verify_tool_call_audit_log",
     description="Verify the durable MCP tool-call audit JSONL hash chain from the configured audit log path or an explicit local path.",
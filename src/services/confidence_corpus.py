@@ -0,0 +1,249 @@
+"""Corpus-wide precomputation and querying of heuristic AOP confidence calls."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Sequence
+
+
+CONFIDENCE_DIMENSIONS: tuple[str, ...] = (
+    "biological_plausibility",
+    "empirical_support",
+    "quantitative_understanding",
+    "essentiality_of_key_events",
+)
+COVERAGE_COLUMNS: tuple[str, ...] = (
+    "key_event_count",
+    "ker_count",
+    "key_events_with_measurement_methods",
+    "kers_with_biological_plausibility",
+    "kers_with_empirical_support",
+    "kers_with_quantitative_understanding",
+)
+CONFIDENCE_RESULT_COLUMNS: tuple[str, ...] = (
+    "aop_id",
+    "title",
+    "overall_call",
+    *CONFIDENCE_DIMENSIONS,
+    *COVERAGE_COLUMNS,
+    "assessed_at",
+    "error",
+)
+# Ordinal ranks so "sort by call" orders strongest evidence first when descending.
+CALL_RANKS: dict[str, int] = {
+    "high": 4,
+    "strong": 3,
+    "moderate": 2,
+    "low": 1,
+    "sparse_evidence": 0,
+    "not_assessed": 0,
+    "not_reported": 0,
+}
+_CALL_COLUMNS = frozenset({"overall_call", *CONFIDENCE_DIMENSIONS})
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def confidence_result_row(aop_id: str, assessment: Mapping[str, Any]) -> dict[str, Any]:
+    """Flatten one ``assess_aop_confidence`` payload into a results-table row."""
+
+    coverage = assessment.get("coverage") or {}
+    row: dict[str, Any] = {
+        "aop_id": aop_id,
+        "title": (assessment.get("aop") or {}).get("title"),
+        "overall_call": assessment.get("overall_call"),
+        "assessed_at": _utc_now(),
+        "error": None,
+    }
+    for dimension in CONFIDENCE_DIMENSIONS:
+        row[dimension] = (assessment.get(dimension) or {}).get("heuristic_call")
+    for column in COVERAGE_COLUMNS:
+        row[column] = int(coverage.get(column) or 0)
+    return row
+
+
+def failed_result_row(aop_id: str, error: str) -> dict[str, Any]:
+    row: dict[str, Any] = {column: None for column in CONFIDENCE_RESULT_COLUMNS}
+    row.update({"aop_id": aop_id, "assessed_at": _utc_now(), "error": error})
+    return row
+
+
+def read_confidence_results(path: str | Path) -> dict[str, dict[str, Any]]:
+    """Read a results CSV; later rows for the same AOP replace earlier ones."""
+
+    rows: dict[str, dict[str, Any]] = {}
+    target = Path(path).expanduser()
+    if not target.exists():
+        return rows
+    with target.open("r", encoding="utf-8", newline="") as handle:
+        for raw in csv.DictReader(handle):
+            aop_id = raw.get("aop_id")
+            if not aop_id:
+                continue
+            row: dict[str, Any] = {}
+            for column in CONFIDENCE_RESULT_COLUMNS:
+                value = raw.get(column) or None
+                if value is not None and column in COVERAGE_COLUMNS:
+                    value = int(value)
+                row[column] = value
+            rows[aop_id] = row
+    return rows
+
+
+async def precompute_confidence_results(
+    aop_ids: Iterable[str],
+    assess: Callable[[str], Awaitable[Mapping[str, Any]]],
+    *,
+    output_path: str | Path,
+    concurrency: int = 4,
+    retry_failed: bool = False,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Stream AOP IDs through bounded-concurrency assessment into a CSV table.
+
+    The CSV doubles as the checkpoint: each row is appended and flushed as soon
+    as its assessment finishes, and a rerun skips AOPs that already have a row
+    (failed rows too, unless ``retry_failed`` is set).
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be positive")
+    target = Path(output_path).expanduser()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    existing = read_confidence_results(target)
+    done = {
+        aop_id for aop_id, row in existing.items() if not (retry_failed and row.get("error"))
+    }
+    summary = {"output_path": str(target), "skipped": 0, "assessed": 0, "failed": 0}
+    queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=concurrency * 2)
+    write_header = not target.exists() or target.stat().st_size == 0
+
+    with target.open("a", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=CONFIDENCE_RESULT_COLUMNS)
+        if write_header:
+            writer.writeheader()
+            handle.flush()
+
+        def record(row: dict[str, Any]) -> None:
+            writer.writerow(row)
+            handle.flush()
+            summary["failed" if row["error"] else "assessed"] += 1
+            if on_result is not None:
+                on_result(row)
+
+        async def worker() -> None:
+            while True:
+                aop_id = await queue.get()
+                try:
+                    if aop_id is None:
+                        return
+                    try:
+                        row = confidence_result_row(aop_id, await assess(aop_id))
+                    except Exception as exc:  # noqa: BLE001 - recorded per AOP, run continues
+                        row = failed_result_row(aop_id, f"{type(exc).__name__}: {exc}")
+                    record(row)
+                finally:
+                    queue.task_done()
+
+        async def produce() -> None:
+            seen: set[str] = set()
+            for aop_id in aop_ids:
+                if aop_id in seen:
+                    continue
+                seen.add(aop_id)
+                if aop_id in done:
+                    summary["skipped"] += 1
+                    continue
+                await queue.put(aop_id)
+            for _ in range(concurrency):
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(worker()) for _ in range(concurrency))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    return summary
+
+
+class ConfidenceResultsStore:
+    """Serve filtered, sorted views over a precomputed results CSV.
+
+    The table is loaded lazily and reloaded whenever the file changes, so a
+    running precompute job becomes visible without restarting the server.
+    """
+
+    def __init__(self, path: str | Path | None) -> None:
+        self.path = Path(path).expanduser() if path else None
+        self._rows: list[dict[str, Any]] = []
+        self._loaded_mtime_ns: int | None = None
+        self.updated_at: str | None = None
+
+    @property
+    def configured(self) -> bool:
+        return self.path is not None
+
+    def rows(self) -> list[dict[str, Any]]:
+        if self.path is None:
+            return self._rows
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return self._rows
+        if stat.st_mtime_ns != self._loaded_mtime_ns:
+            self._rows = list(read_confidence_results(self.path).values())
+            self._loaded_mtime_ns = stat.st_mtime_ns
+            self.updated_at = (
+                datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+                .replace(microsecond=0)
+                .isoformat()
+                .replace("+00:00", "Z")
+            )
+        return self._rows
+
+    def query(
+        self,
+        *,
+        filters: Mapping[str, Sequence[str]] | None = None,
+        min_ker_count: int | None = None,
+        title_contains: str | None = None,
+        include_failed: bool = False,
+        sort_by: str = "aop_id",
+        descending: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Return ``(matched_count, page)`` for the given filters and sort order."""
+
+        if sort_by not in CONFIDENCE_RESULT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort_by}")
+        wanted = {
+            column: frozenset(values) for column, values in (filters or {}).items() if values
+        }
+        needle = title_contains.lower() if title_contains else None
+        matched = [
+            row
+            for row in self.rows()
+            if (include_failed or not row["error"])
+            and all(row.get(column) in values for column, values in wanted.items())
+            and (min_ker_count is None or (row.get("ker_count") or 0) >= min_ker_count)
+            and (needle is None or needle in (row.get("title") or "").lower())
+        ]
+
+        def sort_key(row: dict[str, Any]) -> tuple[Any, ...]:
+            value = row.get(sort_by)
+            if sort_by in _CALL_COLUMNS:
+                value = CALL_RANKS.get(value or "", -1)
+            elif value is None:
+                value = -1 if sort_by in COVERAGE_COLUMNS else ""
+            return (value, row["aop_id"])
+
+        matched.sort(key=sort_key, reverse=descending)
+        return len(matched), [dict(row) for row in matched[offset : offset + limit]]
@@ -1,11 +1,19 @@
 """Async job service abstractions for long-running operations."""
 
-from .model import JobStatus, JobRecord
+from .model import JobPriority, JobStatus, JobRecord
+from .runner import JobRunner
+from .scheduling import FairShareScheduler, SchedulingPolicy
 from .service import JobService, InMemoryJobBackend
+from .sqlite_backend import SqliteJobBackend
 
 __all__ = [
+    "JobPriority",
     "JobStatus",
     "JobRecord",
+    "FairShareScheduler",
+    "JobRunner",
+    "SchedulingPolicy",
     "JobService",
     "InMemoryJobBackend",
+    "SqliteJobBackend",
 ]
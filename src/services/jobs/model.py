@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from time import time
 from typing import Any, Mapping
 
 
@@ -19,6 +20,19 @@ class JobStatus(str, Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+    @property
+    def is_terminal(self) -> bool:
+        return self in TERMINAL_JOB_STATUSES
+
+
+TERMINAL_JOB_STATUSES = frozenset({JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+
+class JobPriority(str, Enum):
+    # Someone is waiting on the result; scheduled ahead of batch work.
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
 
 @dataclass
 class JobRecord:
@@ -30,12 +44,62 @@ class JobRecord:
     payload: Mapping[str, Any] = field(default_factory=dict)
     result: Mapping[str, Any] | None = None
     error: str | None = None
+    timeout_seconds: float | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    progress: float | None = None
+    progress_total: float | None = None
+    progress_message: str | None = None
+    # Hash of the payload fields that determine the result; None if not cacheable.
+    cache_key: str | None = None
+    # Whether the result was served from the result cache instead of being computed.
+    cached: bool = False
+    attempts: int = 0
+    # Scheduling: who submitted the job, its priority class, and the rate-limited
+    # upstream services (e.g. "comptox") it calls.
+    client_id: str | None = None
+    priority: JobPriority = JobPriority.INTERACTIVE
+    upstreams: tuple[str, ...] = ()
+    lease_owner: str | None = None
+    lease_expires_at: float | None = None
 
     def set_status(self, status: JobStatus, *, result: Mapping[str, Any] | None = None, error: str | None = None) -> None:
         self.status = status
         self.updated_at = _utcnow()
+        if status == JobStatus.RUNNING and self.started_at is None:
+            self.started_at = self.updated_at
+        if status.is_terminal:
+            self.finished_at = self.updated_at
+        if status != JobStatus.RUNNING:
+            self.lease_owner = None
+            self.lease_expires_at = None
         if result is not None:
             self.result = result
         if error is not None:
             self.error = error
 
+    def start_lease(self, owner: str, *, lease_seconds: float) -> None:
+        """Mark the job running under a lease held by ``owner`` (one more attempt)."""
+
+        self.set_status(JobStatus.RUNNING)
+        self.attempts += 1
+        self.lease_owner = owner
+        self.lease_expires_at = time() + lease_seconds
+
+    def expire_lease(self, *, max_attempts: int) -> None:
+        """Requeue a job whose worker stopped renewing its lease, or fail it once out of attempts."""
+
+        if self.attempts >= max_attempts:
+            self.set_status(
+                JobStatus.FAILED,
+                error=f"Job abandoned after {self.attempts} attempt(s): its worker stopped renewing the lease",
+            )
+        else:
+            self.set_status(JobStatus.PENDING)
+
+    def set_progress(self, progress: float | None, *, total: float | None = None, message: str | None = None) -> None:
+        self.progress = progress
+        self.progress_total = total
+        self.progress_message = message
+        self.updated_at = _utcnow()
+
@@ -0,0 +1,400 @@
+"""Asynchronous execution of queued jobs."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Mapping, TypeVar
+from uuid import uuid4
+
+from src.instrumentation.audit import hash_json
+from src.instrumentation.metrics import metrics_recorder
+from src.instrumentation.progress import progress_scope
+
+from .model import JobPriority, JobRecord, JobStatus
+from .scheduling import FairShareScheduler, SchedulingPolicy
+from .service import JobService
+
+JobHandler = Callable[[JobRecord], Awaitable["Mapping[str, Any] | None"]]
+_T = TypeVar("_T")
+
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_JOB_TIMEOUT_SECONDS = 600.0
+DEFAULT_RESULT_TTL_SECONDS = 3600.0
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+# Idle workers poll this often for jobs submitted by other processes.
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+
+class JobRunner:
+    def __init__(
+        self,
+        service: JobService | None = None,
+        *,
+        max_workers: int = DEFAULT_JOB_WORKERS,
+        default_timeout_seconds: float = DEFAULT_JOB_TIMEOUT_SECONDS,
+        result_ttl_seconds: float | None = DEFAULT_RESULT_TTL_SECONDS,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        scheduling: SchedulingPolicy | None = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.service = service or JobService()
+        self.max_workers = max_workers
+        self.default_timeout_seconds = default_timeout_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval_seconds = poll_interval_seconds
+        self.scheduler = FairShareScheduler(scheduling)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._cache_key_fields: Dict[str, tuple[str, ...]] = {}
+        self._running: Dict[str, asyncio.Task[Any]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._store_thread: ThreadPoolExecutor | None = None
+
+    def register(
+        self,
+        job_type: str,
+        handler: JobHandler,
+        *,
+        cache_key_fields: tuple[str, ...] | None = None,
+    ) -> None:
+        """Register ``handler`` for ``job_type``.
+
+        ``cache_key_fields`` names the payload fields that fully determine the
+        result; jobs of this type are then served from the result cache.
+        """
+
+        self._handlers[job_type] = handler
+        if cache_key_fields is not None:
+            self._cache_key_fields[job_type] = cache_key_fields
+        else:
+            self._cache_key_fields.pop(job_type, None)
+
+    @property
+    def job_types(self) -> list[str]:
+        return sorted(self._handlers)
+
+    def submit(
+        self,
+        job_type: str,
+        payload: Mapping[str, Any],
+        *,
+        timeout_seconds: float | None = None,
+        use_cache: bool = True,
+        client_id: str | None = None,
+        priority: JobPriority = JobPriority.INTERACTIVE,
+        upstreams: tuple[str, ...] = (),
+    ) -> JobRecord:
+        """Queue a job; must be called from the event loop that runs the jobs.
+
+        With ``use_cache`` false the job neither reads nor fills the result cache.
+        """
+
+        record = self._store_job(
+            job_type,
+            payload,
+            timeout_seconds=timeout_seconds,
+            use_cache=use_cache,
+            client_id=client_id,
+            priority=priority,
+            upstreams=upstreams,
+        )
+        self._job_stored(record)
+        return record
+
+    async def submit_async(
+        self,
+        job_type: str,
+        payload: Mapping[str, Any],
+        *,
+        timeout_seconds: float | None = None,
+        use_cache: bool = True,
+        client_id: str | None = None,
+        priority: JobPriority = JobPriority.INTERACTIVE,
+        upstreams: tuple[str, ...] = (),
+    ) -> JobRecord:
+        """``submit`` with the store writes made through ``call_store``."""
+
+        record = await self.call_store(
+            self._store_job,
+            job_type,
+            payload,
+            timeout_seconds=timeout_seconds,
+            use_cache=use_cache,
+            client_id=client_id,
+            priority=priority,
+            upstreams=upstreams,
+        )
+        self._job_stored(record)
+        return record
+
+    def _store_job(
+        self,
+        job_type: str,
+        payload: Mapping[str, Any],
+        *,
+        timeout_seconds: float | None,
+        use_cache: bool,
+        client_id: str | None,
+        priority: JobPriority,
+        upstreams: tuple[str, ...],
+    ) -> JobRecord:
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        self.purge_expired()
+        fields = self._cache_key_fields.get(job_type)
+        cache_key = (
+            hash_json({"type": job_type, **{name: payload.get(name) for name in fields}})
+            if fields is not None and use_cache
+            else None
+        )
+        record = self.service.submit(
+            JobRecord(
+                job_id=uuid4().hex,
+                type=job_type,
+                payload=dict(payload),
+                timeout_seconds=timeout_seconds or self.default_timeout_seconds,
+                cache_key=cache_key,
+                client_id=client_id,
+                priority=JobPriority(priority),
+                upstreams=tuple(upstreams),
+            )
+        )
+        return record
+
+    def _job_stored(self, record: JobRecord) -> None:
+        if record.cached:
+            metrics_recorder.increment("jobs.cache_hits", type=record.type)
+        else:
+            self._ensure_workers().set()
+
+    def cancel(self, job_id: str) -> JobRecord:
+        """Cancel a pending or running job; finished jobs are returned unchanged."""
+
+        record = self._cancel_record(job_id)
+        self._cancel_task(job_id)
+        return record
+
+    async def cancel_async(self, job_id: str) -> JobRecord:
+        """``cancel`` with the store writes made through ``call_store``."""
+
+        record = await self.call_store(self._cancel_record, job_id)
+        self._cancel_task(job_id)
+        return record
+
+    def _cancel_record(self, job_id: str) -> JobRecord:
+        record = self.service.get(job_id)
+        if record is None:
+            raise KeyError(f"Job '{job_id}' not found")
+        if record.status.is_terminal:
+            return record
+        return self.service.cancel(job_id)
+
+    def _cancel_task(self, job_id: str) -> None:
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+
+    async def call_store(self, func: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+        """Call ``func``, which uses the job store, without blocking the event loop.
+
+        With a blocking backend the call runs on the runner's store thread in
+        a copy of the current context; otherwise it runs inline.
+        """
+
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        if not self.service.blocking:
+            return call()
+        return await asyncio.get_running_loop().run_in_executor(self._store_executor(), call)
+
+    def _store_executor(self) -> ThreadPoolExecutor:
+        if self._store_thread is None:
+            # One thread: store calls are serialized by the backend anyway, and
+            # progress updates queued on it keep their order.
+            self._store_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+        return self._store_thread
+
+    def purge_expired(self) -> int:
+        if self.result_ttl_seconds is None:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.result_ttl_seconds)
+        return self.service.purge(finished_before=cutoff)
+
+    def recover(self) -> int:
+        """Requeue jobs whose lease expired, e.g. those of a crashed worker."""
+
+        return self.service.requeue_expired(max_attempts=self.max_attempts)
+
+    def start(self) -> None:
+        """Start the workers on the running loop, picking up pending and expired jobs."""
+
+        self._ensure_workers().set()
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs still running go back to pending for the next start."""
+
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._loop = None
+        self._wakeup = None
+
+    def _ensure_workers(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._wakeup is None:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            # Workers start from an empty context rather than the submitting
+            # call's, whose tracing span and accounting scope end with it.
+            self._workers = [
+                loop.create_task(
+                    self._work(recover=index == 0),
+                    name=f"job-worker-{index}",
+                    context=contextvars.Context(),
+                )
+                for index in range(self.max_workers)
+            ]
+        return self._wakeup
+
+    async def _work(self, *, recover: bool) -> None:
+        assert self._wakeup is not None
+        wakeup = self._wakeup
+        if recover:
+            await self.call_store(self.recover)
+        while True:
+            # Clear before claiming so a submit racing with an empty claim still wakes us.
+            wakeup.clear()
+            record = await self.call_store(self._claim_next)
+            if record is None:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.poll_interval_seconds)
+                except TimeoutError:
+                    await self.call_store(self.recover)
+                continue
+            try:
+                await self._run(record)
+            finally:
+                # A finished job may lift a cap that kept other jobs waiting.
+                wakeup.set()
+
+    def _claim_next(self) -> JobRecord | None:
+        job_types = tuple(self._handlers)
+        # Another worker or process may claim the chosen job first; pick again.
+        for _ in range(3):
+            heads = self.service.pending_heads(job_types=job_types)
+            if not heads:
+                return None
+            choice = self.scheduler.select(heads, self.service.list(status=JobStatus.RUNNING))
+            if choice is None:
+                return None
+            record = self.service.claim(
+                self.owner,
+                lease_seconds=self.lease_seconds,
+                job_types=job_types,
+                job_id=choice.job_id,
+                admit=self.scheduler.admits,
+            )
+            if record is not None:
+                self.scheduler.charge(record)
+                metrics_recorder.increment(
+                    "jobs.dispatched", priority=record.priority.value
+                )
+                return record
+        return None
+
+    async def _run(self, record: JobRecord) -> None:
+        job_id = record.job_id
+        handler = self._handlers[record.type]
+
+        def report(progress: float, total: float | None, message: str | None) -> None:
+            try:
+                self.service.report_progress(job_id, progress, total=total, message=message)
+            except KeyError:
+                # The job was purged or deleted while running.
+                pass
+
+        def on_progress(progress: float, total: float | None, message: str | None) -> None:
+            if self.service.blocking:
+                # Queued behind earlier updates; the handler does not wait for it.
+                self._store_executor().submit(report, progress, total, message)
+            else:
+                report(progress, total, message)
+
+        # The task copies this context, so the handler reports to this job.
+        with progress_scope(on_progress):
+            task = asyncio.ensure_future(_call_with_timeout(handler, record))
+        self._running[job_id] = task
+        start = perf_counter()
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=self.lease_seconds / 3)
+                if not task.done() and not await self.call_store(
+                    self.service.renew_lease, job_id, self.owner, lease_seconds=self.lease_seconds
+                ):
+                    # Cancelled elsewhere, or the lease lapsed and another worker took over.
+                    task.cancel()
+                    await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            await self.call_store(self.service.release, job_id, self.owner)
+            raise
+        finally:
+            self._running.pop(job_id, None)
+
+        status = await self.call_store(self._finish, record, task)
+        metrics_recorder.increment("jobs.completed", type=record.type, status=status)
+        metrics_recorder.observe("jobs.run_seconds", perf_counter() - start, type=record.type)
+
+    def _finish(self, record: JobRecord, task: asyncio.Future[Any]) -> str:
+        """Record the outcome of ``record``'s finished ``task``; return the job's status."""
+
+        job_id = record.job_id
+        current = self.service.get(job_id)
+        if current is None:
+            # Purged or deleted while running; there is nothing left to update.
+            return JobStatus.CANCELLED.value
+        if current.status != JobStatus.RUNNING or current.lease_owner != self.owner:
+            status = current.status.value
+        elif task.cancelled():
+            status = self.service.cancel(job_id).status.value
+        elif isinstance(task.exception(), TimeoutError):
+            error = f"Job timed out after {record.timeout_seconds:g}s"
+            status = self.service.mark_failed(job_id, error=error).status.value
+        elif task.exception() is not None:
+            exc = task.exception()
+            error = f"{type(exc).__name__}: {exc}"
+            status = self.service.mark_failed(job_id, error=error).status.value
+        else:
+            status = self.service.mark_succeeded(job_id, result=task.result() or {}).status.value
+        return status
+
+
+async def _call_with_timeout(handler: JobHandler, record: JobRecord) -> Mapping[str, Any] | None:
+    async with asyncio.timeout(record.timeout_seconds):
+        return await handler(record)
+
+
+__all__ = [
+    "DEFAULT_JOB_TIMEOUT_SECONDS",
+    "DEFAULT_JOB_WORKERS",
+    "DEFAULT_LEASE_SECONDS",
+    "DEFAULT_MAX_ATTEMPTS",
+    "DEFAULT_RESULT_TTL_SECONDS",
+    "JobHandler",
+    "JobRunner",
+]
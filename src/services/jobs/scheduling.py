@@ -0,0 +1,105 @@
+"""Priority classes and weighted fair sharing of job workers between clients."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+from .model import JobPriority, JobRecord
+
+ANONYMOUS_CLIENT = "anonymous"
+
+
+@dataclass(frozen=True)
+class SchedulingPolicy:
+    client_weights: Mapping[str, float] = field(default_factory=dict)
+    default_weight: float = 1.0
+    # None means no cap.
+    max_running_per_client: int | None = None
+    batch_max_running: int | None = None
+    upstream_max_running_per_client: Mapping[str, int] = field(default_factory=dict)
+
+    def weight(self, client_id: str) -> float:
+        return self.client_weights.get(client_id, self.default_weight)
+
+
+class FairShareScheduler:
+    def __init__(self, policy: SchedulingPolicy | None = None) -> None:
+        self.policy = policy or SchedulingPolicy()
+        self._pass: dict[str, float] = {}
+        self._virtual_time = 0.0
+        # Clients with queued or running jobs as of the last ``select``.
+        self._active: set[str] = set()
+
+    def select(self, heads: Iterable[JobRecord], running: Iterable[JobRecord]) -> JobRecord | None:
+        """Pick the next job among the queue ``heads``, given the jobs ``running`` now."""
+
+        heads = list(heads)
+        running = list(running)
+        self._active = {_client(record) for record in (*heads, *running)}
+        counts = _RunningCounts(running)
+
+        eligible = [head for head in heads if self._within_caps(head, counts)]
+        for priority in (JobPriority.INTERACTIVE, JobPriority.BATCH):
+            candidates = [head for head in eligible if head.priority == priority]
+            if candidates:
+                return min(
+                    candidates,
+                    key=lambda head: (self._client_pass(_client(head)), head.created_at),
+                )
+        return None
+
+    def admits(self, record: JobRecord, running: Iterable[JobRecord]) -> bool:
+        """Whether ``record`` may start while the jobs ``running`` are running."""
+
+        return self._within_caps(record, _RunningCounts(list(running)))
+
+    def _within_caps(self, record: JobRecord, counts: "_RunningCounts") -> bool:
+        policy = self.policy
+        client = _client(record)
+        if (
+            record.priority == JobPriority.BATCH
+            and policy.batch_max_running is not None
+            and counts.batch >= policy.batch_max_running
+        ):
+            return False
+        if (
+            policy.max_running_per_client is not None
+            and counts.per_client[client] >= policy.max_running_per_client
+        ):
+            return False
+        return all(
+            counts.per_upstream[(client, upstream)]
+            < policy.upstream_max_running_per_client.get(upstream, float("inf"))
+            for upstream in record.upstreams
+        )
+
+    def charge(self, record: JobRecord) -> None:
+        """Account one dispatched job to its client."""
+
+        client = _client(record)
+        start = self._client_pass(client)
+        self._virtual_time = max(self._virtual_time, start)
+        self._pass[client] = start + 1.0 / self.policy.weight(client)
+        for idle in [key for key in self._pass if key != client and key not in self._active]:
+            del self._pass[idle]
+
+    def _client_pass(self, client: str) -> float:
+        return max(self._pass.get(client, 0.0), self._virtual_time)
+
+
+class _RunningCounts:
+    def __init__(self, running: list[JobRecord]) -> None:
+        self.per_client = Counter(_client(record) for record in running)
+        self.per_upstream = Counter(
+            (_client(record), upstream) for record in running for upstream in record.upstreams
+        )
+        self.batch = sum(record.priority == JobPriority.BATCH for record in running)
+
+
+def _client(record: JobRecord) -> str:
+    return record.client_id or ANONYMOUS_CLIENT
+
+
+__all__ = ["ANONYMOUS_CLIENT", "FairShareScheduler", "SchedulingPolicy"]
@@ -3,13 +3,22 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import Dict, Iterable, Protocol
+from datetime import datetime, timezone
+from time import time
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, Mapping, Protocol
 
 from .model import JobRecord, JobStatus
 from src.instrumentation.logging import StructuredLogger
 
+# Called with the chosen job and the jobs running now, inside the claim; False skips the claim.
+ClaimCheck = Callable[[JobRecord, list[JobRecord]], bool]
+
 
 class JobBackend(Protocol):
+    # Whether calls may wait on I/O or locks, so async callers should make
+    # them off the event loop.
+    blocking: bool
+
     def enqueue(self, job: JobRecord) -> JobRecord:
         ...
 
@@ -22,10 +31,55 @@ class JobBackend(Protocol):
     def update(self, job_id: str, *, status: JobStatus, result=None, error: str | None = None) -> JobRecord:
         ...
 
+    def update_progress(
+        self,
+        job_id: str,
+        *,
+        progress: float | None,
+        total: float | None = None,
+        message: str | None = None,
+    ) -> JobRecord:
+        ...
+
+    def purge(self, *, finished_before: datetime) -> int:
+        ...
+
+    def claim(
+        self,
+        owner: str,
+        *,
+        lease_seconds: float,
+        job_types: Collection[str] | None = None,
+        job_id: str | None = None,
+        admit: ClaimCheck | None = None,
+    ) -> JobRecord | None:
+        ...
+
+    def pending_heads(self, *, job_types: Collection[str] | None = None) -> list[JobRecord]:
+        ...
+
+    def renew_lease(self, job_id: str, owner: str, *, lease_seconds: float) -> bool:
+        ...
+
+    def release(self, job_id: str, owner: str) -> bool:
+        ...
+
+    def requeue_expired(self, *, max_attempts: int) -> list[JobRecord]:
+        ...
+
+    def cached_result(self, cache_key: str) -> Mapping[str, Any] | None:
+        ...
+
+    def store_result(self, cache_key: str, result: Mapping[str, Any]) -> None:
+        ...
+
 
 class InMemoryJobBackend(JobBackend):
+    blocking = False
+
     def __init__(self) -> None:
         self._records: Dict[str, JobRecord] = {}
+        self._results: Dict[str, tuple[datetime, Mapping[str, Any]]] = {}
 
     def enqueue(self, job: JobRecord) -> JobRecord:
         if job.job_id in self._records:
@@ -49,17 +103,183 @@ class InMemoryJobBackend(JobBackend):
         record.set_status(status, result=result, error=error)
         return replace(record)
 
+    def update_progress(
+        self,
+        job_id: str,
+        *,
+        progress: float | None,
+        total: float | None = None,
+        message: str | None = None,
+    ) -> JobRecord:
+        record = self._records.get(job_id)
+        if record is None:
+            raise KeyError(f"Job '{job_id}' not found")
+        record.set_progress(progress, total=total, message=message)
+        return replace(record)
+
+    def purge(self, *, finished_before: datetime) -> int:
+        expired = [
+            job_id
+            for job_id, record in self._records.items()
+            if record.finished_at is not None and record.finished_at < finished_before
+        ]
+        for job_id in expired:
+            del self._records[job_id]
+        for cache_key in [key for key, (stored_at, _) in self._results.items() if stored_at < finished_before]:
+            del self._results[cache_key]
+        return len(expired)
+
+    def claim(
+        self,
+        owner: str,
+        *,
+        lease_seconds: float,
+        job_types: Collection[str] | None = None,
+        job_id: str | None = None,
+        admit: ClaimCheck | None = None,
+    ) -> JobRecord | None:
+        pending = [
+            record
+            for record in self._pending(job_types)
+            if job_id is None or record.job_id == job_id
+        ]
+        if not pending:
+            return None
+        record = min(pending, key=lambda item: item.created_at)
+        if admit is not None and not admit(record, self._running()):
+            return None
+        record.start_lease(owner, lease_seconds=lease_seconds)
+        return replace(record)
+
+    def pending_heads(self, *, job_types: Collection[str] | None = None) -> list[JobRecord]:
+        heads: Dict[tuple[str | None, str], JobRecord] = {}
+        for record in self._pending(job_types):
+            key = (record.client_id, record.priority.value)
+            if key not in heads or record.created_at < heads[key].created_at:
+                heads[key] = record
+        return [replace(record) for record in heads.values()]
+
+    def _running(self) -> list[JobRecord]:
+        return [record for record in self._records.values() if record.status == JobStatus.RUNNING]
+
+    def _pending(self, job_types: Collection[str] | None) -> Iterator[JobRecord]:
+        for record in self._records.values():
+            if record.status == JobStatus.PENDING and (job_types is None or record.type in job_types):
+                yield record
+
+    def renew_lease(self, job_id: str, owner: str, *, lease_seconds: float) -> bool:
+        record = self._records.get(job_id)
+        if record is None or record.status != JobStatus.RUNNING or record.lease_owner != owner:
+            return False
+        record.lease_expires_at = time() + lease_seconds
+        return True
+
+    def release(self, job_id: str, owner: str) -> bool:
+        record = self._records.get(job_id)
+        if record is None or record.status != JobStatus.RUNNING or record.lease_owner != owner:
+            return False
+        record.set_status(JobStatus.PENDING)
+        record.attempts -= 1
+        return True
+
+    def requeue_expired(self, *, max_attempts: int) -> list[JobRecord]:
+        now = time()
+        changed = []
+        for record in self._records.values():
+            if (
+                record.status != JobStatus.RUNNING
+                or record.lease_expires_at is None
+                or record.lease_expires_at > now
+            ):
+                continue
+            record.expire_lease(max_attempts=max_attempts)
+            changed.append(replace(record))
+        return changed
+
+    def cached_result(self, cache_key: str) -> Mapping[str, Any] | None:
+        entry = self._results.get(cache_key)
+        return entry[1] if entry is not None else None
+
+    def store_result(self, cache_key: str, result: Mapping[str, Any]) -> None:
+        self._results[cache_key] = (datetime.now(timezone.utc), result)
+
 
 class JobService:
     def __init__(self, backend: JobBackend | None = None, logger: StructuredLogger | None = None) -> None:
         self._backend = backend or InMemoryJobBackend()
         self._logger = logger or StructuredLogger("job-service")
 
+    @property
+    def blocking(self) -> bool:
+        """Whether the backend may block; see ``JobRunner.call_store``."""
+
+        return self._backend.blocking
+
     def submit(self, job: JobRecord) -> JobRecord:
+        """Store ``job``; with a cached result for its ``cache_key`` it is stored already succeeded."""
+
+        cached = self._backend.cached_result(job.cache_key) if job.cache_key else None
+        if cached is not None:
+            job = replace(job, cached=True)
+            job.set_status(JobStatus.SUCCEEDED, result=cached)
         stored = self._backend.enqueue(job)
-        self._logger.info("job_submitted", job_id=stored.job_id, job_type=stored.type)
+        self._logger.info(
+            "job_submitted", job_id=stored.job_id, job_type=stored.type, cached=stored.cached
+        )
         return stored
 
+    def claim(
+        self,
+        owner: str,
+        *,
+        lease_seconds: float,
+        job_types: Collection[str] | None = None,
+        job_id: str | None = None,
+        admit: ClaimCheck | None = None,
+    ) -> JobRecord | None:
+        """Start a pending job under a lease held by ``owner``.
+
+        Claims ``job_id`` if given, otherwise the oldest pending job. Returns
+        None when there is nothing to claim, including when ``job_id`` is no
+        longer pending or ``admit`` rejects it given the jobs running now.
+        """
+
+        record = self._backend.claim(
+            owner, lease_seconds=lease_seconds, job_types=job_types, job_id=job_id, admit=admit
+        )
+        if record is not None:
+            self._logger.info("job_running", job_id=record.job_id, attempt=record.attempts)
+        return record
+
+    def pending_heads(self, *, job_types: Collection[str] | None = None) -> list[JobRecord]:
+        """The oldest pending job of each (client, priority) queue, for the scheduler."""
+
+        return self._backend.pending_heads(job_types=job_types)
+
+    def renew_lease(self, job_id: str, owner: str, *, lease_seconds: float) -> bool:
+        """Extend ``owner``'s lease; False once the job was cancelled or claimed elsewhere."""
+
+        return self._backend.renew_lease(job_id, owner, lease_seconds=lease_seconds)
+
+    def release(self, job_id: str, owner: str) -> bool:
+        """Return a running job to pending, e.g. when its worker shuts down."""
+
+        released = self._backend.release(job_id, owner)
+        if released:
+            self._logger.info("job_released", job_id=job_id)
+        return released
+
+    def requeue_expired(self, *, max_attempts: int = 3) -> int:
+        """Requeue running jobs whose lease expired; fail those out of attempts."""
+
+        changed = self._backend.requeue_expired(max_attempts=max_attempts)
+        for record in changed:
+            if record.status == JobStatus.FAILED:
+                self._logger.error("job_failed", job_id=record.job_id, error=record.error)
+            else:
+                self._logger.warning("job_requeued", job_id=record.job_id, attempts=record.attempts)
+        return sum(record.status == JobStatus.PENDING for record in changed)
+
     def mark_running(self, job_id: str) -> JobRecord:
         record = self._backend.update(job_id, status=JobStatus.RUNNING)
         self._logger.info("job_running", job_id=record.job_id)
@@ -67,6 +287,8 @@ class JobService:
 
     def mark_succeeded(self, job_id: str, *, result=None) -> JobRecord:
         record = self._backend.update(job_id, status=JobStatus.SUCCEEDED, result=result)
+        if record.cache_key and result is not None:
+            self._backend.store_result(record.cache_key, result)
         self._logger.info("job_succeeded", job_id=record.job_id)
         return record
 
@@ -80,6 +302,24 @@ class JobService:
         self._logger.warning("job_cancelled", job_id=record.job_id)
         return record
 
+    def report_progress(
+        self,
+        job_id: str,
+        progress: float | None,
+        *,
+        total: float | None = None,
+        message: str | None = None,
+    ) -> JobRecord:
+        return self._backend.update_progress(job_id, progress=progress, total=total, message=message)
+
+    def purge(self, *, finished_before: datetime) -> int:
+        """Drop finished jobs, and cached results, from before ``finished_before``."""
+
+        purged = self._backend.purge(finished_before=finished_before)
+        if purged:
+            self._logger.info("jobs_purged", count=purged)
+        return purged
+
     def get(self, job_id: str) -> JobRecord | None:
         return self._backend.get(job_id)
 
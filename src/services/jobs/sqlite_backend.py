@@ -0,0 +1,411 @@
+"""SQLite job backend that survives restarts and can be shared by several workers."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from time import time
+from typing import Any, Collection, Iterable, Mapping
+
+from .model import JobPriority, JobRecord, JobStatus
+from .service import ClaimCheck
+
+JOB_STORE_SCHEMA_VERSION = "job-store.v2"
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    timeout_seconds REAL,
+    started_at TEXT,
+    finished_at TEXT,
+    progress REAL,
+    progress_total REAL,
+    progress_message TEXT,
+    cache_key TEXT,
+    cached INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    client_id TEXT,
+    priority TEXT NOT NULL DEFAULT 'interactive',
+    upstreams TEXT NOT NULL DEFAULT '[]',
+    lease_owner TEXT,
+    lease_expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    cache_key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    stored_at TEXT NOT NULL
+);
+"""
+
+# Created after migrations, since they may index columns that older stores lack.
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_by_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_status_client_priority
+    ON jobs (status, client_id, priority, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_finished ON jobs (finished_at) WHERE finished_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS results_by_stored ON results (stored_at);
+"""
+
+# Columns each older schema version lacks, added in place when such a store is opened.
+_MIGRATIONS: dict[str, tuple[tuple[str, str], ...]] = {
+    "job-store.v1": (
+        ("client_id", "TEXT"),
+        ("priority", "TEXT NOT NULL DEFAULT 'interactive'"),
+        ("upstreams", "TEXT NOT NULL DEFAULT '[]'"),
+    ),
+}
+
+_COLUMNS = (
+    "job_id",
+    "type",
+    "status",
+    "created_at",
+    "updated_at",
+    "payload",
+    "result",
+    "error",
+    "timeout_seconds",
+    "started_at",
+    "finished_at",
+    "progress",
+    "progress_total",
+    "progress_message",
+    "cache_key",
+    "cached",
+    "attempts",
+    "client_id",
+    "priority",
+    "upstreams",
+    "lease_owner",
+    "lease_expires_at",
+)
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM jobs"
+
+
+class SqliteJobBackend:
+    """``JobBackend`` that stores jobs and cached results in a SQLite file."""
+
+    # Writes wait up to 30 s for other processes' transactions.
+    blocking = True
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; writes open explicit IMMEDIATE transactions.
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._lock = threading.Lock()
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        # executescript commits on its own, so it runs outside a transaction.
+        self._connection.executescript(_TABLES)
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is None:
+                connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (JOB_STORE_SCHEMA_VERSION,),
+                )
+            elif row[0] in _MIGRATIONS:
+                self._migrate(connection, row[0])
+            elif row[0] != JOB_STORE_SCHEMA_VERSION:
+                raise ValueError(
+                    f"Job store {self.path} has schema {row[0]}, expected {JOB_STORE_SCHEMA_VERSION}"
+                )
+        self._connection.executescript(_INDEXES)
+
+    def enqueue(self, job: JobRecord) -> JobRecord:
+        with self._transaction() as connection:
+            try:
+                connection.execute(
+                    f"INSERT INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    _to_row(job),
+                )
+            except sqlite3.IntegrityError as exc:
+                raise ValueError(f"Job '{job.job_id}' already exists") from exc
+        return job
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            row = self._connection.execute(f"{_SELECT} WHERE job_id = ?", (job_id,)).fetchone()
+        return _from_row(row) if row is not None else None
+
+    def list(self, *, status: JobStatus | None = None) -> Iterable[JobRecord]:
+        with self._lock:
+            if status is None:
+                rows = self._connection.execute(f"{_SELECT} ORDER BY created_at").fetchall()
+            else:
+                rows = self._connection.execute(
+                    f"{_SELECT} WHERE status = ? ORDER BY created_at", (status.value,)
+                ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def update(self, job_id: str, *, status: JobStatus, result=None, error: str | None = None) -> JobRecord:
+        with self._transaction() as connection:
+            record = self._require(connection, job_id)
+            record.set_status(status, result=result, error=error)
+            self._write(connection, record)
+        return record
+
+    def update_progress(
+        self,
+        job_id: str,
+        *,
+        progress: float | None,
+        total: float | None = None,
+        message: str | None = None,
+    ) -> JobRecord:
+        with self._transaction() as connection:
+            record = self._require(connection, job_id)
+            record.set_progress(progress, total=total, message=message)
+            self._write(connection, record)
+        return record
+
+    def purge(self, *, finished_before: datetime) -> int:
+        cutoff = _timestamp(finished_before)
+        with self._transaction() as connection:
+            purged = connection.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,)
+            ).rowcount
+            connection.execute("DELETE FROM results WHERE stored_at < ?", (cutoff,))
+        return purged
+
+    def claim(
+        self,
+        owner: str,
+        *,
+        lease_seconds: float,
+        job_types: Collection[str] | None = None,
+        job_id: str | None = None,
+        admit: ClaimCheck | None = None,
+    ) -> JobRecord | None:
+        where, parameters = _pending_filter(job_types)
+        if job_id is not None:
+            where += " AND job_id = ?"
+            parameters.append(job_id)
+        with self._transaction() as connection:
+            row = connection.execute(
+                f"{_SELECT} WHERE {where} ORDER BY created_at LIMIT 1", parameters
+            ).fetchone()
+            if row is None:
+                return None
+            record = _from_row(row)
+            if admit is not None:
+                # Read under the write lock, so other processes' claims are counted.
+                running = connection.execute(
+                    f"{_SELECT} WHERE status = ?", (JobStatus.RUNNING.value,)
+                ).fetchall()
+                if not admit(record, [_from_row(item) for item in running]):
+                    return None
+            record.start_lease(owner, lease_seconds=lease_seconds)
+            self._write(connection, record)
+        return record
+
+    def pending_heads(self, *, job_types: Collection[str] | None = None) -> list[JobRecord]:
+        where, parameters = _pending_filter(job_types)
+        # Served by jobs_by_status_client_priority: one row per (client, priority) queue.
+        query = (
+            f"SELECT {', '.join(_COLUMNS)} FROM ("
+            f"SELECT *, ROW_NUMBER() OVER (PARTITION BY client_id, priority ORDER BY created_at) AS position"
+            f" FROM jobs WHERE {where}) WHERE position = 1"
+        )
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def renew_lease(self, job_id: str, owner: str, *, lease_seconds: float) -> bool:
+        with self._transaction() as connection:
+            renewed = connection.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE job_id = ? AND status = ? AND lease_owner = ?",
+                (time() + lease_seconds, job_id, JobStatus.RUNNING.value, owner),
+            ).rowcount
+        return bool(renewed)
+
+    def release(self, job_id: str, owner: str) -> bool:
+        with self._transaction() as connection:
+            row = connection.execute(f"{_SELECT} WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return False
+            record = _from_row(row)
+            if record.status != JobStatus.RUNNING or record.lease_owner != owner:
+                return False
+            record.set_status(JobStatus.PENDING)
+            record.attempts -= 1
+            self._write(connection, record)
+        return True
+
+    def requeue_expired(self, *, max_attempts: int) -> list[JobRecord]:
+        changed = []
+        with self._transaction() as connection:
+            rows = connection.execute(
+                f"{_SELECT} WHERE status = ? AND lease_expires_at <= ?",
+                (JobStatus.RUNNING.value, time()),
+            ).fetchall()
+            for row in rows:
+                record = _from_row(row)
+                record.expire_lease(max_attempts=max_attempts)
+                self._write(connection, record)
+                changed.append(record)
+        return changed
+
+    def cached_result(self, cache_key: str) -> Mapping[str, Any] | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result FROM results WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def store_result(self, cache_key: str, result: Mapping[str, Any]) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (cache_key, result, stored_at) VALUES (?, ?, ?)",
+                (cache_key, json.dumps(result), _timestamp(datetime.now(timezone.utc))),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection, version: str) -> None:
+        existing = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for column, definition in _MIGRATIONS[version]:
+            if column not in existing:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        connection.execute(
+            "UPDATE meta SET value = ? WHERE key = 'schema_version'", (JOB_STORE_SCHEMA_VERSION,)
+        )
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection, self._lock)
+
+    @staticmethod
+    def _require(connection: sqlite3.Connection, job_id: str) -> JobRecord:
+        row = connection.execute(f"{_SELECT} WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Job '{job_id}' not found")
+        return _from_row(row)
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, record: JobRecord) -> None:
+        assignments = ", ".join(f"{column} = ?" for column in _COLUMNS[1:])
+        row = _to_row(record)
+        connection.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*row[1:], row[0]))
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` (or ``ROLLBACK``) under the backend lock."""
+
+    def __init__(self, connection: sqlite3.Connection, lock: threading.Lock) -> None:
+        self._connection = connection
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._connection
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            self._connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+def _pending_filter(job_types: Collection[str] | None) -> tuple[str, list[Any]]:
+    where = "status = ?"
+    parameters: list[Any] = [JobStatus.PENDING.value]
+    if job_types is not None:
+        # An empty collection matches nothing.
+        where += f" AND type IN ({', '.join('?' * len(job_types)) or 'NULL'})"
+        parameters.extend(job_types)
+    return where, parameters
+
+
+def _timestamp(value: datetime | None) -> str | None:
+    # Fixed-width UTC ISO strings sort chronologically, which the indexes rely on.
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _datetime(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+
+
+def _to_row(record: JobRecord) -> tuple[Any, ...]:
+    return (
+        record.job_id,
+        record.type,
+        record.status.value,
+        _timestamp(record.created_at),
+        _timestamp(record.updated_at),
+        json.dumps(dict(record.payload)),
+        json.dumps(dict(record.result)) if record.result is not None else None,
+        record.error,
+        record.timeout_seconds,
+        _timestamp(record.started_at),
+        _timestamp(record.finished_at),
+        record.progress,
+        record.progress_total,
+        record.progress_message,
+        record.cache_key,
+        int(record.cached),
+        record.attempts,
+        record.client_id,
+        record.priority.value,
+        json.dumps(list(record.upstreams)),
+        record.lease_owner,
+        record.lease_expires_at,
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> JobRecord:
+    values = dict(zip(_COLUMNS, row))
+    return JobRecord(
+        job_id=values["job_id"],
+        type=values["type"],
+        status=JobStatus(values["status"]),
+        created_at=_datetime(values["created_at"]),
+        updated_at=_datetime(values["updated_at"]),
+        payload=json.loads(values["payload"]),
+        result=json.loads(values["result"]) if values["result"] is not None else None,
+        error=values["error"],
+        timeout_seconds=values["timeout_seconds"],
+        started_at=_datetime(values["started_at"]),
+        finished_at=_datetime(values["finished_at"]),
+        progress=values["progress"],
+        progress_total=values["progress_total"],
+        progress_message=values["progress_message"],
+        cache_key=values["cache_key"],
+        cached=bool(values["cached"]),
+        attempts=values["attempts"],
+        client_id=values["client_id"],
+        priority=JobPriority(values["priority"]),
+        upstreams=tuple(json.loads(values["upstreams"])),
+        lease_owner=values["lease_owner"],
+        lease_expires_at=values["lease_expires_at"],
+    )
+
+
+__all__ = ["JOB_STORE_SCHEMA_VERSION", "SqliteJobBackend"]
@@ -0,0 +1,230 @@
+"""Precomputed AOP-to-AOP overlap index backing ``get_related_aops``."""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Literal, Mapping
+
+
+SimilarityMetric = Literal["shared_elements", "jaccard", "overlap", "cosine"]
+SIMILARITY_METRICS: tuple[SimilarityMetric, ...] = ("shared_elements", "jaccard", "overlap", "cosine")
+INDEX_SCHEMA_VERSION = "related-aops-index.v1"
+
+
+def _sort_key(metric: SimilarityMetric, item: Mapping[str, Any]) -> tuple[Any, ...]:
+    counts = (
+        -int(item["shared_key_event_count"]),
+        -int(item["shared_ker_count"]),
+        (item.get("title") or "").lower(),
+        item["id"],
+    )
+    if metric == "shared_elements":
+        return counts
+    return (-float(item[metric]), *counts)
+
+
+@dataclass
+class AopSimilarityIndex:
+    """Sparse top-k neighbour lists derived from AOP KE/KER membership.
+
+    ``neighbors`` keeps, for every AOP, the union of its top-k neighbours under
+    each supported metric, so any metric can be served from memory without
+    materialising the full AOP x AOP matrix.
+    """
+
+    generated_at: str
+    top_k: int
+    aops: dict[str, dict[str, Any]] = field(default_factory=dict)
+    neighbors: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+
+    def has_aop(self, aop_id: str) -> bool:
+        return aop_id in self.aops
+
+    def related(
+        self,
+        aop_id: str,
+        *,
+        limit: int,
+        metric: SimilarityMetric = "shared_elements",
+    ) -> list[dict[str, Any]] | None:
+        if aop_id not in self.aops:
+            return None
+        ranked = sorted(self.neighbors.get(aop_id, []), key=lambda item: _sort_key(metric, item))
+        return [dict(item) for item in ranked[:limit]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "schema_version": INDEX_SCHEMA_VERSION,
+            "generated_at": self.generated_at,
+            "top_k": self.top_k,
+            "aops": self.aops,
+            "neighbors": self.neighbors,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "AopSimilarityIndex":
+        if payload.get("schema_version") != INDEX_SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported related-AOP index schema version: {payload.get('schema_version')!r}"
+            )
+        return cls(
+            generated_at=str(payload["generated_at"]),
+            top_k=int(payload["top_k"]),
+            aops={str(key): dict(value) for key, value in payload["aops"].items()},
+            neighbors={
+                str(key): [dict(item) for item in value]
+                for key, value in payload["neighbors"].items()
+            },
+        )
+
+    def save(self, path: str | Path) -> Path:
+        target = Path(path).expanduser()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.tmp")
+        temporary.write_text(
+            json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        temporary.replace(target)
+        return target
+
+    @classmethod
+    def load(cls, path: str | Path) -> "AopSimilarityIndex":
+        return cls.from_dict(json.loads(Path(path).expanduser().read_text(encoding="utf-8")))
+
+
+def build_aop_similarity_index(
+    memberships: Iterable[Mapping[str, Any]],
+    *,
+    top_k: int = 100,
+    generated_at: str | None = None,
+) -> AopSimilarityIndex:
+    """Compute the sparse AOP x AOP overlap matrix from KE/KER incidence.
+
+    Element identifiers are interned to integers and inverted into posting
+    lists, so each row of ``A @ A.T`` is accumulated only over the AOPs that
+    actually share an element. Jaccard, overlap, and cosine scores are
+    computed on key-event membership, matching the KE-level sharing reported
+    by the live SPARQL query.
+    """
+
+    if top_k < 1:
+        raise ValueError("top_k must be positive")
+    aop_ids: list[str] = []
+    aops: dict[str, dict[str, Any]] = {}
+    key_event_rows: list[frozenset[int]] = []
+    ker_rows: list[frozenset[int]] = []
+    element_index: dict[str, int] = {}
+
+    def intern(values: Iterable[str]) -> frozenset[int]:
+        return frozenset(element_index.setdefault(value, len(element_index)) for value in values if value)
+
+    for record in memberships:
+        aop_id = record.get("id") or record.get("iri")
+        if not aop_id or aop_id in aops:
+            continue
+        key_events = intern(record.get("key_event_ids") or [])
+        kers = intern(record.get("ker_ids") or [])
+        aop_ids.append(aop_id)
+        key_event_rows.append(key_events)
+        ker_rows.append(kers)
+        aops[aop_id] = {
+            "iri": record.get("iri"),
+            "title": record.get("title"),
+            "key_event_count": len(key_events),
+            "ker_count": len(kers),
+        }
+
+    key_event_postings: dict[int, list[int]] = {}
+    ker_postings: dict[int, list[int]] = {}
+    for row_index, (key_events, kers) in enumerate(zip(key_event_rows, ker_rows)):
+        for element in key_events:
+            key_event_postings.setdefault(element, []).append(row_index)
+        for element in kers:
+            ker_postings.setdefault(element, []).append(row_index)
+
+    neighbors: dict[str, list[dict[str, Any]]] = {}
+    for row_index, aop_id in enumerate(aop_ids):
+        shared_key_events: dict[int, int] = {}
+        shared_kers: dict[int, int] = {}
+        for element in key_event_rows[row_index]:
+            for other in key_event_postings[element]:
+                shared_key_events[other] = shared_key_events.get(other, 0) + 1
+        for element in ker_rows[row_index]:
+            for other in ker_postings[element]:
+                shared_kers[other] = shared_kers.get(other, 0) + 1
+
+        size = len(key_event_rows[row_index])
+        row: list[dict[str, Any]] = []
+        for other in set(shared_key_events) | set(shared_kers):
+            if other == row_index:
+                continue
+            other_id = aop_ids[other]
+            other_size = len(key_event_rows[other])
+            shared_ke = shared_key_events.get(other, 0)
+            shared_ker = shared_kers.get(other, 0)
+            union = size + other_size - shared_ke
+            row.append(
+                {
+                    "id": other_id,
+                    "iri": aops[other_id]["iri"],
+                    "title": aops[other_id]["title"],
+                    "shared_key_event_count": shared_ke,
+                    "shared_ker_count": shared_ker,
+                    "total_shared_elements": shared_ke + shared_ker,
+                    "jaccard": round(shared_ke / union, 6) if union else 0.0,
+                    "overlap": round(shared_ke / min(size, other_size), 6) if size and other_size else 0.0,
+                    "cosine": round(shared_ke / math.sqrt(size * other_size), 6) if size and other_size else 0.0,
+                }
+            )
+
+        kept: dict[str, dict[str, Any]] = {}
+        for metric in SIMILARITY_METRICS:
+            for item in sorted(row, key=lambda item: _sort_key(metric, item))[:top_k]:
+                kept[item["id"]] = item
+        neighbors[aop_id] = sorted(kept.values(), key=lambda item: _sort_key("shared_elements", item))
+
+    return AopSimilarityIndex(
+        generated_at=generated_at
+        or datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        top_k=top_k,
+        aops=aops,
+        neighbors=neighbors,
+    )
+
+
+async def build_aop_similarity_index_from_adapter(adapter: Any, *, top_k: int = 100) -> AopSimilarityIndex:
+    return build_aop_similarity_index(await adapter.list_aop_memberships(), top_k=top_k)
+
+
+class RelatedAopsIndexStore:
+    """Load a saved index lazily and reload it when the file is rewritten."""
+
+    def __init__(self, path: str | Path | None) -> None:
+        self.path = Path(path).expanduser() if path else None
+        self._index: AopSimilarityIndex | None = None
+        self._loaded_mtime_ns: int | None = None
+        self.last_error: str | None = None
+
+    def get(self) -> AopSimilarityIndex | None:
+        if self.path is None:
+            return self._index
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError:
+            return self._index
+        if mtime_ns != self._loaded_mtime_ns:
+            try:
+                self._index = AopSimilarityIndex.load(self.path)
+                self.last_error = None
+            except (OSError, ValueError, KeyError) as exc:
+                self.last_error = str(exc)
+            self._loaded_mtime_ns = mtime_ns
+        return self._index
+
+    def set(self, index: AopSimilarityIndex | None) -> None:
+        self._index = index
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from hashlib import sha256
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from jsonschema import Draft202012Validator
 
+from src.instrumentation.accounting import accounting_phase
+from src.instrumentation.tracing import tracer
+from src.tools.offload import offload
 
 
 SCHEMA_ROOT = Path(__file__).resolve().parents[2] / "docs" / "contracts" / "schemas"
@@ -16,31 +24,206 @@ class SchemaValidationError(Exception):
     """Raised when a payload does not conform to the expected schema."""
 
 
+@dataclass
+class _CompiledSchema:
+    schema: dict[str, Any]
+    fingerprint: str
+    validator: Draft202012Validator
+
+
+@dataclass
+class PayloadValidationScope:
+    """Validations observed while a scope is active.
+
+    ``validated`` maps ``id(payload)`` to the payload and the fingerprint of
+    the schema it passed, so the router can tell whether a handler already
+    checked its result against the tool's output schema. Holding the payload
+    keeps its id from being reused by a later object. When ``enabled`` is false,
+    ``validate_payload`` skips schema checks for the scope.
+    """
+
+    enabled: bool = True
+    validated: dict[int, tuple[Any, str]] = field(default_factory=dict)
+    skipped: int = 0
+
+    def was_validated(self, payload: Any, fingerprint: str) -> bool:
+        entry = self.validated.get(id(payload))
+        return entry is not None and entry[0] is payload and entry[1] == fingerprint
+
+
+# Process-wide validator registry. Schemas are loaded and compiled once and
+# treated as read-only afterwards.
+_NAMED_SCHEMAS: dict[tuple[str, str], _CompiledSchema] = {}
+_COMPILED_BY_FINGERPRINT: dict[str, _CompiledSchema] = {}
+_COMPILED_BY_ID: dict[int, _CompiledSchema] = {}
+_validation_scope: ContextVar[PayloadValidationScope | None] = ContextVar(
+    "payload_validation_scope", default=None
+)
+
+
+def schema_fingerprint(schema: dict[str, Any]) -> str:
+    """Return the canonical SHA-256 of a schema (same encoding as audit hashes)."""
+
+    canonical = json.dumps(
+        schema,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=True,
+        default=repr,
+    )
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+
 def load_schema(namespace: str, name: str) -> dict[str, Any]:
-    schema_path = SCHEMA_ROOT / namespace / f"{name}.json"
-    if not schema_path.exists():
-        raise FileNotFoundError(f"Schema '{namespace}/{name}' not found")
-    return json_load(schema_path)
+    return _named_schema(namespace, name).schema
+
+
+def _named_schema(namespace: str, name: str) -> _CompiledSchema:
+    compiled = _NAMED_SCHEMAS.get((namespace, name))
+    if compiled is None:
+        schema_path = SCHEMA_ROOT / namespace / f"{name}.json"
+        if not schema_path.exists():
+            raise FileNotFoundError(f"Schema '{namespace}/{name}' not found")
+        compiled = _compile(json_load(schema_path), remember_identity=True)
+        _NAMED_SCHEMAS[(namespace, name)] = compiled
+    return compiled
+
+
+def _compile(schema: dict[str, Any], *, remember_identity: bool = False) -> _CompiledSchema:
+    cached = _COMPILED_BY_ID.get(id(schema))
+    if cached is not None and cached.schema is schema:
+        return cached
+    fingerprint = schema_fingerprint(schema)
+    compiled = _COMPILED_BY_FINGERPRINT.get(fingerprint)
+    if compiled is None:
+        compiled = _CompiledSchema(
+            schema=schema,
+            fingerprint=fingerprint,
+            validator=Draft202012Validator(schema),
+        )
+        _COMPILED_BY_FINGERPRINT[fingerprint] = compiled
+    if not remember_identity:
+        return compiled
+    # The entry keeps a reference to the schema object, so its id stays unique.
+    if compiled.schema is not schema:
+        compiled = _CompiledSchema(
+            schema=schema,
+            fingerprint=fingerprint,
+            validator=compiled.validator,
+        )
+    _COMPILED_BY_ID[id(schema)] = compiled
+    return compiled
+
+
+def compiled_schema_fingerprint(schema: dict[str, Any]) -> str:
+    """Return the fingerprint of ``schema``, compiling its validator if needed.
+
+    The schema object is remembered by identity, so later validations against
+    the same dict skip re-hashing it.
+    """
+
+    return _compile(schema, remember_identity=True).fingerprint
 
 
 def json_load(path: Path) -> dict[str, Any]:
-    import json
-
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
 
 
+@contextmanager
+def payload_validation_scope(*, enabled: bool = True) -> Iterator[PayloadValidationScope]:
+    """Track (or, when ``enabled`` is false, skip) ``validate_payload`` calls."""
+
+    scope = PayloadValidationScope(enabled=enabled)
+    token = _validation_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _validation_scope.reset(token)
+
+
 def validate_payload(payload: dict[str, Any], *, namespace: str, name: str) -> None:
-    schema = load_schema(namespace, name)
-    validate_payload_against_schema(payload, schema)
+    compiled = _named_schema(namespace, name)
+    scope = _validation_scope.get()
+    if scope is not None and not scope.enabled:
+        scope.skipped += 1
+        return
+    _raise_for_errors(compiled.validator, payload)
+    if scope is not None:
+        scope.validated[id(payload)] = (payload, compiled.fingerprint)
 
 
 def validate_payload_against_schema(payload: dict[str, Any], schema: dict[str, Any]) -> None:
-    validator = Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(payload), key=lambda e: e.path)
-    if errors:
-        message = "; ".join(error.message for error in errors)
+    _raise_for_errors(_compile(schema).validator, payload)
+
+
+async def validate_payload_async(payload: dict[str, Any], *, namespace: str, name: str) -> None:
+    """``validate_payload`` that validates large payloads in a worker process."""
+
+    compiled = _named_schema(namespace, name)
+    scope = _validation_scope.get()
+    if scope is not None and not scope.enabled:
+        scope.skipped += 1
+        return
+    await _raise_for_errors_offloaded(compiled, payload)
+    if scope is not None:
+        scope.validated[id(payload)] = (payload, compiled.fingerprint)
+
+
+async def validate_payload_against_schema_async(
+    payload: dict[str, Any],
+    schema: dict[str, Any],
+) -> None:
+    await _raise_for_errors_offloaded(_compile(schema), payload)
+
+
+async def _raise_for_errors_offloaded(compiled: _CompiledSchema, payload: Any) -> None:
+    if not offload.should_offload(payload):
+        _raise_for_errors(compiled.validator, payload)
+        return
+    with (
+        accounting_phase("schema_validation"),
+        tracer.span(
+            "validate_payload",
+            **{"schema.title": compiled.schema.get("title"), "offloaded": True},
+        ),
+    ):
+        message = await offload.run_in_process(_schema_error_message, compiled.schema, payload)
+    if message is not None:
+        raise SchemaValidationError(message)
+
+
+def _schema_error_message(schema: dict[str, Any], payload: Any) -> str | None:
+    """Worker-side validation; compiled validators are cached per worker by fingerprint."""
+
+    return _error_message(_compile(schema).validator, payload)
+
+
+def _raise_for_errors(validator: Draft202012Validator, payload: Any) -> None:
+    with (
+        accounting_phase("schema_validation"),
+        tracer.span("validate_payload", **{"schema.title": validator.schema.get("title")}),
+    ):
+        message = _error_message(validator, payload)
+    if message is not None:
         raise SchemaValidationError(message)
 
 
-__all__ = ["SchemaValidationError", "validate_payload", "validate_payload_against_schema"]
+def _error_message(validator: Draft202012Validator, payload: Any) -> str | None:
+    if validator.is_valid(payload):
+        return None
+    errors = sorted(validator.iter_errors(payload), key=lambda e: e.path)
+    return "; ".join(error.message for error in errors)
+
+
+__all__ = [
+    "PayloadValidationScope",
+    "SchemaValidationError",
+    "compiled_schema_fingerprint",
+    "payload_validation_scope",
+    "schema_fingerprint",
+    "validate_payload",
+    "validate_payload_against_schema",
+    "validate_payload_against_schema_async",
+    "validate_payload_async",
+]
@@ -0,0 +1,160 @@
+"""Worker pools for CPU-bound stages of tool calls."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from time import perf_counter
+from typing import Any, Callable, TypeVar
+
+from src.instrumentation.metrics import metrics_recorder
+
+DEFAULT_THREAD_WORKERS = 4
+DEFAULT_PROCESS_WORKERS = 0
+DEFAULT_MIN_OFFLOAD_BYTES = 64 * 1024
+
+_T = TypeVar("_T")
+
+
+def estimated_json_size_exceeds(value: Any, limit: int) -> bool:
+    """Return whether ``value`` would encode to at least ``limit`` JSON bytes (roughly).
+
+    Walks the structure and stops as soon as the estimate reaches ``limit``,
+    so the check costs at most about ``limit`` bytes' worth of traversal.
+    """
+
+    if limit <= 0:
+        return True
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            total += len(item) + 2
+        elif isinstance(item, dict):
+            total += 2
+            for key, child in item.items():
+                total += len(key) + 4 if isinstance(key, str) else 8
+                stack.append(child)
+        elif isinstance(item, (list, tuple)):
+            total += 2 + len(item)
+            stack.extend(item)
+        else:
+            total += 8
+        if total >= limit:
+            return True
+    return False
+
+
+class WorkerPools:
+    """Lazily created thread and process pools shared by the server process."""
+
+    def __init__(
+        self,
+        *,
+        thread_workers: int = DEFAULT_THREAD_WORKERS,
+        process_workers: int = DEFAULT_PROCESS_WORKERS,
+        min_offload_bytes: int = DEFAULT_MIN_OFFLOAD_BYTES,
+    ) -> None:
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.configure(
+            thread_workers=thread_workers,
+            process_workers=process_workers,
+            min_offload_bytes=min_offload_bytes,
+        )
+
+    def configure(
+        self,
+        *,
+        thread_workers: int = DEFAULT_THREAD_WORKERS,
+        process_workers: int = DEFAULT_PROCESS_WORKERS,
+        min_offload_bytes: int = DEFAULT_MIN_OFFLOAD_BYTES,
+    ) -> None:
+        if thread_workers < 1:
+            raise ValueError("thread_workers must be at least 1")
+        if process_workers < 0:
+            raise ValueError("process_workers must not be negative")
+        self.shutdown(wait=False)
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.min_offload_bytes = min_offload_bytes
+
+    def should_offload(self, payload: Any) -> bool:
+        return estimated_json_size_exceeds(payload, self.min_offload_bytes)
+
+    async def run_in_thread(self, func: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+        """Run ``func`` on the thread pool in a copy of the current context."""
+
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await self._run("thread", self._threads(), call)
+
+    async def run_in_process(self, func: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+        """Run ``func`` in a worker process (on the thread pool if none are configured)."""
+
+        if self.process_workers == 0:
+            return await self.run_in_thread(func, *args, **kwargs)
+        call = functools.partial(func, *args, **kwargs)
+        try:
+            return await self._run("process", self._processes(), call)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next call.
+            with self._lock:
+                self._process_pool = None
+            raise
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._lock:
+            pools = (self._thread_pool, self._process_pool)
+            self._thread_pool = self._process_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    async def _run(self, kind: str, executor: Executor, call: Callable[[], _T]) -> _T:
+        start = perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+        finally:
+            metrics_recorder.increment("offload.tasks", pool=kind)
+            metrics_recorder.observe("offload.task_seconds", perf_counter() - start, pool=kind)
+
+    def _threads(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_workers,
+                    thread_name_prefix="offload",
+                )
+            return self._thread_pool
+
+    def _processes(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # Forking a process that runs the loop, the audit writer, and
+                # monitor threads can copy held locks, so workers are spawned.
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._process_pool
+
+
+offload = WorkerPools()
+
+
+__all__ = [
+    "DEFAULT_MIN_OFFLOAD_BYTES",
+    "DEFAULT_PROCESS_WORKERS",
+    "DEFAULT_THREAD_WORKERS",
+    "WorkerPools",
+    "estimated_json_size_exceeds",
+    "offload",
+]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+from src.tools import schema_fingerprint
+
+
+DEFAULT_OUTPUT_SCHEMA = {
+    "title": "fake_tool.response",
+    "type": "object",
+    "required": ["ok"],
+    "properties": {"ok": {"type": "boolean"}},
+    "additionalProperties": False,
+}
+ECHO_OUTPUT_SCHEMA = {
+    "title": "fake_tool.response",
+    "type": "object",
+    "required": ["echo"],
+    "properties": {"echo": {"type": "string"}},
+    "additionalProperties": False,
+}
+
+
+class FakeRegisteredTool:
+    sources = [
+        {
+            "name": "Test fixture",
+            "url": "https://github.com/ToxMCP/aop-mcp",
+            "description": "Synthetic evidence used by the unit-test tool.",
+        }
+    ]
+
+    def __init__(
+        self,
+        output_schema: dict[str, Any] | None = None,
+        *,
+        required_scopes: tuple[str, ...] = ("toxmcp:read",),
+        requires_confirmation: bool = False,
+    ) -> None:
+        self.output_schema = output_schema if output_schema is not None else DEFAULT_OUTPUT_SCHEMA
+        self.output_schema_hash = schema_fingerprint(self.output_schema)
+        self.risk_class = "read"
+        self.required_scopes = required_scopes
+        self.requires_confirmation = requires_confirmation
+
+
+class FakeToolRegistry:
+    """Serves one tool, ``name``, to the MCP dispatcher.
+
+    A call returns a copy of ``result``, or, when ``handler`` is given, what
+    ``handler`` returns for the call's arguments.
+    """
+
+    def __init__(
+        self,
+        result: dict[str, Any] | None = None,
+        *,
+        name: str = "fake_tool",
+        handler: Callable[[dict[str, Any]], Awaitable[dict[str, Any]]] | None = None,
+        output_schema: dict[str, Any] | None = None,
+        required_scopes: tuple[str, ...] = ("toxmcp:read",),
+        requires_confirmation: bool = False,
+    ) -> None:
+        self.name = name
+        self._result = result or {}
+        self._handler = handler
+        self._tool = FakeRegisteredTool(
+            output_schema,
+            required_scopes=required_scopes,
+            requires_confirmation=requires_confirmation,
+        )
+
+    def get_tool(self, name: str) -> FakeRegisteredTool:
+        if name != self.name:
+            raise KeyError(f"Tool '{name}' not found")
+        return self._tool
+
+    async def call_tool(self, name: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        self.get_tool(name)
+        if self._handler is not None:
+            return await self._handler(params or {})
+        return dict(self._result)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
+from pydantic import ValidationError
 
+from src.server.config.settings import get_settings
 from src.server.tools import aop as aop_tools
 from src.services.draft_store import (
     DraftStoreService,
@@ -10,6 +14,7 @@ from src.services.draft_store import (
     InMemoryDraftRepository,
     UpdateDraftInput,
 )
+from src.services.related_aops import RelatedAopsIndexStore, build_aop_similarity_index
 from src.tools import validate_payload
 from src.tools.write import WriteTools
 
@@ -238,6 +243,37 @@ async def test_find_paths_between_events_returns_multiple_paths(monkeypatch) ->
     assert result["results"][0]["event_path"][-1]["id"] == "KE:3"
 
 
+@pytest.mark.asyncio
+async def test_find_paths_between_events_supports_evidence_weighting(monkeypatch) -> None:
+    class EvidenceWikiAdapter(StubWikiAdapter):
+        async def list_kers(self, aop_id: str):
+            plausibility = {
+                "KER:10": "Strong support.",
+                "KER:11": "Strong support.",
+                "KER:12": "Low support.",
+            }
+            return [
+                {**record, "plausibility": plausibility[record["id"]]}
+                for record in await super().list_kers(aop_id)
+            ]
+
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: EvidenceWikiAdapter())
+
+    result = await aop_tools.find_paths_between_events(
+        aop_tools.FindPathsBetweenEventsInput(
+            aop_id="AOP:232",
+            source_event_id="KE:1",
+            target_event_id="KE:3",
+            weighting="evidence",
+        )
+    )
+
+    assert result["weighting"] == "evidence"
+    assert [path["path_weight"] for path in result["results"]] == [2.0, 2.0]
+    assert [len(path["ker_path"]) for path in result["results"]] == [1, 2]
+    assert result["results"][1]["ker_path"][0]["id"] == "KER:10"
+
+
 @pytest.mark.asyncio
 async def test_get_related_aops_tool_wraps_source_aop(monkeypatch) -> None:
     monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: StubWikiAdapter())
@@ -253,6 +289,118 @@ async def test_get_related_aops_tool_wraps_source_aop(monkeypatch) -> None:
     assert result["results"][0]["id"] == "AOP:517"
 
 
+@pytest.mark.asyncio
+async def test_assemble_aop_network_merges_shared_events_and_scores_centrality(monkeypatch) -> None:
+    def ke(number: int, title: str) -> dict:
+        return {"id": f"KE:{number}", "iri": f"https://identifiers.org/aop.events/{number}", "title": title, "event_type": None}
+
+    def ker(number: int, upstream: int, downstream: int) -> dict:
+        return {
+            "id": f"KER:{number}",
+            "iri": f"https://identifiers.org/aop.relationships/{number}",
+            "upstream": {"id": f"KE:{upstream}", "iri": f"https://identifiers.org/aop.events/{upstream}"},
+            "downstream": {"id": f"KE:{downstream}", "iri": f"https://identifiers.org/aop.events/{downstream}"},
+        }
+
+    class NetworkWikiAdapter:
+        requested: list[list[str]] = []
+
+        async def search_aops(self, *, text: str | None = None, limit: int = 25):
+            assert text == "steatosis"
+            return [{"id": "AOP:517"}, {"id": "AOP:232"}]
+
+        async def list_aop_networks(self, aop_ids):
+            self.requested.append(list(aop_ids))
+            return [
+                {
+                    "id": "AOP:232",
+                    "iri": "https://identifiers.org/aop/232",
+                    "title": "Short",
+                    "key_events": [ke(1, "MIE"), ke(3, "AO")],
+                    "kers": [ker(10, 1, 3)],
+                },
+                {
+                    "id": "AOP:517",
+                    "iri": "https://identifiers.org/aop/517",
+                    "title": "Long",
+                    "key_events": [ke(1, "MIE"), ke(2, "KE"), ke(3, "AO")],
+                    "kers": [ker(10, 1, 3), ker(11, 1, 2), ker(12, 2, 3)],
+                },
+            ]
+
+    adapter = NetworkWikiAdapter()
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: adapter)
+
+    result = await aop_tools.assemble_aop_network(
+        aop_tools.AssembleAopNetworkInput(aop_ids=["AOP:232"], query="steatosis")
+    )
+
+    assert adapter.requested == [["AOP:232", "AOP:517"]]
+    assert result["node_count"] == 3
+    assert result["edge_count"] == 3
+    nodes = {node["id"]: node for node in result["nodes"]}
+    assert nodes["KE:1"]["aop_ids"] == ["AOP:232", "AOP:517"]
+    assert nodes["KE:2"]["aop_count"] == 1
+    assert nodes["KE:1"]["out_degree"] == 2
+    assert nodes["KE:2"]["betweenness"] == 0.0
+    edges = {edge["id"]: edge for edge in result["edges"]}
+    assert edges["KER:10"]["aop_count"] == 2
+    assert edges["KER:12"]["aop_ids"] == ["AOP:517"]
+
+
+def test_assemble_aop_network_requires_ids_or_query() -> None:
+    with pytest.raises(ValidationError):
+        aop_tools.AssembleAopNetworkInput()
+
+
+@pytest.mark.asyncio
+async def test_get_related_aops_serves_precomputed_index(monkeypatch) -> None:
+    class IndexOnlyWikiAdapter(StubWikiAdapter):
+        async def get_aop(self, aop_id: str):
+            raise AssertionError("the index already identifies the source AOP")
+
+        async def get_related_aops(self, aop_id: str, *, limit: int = 20):
+            raise AssertionError("live query should not run when the index covers the AOP")
+
+    store = RelatedAopsIndexStore(None)
+    store.set(
+        build_aop_similarity_index(
+            [
+                {"id": "AOP:232", "title": "Source", "key_event_ids": ["KE:1", "KE:2"], "ker_ids": ["KER:10"]},
+                {"id": "AOP:517", "title": "Related", "key_event_ids": ["KE:1", "KE:2", "KE:9"], "ker_ids": ["KER:10"]},
+                {"id": "AOP:600", "title": "Narrow", "key_event_ids": ["KE:2"], "ker_ids": []},
+            ],
+            generated_at="2026-01-01T00:00:00Z",
+        )
+    )
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: IndexOnlyWikiAdapter())
+    monkeypatch.setattr(aop_tools, "get_related_aops_index_store", lambda: store)
+
+    result = await aop_tools.get_related_aops(
+        aop_tools.GetRelatedAopsInput(aop_id="https://identifiers.org/aop/232", limit=5, metric="overlap")
+    )
+
+    assert result["source"] == "precomputed_index"
+    assert result["aop"] == {"id": "AOP:232", "iri": None, "title": "Source"}
+    assert result["metric"] == "overlap"
+    assert [item["id"] for item in result["results"]] == ["AOP:517", "AOP:600"]
+    assert result["results"][0]["total_shared_elements"] == 3
+
+
+@pytest.mark.asyncio
+async def test_get_related_aops_rejects_index_metrics_on_the_live_query(monkeypatch) -> None:
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: StubWikiAdapter())
+    monkeypatch.setattr(aop_tools, "get_related_aops_index_store", lambda: RelatedAopsIndexStore(None))
+
+    with pytest.raises(aop_tools.JSONRPCError) as excinfo:
+        await aop_tools.get_related_aops(
+            aop_tools.GetRelatedAopsInput(aop_id="AOP:232", limit=5, metric="jaccard")
+        )
+
+    assert excinfo.value.code == aop_tools.INVALID_PARAMS
+    assert "AOP_MCP_RELATED_AOPS_INDEX_PATH" in excinfo.value.message
+
+
 @pytest.mark.asyncio
 async def test_get_aop_tool_returns_oecd_phase1_fields(monkeypatch) -> None:
     monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: StubWikiAdapter())
@@ -272,6 +420,31 @@ async def test_get_aop_tool_returns_oecd_phase1_fields(monkeypatch) -> None:
     assert result["references"][1]["identifier"] == "PMID:123456"
 
 
+@pytest.mark.asyncio
+async def test_get_aop_tool_projects_fields_and_skips_unrequested_fetches(monkeypatch) -> None:
+    class CoreOnlyWikiAdapter(StubWikiAdapter):
+        async def get_aop(self, aop_id: str):
+            return {**await super().get_aop(aop_id), "iri": "https://identifiers.org/aop/232"}
+
+        async def get_aop_assessment(self, aop_id: str):
+            raise AssertionError("assessment should not be fetched")
+
+    class NoStressorDbAdapter(StubDbAdapter):
+        async def list_stressor_chemicals_for_aop(self, aop_id: str):
+            raise AssertionError("stressors should not be fetched")
+
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: CoreOnlyWikiAdapter())
+    monkeypatch.setattr(aop_tools, "get_aop_db_adapter", lambda: NoStressorDbAdapter())
+
+    result = await aop_tools.get_aop(aop_tools.GetAopInput(aop_id="AOP:232", fields=["title"]))
+
+    validate_payload(result, namespace="read", name="get_aop.response.schema")
+    assert set(result) == {"id", "iri", "title", "projected_fields"}
+    assert result["projected_fields"] == ["title"]
+    with pytest.raises(ValidationError, match="Unknown response field"):
+        aop_tools.GetAopInput(aop_id="AOP:232", fields=["title", "not_a_field"])
+
+
 @pytest.mark.asyncio
 async def test_get_key_event_tool_returns_normalized_oecd_objects(monkeypatch) -> None:
     monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: StubWikiAdapter())
@@ -311,6 +484,25 @@ async def test_get_ker_tool_returns_evidence_blocks(monkeypatch) -> None:
     assert result["references"][0]["identifier"] == "10.1000/ker-10"
 
 
+@pytest.mark.asyncio
+async def test_get_ker_tool_projection_skips_key_event_and_assay_work(monkeypatch) -> None:
+    class KerOnlyWikiAdapter(StubWikiAdapter):
+        async def get_key_event(self, ke_id: str):
+            raise AssertionError("linked key events should not be fetched")
+
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: KerOnlyWikiAdapter())
+    full = await aop_tools.get_ker(aop_tools.GetKerInput(ker_id="KER:10", fields=["title"]))
+    evidence = await aop_tools.get_ker(
+        aop_tools.GetKerInput(ker_id="KER:10", fields=["evidence_blocks", "references"])
+    )
+
+    validate_payload(evidence, namespace="read", name="get_ker.response.schema")
+    assert set(full) == {"id", "iri", "title", "projected_fields"}
+    assert evidence["evidence_blocks"]["biological_plausibility"]["heuristic_call"] == "strong"
+    assert evidence["references"][0]["identifier"] == "10.1000/ker-10"
+    assert "applicability" not in evidence
+
+
 @pytest.mark.asyncio
 async def test_get_ker_tool_surfaces_shared_reference_citation_concordance(monkeypatch) -> None:
     class CitationConcordanceWikiAdapter(StubWikiAdapter):
@@ -531,6 +723,181 @@ async def test_assess_aop_confidence_rolls_up_assay_cutoff_ordering_as_supplemen
     assert any("assay-cutoff ordering" in item.lower() for item in result["rationale"])
 
 
+@pytest.mark.asyncio
+async def test_assess_aop_confidence_projection_matches_full_result_without_assay_ordering(
+    monkeypatch,
+) -> None:
+    db_adapter = StubQuantitativeDbAdapter()
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: StubWikiAdapter())
+    monkeypatch.setattr(aop_tools, "get_aop_db_adapter", lambda: db_adapter)
+
+    full = await aop_tools.assess_aop_confidence(aop_tools.AssessAopConfidenceInput(aop_id="AOP:232"))
+
+    async def no_assay_ordering(*args, **kwargs):
+        raise AssertionError("assay-cutoff ordering should not be computed")
+
+    monkeypatch.setattr(aop_tools, "_build_assay_cutoff_ordering_records", no_assay_ordering)
+    projected = await aop_tools.assess_aop_confidence(
+        aop_tools.AssessAopConfidenceInput(
+            aop_id="AOP:232",
+            fields=["overall_call", "confidence_dimensions"],
+        )
+    )
+
+    validate_payload(projected, namespace="read", name="assess_aop_confidence.response.schema")
+    assert projected == {
+        "aop": full["aop"],
+        "overall_call": full["overall_call"],
+        "confidence_dimensions": full["confidence_dimensions"],
+        "projected_fields": ["overall_call", "confidence_dimensions"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_assess_aop_confidences_shares_fetches_and_matches_single_tool(monkeypatch) -> None:
+    calls: dict[str, int] = {}
+
+    class PortfolioWikiAdapter(StubWikiAdapter):
+        async def list_key_events(self, aop_id: str):
+            events = await super().list_key_events("AOP:232")
+            return events if aop_id == "AOP:232" else events[:2]
+
+        async def list_kers(self, aop_id: str):
+            kers = await super().list_kers("AOP:232")
+            return kers if aop_id == "AOP:232" else kers[:1]
+
+        async def get_aop_assessment(self, aop_id: str):
+            return {**await super().get_aop_assessment("AOP:232"), "id": aop_id}
+
+        async def get_key_event(self, ke_id: str):
+            calls[ke_id] = calls.get(ke_id, 0) + 1
+            return await super().get_key_event(ke_id)
+
+        async def get_ker(self, ker_id: str):
+            calls[ker_id] = calls.get(ker_id, 0) + 1
+            return await super().get_ker(ker_id)
+
+    class PortfolioDbAdapter(StubQuantitativeDbAdapter):
+        async def list_stressor_chemicals_for_aop(self, aop_id: str):
+            return await super().list_stressor_chemicals_for_aop("AOP:232")
+
+    db_adapter = PortfolioDbAdapter()
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: PortfolioWikiAdapter())
+    monkeypatch.setattr(aop_tools, "get_aop_db_adapter", lambda: db_adapter)
+
+    singles = [
+        await aop_tools.assess_aop_confidence(aop_tools.AssessAopConfidenceInput(aop_id=aop_id))
+        for aop_id in ("AOP:232", "AOP:233")
+    ]
+    calls.clear()
+
+    batch = await aop_tools.assess_aop_confidences(
+        aop_tools.AssessAopConfidencesInput(aop_ids=["AOP:232", "AOP:233", "AOP:232"])
+    )
+
+    assert batch["results"] == singles
+    assert batch["aop_count"] == 2
+    assert batch["errors"] == []
+    assert set(calls.values()) == {1}
+    assert batch["shared_elements"] == {
+        "distinct_key_events": 3,
+        "key_event_references": 5,
+        "distinct_kers": 3,
+        "ker_references": 4,
+    }
+
+
+@pytest.mark.asyncio
+async def test_assess_aop_confidences_reports_failed_aops_without_failing_the_batch(monkeypatch) -> None:
+    class FlakyWikiAdapter(StubWikiAdapter):
+        async def get_aop_assessment(self, aop_id: str):
+            if aop_id == "AOP:999":
+                raise RuntimeError("upstream unavailable")
+            return await super().get_aop_assessment(aop_id)
+
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: FlakyWikiAdapter())
+    monkeypatch.setattr(aop_tools, "get_aop_db_adapter", lambda: StubQuantitativeDbAdapter())
+
+    batch = await aop_tools.assess_aop_confidences(
+        aop_tools.AssessAopConfidencesInput(aop_ids=["AOP:999", "AOP:232"])
+    )
+
+    validate_payload(batch, namespace="read", name="assess_aop_confidences.response.schema")
+    assert [result["aop"]["id"] for result in batch["results"]] == ["AOP:232"]
+    assert batch["aop_count"] == 1
+    assert batch["errors"] == [{"aop_id": "AOP:999", "error": "RuntimeError: upstream unavailable"}]
+
+
+@pytest.mark.asyncio
+async def test_assess_aop_confidences_bounds_concurrent_upstream_calls(monkeypatch) -> None:
+    in_flight = {"aop": 0, "key_event": 0}
+    peak = {"aop": 0, "key_event": 0}
+
+    async def tracked(kind: str, call):
+        in_flight[kind] += 1
+        peak[kind] = max(peak[kind], in_flight[kind])
+        try:
+            await asyncio.sleep(0.001)
+            return await call
+        finally:
+            in_flight[kind] -= 1
+
+    class CountingWikiAdapter(StubWikiAdapter):
+        async def get_aop_assessment(self, aop_id: str):
+            return {**await tracked("aop", super().get_aop_assessment("AOP:232")), "id": aop_id}
+
+        async def list_key_events(self, aop_id: str):
+            return await super().list_key_events("AOP:232")
+
+        async def list_kers(self, aop_id: str):
+            return await super().list_kers("AOP:232")
+
+        async def get_key_event(self, ke_id: str):
+            return await tracked("key_event", super().get_key_event(ke_id))
+
+    class PortfolioDbAdapter(StubQuantitativeDbAdapter):
+        async def list_stressor_chemicals_for_aop(self, aop_id: str):
+            return await super().list_stressor_chemicals_for_aop("AOP:232")
+
+    monkeypatch.setenv("AOP_MCP_BATCH_CONCURRENCY", "2")
+    get_settings.cache_clear()
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: CountingWikiAdapter())
+    monkeypatch.setattr(aop_tools, "get_aop_db_adapter", lambda: PortfolioDbAdapter())
+    try:
+        batch = await aop_tools.assess_aop_confidences(
+            aop_tools.AssessAopConfidencesInput(aop_ids=[f"AOP:{index}" for index in range(10)])
+        )
+    finally:
+        get_settings.cache_clear()
+
+    assert batch["aop_count"] == 10
+    assert peak == {"aop": 2, "key_event": 2}
+
+
+@pytest.mark.asyncio
+async def test_confidence_fetch_pool_retries_a_failed_lookup(monkeypatch) -> None:
+    attempts = 0
+
+    class FlakyWikiAdapter(StubWikiAdapter):
+        async def get_key_event(self, ke_id: str):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("timeout")
+            return await super().get_key_event(ke_id)
+
+    monkeypatch.setattr(aop_tools, "get_aop_wiki_adapter", lambda: FlakyWikiAdapter())
+    pool = aop_tools._ConfidenceFetchPool()
+
+    with pytest.raises(RuntimeError):
+        await pool.get_key_event("KE:1")
+    record = await pool.get_key_event("KE:1")
+
+    assert record["id"] == "KE:1"
+    assert await pool.get_key_event("KE:1") is record
+    assert attempts == 2
+
+
 @pytest.mark.asyncio
 async def test_assess_aop_confidence_derives_bounded_essentiality_heuristic(monkeypatch) -> None:
     class EssentialityWikiAdapter(StubWikiAdapter):
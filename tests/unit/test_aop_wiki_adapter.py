@@ -379,3 +379,94 @@ async def test_get_related_aops_returns_shared_counts() -> None:
             "total_shared_elements": 4,
         }
     ]
+
+
+@pytest.mark.asyncio
+async def test_list_aop_memberships_groups_key_events_and_kers_per_aop() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.content.decode("utf-8")
+        assert "aopo:has_key_event_relationship ?ker" in query
+        return httpx.Response(
+            200,
+            json={
+                "results": {
+                    "bindings": [
+                        {
+                            "aop": {"value": "https://identifiers.org/aop/232"},
+                            "title": {"value": "PXR activation"},
+                            "ke": {"value": "https://identifiers.org/aop.events/239"},
+                        },
+                        {
+                            "aop": {"value": "https://identifiers.org/aop/232"},
+                            "title": {"value": "PXR activation"},
+                            "ker": {"value": "https://identifiers.org/aop.relationships/3365"},
+                        },
+                        {
+                            "aop": {"value": "https://identifiers.org/aop/517"},
+                            "ke": {"value": "https://identifiers.org/aop.events/239"},
+                        },
+                    ]
+                }
+            },
+        )
+
+    transport = httpx.MockTransport(handler)
+    async with make_client(transport) as client:
+        adapter = AOPWikiAdapter(client)
+        records = await adapter.list_aop_memberships()
+
+    assert records == [
+        {
+            "id": "AOP:232",
+            "iri": "https://identifiers.org/aop/232",
+            "title": "PXR activation",
+            "key_event_ids": ["KE:239"],
+            "ker_ids": ["KER:3365"],
+        },
+        {
+            "id": "AOP:517",
+            "iri": "https://identifiers.org/aop/517",
+            "title": None,
+            "key_event_ids": ["KE:239"],
+            "ker_ids": [],
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_aop_networks_batches_values_queries_and_keeps_request_order() -> None:
+    queries: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.content.decode("utf-8")
+        queries.append(query)
+        if "<https://identifiers.org/aop/517>" in query:
+            bindings = [
+                {
+                    "aop": {"value": "https://identifiers.org/aop/517"},
+                    "title": {"value": "PXR activation"},
+                    "ke": {"value": "https://identifiers.org/aop.events/239"},
+                    "label": {"value": "PXR activation"},
+                },
+                {
+                    "aop": {"value": "https://identifiers.org/aop/517"},
+                    "ker": {"value": "https://identifiers.org/aop.relationships/3365"},
+                    "upstream": {"value": "https://identifiers.org/aop.events/239"},
+                    "downstream": {"value": "https://identifiers.org/aop.events/459"},
+                },
+            ]
+        else:
+            bindings = []
+        return httpx.Response(200, json={"results": {"bindings": bindings}})
+
+    transport = httpx.MockTransport(handler)
+    async with make_client(transport) as client:
+        adapter = AOPWikiAdapter(client)
+        records = await adapter.list_aop_networks(["AOP:999", "AOP:517", "AOP:999"], batch_size=1)
+
+    assert len(queries) == 2
+    assert all("VALUES ?aop" in query for query in queries)
+    assert [record["id"] for record in records] == ["AOP:999", "AOP:517"]
+    assert records[0]["key_events"] == [] and records[0]["kers"] == []
+    assert records[1]["key_events"][0]["id"] == "KE:239"
+    assert records[1]["kers"][0]["downstream"]["id"] == "KE:459"
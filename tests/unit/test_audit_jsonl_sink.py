@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from src.instrumentation import audit as audit_module
+from src.instrumentation.audit import (
+    GroupCommitAuditWriter,
+    InMemoryToolCallAuditLog,
+    JsonlToolCallAuditSink,
+    ToolCallAuditRecord,
+    audit_merkle_root,
+    hash_json,
+)
+from src.instrumentation.audit_index import AuditLogIndex
+
+
+def make_record(
+    index: int,
+    *,
+    status: str = "success",
+    tool_name: str = "fake_tool",
+    started_at: str = "2026-01-01T00:00:00Z",
+) -> ToolCallAuditRecord:
+    return ToolCallAuditRecord(
+        call_id=f"call-{index}",
+        tool_name=tool_name,
+        started_at=started_at,
+        finished_at="2026-01-01T00:00:01Z",
+        duration_ms=1.0,
+        status=status,
+        argument_keys=["alpha"],
+        request_hash=f"{index:064x}",
+        response_hash=None,
+        output_schema_title=None,
+        output_schema_hash=None,
+        output_validation_status="not_applicable",
+        risk_class="read",
+        required_scopes=["toxmcp:read"],
+        granted_scopes=["toxmcp:read"],
+        requires_confirmation=False,
+        confirmation_provided=False,
+        policy_status="passed",
+    )
+
+
+def count_scans(monkeypatch: pytest.MonkeyPatch, sink: JsonlToolCallAuditSink) -> list[int]:
+    starts: list[int] = []
+    original = sink._scan
+
+    def spy(start, *, collect, **kwargs):
+        starts.append(start.offset)
+        return original(start, collect=collect, **kwargs)
+
+    monkeypatch.setattr(sink, "_scan", spy)
+    return starts
+
+
+def test_append_uses_cached_head_instead_of_rescanning(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    sink = JsonlToolCallAuditSink(tmp_path / "audit.jsonl")
+    sink.append(make_record(0))
+    scans = count_scans(monkeypatch, sink)
+
+    for index in range(1, 50):
+        sink.append(make_record(index))
+
+    assert scans == []
+    assert sink.chain_status() == sink.verify_chain()
+    assert sink.chain_status()["record_count"] == 50
+
+
+def test_new_sink_verifies_tail_from_checkpoint(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    writer = JsonlToolCallAuditSink(path, checkpoint_interval=10)
+    for index in range(25):
+        writer.append(make_record(index))
+    checkpoint = json.loads(writer.checkpoint_path.read_text(encoding="utf-8"))
+    assert checkpoint["record_count"] == 20
+
+    reader = JsonlToolCallAuditSink(path, checkpoint_interval=10)
+    scans = count_scans(monkeypatch, reader)
+    chain = reader.chain_status()
+
+    assert scans == [checkpoint["offset"]]
+    assert chain == writer.verify_chain()
+    assert chain["record_count"] == 25
+
+    # A checkpoint that no longer matches the log is ignored.
+    checkpoint["head_record_hash"] = "0" * 64
+    writer.checkpoint_path.write_text(json.dumps(checkpoint), encoding="utf-8")
+    stale = JsonlToolCallAuditSink(path, checkpoint_interval=10)
+    scans = count_scans(monkeypatch, stale)
+    assert stale.chain_status() == chain
+    assert scans == [0]
+
+
+def test_sinks_sharing_a_file_keep_one_chain(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    first = JsonlToolCallAuditSink(path)
+    second = JsonlToolCallAuditSink(path)
+
+    first.append(make_record(0))
+    second.append(make_record(1))
+    first.append(make_record(2))
+
+    chain = JsonlToolCallAuditSink(path).verify_chain()
+    assert chain["verified"] is True
+    assert chain["record_count"] == 3
+    assert first.chain_status() == chain
+
+
+def test_rewritten_log_is_rescanned_and_blocks_appends(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    sink = JsonlToolCallAuditSink(path)
+    for index in range(3):
+        sink.append(make_record(index))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    tampered = lines[0].replace('"status":"success"', '"status":"failure"')
+    assert len(tampered) == len(lines[0])
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text("\n".join([tampered, *lines[1:]]) + "\n", encoding="utf-8")
+    # Same-size rewrites are detected through mtime; make sure it moved.
+    os.utime(path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    chain = sink.chain_status()
+    assert chain["verified"] is False
+    assert chain["record_count"] == 0
+    assert "record_hash does not match" in chain["verification_error"]
+    with pytest.raises(OSError, match="invalid hash chain"):
+        sink.append(make_record(3))
+
+
+def scanned_files(monkeypatch: pytest.MonkeyPatch, sink: JsonlToolCallAuditSink) -> list[str]:
+    names: list[str] = []
+    original = sink._scan
+
+    def spy(start, *, collect, path=None, **kwargs):
+        names.append((path or sink.path).name)
+        return original(start, collect=collect, path=path, **kwargs)
+
+    monkeypatch.setattr(sink, "_scan", spy)
+    return names
+
+
+def test_segments_are_sealed_with_chained_merkle_roots(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    sink = JsonlToolCallAuditSink(path, segment_records=4)
+    for index in range(10):
+        sink.append(make_record(index))
+
+    seals = [
+        json.loads(line)
+        for line in sink.seals_path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert [seal["file_name"] for seal in seals] == ["00000001.jsonl", "00000002.jsonl"]
+    assert seals[1]["previous_seal_hash"] == seals[0]["seal_hash"]
+    assert seals[1]["first_previous_record_hash"] == seals[0]["last_record_hash"]
+    first_segment = [
+        json.loads(line)
+        for line in (sink.segments_dir / "00000001.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert seals[0]["merkle_root"] == audit_merkle_root(
+        [envelope["record_hash"] for envelope in first_segment]
+    )
+    assert seals[0]["seal_hash"] == hash_json(
+        {key: value for key, value in seals[0].items() if key != "seal_hash"}
+    )
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    chain = JsonlToolCallAuditSink(path).verify_chain()
+    assert chain["verified"] is True
+    assert chain["record_count"] == 10
+    assert chain == sink.chain_status()
+    envelopes = sink.read_verified_envelopes()["envelopes"]
+    assert [envelope["sequence"] for envelope in envelopes] == list(range(1, 11))
+    assert [envelope["line_number"] for envelope in envelopes] == list(range(1, 11))
+
+
+def test_tampered_sealed_segment_fails_verification(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    sink = JsonlToolCallAuditSink(path, segment_records=3)
+    for index in range(7):
+        sink.append(make_record(index))
+    assert sink.verify_chain()["verified"] is True
+
+    segment = sink.segments_dir / "00000002.jsonl"
+    lines = segment.read_text(encoding="utf-8").splitlines()
+    mtime_ns = segment.stat().st_mtime_ns
+    lines[1] = lines[1].replace('"status":"success"', '"status":"failure"')
+    segment.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.utime(segment, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    chain = JsonlToolCallAuditSink(path).verify_chain()
+    assert chain["verified"] is False
+    assert chain["record_count"] == 4
+    assert chain["verification_error"].startswith("Sealed segment 2: Line 5")
+
+    # The newest record lives in the active file, which is all a limit of 1 needs.
+    tail = JsonlToolCallAuditSink(path).read_tail_envelopes(1)
+    assert tail["chain"]["verified"] is True
+    assert tail["scanned_segment_count"] == 0
+
+    scan = JsonlToolCallAuditSink(path).read_tail_envelopes(3)
+    assert scan["chain"] == chain
+    assert scan["complete"] is True
+    assert [envelope["sequence"] for envelope in scan["envelopes"]] == [1, 2, 3, 4]
+
+
+def test_verify_chain_rehashes_every_segment(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    writer = JsonlToolCallAuditSink(path, segment_records=5)
+    for index in range(12):
+        writer.append(make_record(index))
+    reader = JsonlToolCallAuditSink(path)
+    assert reader.verify_chain()["verified"] is True
+
+    # Same size, mtime, and inode: only re-hashing can catch this edit.
+    segment = writer.segments_dir / "00000001.jsonl"
+    stat = segment.stat()
+    with segment.open("r+b") as handle:
+        content = handle.read()
+        handle.seek(0)
+        handle.write(content.replace(b'"call_id":"call-1"', b'"call_id":"call-X"'))
+    os.utime(segment, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    scans = scanned_files(monkeypatch, reader)
+    chain = reader.verify_chain()
+    assert scans == ["00000001.jsonl"]
+    assert chain["verified"] is False
+    assert "Sealed segment 1" in chain["verification_error"]
+
+
+def test_tail_export_reads_only_the_segments_it_needs(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    path = tmp_path / "audit.jsonl"
+    writer = JsonlToolCallAuditSink(path, segment_records=5)
+    for index in range(23):
+        writer.append(make_record(index, status="error" if index % 5 == 0 else "success"))
+
+    reader = JsonlToolCallAuditSink(path)
+    scans = scanned_files(monkeypatch, reader)
+    scan = reader.read_tail_envelopes(6)
+
+    assert scans == ["audit.jsonl", "00000004.jsonl"]
+    assert scan["chain"] == writer.verify_chain()
+    assert scan["complete"] is False
+    assert scan["sealed_segment_count"] == 4
+    assert scan["scanned_segment_count"] == 1
+    assert [envelope["sequence"] for envelope in scan["envelopes"]] == list(range(16, 24))
+
+    errors = reader.read_tail_envelopes(
+        3, lambda envelope: envelope["record"]["status"] == "error"
+    )
+    assert [envelope["sequence"] for envelope in errors["envelopes"]] == [11, 16, 21]
+    assert errors["scanned_segment_count"] == 2
+
+
+def test_interrupted_seal_is_read_in_place_and_completed_on_next_append(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    sink = JsonlToolCallAuditSink(path, segment_records=3, index=True)
+    for index in range(3):
+        sink.append(make_record(index))
+    sink.checkpoint_path.write_text("{}", encoding="utf-8")
+    # Simulate a crash after the seal was written but before the rename.
+    os.replace(sink.segments_dir / "00000001.jsonl", path)
+
+    reader = JsonlToolCallAuditSink(path)
+    assert reader.verify_chain()["record_count"] == 3
+    assert reader.chain_status()["verified"] is True
+    assert [envelope["sequence"] for envelope in reader.read_tail_envelopes(5)["envelopes"]] == [1, 2, 3]
+    assert reader.read_indexed_envelopes(limit=5, tool_name="fake_tool")["matched_count"] == 3
+    # Reads left the files alone.
+    assert path.exists()
+    assert sink.checkpoint_path.exists()
+    assert not (sink.segments_dir / "00000001.jsonl").exists()
+
+    resumed = JsonlToolCallAuditSink(path, segment_records=3)
+    resumed.append(make_record(3))
+
+    assert (resumed.segments_dir / "00000001.jsonl").exists()
+    chain = resumed.verify_chain()
+    assert chain["verified"] is True
+    assert chain["record_count"] == 4
+
+
+def test_append_batch_matches_single_appends_across_segments(tmp_path) -> None:
+    single = JsonlToolCallAuditSink(tmp_path / "single" / "audit.jsonl", segment_records=4)
+    for index in range(10):
+        single.append(make_record(index))
+    batched = JsonlToolCallAuditSink(tmp_path / "batched" / "audit.jsonl", segment_records=4)
+    batched.append_batch([make_record(index) for index in range(7)])
+    batched.append_batch([make_record(index) for index in range(7, 10)])
+
+    chain = batched.verify_chain()
+    assert chain == single.verify_chain()
+    assert chain["record_count"] == 10
+    assert len(batched.seals_path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+@pytest.mark.parametrize(("mode", "expected"), [("none", 0), ("record", 5), ("batch", 1), ("interval", 0)])
+def test_fsync_modes(monkeypatch: pytest.MonkeyPatch, tmp_path, mode: str, expected: int) -> None:
+    calls: list[int] = []
+    monkeypatch.setattr(audit_module.os, "fsync", calls.append)
+    sink = JsonlToolCallAuditSink(tmp_path / "audit.jsonl", fsync=mode, fsync_interval=3600)
+
+    sink.append_batch([make_record(index) for index in range(5)])
+    assert len(calls) == expected
+
+    sink.sync()
+    assert len(calls) == expected + (mode == "interval")
+
+
+@pytest.mark.asyncio
+async def test_background_writer_group_commits_concurrent_appends(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    log = InMemoryToolCallAuditLog()
+    log.configure_jsonl_sink(path, background=True, batch_size=16)
+    try:
+        await asyncio.gather(*(log.append_async(make_record(index)) for index in range(100)))
+        log.flush()
+        status = log.persistence_status()
+    finally:
+        log.close()
+
+    assert status["last_error"] is None
+    assert status["chain"]["verified"] is True
+    assert status["chain"]["record_count"] == 100
+    envelopes = JsonlToolCallAuditSink(path).read_verified_envelopes()["envelopes"]
+    assert [envelope["record"]["call_id"] for envelope in envelopes] == [
+        f"call-{index}" for index in range(100)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_background_writer_applies_backpressure_and_flushes_on_close(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    sink = JsonlToolCallAuditSink(tmp_path / "audit.jsonl")
+    release = threading.Event()
+    original = sink.append_batch
+
+    def slow_append_batch(records):
+        release.wait(timeout=5)
+        original(records)
+
+    monkeypatch.setattr(sink, "append_batch", slow_append_batch)
+    writer = GroupCommitAuditWriter(sink, queue_size=1, batch_size=1)
+    try:
+        await writer.submit_async(make_record(0))
+        while writer.pending:
+            # Wait for the writer thread to take the first record.
+            await asyncio.sleep(0.01)
+        await writer.submit_async(make_record(1))
+        blocked = asyncio.create_task(writer.submit_async(make_record(2)))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        release.set()
+        await asyncio.wait_for(blocked, timeout=5)
+    finally:
+        release.set()
+        writer.close()
+
+    assert sink.verify_chain()["record_count"] == 3
+
+
+def test_background_writer_fails_fast_after_an_unexpected_error(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    sink = JsonlToolCallAuditSink(tmp_path / "audit.jsonl")
+    release = threading.Event()
+    errors: list[str | None] = []
+
+    def broken_append_batch(records):
+        release.wait(timeout=5)
+        raise ValueError("cannot serialize record")
+
+    monkeypatch.setattr(sink, "append_batch", broken_append_batch)
+    writer = GroupCommitAuditWriter(sink, queue_size=1, batch_size=1, on_result=errors.append)
+    writer.submit(make_record(0))
+    writer.submit(make_record(1))
+    flushed: list[BaseException] = []
+
+    def flush() -> None:
+        try:
+            writer.flush()
+        except RuntimeError as exc:
+            flushed.append(exc)
+
+    waiter = threading.Thread(target=flush)
+    waiter.start()
+    release.set()
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert len(flushed) == 1
+    assert errors == ["ValueError: cannot serialize record"]
+    with pytest.raises(RuntimeError, match="cannot serialize record"):
+        writer.submit(make_record(2))
+    with pytest.raises(RuntimeError, match="cannot serialize record"):
+        writer.flush()
+    with pytest.raises(RuntimeError, match="cannot serialize record"):
+        writer.close()
+
+
+def make_indexed_records(count: int) -> list[ToolCallAuditRecord]:
+    return [
+        make_record(
+            index,
+            status="error" if index % 3 == 0 else "success",
+            tool_name=("alpha", "beta")[index % 2],
+            started_at=f"2026-01-{index // 4 + 1:02d}T00:00:00Z",
+        )
+        for index in range(count)
+    ]
+
+
+def test_indexed_query_matches_a_full_scan(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    writer = JsonlToolCallAuditSink(path, segment_records=4, index=True)
+    for record in make_indexed_records(18):
+        writer.append(record)
+    assert writer.index_path.exists()
+
+    all_envelopes = writer.read_verified_envelopes()["envelopes"]
+    reader = JsonlToolCallAuditSink(path)
+    for filters in (
+        {"tool_name": "alpha", "status": "error"},
+        {"status": "success", "started_after": "2026-01-02T00:00:00Z"},
+        {"tool_name": "beta", "started_before": "2026-01-04T00:00:00Z"},
+    ):
+        expected = [
+            envelope
+            for envelope in all_envelopes
+            if envelope["record"]["tool_name"] == filters.get("tool_name", envelope["record"]["tool_name"])
+            and envelope["record"]["status"] == filters.get("status", envelope["record"]["status"])
+            and envelope["record"]["started_at"] >= filters.get("started_after", "")
+            and envelope["record"]["started_at"] < filters.get("started_before", "9999")
+        ]
+        result = reader.read_indexed_envelopes(limit=3, **filters)
+        assert result is not None
+        assert result["matched_count"] == len(expected)
+        assert result["envelopes"] == expected[-3:]
+        assert result["chain"] == writer.verify_chain()
+
+
+def test_index_catches_up_with_unindexed_appends(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    records = make_indexed_records(9)
+    plain = JsonlToolCallAuditSink(path)
+    for record in records[:6]:
+        plain.append(record)
+    assert JsonlToolCallAuditSink(path).read_indexed_envelopes(limit=5, tool_name="alpha") is None
+
+    indexed = JsonlToolCallAuditSink(path, index=True)
+    indexed.append(records[6])
+    plain.append(records[7])
+    plain.append(records[8])
+
+    result = JsonlToolCallAuditSink(path).read_indexed_envelopes(limit=10, tool_name="alpha")
+    assert [envelope["sequence"] for envelope in result["envelopes"]] == [1, 3, 5, 7, 9]
+
+
+
+def test_indexed_sink_notices_a_reset_by_another_sink(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    records = make_indexed_records(6)
+    writer = JsonlToolCallAuditSink(path, index=True)
+    for record in records[:3]:
+        writer.append(record)
+    # Another connection empties the index, e.g. a sink that found it stale.
+    other = AuditLogIndex(writer.index_path)
+    other.reset()
+    other.close()
+    for record in records[3:]:
+        writer.append(record)
+
+    result = JsonlToolCallAuditSink(path).read_indexed_envelopes(limit=10)
+    assert result["matched_count"] == 6
+    assert [envelope["sequence"] for envelope in result["envelopes"]] == [1, 2, 3, 4, 5, 6]
+    writer.close()
+
+
+def test_index_with_gaps_is_rebuilt(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    writer = JsonlToolCallAuditSink(path, index=True)
+    for record in make_indexed_records(5):
+        writer.append(record)
+    index = AuditLogIndex(writer.index_path)
+    with index._connection:
+        index._connection.execute("DELETE FROM records WHERE sequence = 2")
+    index.close()
+
+    assert JsonlToolCallAuditSink(path).read_indexed_envelopes(limit=10) is None
+    result = JsonlToolCallAuditSink(path, index=True).read_indexed_envelopes(limit=10)
+    assert result["matched_count"] == 5
+
+
+def test_indexed_read_rejects_tampered_lines(tmp_path) -> None:
+    path = tmp_path / "audit.jsonl"
+    writer = JsonlToolCallAuditSink(path, segment_records=4, index=True)
+    for record in make_indexed_records(10):
+        writer.append(record)
+
+    # Sealed segments are not re-read for the chain head, so only the
+    # per-line check on indexed reads can catch this edit.
+    segment = writer.segments_dir / "00000001.jsonl"
+    lines = segment.read_text(encoding="utf-8").splitlines()
+    lines[2] = lines[2].replace('"call_id":"call-2"', '"call_id":"call-X"')
+    segment.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    reader = JsonlToolCallAuditSink(path)
+    assert reader.chain_status()["verified"] is True
+    assert reader.read_indexed_envelopes(limit=2, tool_name="alpha", status="success") is not None
+    assert reader.read_indexed_envelopes(limit=10, tool_name="alpha") is None
+    assert reader.verify_chain()["verified"] is False
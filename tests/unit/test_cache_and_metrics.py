@@ -16,5 +16,50 @@ def test_metrics_recorder_tracks_counters_and_timings() -> None:
     with metrics.time("sparql.query_time"):
         pass
 
-    assert metrics.counters["sparql.cache_hit"] == 1
-    assert len(metrics.timings["sparql.query_time"]) == 1
+    assert metrics.counter_value("sparql.cache_hit") == 1
+    assert len(metrics.histogram("sparql.query_time")) == 1
+
+
+def test_histograms_use_fixed_buckets_and_estimate_quantiles() -> None:
+    metrics = MetricsRecorder(buckets=(0.01, 0.1, 1.0))
+    for index in range(10_000):
+        metrics.observe("mcp.tool_call_seconds", (index % 100) / 100, tool="get_aop")
+
+    histogram = metrics.histogram("mcp.tool_call_seconds", tool="get_aop")
+    assert histogram.count == 10_000
+    assert len(histogram.bucket_counts) == 4
+    assert histogram.bucket_counts == [200, 900, 8900, 0]
+    assert 0.45 <= histogram.quantile(0.5) <= 0.55
+    assert histogram.quantile(1.0) == histogram.max == 0.99
+    assert metrics.histogram("mcp.tool_call_seconds", tool="get_ker") is None
+
+
+def test_render_prometheus_text_format() -> None:
+    metrics = MetricsRecorder(buckets=(0.1, 1.0))
+    metrics.describe("mcp.tool_calls", "MCP tool calls by tool and status.")
+    metrics.increment("mcp.tool_calls", tool="get_aop", status="success")
+    metrics.increment("mcp.tool_calls", 2, tool='we"ird', status="error")
+    metrics.observe("sparql.query_seconds", 0.05, service="aop_wiki_sparql")
+    metrics.observe("sparql.query_seconds", 0.5, service="aop_wiki_sparql")
+    metrics.add_gauge("mcp.tool_calls_in_flight", 1)
+    state = {"value": 2}
+    metrics.register_gauge("sparql.circuit_breaker_state", lambda: state["value"], endpoint="a")
+
+    text = metrics.render_prometheus()
+
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert "# HELP aop_mcp_mcp_tool_calls_total MCP tool calls by tool and status." in lines
+    assert "# TYPE aop_mcp_mcp_tool_calls_total counter" in lines
+    assert 'aop_mcp_mcp_tool_calls_total{status="success",tool="get_aop"} 1' in lines
+    assert 'aop_mcp_mcp_tool_calls_total{status="error",tool="we\\"ird"} 2' in lines
+    assert "aop_mcp_mcp_tool_calls_in_flight 1" in lines
+    assert 'aop_mcp_sparql_circuit_breaker_state{endpoint="a"} 2' in lines
+    assert "# TYPE aop_mcp_sparql_query_seconds histogram" in lines
+    assert [line for line in lines if line.startswith("aop_mcp_sparql_query_seconds")] == [
+        'aop_mcp_sparql_query_seconds_bucket{service="aop_wiki_sparql",le="0.1"} 1',
+        'aop_mcp_sparql_query_seconds_bucket{service="aop_wiki_sparql",le="1"} 2',
+        'aop_mcp_sparql_query_seconds_bucket{service="aop_wiki_sparql",le="+Inf"} 2',
+        'aop_mcp_sparql_query_seconds_sum{service="aop_wiki_sparql"} 0.55',
+        'aop_mcp_sparql_query_seconds_count{service="aop_wiki_sparql"} 2',
+    ]
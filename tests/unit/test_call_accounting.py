@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.adapters import CircuitBreakerConfig, HgncClient, SparqlClient
+from src.instrumentation.accounting import (
+    call_accounting_scope,
+    record_upstream,
+)
+from src.instrumentation.audit import tool_call_audit_log
+from src.instrumentation.cache import InMemoryCache
+from src.server.api.server import create_app
+from src.server.config.settings import get_settings
+from src.server.mcp import dispatch as dispatch_module
+from src.tools import validate_payload_against_schema
+from tests.support.fake_tools import FakeToolRegistry
+
+
+@pytest.mark.asyncio
+async def test_sparql_client_reports_requests_retries_and_cache_to_active_scope() -> None:
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"results": {"bindings": []}})])
+    transport = httpx.MockTransport(lambda request: next(responses))
+
+    async with SparqlClient(
+        ["https://primary.example/sparql"],
+        transport=transport,
+        cache=InMemoryCache(),
+        retry_base_delay=0,
+        service_name="aop_wiki_sparql",
+    ) as client:
+        await client.query("SELECT * WHERE {?s ?p ?o}")  # outside a scope: not recorded
+        with call_accounting_scope() as accounting:
+            await client.query("SELECT * WHERE {?s ?p ?o}")
+
+    usage = accounting.to_dict()["services"]["aop_wiki_sparql"]
+    assert usage["cache_hits"] == 1
+    assert usage["requests"] == 0
+
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"results": {"bindings": []}})])
+    async with SparqlClient(
+        ["https://primary.example/sparql"],
+        transport=httpx.MockTransport(lambda request: next(responses)),
+        retry_base_delay=0,
+        circuit_breaker_config=CircuitBreakerConfig(failure_threshold=1),
+        service_name="aop_wiki_sparql",
+    ) as client:
+        with call_accounting_scope() as accounting:
+            with pytest.raises(Exception):
+                await client.query("SELECT 1")
+
+    usage = accounting.to_dict()["services"]["aop_wiki_sparql"]
+    assert usage["requests"] == 1
+    assert usage["errors"] == 1
+    assert usage["retries"] == 1
+    assert usage["circuit_breaker_trips"] == 1
+    assert usage["circuit_breaker_rejections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_clients_on_worker_threads_charge_the_calling_scope() -> None:
+    body = b'{"response": {"docs": [{"symbol": "esr1"}]}}'
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    hgnc = HgncClient(transport=transport)
+
+    with call_accounting_scope() as accounting:
+        symbols = await asyncio.gather(
+            asyncio.to_thread(hgnc.resolve_symbol, "HGNC:3467"),
+            asyncio.to_thread(hgnc.resolve_symbol, "HGNC:3468"),
+        )
+        await asyncio.to_thread(hgnc.resolve_symbol, "HGNC:3467")
+
+    assert symbols == ["ESR1", "ESR1"]
+    usage = accounting.to_dict()["services"]["hgnc"]
+    assert usage["requests"] == 2
+    assert usage["bytes_received"] == 2 * len(body)
+    assert usage["cache_misses"] == 2
+    assert usage["cache_hits"] == 1
+
+
+_UPSTREAM_SCHEMA = {"title": "upstream.response", "type": "object"}
+
+
+async def _upstream_call(params: dict[str, Any]) -> dict[str, Any]:
+    record_upstream("comptox", requests=2, bytes_received=512)
+    validate_payload_against_schema({"ok": True}, _UPSTREAM_SCHEMA)
+    return {"ok": True}
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch):
+    registry = FakeToolRegistry(name="upstream", handler=_upstream_call, output_schema=_UPSTREAM_SCHEMA)
+    monkeypatch.setattr(dispatch_module, "tool_registry", registry)
+    get_settings.cache_clear()
+    tool_call_audit_log.clear()
+    yield TestClient(create_app())
+    get_settings.cache_clear()
+    tool_call_audit_log.clear()
+
+
+def _call(client: TestClient, meta: dict[str, Any] | None = None) -> dict[str, Any]:
+    params: dict[str, Any] = {"name": "upstream"}
+    if meta is not None:
+        params["_meta"] = meta
+    response = client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": params},
+    )
+    assert response.status_code == 200
+    return response.json()["result"]
+
+
+def test_tool_call_cost_is_audited_and_returned_on_request(client: TestClient) -> None:
+    plain = _call(client)
+    assert dispatch_module.COST_META_KEY not in plain["_meta"]
+
+    result = _call(client, {dispatch_module.COST_META_KEY: True})
+
+    cost = result["_meta"][dispatch_module.COST_META_KEY]
+    assert cost["schema_version"] == "tool-call-cost.v1"
+    assert cost["services"]["comptox"]["requests"] == 2
+    assert cost["services"]["comptox"]["bytes_received"] == 512
+    assert {"handler", "render", "schema_validation"} <= set(cost["phases_ms"])
+
+    records = tool_call_audit_log.list_records()
+    assert [record.cost["services"] for record in records] == [cost["services"]] * 2
+    assert records[-1].to_dict()["cost"] == records[-1].cost
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.server.tools import aop as aop_tools
+from src.services.confidence_corpus import (
+    ConfidenceResultsStore,
+    precompute_confidence_results,
+    read_confidence_results,
+)
+
+
+def _assessment(aop_id: str, overall: str, plausibility: str, ker_count: int) -> dict:
+    return {
+        "aop": {"id": aop_id, "title": f"Title {aop_id}"},
+        "overall_call": overall,
+        "biological_plausibility": {"heuristic_call": plausibility},
+        "empirical_support": {"heuristic_call": "moderate"},
+        "quantitative_understanding": {"heuristic_call": "low"},
+        "essentiality_of_key_events": {"heuristic_call": "not_assessed"},
+        "coverage": {"key_event_count": ker_count + 1, "ker_count": ker_count},
+    }
+
+
+ASSESSMENTS = {
+    "AOP:1": _assessment("AOP:1", "high", "strong", 5),
+    "AOP:2": _assessment("AOP:2", "low", "low", 1),
+    "AOP:3": _assessment("AOP:3", "moderate", "moderate", 3),
+}
+
+
+@pytest.mark.asyncio
+async def test_precompute_bounds_concurrency_and_resumes_from_checkpoint(tmp_path) -> None:
+    output = tmp_path / "results.csv"
+    in_flight = 0
+    peak = 0
+    calls: list[str] = []
+
+    async def assess(aop_id: str) -> dict:
+        nonlocal in_flight, peak
+        calls.append(aop_id)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if aop_id == "AOP:4":
+            raise RuntimeError("upstream timeout")
+        return ASSESSMENTS[aop_id]
+
+    first = await precompute_confidence_results(
+        ["AOP:1", "AOP:2", "AOP:4", "AOP:1"], assess, output_path=output, concurrency=2
+    )
+    assert first == {"output_path": str(output), "skipped": 0, "assessed": 2, "failed": 1}
+    assert peak <= 2
+
+    calls.clear()
+    second = await precompute_confidence_results(
+        ["AOP:1", "AOP:2", "AOP:3", "AOP:4"], assess, output_path=output, concurrency=2
+    )
+    assert calls == ["AOP:3"]
+    assert second["skipped"] == 3
+
+    calls.clear()
+    await precompute_confidence_results(["AOP:4"], assess, output_path=output, retry_failed=True)
+    assert calls == ["AOP:4"]
+
+    rows = read_confidence_results(output)
+    assert sorted(rows) == ["AOP:1", "AOP:2", "AOP:3", "AOP:4"]
+    assert rows["AOP:1"]["ker_count"] == 5
+    assert rows["AOP:4"]["error"] == "RuntimeError: upstream timeout"
+    assert output.read_text(encoding="utf-8").count("aop_id,") == 1
+
+
+@pytest.mark.asyncio
+async def test_query_tool_filters_and_sorts_precomputed_rows(tmp_path, monkeypatch) -> None:
+    output = tmp_path / "results.csv"
+
+    async def assess(aop_id: str) -> dict:
+        if aop_id == "AOP:9":
+            raise ValueError("bad record")
+        return ASSESSMENTS[aop_id]
+
+    await precompute_confidence_results(["AOP:1", "AOP:2", "AOP:3", "AOP:9"], assess, output_path=output)
+    store = ConfidenceResultsStore(output)
+    monkeypatch.setattr(aop_tools, "get_confidence_results_store", lambda: store)
+
+    by_call = await aop_tools.query_aop_confidence_results(
+        aop_tools.QueryAopConfidenceResultsInput(sort_by="overall_call", descending=True)
+    )
+    assert [row["aop_id"] for row in by_call["results"]] == ["AOP:1", "AOP:3", "AOP:2"]
+    assert by_call["total_rows"] == 4
+    assert by_call["configured"] is True
+
+    filtered = await aop_tools.query_aop_confidence_results(
+        aop_tools.QueryAopConfidenceResultsInput(
+            biological_plausibility=["strong", "moderate"],
+            min_ker_count=4,
+        )
+    )
+    assert [row["aop_id"] for row in filtered["results"]] == ["AOP:1"]
+
+    unassessed = await aop_tools.query_aop_confidence_results(
+        aop_tools.QueryAopConfidenceResultsInput(essentiality_of_key_events=["not_assessed"])
+    )
+    assert unassessed["matched_count"] == 3
+
+    failed = await aop_tools.query_aop_confidence_results(
+        aop_tools.QueryAopConfidenceResultsInput(aop_ids=["AOP:9"], include_failed=True)
+    )
+    assert failed["matched_count"] == 1
+    assert failed["results"][0]["error"] == "ValueError: bad record"
+
+
+@pytest.mark.asyncio
+async def test_query_tool_reports_unconfigured_table(monkeypatch) -> None:
+    monkeypatch.setattr(aop_tools, "get_confidence_results_store", lambda: ConfidenceResultsStore(None))
+
+    result = await aop_tools.query_aop_confidence_results(aop_tools.QueryAopConfidenceResultsInput())
+
+    assert result["configured"] is False
+    assert result["results"] == []
+    assert "AOP_MCP_CONFIDENCE_RESULTS_PATH" in result["warnings"][0]
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.instrumentation.progress import report_progress
+from src.server.dependencies import get_job_runner, get_job_service
+from src.server.mcp import dispatch as dispatch_module
+from src.server.mcp.protocol import FORBIDDEN, INVALID_PARAMS, JSONRPCError, JSONRPCRequest
+from src.services.jobs import JobRecord, JobRunner, JobService, JobStatus
+
+
+async def _wait_until_finished(service: JobService, job_id: str) -> JobRecord:
+    for _ in range(200):
+        record = service.get(job_id)
+        if record.status.is_terminal:
+            return record
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.mark.asyncio
+async def test_runner_executes_jobs_and_records_progress() -> None:
+    runner = JobRunner(max_workers=2)
+
+    async def handler(job: JobRecord) -> dict:
+        for index in range(3):
+            report_progress(index + 1, 3, f"step {index + 1}")
+            await asyncio.sleep(0)
+        return {"doubled": job.payload["value"] * 2}
+
+    runner.register("double", handler)
+    job = runner.submit("double", {"value": 21})
+    assert job.status == JobStatus.PENDING
+
+    finished = await _wait_until_finished(runner.service, job.job_id)
+    await runner.stop()
+
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.result == {"doubled": 42}
+    assert (finished.progress, finished.progress_total, finished.progress_message) == (3, 3, "step 3")
+    assert finished.started_at is not None and finished.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_runner_bounds_concurrency() -> None:
+    runner = JobRunner(max_workers=2)
+    active = 0
+    peak = 0
+
+    async def handler(job: JobRecord) -> dict:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return {}
+
+    runner.register("sleep", handler)
+    jobs = [runner.submit("sleep", {}) for _ in range(6)]
+    for job in jobs:
+        await _wait_until_finished(runner.service, job.job_id)
+    await runner.stop()
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_runner_times_out_and_cancels_jobs() -> None:
+    runner = JobRunner(max_workers=1)
+    started = asyncio.Event()
+
+    async def handler(job: JobRecord) -> dict:
+        started.set()
+        await asyncio.sleep(10)
+        return {}
+
+    runner.register("slow", handler)
+    timed_out = runner.submit("slow", {}, timeout_seconds=0.05)
+    record = await _wait_until_finished(runner.service, timed_out.job_id)
+    assert record.status == JobStatus.FAILED
+    assert record.error == "Job timed out after 0.05s"
+
+    started.clear()
+    running = runner.submit("slow", {})
+    queued = runner.submit("slow", {})
+    await started.wait()
+    assert runner.cancel(queued.job_id).status == JobStatus.CANCELLED
+    assert runner.cancel(running.job_id).status == JobStatus.CANCELLED
+    await asyncio.sleep(0.01)
+    await runner.stop()
+
+    assert runner.service.get(running.job_id).status == JobStatus.CANCELLED
+    assert runner.service.get(queued.job_id).started_at is None
+
+
+@pytest.mark.asyncio
+async def test_runner_records_handler_errors_and_purges_expired_results() -> None:
+    runner = JobRunner(max_workers=1, result_ttl_seconds=60)
+
+    async def handler(job: JobRecord) -> dict:
+        raise RuntimeError("upstream unavailable")
+
+    runner.register("broken", handler)
+    job = runner.submit("broken", {})
+    record = await _wait_until_finished(runner.service, job.job_id)
+    await runner.stop()
+
+    assert record.error == "RuntimeError: upstream unavailable"
+    assert runner.purge_expired() == 0
+    purged = runner.service.purge(finished_before=datetime.now(timezone.utc) + timedelta(seconds=1))
+    assert purged == 1
+    assert runner.service.get(job.job_id) is None
+
+
+@pytest.mark.asyncio
+async def test_submit_job_runs_a_tool_call_in_the_background() -> None:
+    get_job_service.cache_clear()
+    get_job_runner.cache_clear()
+    try:
+        submitted = await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=1,
+                method="tools/call",
+                params={"name": "submit_job", "arguments": {"tool_name": "get_tool_call_statistics"}},
+            )
+        )
+        job_id = submitted["structuredContent"]["job"]["job_id"]
+        await _wait_until_finished(get_job_service(), job_id)
+
+        polled = await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=2,
+                method="tools/call",
+                params={"name": "get_job", "arguments": {"job_id": job_id}},
+            )
+        )
+        job = polled["structuredContent"]["job"]
+        assert job["status"] == "succeeded"
+        assert job["tool_name"] == "get_tool_call_statistics"
+        assert "tools" in job["result"]
+
+        listed = await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=3,
+                method="tools/call",
+                params={"name": "list_jobs", "arguments": {"status": "succeeded"}},
+            )
+        )
+        assert [entry["job_id"] for entry in listed["structuredContent"]["jobs"]] == [job_id]
+    finally:
+        await get_job_runner().stop()
+        get_job_service.cache_clear()
+        get_job_runner.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_submit_job_checks_the_target_tool_policy() -> None:
+    read_only = dispatch_module.ToolExecutionContext(scopes=frozenset({"toxmcp:read"}))
+    with pytest.raises(JSONRPCError) as exc_info:
+        await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=1,
+                method="tools/call",
+                params={"name": "submit_job", "arguments": {"tool_name": "profile_tool_calls"}},
+            ),
+            execution_context=read_only,
+        )
+    assert exc_info.value.code == FORBIDDEN
+    assert exc_info.value.data["missingScopes"] == ["toxmcp:admin"]
+
+
+@pytest.mark.asyncio
+async def test_job_tools_only_expose_the_callers_own_jobs_and_permitted_results() -> None:
+    get_job_service.cache_clear()
+    get_job_runner.cache_clear()
+    admin = dispatch_module.ToolExecutionContext(client_id="token:a")
+    owner_read_only = dispatch_module.ToolExecutionContext(
+        scopes=frozenset({"toxmcp:read"}), client_id="token:a"
+    )
+    other = dispatch_module.ToolExecutionContext(client_id="token:b")
+
+    async def call(name: str, arguments: dict, context) -> dict:
+        response = await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=1,
+                method="tools/call",
+                params={"name": name, "arguments": arguments},
+            ),
+            execution_context=context,
+        )
+        return response["structuredContent"]
+
+    try:
+        submitted = await call("submit_job", {"tool_name": "profile_tool_calls"}, admin)
+        job_id = submitted["job"]["job_id"]
+        await _wait_until_finished(get_job_service(), job_id)
+
+        assert (await call("get_job", {"job_id": job_id}, admin))["job"]["result"] is not None
+        # The admin tool's output is withheld from a read-only caller, even its submitter.
+        withheld = (await call("get_job", {"job_id": job_id}, owner_read_only))["job"]
+        assert withheld["result"] is None
+        assert withheld["result_withheld"] is True
+
+        assert (await call("list_jobs", {}, other))["jobs"] == []
+        for name, unknown_id in (("get_job", job_id), ("cancel_job", job_id), ("get_job", "nope")):
+            with pytest.raises(JSONRPCError) as exc_info:
+                await call(name, {"job_id": unknown_id}, other)
+            assert exc_info.value.code == INVALID_PARAMS
+            assert exc_info.value.message == f"Job '{unknown_id}' not found"
+    finally:
+        await get_job_runner().stop()
+        get_job_service.cache_clear()
+        get_job_runner.cache_clear()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.instrumentation import throttle as throttle_module
+from src.instrumentation.throttle import UpstreamThrottle, client_scope
+from src.server.mcp import dispatch as dispatch_module
+from src.server.mcp.protocol import JSONRPCRequest
+from src.services.jobs import (
+    FairShareScheduler,
+    JobPriority,
+    JobRecord,
+    JobRunner,
+    SchedulingPolicy,
+)
+from tests.support.fake_tools import FakeToolRegistry
+
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _job(client: str, index: int, *, priority: JobPriority = JobPriority.BATCH, upstreams=()) -> JobRecord:
+    return JobRecord(
+        job_id=f"{client}-{index}",
+        type="tool_call",
+        client_id=client,
+        priority=priority,
+        upstreams=tuple(upstreams),
+        created_at=_EPOCH + timedelta(seconds=index),
+    )
+
+
+def _dispatch_order(scheduler: FairShareScheduler, queues: dict[str, list[JobRecord]], count: int) -> list[str]:
+    order = []
+    for _ in range(count):
+        heads = [queue[0] for queue in queues.values() if queue]
+        choice = scheduler.select(heads, [])
+        queues[choice.client_id].pop(0)
+        scheduler.charge(choice)
+        order.append(choice.client_id)
+    return order
+
+
+def test_stride_scheduling_shares_workers_by_weight() -> None:
+    queues = {
+        "bulk": [_job("bulk", index) for index in range(200)],
+        "light": [_job("light", 1000 + index) for index in range(3)],
+    }
+    assert _dispatch_order(FairShareScheduler(), queues, 6) == [
+        "bulk", "light", "bulk", "light", "bulk", "light"
+    ]
+
+    weighted = FairShareScheduler(SchedulingPolicy(client_weights={"bulk": 2.0}))
+    queues = {
+        "bulk": [_job("bulk", index) for index in range(200)],
+        "light": [_job("light", 1000 + index) for index in range(200)],
+    }
+    assert _dispatch_order(weighted, queues, 6).count("bulk") == 4
+
+
+def test_idle_clients_rejoin_at_the_current_virtual_time() -> None:
+    scheduler = FairShareScheduler()
+    queues = {"bulk": [_job("bulk", index) for index in range(20)]}
+    _dispatch_order(scheduler, queues, 10)
+
+    queues["late"] = [_job("late", 100 + index) for index in range(5)]
+    # The newcomer alternates with bulk rather than running its whole backlog first.
+    assert _dispatch_order(scheduler, queues, 4) == ["late", "bulk", "late", "bulk"]
+
+
+def test_interactive_jobs_go_first_and_batch_is_capped() -> None:
+    scheduler = FairShareScheduler(SchedulingPolicy(batch_max_running=1))
+    batch = _job("bulk", 0)
+    interactive = _job("user", 5, priority=JobPriority.INTERACTIVE)
+
+    assert scheduler.select([batch, interactive], []) is interactive
+    assert scheduler.select([batch], [_job("bulk", 9)]) is None
+    assert scheduler.select([interactive], [_job("bulk", 9)]) is interactive
+
+
+def test_per_client_and_upstream_caps() -> None:
+    scheduler = FairShareScheduler(
+        SchedulingPolicy(max_running_per_client=2, upstream_max_running_per_client={"comptox": 1})
+    )
+    running = [_job("bulk", 0, upstreams=("comptox",)), _job("bulk", 1)]
+
+    assert scheduler.select([_job("bulk", 2)], running) is None
+    assert scheduler.select([_job("bulk", 2, upstreams=("comptox",))], running[:1]) is None
+    assert scheduler.select([_job("bulk", 2)], running[:1]) is not None
+    assert scheduler.select([_job("other", 2, upstreams=("comptox",))], running) is not None
+
+
+@pytest.mark.asyncio
+async def test_runner_interleaves_clients() -> None:
+    runner = JobRunner(max_workers=1)
+    order: list[str] = []
+
+    async def handler(job: JobRecord) -> dict:
+        order.append(job.payload["label"])
+        return {}
+
+    runner.register("work", handler)
+    for index in range(4):
+        runner.submit("work", {"label": f"bulk-{index}"}, client_id="bulk", priority=JobPriority.BATCH)
+    runner.submit("work", {"label": "light-0"}, client_id="light", priority=JobPriority.BATCH)
+    runner.submit("work", {"label": "urgent"}, client_id="bulk", priority=JobPriority.INTERACTIVE)
+    for _ in range(200):
+        if len(order) == 6:
+            break
+        await asyncio.sleep(0.01)
+    await runner.stop()
+
+    # The interactive job is charged to "bulk", so "light" goes next.
+    assert order[:4] == ["urgent", "light-0", "bulk-0", "bulk-1"]
+
+
+def test_throttle_limits_each_client_to_its_share(monkeypatch: pytest.MonkeyPatch) -> None:
+    waits: list[float] = []
+    monkeypatch.setattr(throttle_module.time, "sleep", waits.append)
+    throttle = UpstreamThrottle()
+    throttle.configure("comptox", requests_per_second=10, burst=10, client_share=0.2)
+
+    with client_scope("light"):
+        throttle.acquire("comptox")
+    with client_scope("bulk"):
+        delays = [throttle.acquire("comptox") for _ in range(4)]
+    with client_scope("light"):
+        light_delay = throttle.acquire("comptox")
+
+    # "bulk" gets a 2-request burst at 2 requests per second; "light" is unaffected.
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.5, abs=0.05)
+    assert delays[3] == pytest.approx(1.0, abs=0.05)
+    assert light_delay == 0.0
+    assert throttle.acquire("hgnc") == 0.0
+
+
+def test_throttle_gives_a_lone_client_the_whole_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(throttle_module.time, "sleep", lambda seconds: None)
+    throttle = UpstreamThrottle()
+    throttle.configure("comptox", requests_per_second=10, burst=10, client_share=0.2)
+
+    with client_scope("only"):
+        delays = [throttle.acquire("comptox") for _ in range(11)]
+
+    assert delays[:10] == [0.0] * 10
+    assert delays[10] == pytest.approx(0.1, abs=0.05)
+
+
+def test_throttle_drops_refilled_client_buckets(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(throttle_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(throttle_module.time, "sleep", lambda seconds: None)
+    throttle = UpstreamThrottle()
+    throttle.configure("comptox", requests_per_second=10, burst=10, client_share=0.2)
+
+    for index in range(50):
+        with client_scope(f"client-{index}"):
+            throttle.acquire("comptox")
+    with client_scope("busy"):
+        throttle.acquire("comptox")
+        throttle.acquire("comptox")
+        throttle.acquire("comptox")
+    now[0] += throttle_module._EVICT_INTERVAL_SECONDS
+    with client_scope("other"):
+        throttle.acquire("comptox")
+    with client_scope("busy"):
+        throttle.acquire("comptox")
+
+    # A new bucket starts full, so dropping refilled ones changes no delay.
+    assert list(throttle._client_buckets) == [("comptox", "busy")]
+    assert list(throttle._last_seen["comptox"]) == ["other", "busy"]
+
+
+def test_scheduler_forgets_clients_without_queued_or_running_jobs() -> None:
+    scheduler = FairShareScheduler()
+    for index in range(100):
+        choice = scheduler.select([_job(f"once-{index}", index)], [])
+        scheduler.charge(choice)
+    queues = {"bulk": [_job("bulk", index) for index in range(5)]}
+    _dispatch_order(scheduler, queues, 2)
+
+    assert list(scheduler._pass) == ["bulk"]
+
+
+class _ClientRecordingRegistry(FakeToolRegistry):
+    def __init__(self) -> None:
+        super().__init__(name="echo", handler=self._record, output_schema={"type": "object"})
+        self.clients: list[str | None] = []
+
+    async def _record(self, params: dict) -> dict:
+        self.clients.append(throttle_module.current_client_id())
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_client_identity_comes_only_from_authentication(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = _ClientRecordingRegistry()
+    monkeypatch.setattr(dispatch_module, "tool_registry", registry)
+    meta = {"toxmcp/clientInfo": {"name": "agent-1", "version": "1.0"}}
+
+    for client_id in ("token:abc", None):
+        await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=1,
+                method="tools/call",
+                params={"name": "echo", "arguments": {}, "_meta": meta},
+            ),
+            execution_context=dispatch_module.ToolExecutionContext(client_id=client_id),
+        )
+
+    # A client-chosen name never gets its own budget or job queue.
+    assert registry.clients == ["token:abc", None]
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.instrumentation.progress import report_progress
+from src.server.mcp import dispatch as dispatch_module
+from src.server.tools.registry import tool_registry
+from src.services.jobs import (
+    FairShareScheduler,
+    JobPriority,
+    JobRecord,
+    JobRunner,
+    JobService,
+    JobStatus,
+    SchedulingPolicy,
+    SqliteJobBackend,
+)
+from src.services.jobs.sqlite_backend import JOB_STORE_SCHEMA_VERSION
+
+
+def test_sqlite_backend_persists_jobs_across_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    service = JobService(SqliteJobBackend(path))
+    service.submit(JobRecord(job_id="job-1", type="sparql", payload={"query": "ASK {}"}))
+    service.submit(JobRecord(job_id="job-2", type="sparql"))
+    service.report_progress("job-1", 1, total=4, message="first page")
+    service.mark_succeeded("job-2", result={"rows": 3})
+
+    reopened = JobService(SqliteJobBackend(path))
+    first = reopened.get("job-1")
+    assert first.payload == {"query": "ASK {}"}
+    assert (first.progress, first.progress_total, first.progress_message) == (1, 4, "first page")
+    assert [job.job_id for job in reopened.list(status=JobStatus.SUCCEEDED)] == ["job-2"]
+    assert reopened.get("job-2").result == {"rows": 3}
+    with pytest.raises(ValueError):
+        reopened.submit(JobRecord(job_id="job-1", type="sparql"))
+
+
+def test_client_caps_hold_across_backends_claiming_from_stale_snapshots(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    first = JobService(SqliteJobBackend(path))
+    second = JobService(SqliteJobBackend(path))
+    for index in range(2):
+        first.submit(JobRecord(job_id=f"bulk-{index}", type="sparql", client_id="bulk"))
+    first.submit(JobRecord(job_id="light-0", type="sparql", client_id="light"))
+    scheduler = FairShareScheduler(SchedulingPolicy(max_running_per_client=1))
+
+    # Both processes chose before either claimed, so each saw "bulk" with nothing running.
+    assert scheduler.admits(first.get("bulk-0"), first.list(status=JobStatus.RUNNING))
+    assert scheduler.admits(second.get("bulk-1"), second.list(status=JobStatus.RUNNING))
+    claimed = first.claim("worker-a", lease_seconds=30, job_id="bulk-0", admit=scheduler.admits)
+    refused = second.claim("worker-b", lease_seconds=30, job_id="bulk-1", admit=scheduler.admits)
+    other = second.claim("worker-b", lease_seconds=30, job_id="light-0", admit=scheduler.admits)
+
+    assert claimed is not None and claimed.job_id == "bulk-0"
+    assert refused is None
+    assert second.get("bulk-1").status == JobStatus.PENDING
+    assert other is not None and other.job_id == "light-0"
+
+
+def test_claims_are_exclusive_across_backends_on_one_file(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    first = JobService(SqliteJobBackend(path))
+    second = JobService(SqliteJobBackend(path))
+    for index in range(3):
+        first.submit(JobRecord(job_id=f"job-{index}", type="sparql"))
+    first.submit(JobRecord(job_id="other", type="publish"))
+
+    claimed = [
+        first.claim("worker-a", lease_seconds=30, job_types=("sparql",)),
+        second.claim("worker-b", lease_seconds=30, job_types=("sparql",)),
+        first.claim("worker-a", lease_seconds=30, job_types=("sparql",)),
+    ]
+
+    assert [job.job_id for job in claimed] == ["job-0", "job-1", "job-2"]
+    assert [job.lease_owner for job in claimed] == ["worker-a", "worker-b", "worker-a"]
+    assert second.claim("worker-b", lease_seconds=30, job_types=("sparql",)) is None
+    assert second.get("other").status == JobStatus.PENDING
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_expired_leases_are_requeued_then_abandoned(tmp_path: Path, backend: str) -> None:
+    service = JobService(SqliteJobBackend(tmp_path / "jobs.sqlite3") if backend == "sqlite" else None)
+    service.submit(JobRecord(job_id="job-1", type="sparql"))
+
+    service.claim("crashed", lease_seconds=0.01)
+    time.sleep(0.02)
+    assert not service.renew_lease("job-1", "other", lease_seconds=30)
+    assert service.requeue_expired(max_attempts=2) == 1
+    assert service.get("job-1").status == JobStatus.PENDING
+
+    reclaimed = service.claim("also-crashed", lease_seconds=0.01)
+    assert reclaimed.attempts == 2
+    time.sleep(0.02)
+    assert service.requeue_expired(max_attempts=2) == 0
+    abandoned = service.get("job-1")
+    assert abandoned.status == JobStatus.FAILED
+    assert abandoned.error.startswith("Job abandoned after 2 attempt(s)")
+
+
+def test_cancelling_a_running_job_revokes_its_lease(tmp_path: Path) -> None:
+    service = JobService(SqliteJobBackend(tmp_path / "jobs.sqlite3"))
+    service.submit(JobRecord(job_id="job-1", type="sparql"))
+    service.claim("worker", lease_seconds=30)
+    assert service.renew_lease("job-1", "worker", lease_seconds=30)
+
+    service.cancel("job-1")
+
+    assert not service.renew_lease("job-1", "worker", lease_seconds=30)
+    assert service.get("job-1").lease_owner is None
+
+
+@pytest.mark.asyncio
+async def test_runner_resumes_jobs_of_a_crashed_worker(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    crashed = JobService(SqliteJobBackend(path))
+    crashed.submit(JobRecord(job_id="job-1", type="echo", payload={"value": 7}, timeout_seconds=5))
+    crashed.claim("crashed-worker", lease_seconds=0.01)
+    await asyncio.sleep(0.02)
+
+    runner = JobRunner(JobService(SqliteJobBackend(path)), max_workers=1)
+
+    async def echo(job: JobRecord) -> dict:
+        return {"value": job.payload["value"]}
+
+    runner.register("echo", echo)
+    runner.start()
+    for _ in range(200):
+        if runner.service.get("job-1").status.is_terminal:
+            break
+        await asyncio.sleep(0.01)
+    await runner.stop()
+
+    recovered = runner.service.get("job-1")
+    assert recovered.status == JobStatus.SUCCEEDED
+    assert recovered.result == {"value": 7}
+    assert recovered.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_jobs_are_served_from_the_result_cache(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    calls = 0
+
+    async def square(job: JobRecord) -> dict:
+        nonlocal calls
+        calls += 1
+        return {"square": job.payload["value"] ** 2}
+
+    runner = JobRunner(JobService(SqliteJobBackend(path)), max_workers=1)
+    runner.register("square", square, cache_key_fields=("value",))
+    first = runner.submit("square", {"value": 4, "requested_by": "a"})
+    for _ in range(200):
+        if runner.service.get(first.job_id).status.is_terminal:
+            break
+        await asyncio.sleep(0.01)
+    await runner.stop()
+
+    restarted = JobRunner(JobService(SqliteJobBackend(path)), max_workers=1)
+    restarted.register("square", square, cache_key_fields=("value",))
+    hit = restarted.submit("square", {"value": 4, "requested_by": "b"})
+    bypass = restarted.submit("square", {"value": 4}, use_cache=False)
+    await restarted.stop()
+
+    assert calls == 1
+    assert hit.cached and hit.status == JobStatus.SUCCEEDED
+    assert hit.result == {"square": 16}
+    assert not bypass.cached and bypass.status == JobStatus.PENDING
+
+
+
+@pytest.mark.asyncio
+async def test_runner_keeps_sqlite_calls_off_the_event_loop(tmp_path: Path) -> None:
+    backend = SqliteJobBackend(tmp_path / "jobs.sqlite3")
+    threads: set[str] = set()
+    for name in ("enqueue", "claim", "update", "update_progress", "requeue_expired"):
+        method = getattr(backend, name)
+
+        def record_thread(*args, _method=method, **kwargs):
+            threads.add(threading.current_thread().name)
+            return _method(*args, **kwargs)
+
+        setattr(backend, name, record_thread)
+
+    async def echo(job: JobRecord) -> dict:
+        report_progress(1, 1, "done")
+        return {"value": job.payload["value"]}
+
+    runner = JobRunner(JobService(backend), max_workers=1)
+    runner.register("echo", echo)
+    job = await runner.submit_async("echo", {"value": 3})
+    for _ in range(200):
+        record = await runner.call_store(runner.service.get, job.job_id)
+        if record.status.is_terminal:
+            break
+        await asyncio.sleep(0.01)
+    await runner.stop()
+
+    assert record.result == {"value": 3}
+    assert threads and all(name.startswith("job-store") for name in threads)
+    # Releasing a job that was purged meanwhile is a no-op.
+    assert not backend.release("missing", runner.owner)
+
+
+def test_only_reference_data_tools_are_cacheable() -> None:
+    assert dispatch_module._job_result_cacheable(tool_registry.get_tool("search_aops"))
+    assert not dispatch_module._job_result_cacheable(tool_registry.get_tool("get_tool_call_statistics"))
+    assert not dispatch_module._job_result_cacheable(tool_registry.get_tool("create_draft_aop"))
+
+
+def test_opening_a_v1_store_adds_the_scheduling_columns(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    # The layout written before jobs carried a client, priority, and upstreams.
+    with sqlite3.connect(path) as connection:
+        connection.executescript(
+            """
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            INSERT INTO meta VALUES ('schema_version', 'job-store.v1');
+            CREATE TABLE jobs (
+                job_id TEXT PRIMARY KEY, type TEXT NOT NULL, status TEXT NOT NULL,
+                created_at TEXT NOT NULL, updated_at TEXT NOT NULL, payload TEXT NOT NULL,
+                result TEXT, error TEXT, timeout_seconds REAL, started_at TEXT, finished_at TEXT,
+                progress REAL, progress_total REAL, progress_message TEXT, cache_key TEXT,
+                cached INTEGER NOT NULL DEFAULT 0, attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT, lease_expires_at REAL
+            );
+            CREATE INDEX jobs_by_status_created ON jobs (status, created_at);
+            INSERT INTO jobs (job_id, type, status, created_at, updated_at, payload)
+                VALUES ('old', 'sparql', 'pending', '2026-01-01T00:00:00.000000Z',
+                        '2026-01-01T00:00:00.000000Z', '{}');
+            CREATE TABLE results (cache_key TEXT PRIMARY KEY, result TEXT NOT NULL, stored_at TEXT NOT NULL);
+            """
+        )
+    connection.close()
+
+    service = JobService(SqliteJobBackend(path))
+
+    old = service.get("old")
+    assert (old.client_id, old.priority, old.upstreams) == (None, JobPriority.INTERACTIVE, ())
+    assert [head.job_id for head in service.pending_heads()] == ["old"]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT value FROM meta").fetchone() == (JOB_STORE_SCHEMA_VERSION,)
+    connection.close()
+    # Reopening the migrated store is a no-op.
+    assert JobService(SqliteJobBackend(path)).get("old").job_id == "old"
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.instrumentation.loop_monitor import EventLoopMonitor, event_loop_monitor
+from src.instrumentation.metrics import MetricsRecorder
+from src.server.api.server import create_app
+from src.server.config.settings import get_settings
+
+
+async def _blocking_handler() -> None:
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_lag_and_the_blocking_coroutine() -> None:
+    metrics = MetricsRecorder()
+    monitor = EventLoopMonitor(threshold_seconds=0.05, metrics=metrics)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        await _blocking_handler()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert not monitor.running
+    [event] = monitor.recent_events()
+    assert event["coroutine"] == "_blocking_handler"
+    assert event["stack"][-1].startswith("test_loop_monitor.py:")
+    assert event["stack"][-1].endswith("_blocking_handler")
+    assert event["resolved"] is True
+    assert event["lag_seconds"] >= 0.2
+    assert metrics.counter_value("event_loop.blocked") == 1
+    assert metrics.histogram("event_loop.lag_seconds").count >= 2
+    assert monitor.lag_quantile(0.99) > 0.05
+    assert 'aop_mcp_event_loop_lag_quantile_seconds{quantile="0.99"}' in metrics.render_prometheus()
+
+
+def test_app_lifespan_starts_and_stops_the_monitor(monkeypatch: pytest.MonkeyPatch) -> None:
+    get_settings.cache_clear()
+    try:
+        with TestClient(create_app()):
+            assert event_loop_monitor.running
+        assert not event_loop_monitor.running
+
+        monkeypatch.setenv("AOP_MCP_LOOP_LAG_MONITOR_ENABLED", "false")
+        get_settings.cache_clear()
+        with TestClient(create_app()):
+            assert not event_loop_monitor.running
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.instrumentation.audit import tool_call_audit_log
+from src.server.api.server import app
+from src.server.config.settings import get_settings
+from src.server.mcp import dispatch as dispatch_module
+from src.server.mcp import router as router_module
+from tests.support.fake_tools import ECHO_OUTPUT_SCHEMA, FakeToolRegistry
+
+
+class SlowEchoRegistry(FakeToolRegistry):
+    """Echoes ``value`` after ``delay`` seconds and records peak concurrency."""
+
+    def __init__(self) -> None:
+        super().__init__(name="echo", handler=self._echo, output_schema=ECHO_OUTPUT_SCHEMA)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _echo(self, params: dict[str, Any]) -> dict[str, Any]:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(params.get("delay", 0))
+        finally:
+            self.in_flight -= 1
+        return {"echo": params["value"]}
+
+
+def _echo(request_id: Any, value: str, *, delay: float = 0.0) -> dict[str, Any]:
+    message: dict[str, Any] = {
+        "jsonrpc": "2.0",
+        "method": "tools/call",
+        "params": {"name": "echo", "arguments": {"value": value, "delay": delay}},
+    }
+    if request_id is not None:
+        message["id"] = request_id
+    return message
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> SlowEchoRegistry:
+    fake = SlowEchoRegistry()
+    monkeypatch.setattr(dispatch_module, "tool_registry", fake)
+    tool_call_audit_log.clear()
+    yield fake
+    tool_call_audit_log.clear()
+
+
+@pytest.fixture
+def settings_env(monkeypatch: pytest.MonkeyPatch):
+    def apply(**values: str) -> None:
+        for name, value in values.items():
+            monkeypatch.setenv(f"AOP_MCP_{name.upper()}", value)
+        get_settings.cache_clear()
+
+    yield apply
+    get_settings.cache_clear()
+
+
+def test_batch_runs_concurrently_and_preserves_order(
+    registry: SlowEchoRegistry, settings_env
+) -> None:
+    settings_env(batch_concurrency="2")
+    batch = [
+        _echo(1, "slow", delay=0.05),
+        _echo(2, "fast"),
+        _echo(None, "notification"),
+        _echo(3, "medium", delay=0.02),
+    ]
+
+    response = TestClient(app).post("/mcp", json=batch)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body] == [1, 2, 3]
+    assert [item["result"]["structuredContent"]["echo"] for item in body] == [
+        "slow",
+        "fast",
+        "medium",
+    ]
+    assert registry.peak == 2
+    # Every element, the notification included, is its own audited tool call.
+    assert len(tool_call_audit_log.list_records()) == 4
+
+
+def test_batch_errors_stay_per_element(registry: SlowEchoRegistry) -> None:
+    batch = [
+        _echo("ok", "fine"),
+        {"jsonrpc": "2.0", "id": "missing", "method": "tools/call", "params": {"name": "nope"}},
+        "not an object",
+        {"jsonrpc": "2.0", "id": "init", "method": "initialize", "params": {}},
+    ]
+
+    body = TestClient(app).post("/mcp", json=batch).json()
+
+    assert body[0]["result"]["structuredContent"] == {"echo": "fine"}
+    assert body[1]["id"] == "missing"
+    assert body[1]["error"]["message"] == "Tool not found: nope"
+    assert body[2]["error"]["code"] == dispatch_module.INVALID_REQUEST
+    assert body[3]["id"] == "init"
+    assert body[3]["error"]["code"] == dispatch_module.INVALID_REQUEST
+
+
+def test_batch_of_notifications_returns_no_content(registry: SlowEchoRegistry) -> None:
+    response = TestClient(app).post("/mcp", json=[_echo(None, "a"), _echo(None, "b")])
+
+    assert response.status_code == 204
+    assert response.content == b""
+
+
+def test_empty_batch_and_oversized_chunked_body_are_rejected(
+    registry: SlowEchoRegistry, settings_env
+) -> None:
+    client = TestClient(app)
+    assert client.post("/mcp", json=[]).status_code == 400
+
+    settings_env(max_request_bytes="64")
+    body = json.dumps([_echo(index, "x" * 20) for index in range(4)]).encode()
+
+    def chunks():
+        yield body
+
+    # A generator body is sent chunked, without Content-Length.
+    response = client.post("/mcp", content=chunks(), headers={"content-type": "application/json"})
+
+    assert response.status_code == 413
+    assert registry.peak == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_creates_a_task_per_worker_not_per_element(
+    registry: SlowEchoRegistry, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tasks: list[int] = []
+    baseline = len(asyncio.all_tasks())
+
+    async def counting_call_tool(name: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        tasks.append(len(asyncio.all_tasks()) - baseline)
+        return await SlowEchoRegistry.call_tool(registry, name, params)
+
+    monkeypatch.setattr(registry, "call_tool", counting_call_tool)
+
+    responses = await dispatch_module.dispatch_batch(
+        [_echo(index, str(index), delay=0.001) for index in range(50)], concurrency=3
+    )
+
+    assert [json.loads(response)["id"] for response in responses] == list(range(50))
+    assert registry.peak == 3
+    assert max(tasks) <= 3
+
+
+class _ChunkedRequest:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.read = 0
+
+    async def stream(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_request_body_read_stops_at_the_size_limit() -> None:
+    request = _ChunkedRequest([b"x" * 40] * 10)
+
+    assert await router_module._read_body(request, limit=100) is None
+    assert request.read == 3
+    assert await router_module._read_body(_ChunkedRequest([b"{}", b"[]"]), limit=4) == b"{}[]"
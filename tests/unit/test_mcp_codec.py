@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.instrumentation.audit import hash_json, tool_call_audit_log
+from src.server.api.server import create_app
+from src.server.config.settings import get_settings
+from src.server.mcp import codec
+from src.server.mcp import dispatch as dispatch_module
+from tests.support.fake_tools import FakeRegisteredTool, FakeToolRegistry
+
+
+PAYLOAD = {
+    "zeta": [1, 2.5, None, True],
+    "alpha": {"title": "Développement — Ω", "count": 3},
+    "aop_ids": ["AOP:1", "AOP:2"],
+}
+
+
+async def _echo_payload(params: dict[str, Any]) -> dict[str, Any]:
+    return json.loads(json.dumps(PAYLOAD))
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch):
+    registry = FakeToolRegistry(
+        name="echo", handler=_echo_payload, output_schema={"title": "echo.response", "type": "object"}
+    )
+    monkeypatch.setattr(dispatch_module, "tool_registry", registry)
+    get_settings.cache_clear()
+    tool_call_audit_log.clear()
+    yield TestClient(create_app())
+    get_settings.cache_clear()
+    tool_call_audit_log.clear()
+
+
+def _call(client: TestClient, **headers: str):
+    return client.post(
+        "/mcp",
+        headers=headers,
+        json={"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": {"name": "echo"}},
+    )
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_codec_hash_and_envelope_match_stdlib(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if use_orjson and not codec.HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(codec, "orjson", None)
+
+    encoded = codec.encode_payload(PAYLOAD)
+    assert encoded.sha256 == hash_json(PAYLOAD)
+    assert json.loads(encoded.text()) == PAYLOAD
+    assert json.loads(encoded.text(compact=True)) == PAYLOAD
+
+    result = codec.ToolCallResult(content=[{"type": "text", "text": "x"}], structuredContent=PAYLOAD)
+    result.encoded_structured_content = encoded.canonical
+    body = codec.render_jsonrpc(result=result, request_id="req-1")
+    assert codec.loads(body) == {"jsonrpc": "2.0", "result": dict(result), "id": "req-1"}
+
+
+def test_accepts_gzip_honours_quality_values() -> None:
+    assert codec.accepts_gzip("gzip, deflate, br")
+    assert codec.accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not codec.accepts_gzip("gzip;q=0, *")
+    assert not codec.accepts_gzip("identity")
+    assert not codec.accepts_gzip(None)
+
+
+def test_mcp_endpoint_gzips_large_bodies_and_reuses_result_hash(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("AOP_MCP_RESPONSE_GZIP_MIN_BYTES", "64")
+    get_settings.cache_clear()
+
+    response = _call(client, **{"accept-encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    result = response.json()["result"]
+    assert result["structuredContent"] == PAYLOAD
+    assert tool_call_audit_log.list_records()[-1].response_hash == hash_json(PAYLOAD)
+
+    plain = _call(client, **{"accept-encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == response.json()
+
+
+def test_mcp_endpoint_compact_text_mode(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AOP_MCP_COMPACT_JSON_TEXT", "true")
+    get_settings.cache_clear()
+
+    text = _call(client).json()["result"]["content"][0]["text"]
+
+    body, _, sources = text.partition("\n\nSources:")
+    assert body == codec.canonical_dumps(PAYLOAD).decode("ascii")
+    source = FakeRegisteredTool.sources[0]
+    assert sources == f"\n- {source['name']}: {source['url']}"
+
+
+def test_mcp_endpoint_rejects_invalid_json(client: TestClient) -> None:
+    response = client.post("/mcp", content=b"{not json", headers={"content-type": "application/json"})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32700
+
+
+def test_mcp_endpoint_summarizes_text_for_structured_content_clients(client: TestClient) -> None:
+    initialize = client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": {}}},
+    )
+    assert initialize.json()["result"]["capabilities"]["structuredContentSummaries"]["enabled"] is True
+
+    response = client.post(
+        "/mcp",
+        json={
+            "jsonrpc": "2.0",
+            "id": 2,
+            "method": "tools/call",
+            "params": {"name": "echo", "_meta": {dispatch_module.STRUCTURED_CONTENT_META_KEY: True}},
+        },
+    )
+
+    result = response.json()["result"]
+    assert result["structuredContent"] == PAYLOAD
+    assert result["content"][0]["text"] == (
+        "echo returned 3 field(s) in structuredContent.\n"
+        "- zeta: 4 item(s)\n"
+        "- aop_ids: 2 item(s)\n\n"
+        "Sources:\n- Test fixture: https://github.com/ToxMCP/aop-mcp"
+    )
+    assert tool_call_audit_log.list_records()[-1].response_hash == hash_json(PAYLOAD)
@@ -67,6 +67,12 @@ def test_tools_list_includes_registered_tools() -> None:
         "export_draft_replay_package",
         "export_tool_call_audit_log_evidence",
         "list_tool_call_audit_records",
+        "get_tool_call_statistics",
+        "profile_tool_calls",
+        "submit_job",
+        "get_job",
+        "cancel_job",
+        "list_jobs",
         "list_saved_draft_review_artifacts",
         "plan_linear_draft_review_document",
         "review_draft_evidence_gaps",
@@ -98,6 +104,16 @@ def test_tools_list_includes_registered_tools() -> None:
     assert by_name["export_tool_call_audit_log_evidence"]["annotations"]["requiresConfirmation"] is True
     assert by_name["list_tool_call_audit_records"]["outputSchema"]["title"] == "list_tool_call_audit_records.response"
     assert by_name["list_tool_call_audit_records"]["annotations"]["riskClass"] == "read"
+    assert by_name["get_tool_call_statistics"]["outputSchema"]["title"] == "get_tool_call_statistics.response"
+    assert by_name["get_tool_call_statistics"]["annotations"]["riskClass"] == "read"
+    assert by_name["profile_tool_calls"]["outputSchema"]["title"] == "profile_tool_calls.response"
+    assert by_name["profile_tool_calls"]["annotations"]["riskClass"] == "admin"
+    assert by_name["profile_tool_calls"]["annotations"]["requiredScopes"] == ["toxmcp:admin"]
+    assert by_name["submit_job"]["outputSchema"]["title"] == "submit_job.response"
+    assert by_name["submit_job"]["annotations"]["riskClass"] == "read"
+    assert by_name["get_job"]["outputSchema"]["title"] == "get_job.response"
+    assert by_name["cancel_job"]["annotations"]["riskClass"] == "execute"
+    assert by_name["list_jobs"]["outputSchema"]["title"] == "list_jobs.response"
     assert by_name["list_saved_draft_review_artifacts"]["outputSchema"]["title"] == "list_saved_draft_review_artifacts.response"
     assert by_name["plan_linear_draft_review_document"]["outputSchema"]["title"] == "plan_linear_draft_review_document.response"
     assert by_name["plan_linear_draft_review_document"]["annotations"]["riskClass"] == "export"
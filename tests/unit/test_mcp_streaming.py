@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.instrumentation.progress import (
+    report_partial_result,
+    report_progress,
+    wants_partial_results,
+)
+from src.server.api.server import app
+from src.server.mcp import dispatch as dispatch_module
+from tests.support.fake_tools import FakeToolRegistry
+
+ITEMS_OUTPUT_SCHEMA = {
+    "title": "fake_tool.response",
+    "type": "object",
+    "required": ["items"],
+    "properties": {"items": {"type": "array", "items": {"type": "string"}}},
+    "additionalProperties": False,
+}
+
+
+class ProgressReportingRegistry(FakeToolRegistry):
+    """Reports one step from the loop and one from a worker thread, then finishes."""
+
+    def __init__(self) -> None:
+        super().__init__(handler=self._report, output_schema=ITEMS_OUTPUT_SCHEMA)
+        self.saw_partial_receiver: bool | None = None
+
+    async def _report(self, params: dict[str, Any]) -> dict[str, Any]:
+        self.saw_partial_receiver = wants_partial_results()
+        report_progress(1, 2, "first")
+        report_partial_result({"item": "a"})
+        await asyncio.to_thread(report_progress, 2, 2, "second")
+        await asyncio.to_thread(report_partial_result, {"item": "b"})
+        return {"items": ["a", "b"]}
+
+
+def _call(meta: dict[str, Any], *, tool: str = "fake_tool") -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": 7,
+        "method": "tools/call",
+        "params": {"name": tool, "arguments": {}, "_meta": meta},
+    }
+
+
+def _events(body: str) -> list[dict[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = block.splitlines()
+        assert lines[0] == "event: message"
+        events.append(json.loads(lines[1].removeprefix("data: ")))
+    return events
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> ProgressReportingRegistry:
+    fake = ProgressReportingRegistry()
+    monkeypatch.setattr(dispatch_module, "tool_registry", fake)
+    return fake
+
+
+def test_tool_call_streams_progress_then_result(registry: ProgressReportingRegistry) -> None:
+    response = TestClient(app).post(
+        "/mcp",
+        json=_call({"progressToken": "tok-1"}),
+        headers={"Accept": "application/json, text/event-stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [event.get("method") for event in events] == [
+        "notifications/progress",
+        "notifications/progress",
+        None,
+    ]
+    assert events[0]["params"] == {
+        "progressToken": "tok-1",
+        "progress": 1,
+        "total": 2,
+        "message": "first",
+    }
+    assert events[1]["params"]["message"] == "second"
+    assert events[2]["id"] == 7
+    assert events[2]["result"]["structuredContent"] == {"items": ["a", "b"]}
+    # Partial results were not requested, so handlers skip building them.
+    assert registry.saw_partial_receiver is False
+
+
+def test_tool_call_streams_partial_results_when_requested(
+    registry: ProgressReportingRegistry,
+) -> None:
+    response = TestClient(app).post(
+        "/mcp",
+        json=_call({"toxmcp/partialResults": True}),
+        headers={"Accept": "application/json, text/event-stream"},
+    )
+
+    events = _events(response.text)
+    assert [event.get("method") for event in events] == [
+        "notifications/toxmcp/partialResult",
+        "notifications/toxmcp/partialResult",
+        None,
+    ]
+    # Without a progressToken there is nothing to report progress against.
+    assert [event["params"] for event in events[:2]] == [
+        {"result": {"item": "a"}},
+        {"result": {"item": "b"}},
+    ]
+    assert events[2]["result"]["structuredContent"] == {"items": ["a", "b"]}
+
+
+def test_streamed_tool_call_errors_arrive_as_the_final_event(
+    registry: ProgressReportingRegistry,
+) -> None:
+    response = TestClient(app).post(
+        "/mcp",
+        json=_call({"progressToken": 3}, tool="missing_tool"),
+        headers={"Accept": "application/json, text/event-stream"},
+    )
+
+    assert response.status_code == 200
+    (event,) = _events(response.text)
+    assert event["id"] == 7
+    assert event["error"]["message"] == "Tool not found: missing_tool"
+
+
+def test_tool_call_without_event_stream_accept_returns_json(
+    registry: ProgressReportingRegistry,
+) -> None:
+    response = TestClient(app).post("/mcp", json=_call({"progressToken": "tok-1"}))
+
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json()["result"]["structuredContent"] == {"items": ["a", "b"]}
@@ -1,58 +1,23 @@
 from __future__ import annotations
 
+import itertools
 import json
+import threading
 from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
-from src.instrumentation.audit import tool_call_audit_log
-from src.server.mcp import router as router_module
+from src.instrumentation.audit import (
+    InMemoryToolCallAuditLog,
+    ToolCallAuditRecord,
+    tool_call_audit_log,
+)
+from src.server.mcp import dispatch as dispatch_module
 from src.server.mcp.protocol import FORBIDDEN, INTERNAL_ERROR, JSONRPCError, JSONRPCRequest
 from src.server.tools import aop as aop_tools
-
-
-class FakeRegisteredTool:
-    output_schema = {
-        "title": "fake_tool.response",
-        "type": "object",
-        "required": ["ok"],
-        "properties": {"ok": {"type": "boolean"}},
-        "additionalProperties": False,
-    }
-    risk_class = "read"
-    required_scopes = ("toxmcp:read",)
-    requires_confirmation = False
-    sources = [
-        {
-            "name": "Test fixture",
-            "url": "https://github.com/ToxMCP/aop-mcp",
-            "description": "Synthetic evidence used by the unit-test tool.",
-        }
-    ]
-
-
-class FakeToolRegistry:
-    def __init__(
-        self,
-        result: dict[str, Any],
-        *,
-        required_scopes: tuple[str, ...] = ("toxmcp:read",),
-        requires_confirmation: bool = False,
-    ) -> None:
-        self._result = result
-        self._tool = FakeRegisteredTool()
-        self._tool.required_scopes = required_scopes
-        self._tool.requires_confirmation = requires_confirmation
-
-    def get_tool(self, name: str) -> FakeRegisteredTool:
-        if name != "fake_tool":
-            raise KeyError(f"Tool '{name}' not found")
-        return self._tool
-
-    async def call_tool(self, name: str, params: dict[str, Any] | None) -> dict[str, Any]:
-        self.get_tool(name)
-        return dict(self._result)
+from src.tools import load_schema, schema_fingerprint, validate_payload
+from tests.support.fake_tools import FakeRegisteredTool, FakeToolRegistry
 
 
 @pytest.fixture(autouse=True)
@@ -68,9 +33,9 @@ def clear_tool_audit_log() -> None:
 async def test_tool_call_audit_records_success_and_schema_validation(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
 
-    response = await router_module.dispatch_request(
+    response = await dispatch_module.dispatch_request(
         JSONRPCRequest(
             jsonrpc="2.0",
             id=1,
@@ -101,14 +66,79 @@ async def test_tool_call_audit_records_success_and_schema_validation(
     assert record.error_type is None
 
 
+@pytest.mark.asyncio
+async def test_router_skips_output_validation_already_done_by_handler(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class ValidatingRegistry(FakeToolRegistry):
+        def __init__(self) -> None:
+            super().__init__({"results": []})
+            self._tool.output_schema = load_schema("read", "search_aops.response.schema")
+            self._tool.output_schema_hash = schema_fingerprint(self._tool.output_schema)
+
+        async def call_tool(self, name: str, params: dict[str, Any] | None) -> dict[str, Any]:
+            result = await super().call_tool(name, params)
+            validate_payload(result, namespace="read", name="search_aops.response.schema")
+            return result
+
+    router_validations: list[dict[str, Any]] = []
+
+    async def record_validation(payload: dict[str, Any], schema: dict[str, Any]) -> None:
+        router_validations.append(payload)
+
+    monkeypatch.setattr(dispatch_module, "tool_registry", ValidatingRegistry())
+    monkeypatch.setattr(
+        dispatch_module,
+        "validate_payload_against_schema_async",
+        record_validation,
+    )
+
+    await dispatch_module.dispatch_request(
+        JSONRPCRequest(
+            jsonrpc="2.0",
+            id=1,
+            method="tools/call",
+            params={"name": "fake_tool", "arguments": {}},
+        )
+    )
+
+    assert router_validations == []
+    assert tool_call_audit_log.list_records()[0].output_validation_status == "passed"
+
+
+@pytest.mark.asyncio
+async def test_router_samples_read_tool_output_validation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"wrong": True}))
+    monkeypatch.setattr(
+        dispatch_module,
+        "get_settings",
+        lambda: SimpleNamespace(output_validation_sample_rate=1_000_000, compact_json_text=False),
+    )
+    monkeypatch.setattr(dispatch_module, "_output_validation_counter", itertools.count(1))
+
+    response = await dispatch_module.dispatch_request(
+        JSONRPCRequest(
+            jsonrpc="2.0",
+            id=1,
+            method="tools/call",
+            params={"name": "fake_tool", "arguments": {}},
+        )
+    )
+
+    assert response["structuredContent"] == {"wrong": True}
+    assert tool_call_audit_log.list_records()[0].output_validation_status == "sampled_out"
+
+
 @pytest.mark.asyncio
 async def test_tool_call_audit_records_schema_validation_failure(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"wrong": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"wrong": True}))
 
     with pytest.raises(JSONRPCError) as exc_info:
-        await router_module.dispatch_request(
+        await dispatch_module.dispatch_request(
             JSONRPCRequest(
                 jsonrpc="2.0",
                 id=1,
@@ -136,20 +166,20 @@ async def test_tool_call_audit_records_scope_policy_failure(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     monkeypatch.setattr(
-        router_module,
+        dispatch_module,
         "tool_registry",
         FakeToolRegistry({"ok": True}, required_scopes=("toxmcp:live",)),
     )
 
     with pytest.raises(JSONRPCError) as exc_info:
-        await router_module.dispatch_request(
+        await dispatch_module.dispatch_request(
             JSONRPCRequest(
                 jsonrpc="2.0",
                 id=1,
                 method="tools/call",
                 params={"name": "fake_tool", "arguments": {"alpha": 1}},
             ),
-            execution_context=router_module.ToolExecutionContext(
+            execution_context=dispatch_module.ToolExecutionContext(
                 scopes=frozenset({"toxmcp:read"}),
                 enforce_confirmations=True,
             ),
@@ -174,9 +204,9 @@ async def test_tool_call_audit_persists_jsonl_records(
 ) -> None:
     audit_path = tmp_path / "tool-calls.jsonl"
     tool_call_audit_log.configure_jsonl_sink(audit_path)
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
 
-    await router_module.dispatch_request(
+    await dispatch_module.dispatch_request(
         JSONRPCRequest(
             jsonrpc="2.0",
             id=1,
@@ -207,6 +237,41 @@ async def test_tool_call_audit_persists_jsonl_records(
     assert persisted["record"]["response_hash"]
 
 
+def test_background_audit_writer_flushes_on_app_shutdown(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    from fastapi.testclient import TestClient
+
+    from src.server.api.server import create_app
+    from src.server.config.settings import get_settings
+
+    audit_path = tmp_path / "tool-calls.jsonl"
+    monkeypatch.setenv("AOP_MCP_AUDIT_LOG_PATH", str(audit_path))
+    monkeypatch.setenv("AOP_MCP_AUDIT_LOG_WRITER", "background")
+    monkeypatch.setenv("AOP_MCP_AUDIT_LOG_FSYNC", "batch")
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    get_settings.cache_clear()
+    try:
+        with TestClient(create_app()) as client:
+            for request_id in range(1, 4):
+                response = client.post(
+                    "/mcp",
+                    json={
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": "tools/call",
+                        "params": {"name": "fake_tool", "arguments": {"alpha": request_id}},
+                    },
+                )
+                assert response.status_code == 200
+    finally:
+        get_settings.cache_clear()
+
+    lines = audit_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["sequence"] for line in lines] == [1, 2, 3]
+
+
 @pytest.mark.asyncio
 async def test_list_tool_call_audit_records_filters_recent_records_and_persistence(
     monkeypatch: pytest.MonkeyPatch,
@@ -214,8 +279,8 @@ async def test_list_tool_call_audit_records_filters_recent_records_and_persisten
 ) -> None:
     audit_path = tmp_path / "tool-calls.jsonl"
     tool_call_audit_log.configure_jsonl_sink(audit_path)
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"ok": True}))
-    await router_module.dispatch_request(
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    await dispatch_module.dispatch_request(
         JSONRPCRequest(
             jsonrpc="2.0",
             id=1,
@@ -223,9 +288,9 @@ async def test_list_tool_call_audit_records_filters_recent_records_and_persisten
             params={"name": "fake_tool", "arguments": {"alpha": 1}},
         )
     )
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"wrong": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"wrong": True}))
     with pytest.raises(JSONRPCError):
-        await router_module.dispatch_request(
+        await dispatch_module.dispatch_request(
             JSONRPCRequest(
                 jsonrpc="2.0",
                 id=2,
@@ -272,6 +337,142 @@ async def test_list_tool_call_audit_records_filters_recent_records_and_persisten
     assert empty_window["records"] == []
 
 
+def make_audit_record(
+    index: int,
+    *,
+    tool_name: str,
+    status: str = "success",
+    duration_ms: float = 1.0,
+    risk_class: str | None = "read",
+) -> ToolCallAuditRecord:
+    return ToolCallAuditRecord(
+        call_id=f"call-{index}",
+        tool_name=tool_name,
+        started_at="2026-01-01T00:00:00Z",
+        finished_at=f"2026-01-01T00:00:{index:02d}Z",
+        duration_ms=duration_ms,
+        status=status,
+        argument_keys=[],
+        request_hash=f"{index:064x}",
+        response_hash=None,
+        output_schema_title=None,
+        output_schema_hash=None,
+        output_validation_status="not_applicable",
+        risk_class=risk_class,
+        required_scopes=["toxmcp:read"],
+        granted_scopes=["toxmcp:read"],
+        requires_confirmation=False,
+        confirmation_provided=False,
+        policy_status="passed",
+    )
+
+
+def test_audit_buffer_indexes_follow_ring_buffer_eviction() -> None:
+    log = InMemoryToolCallAuditLog(max_records=7)
+    appended = []
+    for index in range(20):
+        record = make_audit_record(
+            index,
+            tool_name=("alpha", "beta", "gamma")[index % 3],
+            status="error" if index % 4 == 0 else "success",
+        )
+        log.append(record)
+        appended.append(record)
+
+    buffered = appended[-7:]
+    assert log.list_records() == buffered
+    for tool_name, status in itertools.product([None, "alpha", "beta", "delta"], [None, "success", "error"]):
+        expected = [
+            record
+            for record in buffered
+            if (tool_name is None or record.tool_name == tool_name)
+            and (status is None or record.status == status)
+        ]
+        assert log.list_records(tool_name=tool_name, status=status) == expected
+        assert log.list_records(tool_name=tool_name, status=status, limit=2) == expected[-2:]
+        assert log.count_records(tool_name=tool_name, status=status) == len(expected)
+
+    log.clear()
+    assert log.list_records(tool_name="alpha") == []
+    log.append(make_audit_record(20, tool_name="alpha"))
+    assert [record.call_id for record in log.list_records(tool_name="alpha")] == ["call-20"]
+
+
+def test_tool_statistics_roll_over_the_latency_window() -> None:
+    log = InMemoryToolCallAuditLog(stats_window=10)
+    for index in range(1, 21):
+        log.append(
+            make_audit_record(
+                index,
+                tool_name="alpha",
+                status="error" if index <= 5 else "success",
+                duration_ms=float(index),
+            )
+        )
+    log.append(make_audit_record(21, tool_name="not-a-tool", status="error", risk_class=None))
+
+    stats = log.tool_statistics()
+    assert list(stats) == ["(unregistered)", "alpha"]
+    alpha = stats["alpha"]
+    assert alpha["call_count"] == 20
+    assert alpha["error_count"] == 5
+    assert alpha["error_rate"] == 0.25
+    assert alpha["last_called_at"] == "2026-01-01T00:00:20Z"
+    assert alpha["window"]["call_count"] == 10
+    assert alpha["window"]["error_count"] == 0
+    assert alpha["window"]["latency_ms"] == {
+        "min": 11.0,
+        "mean": 15.5,
+        "p50": 15.0,
+        "p90": 19.0,
+        "p95": 20.0,
+        "p99": 20.0,
+        "max": 20.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_tool_call_statistics_reports_dispatched_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    await dispatch_module.dispatch_request(
+        JSONRPCRequest(
+            jsonrpc="2.0",
+            id=1,
+            method="tools/call",
+            params={"name": "fake_tool", "arguments": {"alpha": 1}},
+        )
+    )
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"wrong": True}))
+    with pytest.raises(JSONRPCError):
+        await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=2,
+                method="tools/call",
+                params={"name": "fake_tool", "arguments": {}},
+            )
+        )
+
+    result = await aop_tools.get_tool_call_statistics(
+        aop_tools.GetToolCallStatisticsInput(tool_name="fake_tool")
+    )
+
+    assert result["scope"] == "process_local_rolling_statistics"
+    assert result["tool_count"] == 1
+    stats = result["tools"][0]
+    assert stats["tool_name"] == "fake_tool"
+    assert stats["call_count"] == 2
+    assert stats["error_rate"] == 0.5
+    assert stats["window"]["latency_ms"]["p50"] is not None
+
+    missing = await aop_tools.get_tool_call_statistics(
+        aop_tools.GetToolCallStatisticsInput(tool_name="other_tool")
+    )
+    assert missing["tools"] == []
+
+
 @pytest.mark.asyncio
 async def test_export_tool_call_audit_log_evidence_filters_verified_durable_log(
     monkeypatch: pytest.MonkeyPatch,
@@ -279,8 +480,8 @@ async def test_export_tool_call_audit_log_evidence_filters_verified_durable_log(
 ) -> None:
     audit_path = tmp_path / "tool-calls.jsonl"
     tool_call_audit_log.configure_jsonl_sink(audit_path)
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"ok": True}))
-    await router_module.dispatch_request(
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    await dispatch_module.dispatch_request(
         JSONRPCRequest(
             jsonrpc="2.0",
             id=1,
@@ -288,9 +489,9 @@ async def test_export_tool_call_audit_log_evidence_filters_verified_durable_log(
             params={"name": "fake_tool", "arguments": {"alpha": 1}},
         )
     )
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"wrong": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"wrong": True}))
     with pytest.raises(JSONRPCError):
-        await router_module.dispatch_request(
+        await dispatch_module.dispatch_request(
             JSONRPCRequest(
                 jsonrpc="2.0",
                 id=2,
@@ -320,11 +521,15 @@ async def test_export_tool_call_audit_log_evidence_filters_verified_durable_log(
         "limit": 1,
         "tool_name": None,
         "status": "error",
+        "started_after": None,
+        "started_before": None,
     }
+    assert result["index_used"] is False
     assert result["chain"]["verified"] is True
     assert result["chain"]["record_count"] == 2
     assert result["verified_prefix_envelope_count"] == 2
     assert result["matched_envelope_count"] == 1
+    assert result["matched_envelope_count_complete"] is True
     assert result["exported_envelope_count"] == 1
     assert result["exported_order"] == "oldest_to_newest"
     assert len(result["evidence_sha256"]) == 64
@@ -346,9 +551,9 @@ async def test_export_tool_call_audit_log_evidence_reports_verified_prefix_on_ta
 ) -> None:
     audit_path = tmp_path / "tool-calls.jsonl"
     tool_call_audit_log.configure_jsonl_sink(audit_path)
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
     for request_id, key in [(1, "alpha"), (2, "beta")]:
-        await router_module.dispatch_request(
+        await dispatch_module.dispatch_request(
             JSONRPCRequest(
                 jsonrpc="2.0",
                 id=request_id,
@@ -385,6 +590,81 @@ async def test_export_tool_call_audit_log_evidence_reports_verified_prefix_on_ta
     assert result["envelopes"][0]["record"]["status"] == "success"
 
 
+@pytest.mark.asyncio
+async def test_export_tool_call_audit_log_evidence_reads_tail_segments(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    audit_path = tmp_path / "tool-calls.jsonl"
+    tool_call_audit_log.configure_jsonl_sink(audit_path, segment_records=2)
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    for request_id in range(1, 8):
+        await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=request_id,
+                method="tools/call",
+                params={"name": "fake_tool", "arguments": {"alpha": request_id}},
+            )
+        )
+
+    result = await aop_tools.export_tool_call_audit_log_evidence(
+        aop_tools.ExportToolCallAuditLogEvidenceInput(
+            audit_log_path=str(audit_path),
+            limit=2,
+        )
+    )
+
+    assert result["chain"]["verified"] is True
+    assert result["chain"]["record_count"] == 7
+    assert result["segments"] == {
+        "sealed_segment_count": 3,
+        "scanned_segment_count": 1,
+        "complete": False,
+    }
+    assert result["verified_prefix_envelope_count"] == 3
+    assert result["matched_envelope_count_complete"] is False
+    assert [envelope["sequence"] for envelope in result["envelopes"]] == [6, 7]
+    assert any("sealed audit segments" in limitation for limitation in result["limitations"])
+
+
+@pytest.mark.asyncio
+async def test_export_tool_call_audit_log_evidence_uses_sidecar_index(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    audit_path = tmp_path / "tool-calls.jsonl"
+    tool_call_audit_log.configure_jsonl_sink(audit_path, index=True)
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    for request_id in range(1, 5):
+        await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=request_id,
+                method="tools/call",
+                params={"name": "fake_tool", "arguments": {"alpha": request_id}},
+            )
+        )
+
+    result = await aop_tools.export_tool_call_audit_log_evidence(
+        aop_tools.ExportToolCallAuditLogEvidenceInput(
+            audit_log_path=str(audit_path),
+            limit=2,
+            tool_name="fake_tool",
+            started_after="2000-01-01T00:00:00+00:00",
+        )
+    )
+
+    assert result["index_used"] is True
+    assert "segments" not in result
+    assert result["selection"]["started_after"] == "2000-01-01T00:00:00Z"
+    assert result["chain"]["record_count"] == 4
+    assert result["matched_envelope_count"] == 4
+    assert result["matched_envelope_count_complete"] is True
+    assert [envelope["sequence"] for envelope in result["envelopes"]] == [3, 4]
+    assert any("sidecar index" in limitation for limitation in result["limitations"])
+
+
 @pytest.mark.asyncio
 async def test_verify_tool_call_audit_log_reports_missing_unconfigured_path(
     monkeypatch: pytest.MonkeyPatch,
@@ -415,9 +695,9 @@ async def test_verify_tool_call_audit_log_uses_configured_path_and_verifies_chai
 ) -> None:
     audit_path = tmp_path / "tool-calls.jsonl"
     tool_call_audit_log.configure_jsonl_sink(audit_path)
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
 
-    await router_module.dispatch_request(
+    await dispatch_module.dispatch_request(
         JSONRPCRequest(
             jsonrpc="2.0",
             id=1,
@@ -445,6 +725,38 @@ async def test_verify_tool_call_audit_log_uses_configured_path_and_verifies_chai
     assert result["warnings"] == []
 
 
+@pytest.mark.asyncio
+async def test_audit_log_tools_read_through_the_live_sink_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    audit_path = tmp_path / "tool-calls.jsonl"
+    tool_call_audit_log.configure_jsonl_sink(audit_path)
+    sink = tool_call_audit_log.jsonl_sink_for(audit_path)
+    assert sink is not None
+    reads: list[tuple[str, bool]] = []
+    loop_thread = threading.current_thread()
+
+    def recorded(method):
+        def read(*args, **kwargs):
+            reads.append((method.__name__, threading.current_thread() is not loop_thread))
+            return method(*args, **kwargs)
+
+        return read
+
+    monkeypatch.setattr(sink, "verify_chain", recorded(sink.verify_chain))
+    monkeypatch.setattr(sink, "read_tail_envelopes", recorded(sink.read_tail_envelopes))
+
+    await aop_tools.verify_tool_call_audit_log(
+        aop_tools.VerifyToolCallAuditLogInput(audit_log_path=str(audit_path))
+    )
+    await aop_tools.export_tool_call_audit_log_evidence(
+        aop_tools.ExportToolCallAuditLogEvidenceInput(audit_log_path=str(audit_path), limit=1)
+    )
+
+    assert reads == [("verify_chain", True), ("read_tail_envelopes", True)]
+
+
 @pytest.mark.asyncio
 async def test_tool_call_audit_persistence_detects_tampered_jsonl_record(
     monkeypatch: pytest.MonkeyPatch,
@@ -452,9 +764,9 @@ async def test_tool_call_audit_persistence_detects_tampered_jsonl_record(
 ) -> None:
     audit_path = tmp_path / "tool-calls.jsonl"
     tool_call_audit_log.configure_jsonl_sink(audit_path)
-    monkeypatch.setattr(router_module, "tool_registry", FakeToolRegistry({"ok": True}))
+    monkeypatch.setattr(dispatch_module, "tool_registry", FakeToolRegistry({"ok": True}))
 
-    await router_module.dispatch_request(
+    await dispatch_module.dispatch_request(
         JSONRPCRequest(
             jsonrpc="2.0",
             id=1,
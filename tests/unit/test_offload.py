@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from typing import Any
+
+import pytest
+
+import src.tools as tools_module
+from src.instrumentation.audit import hash_json, tool_call_audit_log
+from src.instrumentation.metrics import metrics_recorder
+from src.server.mcp import dispatch as dispatch_module
+from src.server.mcp.protocol import JSONRPCRequest
+from src.tools import (
+    SchemaValidationError,
+    payload_validation_scope,
+    validate_payload_async,
+)
+from src.tools.offload import WorkerPools, estimated_json_size_exceeds
+from tests.support.fake_tools import FakeToolRegistry
+
+_request_label: ContextVar[str | None] = ContextVar("request_label", default=None)
+
+
+def test_size_estimate_stops_at_the_limit() -> None:
+    payload = {"rows": [{"title": "x" * 100} for _ in range(100)]}
+
+    assert estimated_json_size_exceeds(payload, 5_000)
+    assert not estimated_json_size_exceeds(payload, 50_000)
+    assert estimated_json_size_exceeds({}, 0)
+    assert not WorkerPools(min_offload_bytes=1024).should_offload({"ok": True})
+
+
+@pytest.mark.asyncio
+async def test_thread_offload_carries_the_callers_context() -> None:
+    pools = WorkerPools(thread_workers=1)
+    token = _request_label.set("call-1")
+    try:
+        label, thread_name = await pools.run_in_thread(
+            lambda: (_request_label.get(), threading.current_thread().name)
+        )
+        # Without process workers, process-bound work falls back to the thread pool.
+        fallback = await pools.run_in_process(_request_label.get)
+    finally:
+        _request_label.reset(token)
+        pools.shutdown()
+
+    assert label == "call-1"
+    assert thread_name.startswith("offload")
+    assert fallback == "call-1"
+
+
+@pytest.mark.asyncio
+async def test_large_payload_validation_runs_in_a_worker_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pools = WorkerPools(process_workers=1, min_offload_bytes=0)
+    monkeypatch.setattr(tools_module, "offload", pools)
+    valid = {"results": []}
+    try:
+        with payload_validation_scope() as scope:
+            await validate_payload_async(
+                valid, namespace="read", name="search_aops.response.schema"
+            )
+        with pytest.raises(SchemaValidationError, match="'iri' is a required property"):
+            await validate_payload_async(
+                {"results": [{"id": "AOP:1"}]},
+                namespace="read",
+                name="search_aops.response.schema",
+            )
+    finally:
+        pools.shutdown()
+
+    fingerprint = tools_module._named_schema("read", "search_aops.response.schema").fingerprint
+    assert scope.was_validated(valid, fingerprint)
+    assert metrics_recorder.counter_value("offload.tasks", pool="process") >= 2
+
+
+_LARGE_RESULT = {"rows": [{"id": index, "title": "é" * 50} for index in range(2_000)]}
+
+
+async def _large_result(params: dict[str, Any]) -> dict[str, Any]:
+    return _LARGE_RESULT
+
+
+@pytest.mark.asyncio
+async def test_router_encodes_and_hashes_large_results_off_the_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pools = WorkerPools(thread_workers=1)
+    monkeypatch.setattr(dispatch_module, "offload", pools)
+    registry = FakeToolRegistry(
+        name="large", handler=_large_result, output_schema={"title": "large.response", "type": "object"}
+    )
+    monkeypatch.setattr(dispatch_module, "tool_registry", registry)
+    tool_call_audit_log.clear()
+    before = metrics_recorder.counter_value("offload.tasks", pool="thread")
+    try:
+        response = await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=1,
+                method="tools/call",
+                params={"name": "large", "arguments": {}},
+            )
+        )
+    finally:
+        pools.shutdown()
+
+    assert metrics_recorder.counter_value("offload.tasks", pool="thread") > before
+    assert response["structuredContent"] is _LARGE_RESULT
+    assert response["content"][0]["text"].startswith('{\n  "rows"')
+    [record] = tool_call_audit_log.list_records()
+    assert record.response_hash == hash_json(_LARGE_RESULT)
+    tool_call_audit_log.clear()
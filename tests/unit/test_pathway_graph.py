@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from src.semantic.pathway_graph import PathwayGraph
+
+
+def _brute_force_paths(edges, source, target, max_hops):
+    paths = []
+
+    def walk(node, visited, edge_path):
+        if node == target:
+            paths.append(tuple(edge_path))
+            return
+        if len(edge_path) >= max_hops:
+            return
+        for index, (upstream, downstream) in enumerate(edges):
+            if upstream == node and downstream not in visited:
+                walk(downstream, visited | {downstream}, [*edge_path, index])
+
+    walk(source, {source}, [])
+    return paths
+
+
+def test_k_shortest_paths_orders_by_hop_count_and_respects_limit() -> None:
+    graph = PathwayGraph(
+        [("KE:1", "KE:2"), ("KE:2", "KE:3"), ("KE:1", "KE:3"), ("KE:3", "KE:4"), ("KE:2", "KE:4")]
+    )
+
+    paths = graph.k_shortest_paths(["KE:1"], ["KE:4"], k=2)
+
+    assert [path.nodes for path in paths] == [
+        ("KE:1", "KE:2", "KE:4"),
+        ("KE:1", "KE:3", "KE:4"),
+    ]
+    assert [path.edges for path in paths] == [(0, 4), (2, 3)]
+
+
+def test_k_shortest_paths_matches_exhaustive_enumeration_on_dense_graph() -> None:
+    nodes = [f"KE:{index}" for index in range(7)]
+    edges = [(upstream, downstream) for upstream, downstream in itertools.permutations(nodes, 2)]
+    graph = PathwayGraph(edges)
+
+    expected = _brute_force_paths(edges, "KE:0", "KE:6", max_hops=3)
+    paths = graph.k_shortest_paths(["KE:0"], ["KE:6"], k=1000, max_hops=3)
+
+    assert sorted(path.edges for path in paths) == sorted(expected)
+    assert [path.hop_count for path in paths] == sorted(path.hop_count for path in paths)
+
+
+def test_k_shortest_paths_prefers_lower_weight_over_fewer_hops() -> None:
+    graph = PathwayGraph(
+        [("KE:1", "KE:3"), ("KE:1", "KE:2"), ("KE:2", "KE:3")],
+        weights=[2.5, 1.0, 1.0],
+    )
+
+    paths = graph.k_shortest_paths(["KE:1"], ["KE:3"], k=2)
+
+    assert [path.nodes for path in paths] == [("KE:1", "KE:2", "KE:3"), ("KE:1", "KE:3")]
+    assert [path.cost for path in paths] == [2.0, 2.5]
+
+    bounded = graph.k_shortest_paths(["KE:1"], ["KE:3"], k=2, max_hops=1)
+    assert [path.nodes for path in bounded] == [("KE:1", "KE:3")]
+
+
+def test_k_shortest_paths_is_deterministic_across_edge_order() -> None:
+    edges = [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D")]
+    forward = PathwayGraph(edges).k_shortest_paths(["A"], ["D"], k=5)
+    reverse = PathwayGraph(list(reversed(edges))).k_shortest_paths(["A"], ["D"], k=5)
+
+    assert [path.nodes for path in forward] == [path.nodes for path in reverse]
+
+
+def test_k_shortest_paths_treats_targets_as_terminal_across_sources() -> None:
+    graph = PathwayGraph(
+        [("MIE:1", "KE:2"), ("MIE:2", "KE:2"), ("KE:2", "AO:1"), ("AO:1", "AO:2")],
+        nodes=["MIE:3"],
+    )
+
+    paths = graph.k_shortest_paths(["MIE:1", "MIE:2", "MIE:3"], ["AO:1", "AO:2"], k=10)
+
+    assert [path.nodes for path in paths] == [
+        ("MIE:1", "KE:2", "AO:1"),
+        ("MIE:2", "KE:2", "AO:1"),
+    ]
+
+
+def test_nodes_reaching_prunes_dead_end_branches() -> None:
+    graph = PathwayGraph([("A", "B"), ("B", "C"), ("A", "X"), ("X", "Y")])
+
+    assert graph.nodes_reaching(["C"]) == frozenset({"A", "B", "C"})
+    assert graph.k_shortest_paths(["X"], ["C"], k=3) == []
+
+
+def test_pathway_graph_rejects_non_positive_weights() -> None:
+    with pytest.raises(ValueError):
+        PathwayGraph([("A", "B")], weights=[0.0])
+
+
+def test_betweenness_centrality_matches_hand_computed_scores() -> None:
+    graph = PathwayGraph([("A", "B"), ("B", "C"), ("A", "D"), ("D", "C"), ("C", "E"), ("A", "B")])
+
+    raw = graph.betweenness_centrality(normalized=False)
+
+    assert raw == {"A": 0.0, "B": 1.0, "C": 3.0, "D": 1.0, "E": 0.0}
+    assert graph.betweenness_centrality()["C"] == 3.0 / 12
+    assert graph.degrees()["A"] == (0, 3)
+    assert graph.degrees()["C"] == (2, 1)
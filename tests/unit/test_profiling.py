@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from src.instrumentation.profiling import ToolCallProfiler, tool_call_profiler
+from src.server.config.settings import get_settings
+from src.server.mcp import dispatch as dispatch_module
+from src.server.mcp.protocol import JSONRPCRequest
+from src.server.tools import aop as aop_tools
+from src.server.tools.registry import classify_tool_policy
+
+
+def _busy_work() -> list[str]:
+    return [str(index) * 4 for index in range(20_000)]
+
+
+def test_cprofile_session_profiles_the_next_n_calls(tmp_path: Path) -> None:
+    profiler = ToolCallProfiler()
+    session = profiler.arm("slow_tool", output_directory=tmp_path, calls=2)
+
+    with profiler.profile("other_tool", "call-0"):
+        _busy_work()
+    for index in range(3):
+        with profiler.profile("slow_tool", f"call-{index + 1}"):
+            _busy_work()
+
+    assert session.state == "completed"
+    assert [call.call_id for call in session.profiles] == ["call-1", "call-2"]
+    first = session.profiles[0]
+    assert Path(first.artifact_path).suffix == ".pstats"
+    assert Path(first.artifact_path).is_file()
+    assert any("_busy_work" in entry["function"] for entry in first.top_functions)
+    summary = json.loads(Path(first.summary_path).read_text(encoding="utf-8"))
+    assert summary["schema_version"] == "tool-call-profile.v1"
+    assert summary["tool_name"] == "slow_tool"
+    assert first.allocation_sites is None
+
+
+def test_sampling_session_writes_collapsed_stacks_and_allocation_sites(tmp_path: Path) -> None:
+    profiler = ToolCallProfiler()
+    session = profiler.arm(
+        "slow_tool",
+        output_directory=tmp_path,
+        mode="sampling",
+        duration_seconds=60,
+        memory=True,
+        sample_interval_seconds=0.001,
+    )
+
+    with profiler.profile("slow_tool", "call-1"):
+        retained = [_busy_work() for _ in range(10)]
+
+    assert session.state == "armed"
+    call = session.profiles[0]
+    assert call.sample_count and call.sample_count > 0
+    folded = Path(call.artifact_path).read_text(encoding="utf-8")
+    assert "_busy_work" in folded
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines())
+    assert call.collapsed_stacks[0]["stack"].startswith("thread:")
+    assert call.allocation_sites and call.allocation_sites[0]["size_diff_bytes"] > 0
+    assert retained
+
+    assert profiler.disarm(tool_name="slow_tool") == [session]
+    assert session.state == "disarmed"
+    with profiler.profile("slow_tool", "call-2"):
+        pass
+    assert len(session.profiles) == 1
+
+
+def test_profile_prefix_is_admin_scoped() -> None:
+    policy = classify_tool_policy("profile_anything")
+    assert policy == {
+        "riskClass": "admin",
+        "requiredScopes": ("toxmcp:admin",),
+        "requiresConfirmation": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_profile_tool_calls_arms_and_reports_live_tool_calls(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setenv("AOP_MCP_ARTIFACT_OUTPUT_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    tool_call_profiler.clear()
+    try:
+        with pytest.raises(ValidationError):
+            aop_tools.ProfileToolCallsInput(action="arm", tool_name="no_such_tool")
+
+        armed = await aop_tools.profile_tool_calls(
+            aop_tools.ProfileToolCallsInput(
+                action="arm", tool_name="get_tool_call_statistics", memory=True
+            )
+        )
+        session_id = armed["sessions"][0]["session_id"]
+        assert armed["sessions"][0]["state"] == "armed"
+        assert armed["sessions"][0]["output_directory"] == str(
+            (tmp_path / "profiles" / session_id).resolve()
+        )
+
+        await dispatch_module.dispatch_request(
+            JSONRPCRequest(
+                jsonrpc="2.0",
+                id=1,
+                method="tools/call",
+                params={"name": "get_tool_call_statistics", "arguments": {}},
+            )
+        )
+
+        status = await aop_tools.profile_tool_calls(
+            aop_tools.ProfileToolCallsInput(session_id=session_id)
+        )
+        session = status["sessions"][0]
+        assert session["state"] == "completed"
+        assert session["calls_profiled"] == 1
+        profile = session["profiles"][0]
+        assert Path(profile["artifact_path"]).is_file()
+        assert profile["top_functions"]
+        assert profile["allocation_sites"] is not None
+    finally:
+        tool_call_profiler.clear()
+        get_settings.cache_clear()
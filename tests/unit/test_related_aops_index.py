@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from src.services.related_aops import (
+    AopSimilarityIndex,
+    RelatedAopsIndexStore,
+    build_aop_similarity_index,
+)
+
+
+MEMBERSHIPS = [
+    {"id": "AOP:1", "iri": "https://identifiers.org/aop/1", "title": "Alpha", "key_event_ids": ["KE:1", "KE:2", "KE:3"], "ker_ids": ["KER:1", "KER:2"]},
+    {"id": "AOP:2", "iri": "https://identifiers.org/aop/2", "title": "Beta", "key_event_ids": ["KE:1", "KE:2", "KE:4", "KE:5", "KE:6", "KE:7"], "ker_ids": ["KER:1"]},
+    {"id": "AOP:3", "iri": "https://identifiers.org/aop/3", "title": "Gamma", "key_event_ids": ["KE:3"], "ker_ids": []},
+    {"id": "AOP:4", "iri": "https://identifiers.org/aop/4", "title": "Delta", "key_event_ids": ["KE:9"], "ker_ids": []},
+]
+
+
+def test_build_index_computes_shared_counts_and_similarity_scores() -> None:
+    index = build_aop_similarity_index(MEMBERSHIPS, generated_at="2026-01-01T00:00:00Z")
+
+    related = index.related("AOP:1", limit=10)
+
+    assert [item["id"] for item in related] == ["AOP:2", "AOP:3"]
+    beta = related[0]
+    assert beta["shared_key_event_count"] == 2
+    assert beta["shared_ker_count"] == 1
+    assert beta["total_shared_elements"] == 3
+    assert beta["jaccard"] == round(2 / 7, 6)
+    assert beta["overlap"] == round(2 / 3, 6)
+    assert index.related("AOP:4", limit=10) == []
+    assert index.related("AOP:999", limit=10) is None
+
+
+def test_related_ranks_by_requested_metric() -> None:
+    index = build_aop_similarity_index(MEMBERSHIPS)
+
+    assert [item["id"] for item in index.related("AOP:1", limit=10, metric="overlap")] == ["AOP:3", "AOP:2"]
+    assert [item["id"] for item in index.related("AOP:1", limit=1, metric="jaccard")] == ["AOP:3"]
+
+
+def test_top_k_keeps_union_of_metric_leaders() -> None:
+    index = build_aop_similarity_index(MEMBERSHIPS, top_k=1)
+
+    assert sorted(item["id"] for item in index.neighbors["AOP:1"]) == ["AOP:2", "AOP:3"]
+    with pytest.raises(ValueError):
+        build_aop_similarity_index(MEMBERSHIPS, top_k=0)
+
+
+def test_index_store_reloads_when_file_is_rewritten(tmp_path) -> None:
+    path = tmp_path / "related.json"
+    store = RelatedAopsIndexStore(path)
+    assert store.get() is None
+
+    build_aop_similarity_index(MEMBERSHIPS[:2], generated_at="first").save(path)
+    assert store.get().generated_at == "first"
+
+    build_aop_similarity_index(MEMBERSHIPS, generated_at="second").save(path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = store.get()
+
+    assert reloaded.generated_at == "second"
+    assert AopSimilarityIndex.load(path).to_dict() == reloaded.to_dict()
@@ -3,7 +3,13 @@ from __future__ import annotations
 import pytest
 
 from src.adapters import AOPWikiAdapter, AOPDBAdapter, SparqlClient
-from src.tools import SchemaValidationError, validate_payload
+from src.tools import (
+    SchemaValidationError,
+    load_schema,
+    payload_validation_scope,
+    schema_fingerprint,
+    validate_payload,
+)
 
 import httpx
 
@@ -988,6 +994,7 @@ def test_export_tool_call_audit_log_evidence_schema_validation() -> None:
         },
         "verified_prefix_envelope_count": 1,
         "matched_envelope_count": 1,
+        "matched_envelope_count_complete": True,
         "exported_envelope_count": 1,
         "exported_order": "oldest_to_newest",
         "envelopes": [
@@ -1315,3 +1322,35 @@ def test_list_assays_for_aop_schema_rejects_invalid_empty_reason() -> None:
 
     with pytest.raises(SchemaValidationError):
         validate_payload(payload, namespace="read", name="list_assays_for_aop.response.schema")
+
+
+def test_named_schemas_are_loaded_and_compiled_once() -> None:
+    first = load_schema("read", "search_aops.response.schema")
+    assert load_schema("read", "search_aops.response.schema") is first
+
+    with payload_validation_scope() as scope:
+        payload = {"results": []}
+        validate_payload(payload, namespace="read", name="search_aops.response.schema")
+
+    assert scope.was_validated(payload, schema_fingerprint(first))
+    assert not scope.was_validated({"results": []}, schema_fingerprint(first))
+
+
+def test_validation_scope_is_not_fooled_by_a_reused_payload_id() -> None:
+    fingerprint = schema_fingerprint(load_schema("read", "search_aops.response.schema"))
+    with payload_validation_scope() as scope:
+        for _ in range(20):
+            # The validated dict is dropped at once, so CPython may hand its
+            # address to the next dict unless the scope holds on to it.
+            validate_payload({"results": []}, namespace="read", name="search_aops.response.schema")
+            fresh = {"results": [{"unvalidated": True}]}
+            assert not scope.was_validated(fresh, fingerprint)
+
+
+def test_disabled_validation_scope_skips_schema_checks() -> None:
+    with payload_validation_scope(enabled=False) as scope:
+        validate_payload({"unexpected": True}, namespace="read", name="search_aops.response.schema")
+
+    assert scope.skipped == 1
+    with pytest.raises(SchemaValidationError):
+        validate_payload({"unexpected": True}, namespace="read", name="search_aops.response.schema")
@@ -6,6 +6,7 @@ from pydantic import ValidationError
 
 from src.server.api.server import create_app
 from src.server.config.settings import get_settings
+from src.server.mcp import router as router_module
 from src.server.mcp.protocol import FORBIDDEN
 
 
@@ -192,3 +193,65 @@ def test_mcp_endpoint_treats_link_stressor_as_write_tool(
     assert payload["error"]["code"] == FORBIDDEN
     assert payload["error"]["data"]["missingScopes"] == ["toxmcp:execute"]
     _clear_settings()
+
+
+def test_bearer_tokens_authenticate_separate_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AOP_MCP_AUTH_MODE", "bearer")
+    monkeypatch.setenv("AOP_MCP_AUTH_BEARER_TOKEN", "secret-token")
+    monkeypatch.setenv("AOP_MCP_AUTH_BEARER_TOKENS", "alice=alice-token, bob=bob-token==")
+    _clear_settings()
+    clients: list[str | None] = []
+    original = router_module._execution_context_from_request
+
+    def recording_context(request):
+        context = original(request)
+        clients.append(context.client_id)
+        return context
+
+    monkeypatch.setattr(router_module, "_execution_context_from_request", recording_context)
+    client = TestClient(create_app())
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "tools/list", "params": {}}
+    statuses = [
+        client.post("/mcp", headers={"authorization": f"Bearer {token}"}, json=payload).status_code
+        for token in ("alice-token", "bob-token==", "secret-token", "alice-token-x")
+    ]
+
+    assert statuses == [200, 200, 200, 401]
+    assert clients[:2] == ["alice", "bob"]
+    assert clients[2].startswith("token:")
+    _clear_settings()
+
+
+def test_metrics_endpoint_exports_prometheus_text_behind_bearer_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("AOP_MCP_AUTH_MODE", "bearer")
+    monkeypatch.setenv("AOP_MCP_AUTH_BEARER_TOKEN", "secret-token")
+    _clear_settings()
+
+    client = TestClient(create_app())
+    assert client.get("/metrics").status_code == 401
+
+    headers = {"authorization": "Bearer secret-token"}
+    client.post(
+        "/mcp",
+        headers=headers,
+        json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": "list_tool_call_audit_records", "arguments": {"limit": 1}},
+        },
+    )
+    response = client.get("/metrics", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert any(
+        line.startswith('aop_mcp_mcp_tool_calls_total{status="success",tool="list_tool_call_audit_records"}')
+        for line in lines
+    )
+    assert "aop_mcp_mcp_tool_calls_in_flight 0" in lines
+    assert "aop_mcp_audit_writer_queue_depth 0" in lines
+    _clear_settings()
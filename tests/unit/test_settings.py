@@ -28,3 +28,9 @@ def test_settings_parse_hgnc_configuration(monkeypatch) -> None:
 
     assert settings.hgnc_base_url == "https://hgnc.example/api/"
     assert settings.hgnc_timeout == 2.5
+
+
+def test_settings_keep_process_offload_opt_in(monkeypatch) -> None:
+    monkeypatch.delenv("AOP_MCP_OFFLOAD_PROCESS_WORKERS", raising=False)
+
+    assert Settings().offload_process_workers == 0
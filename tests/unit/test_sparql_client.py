@@ -178,6 +178,17 @@ def test_render_safe_rejects_invalid_uris() -> None:
         catalog.render_safe("test", uris={"iri": "javascript:alert(1)"})
 
 
+def test_render_safe_renders_uri_lists_for_values_blocks() -> None:
+    catalog = TemplateCatalog({"test": "VALUES ?aop {{ {aops} }}"})
+    rendered = catalog.render_safe(
+        "test",
+        uri_lists={"aops": ["https://example.org/aop/1", "https://example.org/aop/2"]},
+    )
+    assert rendered == "VALUES ?aop { <https://example.org/aop/1> <https://example.org/aop/2> }"
+    with pytest.raises(ValueError, match="Invalid URI characters"):
+        catalog.render_safe("test", uri_lists={"aops": ["https://example.org/a> } ?s ?p ?o {"]})
+
+
 def test_render_safe_validates_ints() -> None:
     catalog = TemplateCatalog({"test": "LIMIT {limit}"})
     rendered = catalog.render_safe("test", ints={"limit": 25})
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.instrumentation.progress import report_progress
+from src.server.config.settings import get_settings
+from src.server.mcp import dispatch as dispatch_module
+from src.server.stdio import StdioServer
+from tests.support.fake_tools import ECHO_OUTPUT_SCHEMA, FakeToolRegistry
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+async def _sleepy_echo(params: dict[str, Any]) -> dict[str, Any]:
+    report_progress(0, 1, "started")
+    await asyncio.sleep(params.get("delay", 0))
+    return {"echo": params["value"]}
+
+
+def _echo(request_id: Any, value: str, *, delay: float = 0.0, meta: dict | None = None) -> dict:
+    params: dict[str, Any] = {"name": "echo", "arguments": {"value": value, "delay": delay}}
+    if meta:
+        params["_meta"] = meta
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": params}
+
+
+def _serve(*messages: Any) -> list[Any]:
+    reader = io.BytesIO(b"".join(json.dumps(message).encode() + b"\n" for message in messages))
+    writer = io.BytesIO()
+    asyncio.run(StdioServer(reader, writer, settings=get_settings()).serve())
+    return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+
+@pytest.fixture(autouse=True)
+def echo_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = FakeToolRegistry(name="echo", handler=_sleepy_echo, output_schema=ECHO_OUTPUT_SCHEMA)
+    monkeypatch.setattr(dispatch_module, "tool_registry", registry)
+
+
+def test_stdio_handles_requests_concurrently_and_streams_progress() -> None:
+    out = _serve(
+        _echo(1, "slow", delay=0.1, meta={"progressToken": "p1"}),
+        _echo(2, "fast"),
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    )
+
+    responses = [message for message in out if "id" in message]
+    # The fast call overtakes the slow one; ids match them up.
+    assert [message["id"] for message in responses] == [2, 1]
+    assert responses[1]["result"]["structuredContent"] == {"echo": "slow"}
+    (progress,) = [message for message in out if message.get("method") == "notifications/progress"]
+    assert progress["params"] == {"progressToken": "p1", "progress": 0, "total": 1, "message": "started"}
+    assert out.index(progress) < out.index(responses[1])
+
+
+def test_stdio_cancellation_batches_and_bad_lines() -> None:
+    out = _serve(
+        _echo("long", "never", delay=30),
+        {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": "long"}},
+        [_echo(3, "a"), {"jsonrpc": "2.0", "id": 4, "method": "nope"}],
+        "not an object",
+    )
+
+    assert all(message.get("id") != "long" for message in out if isinstance(message, dict))
+    (batch,) = [message for message in out if isinstance(message, list)]
+    assert batch[0]["result"]["structuredContent"] == {"echo": "a"}
+    assert batch[1]["error"]["code"] == dispatch_module.METHOD_NOT_FOUND
+    (invalid,) = [message for message in out if isinstance(message, dict)]
+    assert invalid["error"]["code"] == dispatch_module.INVALID_REQUEST
+
+
+def test_stdio_answers_requests_when_the_dispatcher_fails_to_load(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def failing_loader(self: StdioServer) -> Any:
+        raise ImportError("broken tool module")
+
+    monkeypatch.setattr(StdioServer, "_load_dispatcher", failing_loader)
+    reader = io.BytesIO(
+        b"".join(
+            json.dumps(message).encode() + b"\n"
+            for message in (
+                {"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+                {"jsonrpc": "2.0", "method": "notifications/initialized"},
+                [_echo(2, "a"), {"jsonrpc": "2.0", "method": "notifications/initialized"}],
+            )
+        )
+    )
+    writer = io.BytesIO()
+
+    with pytest.raises(ImportError):
+        asyncio.run(StdioServer(reader, writer, settings=get_settings()).serve())
+
+    out = [json.loads(line) for line in writer.getvalue().splitlines()]
+    single, batch = sorted(out, key=lambda message: isinstance(message, list))
+    assert single["id"] == 1
+    assert single["error"]["code"] == dispatch_module.INTERNAL_ERROR
+    assert [element["id"] for element in batch] == [2]
+
+
+def test_stdio_entry_point_runs_without_fastapi() -> None:
+    script = (
+        "import runpy, sys\n"
+        "try:\n"
+        "    runpy.run_module('src.server.stdio', run_name='__main__')\n"
+        "finally:\n"
+        "    print('fastapi' in sys.modules, file=sys.stderr)\n"
+    )
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {"protocolVersion": "2025-03-26", "clientInfo": {"name": "test", "version": "1"}},
+    }
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        input="".join(
+            json.dumps(message) + "\n"
+            for message in (initialize, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        ),
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        timeout=60,
+        check=True,
+    )
+
+    by_id = {message["id"]: message for message in map(json.loads, completed.stdout.splitlines())}
+    assert by_id[1]["result"]["serverInfo"]["name"] == "AOP MCP Server"
+    assert any(tool["name"] == "search_aops" for tool in by_id[2]["result"]["tools"])
+    assert completed.stderr.strip().splitlines()[-1] == "False"
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.adapters import SparqlClient
+from src.instrumentation.audit import tool_call_audit_log
+from src.instrumentation.tracing import (
+    InMemorySpanExporter,
+    JsonlSpanExporter,
+    Tracer,
+    critical_path,
+    tracer,
+)
+from src.server.api.server import create_app
+from src.server.config.settings import get_settings
+from src.server.mcp import dispatch as dispatch_module
+from src.tools import validate_payload_against_schema
+from tests.support.fake_tools import FakeToolRegistry
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks_and_threads_and_export_per_trace() -> None:
+    exporter = InMemorySpanExporter()
+    local = Tracer(exporter=exporter)
+
+    def blocking_lookup() -> None:
+        with local.span("thread.lookup"):
+            pass
+
+    async def fetch(delay: float) -> None:
+        with local.span("fetch", delay=delay):
+            await asyncio.sleep(delay)
+            await asyncio.to_thread(blocking_lookup)
+
+    with local.span("outside"):
+        pass
+    with local.trace("root", tool="assess") as root:
+        await asyncio.gather(fetch(0.0), fetch(0.02))
+
+    assert len(exporter.traces) == 1
+    spans = exporter.traces[0]
+    by_id = {span.span_id: span for span in spans}
+    assert {span.trace_id for span in spans} == {root.trace_id}
+    assert sorted(span.name for span in spans) == [
+        "fetch",
+        "fetch",
+        "root",
+        "thread.lookup",
+        "thread.lookup",
+    ]
+    for span in spans:
+        if span.name == "thread.lookup":
+            assert by_id[span.parent_span_id].name == "fetch"
+    path = critical_path(spans)
+    assert [span.name for span in path] == ["root", "fetch", "thread.lookup"]
+    assert path[1].attributes["delay"] == 0.02
+
+    request = spans[-1].to_otlp()
+    assert request["name"] == "root"
+    assert "parentSpanId" not in request
+    assert request["status"] == {"code": 1}
+    assert request["attributes"] == [{"key": "tool", "value": {"stringValue": "assess"}}]
+
+
+def test_head_sampling_drops_whole_traces_and_errors_mark_status() -> None:
+    exporter = InMemorySpanExporter()
+    local = Tracer(exporter=exporter, sample_rate=0.0)
+
+    with local.trace("root") as root:
+        with local.span("child") as child:
+            pass
+    assert root is None and child is None
+    assert exporter.traces == []
+
+    local.configure(exporter=exporter, sample_rate=1.0)
+    with pytest.raises(RuntimeError):
+        with local.trace("root"):
+            with local.span("child"):
+                raise RuntimeError("boom")
+    assert [span.status for span in exporter.traces[0]] == ["error", "error"]
+    assert exporter.traces[0][0].to_otlp()["status"] == {
+        "code": 2,
+        "message": "RuntimeError: boom",
+    }
+
+
+def test_jsonl_exporter_writes_from_its_own_thread(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    exporter = JsonlSpanExporter(tmp_path / "traces.jsonl", max_queued=1)
+    release = threading.Event()
+    writers: list[str] = []
+    original = exporter._write
+
+    def blocked_write(spans):
+        release.wait(timeout=5)
+        writers.append(threading.current_thread().name)
+        original(spans)
+
+    monkeypatch.setattr(exporter, "_write", blocked_write)
+    local = Tracer(exporter=exporter)
+    try:
+        with local.trace("root"):
+            pass
+        while exporter._queue.qsize():
+            # Wait for the writer thread to take the first trace.
+            time.sleep(0.01)
+        for _ in range(2):
+            # Returns at once although the file write is held up.
+            with local.trace("root"):
+                pass
+        release.set()
+        local.flush()
+    finally:
+        release.set()
+        exporter.close()
+
+    lines = (tmp_path / "traces.jsonl").read_text(encoding="utf-8").splitlines()
+    # One trace is being written, one is queued, and the third does not fit.
+    assert len(lines) == 2
+    assert exporter.dropped_traces == 1
+    assert writers == ["trace-exporter", "trace-exporter"]
+
+
+_TRACED_SCHEMA = {"title": "traced.response", "type": "object"}
+
+
+async def _traced_call(params: dict[str, Any]) -> dict[str, Any]:
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"results": {"bindings": []}})
+    )
+    async with SparqlClient(
+        ["https://sparql.example"], transport=transport, service_name="aop_wiki_sparql"
+    ) as client:
+        await client.query("SELECT 1")
+    payload = {"ok": True}
+    validate_payload_against_schema(payload, _TRACED_SCHEMA)
+    return payload
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    registry = FakeToolRegistry(name="traced", handler=_traced_call, output_schema=_TRACED_SCHEMA)
+    monkeypatch.setattr(dispatch_module, "tool_registry", registry)
+    monkeypatch.setenv("AOP_MCP_TRACE_EXPORT_PATH", str(tmp_path / "traces.jsonl"))
+    get_settings.cache_clear()
+    tool_call_audit_log.clear()
+    yield TestClient(create_app())
+    get_settings.cache_clear()
+    tool_call_audit_log.clear()
+    tracer.configure(exporter=None)
+
+
+def test_tool_calls_export_otlp_json_traces(client: TestClient, tmp_path: Path) -> None:
+    response = client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "traced"}},
+    )
+    assert response.status_code == 200
+    tracer.flush()
+
+    lines = (tmp_path / "traces.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    resource_spans = json.loads(lines[0])["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "aop-mcp"}}
+    ]
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    root = next(span for span in spans if "parentSpanId" not in span)
+    assert root["name"] == "tools/call"
+    assert {"key": "mcp.tool.name", "value": {"stringValue": "traced"}} in root["attributes"]
+    children = {span["name"] for span in spans if span.get("parentSpanId") == root["spanId"]}
+    assert {"sparql.query", "validate_payload"} <= children
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])